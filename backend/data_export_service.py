@@ -7,11 +7,22 @@
 
 from pathlib import Path
 from datetime import datetime
-from typing import Tuple, List
+from typing import Tuple, List, Dict, Iterable, Iterator, Optional, Any, Callable, ContextManager
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor
+import filecmp
+import hashlib
+import io
+import json
+import os
 import zipfile
 import tempfile
 import shutil
 import re
+import threading
+import uuid
+
+from fastapi.concurrency import run_in_threadpool
 
 from backend.models import (
     ValidationError,
@@ -20,6 +31,7 @@ from backend.models import (
     ImportSuccessResponse,
     ErrorType
 )
+from backend.storage import StorageProvider, FileStats
 
 # 常數定義
 # 使用絕對路徑,支援開發環境和部署環境
@@ -37,46 +49,286 @@ if not DATA_DIR.exists():
 TEMP_DIR = Path(tempfile.gettempdir())
 REQUIRED_DIRS = ["Day", "Week", "Month", "Year"]
 MAX_ZIP_SIZE = 100 * 1024 * 1024  # 100MB
+MAX_EXTRACTED_SIZE = 10 * MAX_ZIP_SIZE  # 中央目錄記錄的解壓後總大小上限
+MAX_IMPORT_ARCHIVES = 20  # 一次匯入（基準 + 增量）的檔案數上限
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 儲存上傳檔案時每次讀取的位元組數
+STREAM_CHUNK_SIZE = 64 * 1024  # 串流匯出時每次讀取/送出的位元組數
+EXPORT_BATCH_SIZE = 50  # 匯出時每次 read_many 讀取的檔案數
+KEEP_IMPORT_BACKUPS = 1  # 匯入後保留的舊計畫目錄備份數
+
+# 每個匯出 ZIP 最後附上 manifest.json，記錄匯出當下所有檔案的大小與 sha256：
+#   {"version": 1, "type": "full" | "incremental", "created_at": "...",
+#    "files": {"Day/20251025.md": {"size": 12, "sha256": "..."}, ...},
+#    "changed": [...], "deleted": [...]}
+# 增量匯出只打包相對於前一次 manifest 新增或修改的檔案（changed），
+# 並列出已刪除的檔案（deleted）；files 仍為完整狀態，可作為下一次增量的基準。
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+EXPORT_TYPE_FULL = "full"
+EXPORT_TYPE_INCREMENTAL = "incremental"
 
 
 # ============================================================================
 # 匯出相關函數
 # ============================================================================
 
-def create_export_zip() -> Tuple[Path, int]:
+def export_filename() -> str:
+    """產生帶時間戳的匯出檔名 (export_data_YYYYMMDD_HHMMSS.zip)"""
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return f"export_data_{timestamp}.zip"
+
+
+def list_export_files(storage: StorageProvider) -> List[Tuple[str, FileStats]]:
     """
-    建立匯出 ZIP 檔案
+    列出要匯出的計畫檔案
+    
+    以各計畫目錄的 list_files_with_stats 一次列出（Google Drive 為單次分頁查詢），
+    反映目前使用中的儲存後端，而不是本地 DATA_DIR。
+    
+    Args:
+        storage: 目前使用中的 StorageProvider
     
     Returns:
-        Tuple[Path, int]: (ZIP 檔案路徑, 包含的檔案數量)
+        List[Tuple[str, FileStats]]: (相對路徑, 統計資訊)，依路徑排序
     
     Raises:
-        FileNotFoundError: 如果 DATA_DIR 不存在
-        IOError: 如果建立 ZIP 失敗
+        GoogleDriveError 等: 列出目錄失敗（不忽略，避免匯出不完整的資料）
     """
-    if not DATA_DIR.exists():
-        raise FileNotFoundError(f"資料目錄不存在: {DATA_DIR}")
+    files: List[Tuple[str, FileStats]] = []
+    for directory in REQUIRED_DIRS:
+        try:
+            listing = storage.list_files_with_stats(directory)
+        except FileNotFoundError:
+            # 目錄不存在表示沒有此類計畫
+            continue
+        for filename, stats in listing.items():
+            if filename.endswith(".md"):
+                files.append((f"{directory}/{filename}", stats))
+    return sorted(files, key=lambda item: item[0])
+
+
+class _ZipStreamBuffer(io.RawIOBase):
+    """zipfile 的輸出目標：暫存寫入的位元組，由串流產生器逐次取出
     
-    # 產生帶時間戳的檔名
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"export_data_{timestamp}.zip"
-    zip_path = TEMP_DIR / filename
+    不支援 seek/tell，zipfile 會改用 data descriptor 記錄每個檔案的
+    大小與 CRC，因此可以邊壓縮邊送出，不需要先寫完整個檔案。
+    """
     
-    file_count = 0
+    def __init__(self):
+        super().__init__()
+        self._chunks: List[bytes] = []
+    
+    def writable(self) -> bool:
+        return True
     
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+    
+    def drain(self) -> bytes:
+        """取出目前暫存的位元組"""
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def iter_zip_stream(entries: Iterable[Tuple[zipfile.ZipInfo, Iterable[bytes]]]) -> Iterator[bytes]:
+    """
+    邊壓縮邊產生 ZIP 內容
+    
+    Args:
+        entries: (ZipInfo, 檔案內容的區塊) 序列；內容以區塊提供，
+                 記憶體用量只與區塊大小有關，與檔案或 ZIP 大小無關
+        
+    Yields:
+        bytes: ZIP 資料區塊
+    """
+    buffer = _ZipStreamBuffer()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as zipf:
+        for zip_info, chunks in entries:
+            zip_info.compress_type = zipfile.ZIP_DEFLATED
+            with zipf.open(zip_info, 'w') as dest:
+                for chunk in chunks:
+                    dest.write(chunk)
+                    data = buffer.drain()
+                    if data:
+                        yield data
+            data = buffer.drain()
+            if data:
+                yield data
+    # 中央目錄在關閉時寫入
+    data = buffer.drain()
+    if data:
+        yield data
+
+
+def _zip_info(relative_path: str, stats: FileStats) -> zipfile.ZipInfo:
+    """以檔案的修改時間建立 ZipInfo（ZIP 格式最早只能記錄 1980 年）"""
+    modified = stats.modified_at or datetime.now()
+    date_time = max(modified.timetuple()[:6], (1980, 1, 1, 0, 0, 0))
+    return zipfile.ZipInfo(relative_path, date_time=date_time)
+
+
+def _split_chunks(data: bytes) -> Iterator[bytes]:
+    """將內容切成 STREAM_CHUNK_SIZE 的區塊"""
+    for offset in range(0, len(data), STREAM_CHUNK_SIZE):
+        yield data[offset:offset + STREAM_CHUNK_SIZE]
+
+
+def _read_batch(storage: StorageProvider, paths: List[str]) -> Dict[str, str]:
+    """以 read_many 讀取一批檔案（Google Drive 並行下載），任一檔案失敗即中止匯出"""
+    contents = storage.read_many(paths)
+    for path in paths:
+        if isinstance(contents.get(path), Exception):
+            raise IOError(f"讀取 {path} 失敗: {contents[path]}")
+    return contents
+
+
+def parse_manifest(data: bytes) -> Dict[str, Any]:
+    """
+    解析並檢查匯出 manifest
+    
+    Raises:
+        ValueError: 格式不正確或版本不支援
+    """
     try:
-        # 使用 ZIP_DEFLATED 壓縮,串流方式處理
-        with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            # 遞迴遍歷 DATA_DIR 目錄
-            for item in DATA_DIR.rglob("*"):
-                if item.is_file() and item.suffix == ".md":
-                    # 計算相對路徑 (只保留 Day/Week/Month/Year 結構)
-                    # /path/to/data/Day/20251025.md -> Day/20251025.md
-                    arcname = item.relative_to(DATA_DIR)
-                    zipf.write(item, arcname)
-                    file_count += 1
-        
-        return zip_path, file_count
+        manifest = json.loads(data.decode('utf-8'))
+    except (UnicodeDecodeError, ValueError):
+        raise ValueError("manifest 不是有效的 JSON")
+    if not isinstance(manifest, dict) or manifest.get("version") != MANIFEST_VERSION:
+        raise ValueError("不支援的 manifest 版本")
+    if manifest.get("type") not in (EXPORT_TYPE_FULL, EXPORT_TYPE_INCREMENTAL):
+        raise ValueError(f"未知的匯出類型: {manifest.get('type')}")
+    files = manifest.get("files")
+    if not isinstance(files, dict) or not all(
+        isinstance(entry, dict) and "size" in entry and "sha256" in entry for entry in files.values()
+    ):
+        raise ValueError("manifest 缺少檔案清單")
+    if not isinstance(manifest.get("deleted", []), list):
+        raise ValueError("manifest 的刪除清單格式錯誤")
+    return manifest
+
+
+def read_zip_manifest(zipf: zipfile.ZipFile) -> Optional[Dict[str, Any]]:
+    """
+    讀取 ZIP 內的 manifest（舊版匯出沒有 manifest，返回 None）
+    
+    Raises:
+        ValueError: manifest 格式不正確
+    """
+    try:
+        data = zipf.read(MANIFEST_NAME)
+    except KeyError:
+        return None
+    return parse_manifest(data)
+
+
+def load_base_manifest(fileobj) -> Dict[str, Any]:
+    """
+    讀取增量匯出的基準：前一次匯出的 manifest.json，或前一次匯出的 ZIP
+    
+    Args:
+        fileobj: 可 seek 的檔案物件（例如 UploadFile.file）
+        
+    Raises:
+        ValueError: 不是有效的 manifest 或不含 manifest 的 ZIP
+    """
+    if zipfile.is_zipfile(fileobj):
+        fileobj.seek(0)
+        with zipfile.ZipFile(fileobj) as zipf:
+            manifest = read_zip_manifest(zipf)
+        if manifest is None:
+            raise ValueError("此匯出檔沒有 manifest，無法作為增量匯出的基準")
+        return manifest
+    fileobj.seek(0)
+    return parse_manifest(fileobj.read())
+
+
+def stream_export_zip(
+    storage: StorageProvider,
+    files: List[Tuple[str, FileStats]],
+    base_manifest: Optional[Dict[str, Any]] = None
+) -> Iterator[bytes]:
+    """
+    串流產生匯出 ZIP（不建立暫存檔）
+    
+    檔案每 EXPORT_BATCH_SIZE 個以 read_many 讀取；壓縮目前這批的同時，
+    背景執行緒已在讀取下一批，記憶體中最多只有兩批的內容。
+    提供 base_manifest 時為增量匯出：大小與 sha256 都與基準相同的檔案不打包。
+    manifest.json 在所有檔案之後寫入。
+    
+    Args:
+        storage: 目前使用中的 StorageProvider
+        files: list_export_files() 回傳的檔案清單
+        base_manifest: 前一次匯出的 manifest（增量匯出）
+        
+    Yields:
+        bytes: ZIP 資料區塊
+    """
+    batches = [files[i:i + EXPORT_BATCH_SIZE] for i in range(0, len(files), EXPORT_BATCH_SIZE)]
+    base_files = base_manifest["files"] if base_manifest is not None else {}
+    manifest_files: Dict[str, Dict[str, Any]] = {}
+    changed: List[str] = []
+    
+    def entries():
+        if batches:
+            with ThreadPoolExecutor(max_workers=1, thread_name_prefix="export-prefetch") as executor:
+                pending = executor.submit(_read_batch, storage, [path for path, _ in batches[0]])
+                for index, batch in enumerate(batches):
+                    contents = pending.result()
+                    if index + 1 < len(batches):
+                        pending = executor.submit(_read_batch, storage, [path for path, _ in batches[index + 1]])
+                    for relative_path, stats in batch:
+                        data = contents[relative_path].encode('utf-8')
+                        entry = {"size": len(data), "sha256": hashlib.sha256(data).hexdigest()}
+                        manifest_files[relative_path] = entry
+                        if base_files.get(relative_path) == entry:
+                            continue
+                        changed.append(relative_path)
+                        zip_info = _zip_info(relative_path, stats)
+                        zip_info.file_size = len(data)
+                        yield zip_info, _split_chunks(data)
+        
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "type": EXPORT_TYPE_INCREMENTAL if base_manifest is not None else EXPORT_TYPE_FULL,
+            "created_at": datetime.now().isoformat(),
+            "files": manifest_files,
+            "changed": changed,
+            "deleted": sorted(set(base_files) - set(manifest_files)),
+        }
+        if base_manifest is not None:
+            manifest["base_created_at"] = base_manifest.get("created_at")
+        data = json.dumps(manifest, ensure_ascii=False, indent=2).encode('utf-8')
+        yield zipfile.ZipInfo(MANIFEST_NAME, date_time=datetime.now().timetuple()[:6]), [data]
+    
+    return iter_zip_stream(entries())
+
+
+def create_export_zip(storage: StorageProvider) -> Tuple[Path, int]:
+    """
+    建立匯出 ZIP 檔案（寫入 TEMP_DIR，供 /api/export/download 下載）
+    
+    新的匯出改用 stream_export_zip 直接串流，不需要暫存檔。
+    
+    Args:
+        storage: 目前使用中的 StorageProvider
+    
+    Returns:
+        Tuple[Path, int]: (ZIP 檔案路徑, 包含的檔案數量)
+    
+    Raises:
+        IOError: 如果建立 ZIP 失敗
+    """
+    zip_path = TEMP_DIR / export_filename()
+    
+    try:
+        files = list_export_files(storage)
+        with open(zip_path, 'wb') as output:
+            for chunk in stream_export_zip(storage, files):
+                output.write(chunk)
+        
+        return zip_path, len(files)
         
     except Exception as e:
         # 清理失敗的 ZIP 檔案
@@ -89,6 +341,70 @@ def create_export_zip() -> Tuple[Path, int]:
 # 驗證相關函數  
 # ============================================================================
 
+class UploadTooLargeError(ValueError):
+    """上傳檔案超過 MAX_ZIP_SIZE"""
+    
+    def __init__(self, size: int):
+        super().__init__(f"ZIP 檔案過大: 超過 {size / 1024 / 1024:.2f}MB (上限 {MAX_ZIP_SIZE // 1024 // 1024}MB)")
+        self.size = size
+
+
+def _temp_upload_path(prefix: str) -> Path:
+    """同時處理多個上傳時不會重複的暫存檔路徑"""
+    return TEMP_DIR / f"{prefix}_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}.zip"
+
+
+async def spool_upload(upload, dest: Path, max_size: int = MAX_ZIP_SIZE) -> int:
+    """
+    將 UploadFile 分段寫入磁碟
+    
+    記憶體用量固定為 UPLOAD_CHUNK_SIZE；已知大小（upload.size）超過上限時
+    不讀取任何內容，否則累計超過上限時立即停止並刪除暫存檔。
+    
+    Args:
+        upload: FastAPI UploadFile 物件
+        dest: 暫存檔路徑
+        max_size: 大小上限
+        
+    Returns:
+        int: 寫入的位元組數
+        
+    Raises:
+        UploadTooLargeError: 超過大小上限
+    """
+    declared_size = getattr(upload, "size", None)
+    if isinstance(declared_size, int) and declared_size > max_size:
+        raise UploadTooLargeError(declared_size)
+    
+    total = 0
+    try:
+        with open(dest, 'wb') as output:
+            while True:
+                chunk = await upload.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                total += len(chunk)
+                if total > max_size:
+                    raise UploadTooLargeError(total)
+                output.write(chunk)
+    except BaseException:
+        if dest.exists():
+            dest.unlink()
+        raise
+    return total
+
+
+def _missing_dirs(names: Iterable[str]) -> List[str]:
+    """由 ZIP 中央目錄的檔名清單找出缺少的必要目錄"""
+    all_paths = [str(Path(name)) for name in names]
+    # 檢查是否有任何檔案路徑包含此目錄
+    # 例如: data/Day/20251025.md 應包含 "Day"
+    return [
+        required_dir for required_dir in REQUIRED_DIRS
+        if not any(required_dir in path for path in all_paths)
+    ]
+
+
 def validate_zip_structure(zip_path: Path) -> List[str]:
     """
     驗證 ZIP 檔案結構是否包含必要目錄
@@ -99,22 +415,9 @@ def validate_zip_structure(zip_path: Path) -> List[str]:
     Returns:
         List[str]: 缺少的目錄清單 (空清單表示完整)
     """
-    missing_dirs = []
-    
     try:
         with zipfile.ZipFile(zip_path, 'r') as zipf:
-            # 取得所有檔案路徑
-            all_paths = [Path(name) for name in zipf.namelist()]
-            
-            # 檢查每個必要目錄是否存在
-            for required_dir in REQUIRED_DIRS:
-                # 檢查是否有任何檔案路徑包含此目錄
-                # 例如: data/Day/20251025.md 應包含 "Day"
-                found = any(required_dir in str(p) for p in all_paths)
-                if not found:
-                    missing_dirs.append(required_dir)
-        
-        return missing_dirs
+            return _missing_dirs(zipf.namelist())
         
     except zipfile.BadZipFile:
         # 如果不是有效的 ZIP 檔案,回傳所有必要目錄為缺少
@@ -214,21 +517,18 @@ async def validate_zip_file(file) -> ImportValidation:
     file_count = 0
     
     # 建立臨時檔案儲存上傳的 ZIP
-    temp_zip = TEMP_DIR / f"upload_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip"
+    temp_zip = _temp_upload_path("upload")
     
     try:
-        # 儲存上傳檔案
-        content = await file.read()
-        temp_zip.write_bytes(content)
-        
-        # 1. 檢查檔案大小
-        file_size = temp_zip.stat().st_size
-        if file_size > MAX_ZIP_SIZE:
+        # 1. 分段儲存上傳檔案，超過大小上限時立即停止接收
+        try:
+            await spool_upload(file, temp_zip)
+        except UploadTooLargeError as e:
             errors.append(ValidationError(
                 error_type=ErrorType.SIZE,
-                file_path=str(temp_zip.name),
-                message=f"ZIP 檔案過大: {file_size / 1024 / 1024:.2f}MB (上限 100MB)",
-                details={"size_bytes": file_size, "max_size_bytes": MAX_ZIP_SIZE}
+                file_path=str(getattr(file, "filename", None) or temp_zip.name),
+                message=str(e),
+                details={"size_bytes": e.size, "max_size_bytes": MAX_ZIP_SIZE}
             ))
             return ImportValidation(
                 is_valid=False,
@@ -238,8 +538,13 @@ async def validate_zip_file(file) -> ImportValidation:
                 validated_at=datetime.now().isoformat()
             )
         
-        # 2. 驗證 ZIP 結構
-        missing_dirs = validate_zip_structure(temp_zip)
+        # 2. 驗證 ZIP 結構（增量匯出只包含變更的檔案，不要求完整目錄）
+        # 中央目錄只讀取一次，之後的檢查都使用這份清單
+        with zipfile.ZipFile(temp_zip, 'r') as zipf:
+            manifest = read_zip_manifest(zipf)
+            entries = zipf.infolist()
+        is_incremental = manifest is not None and manifest["type"] == EXPORT_TYPE_INCREMENTAL
+        missing_dirs = [] if is_incremental else _missing_dirs(zip_info.filename for zip_info in entries)
         if missing_dirs:
             errors.append(ValidationError(
                 error_type=ErrorType.STRUCTURE,
@@ -248,76 +553,88 @@ async def validate_zip_file(file) -> ImportValidation:
                 details={"missing_dirs": missing_dirs, "required_dirs": REQUIRED_DIRS}
             ))
         
-        # 3. 逐檔驗證
-        with zipfile.ZipFile(temp_zip, 'r') as zipf:
-            for zip_info in zipf.filelist:
-                # 跳過目錄項目
-                if zip_info.is_dir():
-                    continue
-                
-                file_path = Path(zip_info.filename)
-                
-                # 只檢查 .md 檔案
-                if file_path.suffix != ".md":
-                    warnings.append(ValidationError(
-                        error_type=ErrorType.FILENAME,
-                        file_path=str(file_path),
-                        message=f"忽略非 .md 檔案: {file_path.name}",
-                        details={"suffix": file_path.suffix}
-                    ))
-                    continue
-                
-                file_count += 1
-                
-                # 判斷目錄類型
-                dir_type = None
-                for required_dir in REQUIRED_DIRS:
-                    if required_dir in file_path.parts:
-                        dir_type = required_dir
-                        break
-                
-                if not dir_type:
-                    errors.append(ValidationError(
-                        error_type=ErrorType.STRUCTURE,
-                        file_path=str(file_path),
-                        message=f"檔案不在有效目錄中: {file_path}",
-                        details={"path_parts": list(file_path.parts)}
-                    ))
-                    continue
-                
-                # 4. 驗證檔名格式
-                is_valid, error_msg = validate_filename(file_path.name, dir_type)
-                if not is_valid:
+        # 3. 逐檔驗證（只使用中央目錄的資訊，不讀取檔案內容）
+        total_uncompressed = 0
+        for zip_info in entries:
+            # 跳過目錄項目
+            if zip_info.is_dir():
+                continue
+            
+            file_path = Path(zip_info.filename)
+            if zip_info.filename == MANIFEST_NAME:
+                continue
+            
+            # 只檢查 .md 檔案
+            if file_path.suffix != ".md":
+                warnings.append(ValidationError(
+                    error_type=ErrorType.FILENAME,
+                    file_path=str(file_path),
+                    message=f"忽略非 .md 檔案: {file_path.name}",
+                    details={"suffix": file_path.suffix}
+                ))
+                continue
+            
+            file_count += 1
+            total_uncompressed += zip_info.file_size
+            
+            # 判斷目錄類型
+            dir_type = None
+            for required_dir in REQUIRED_DIRS:
+                if required_dir in file_path.parts:
+                    dir_type = required_dir
+                    break
+            
+            if not dir_type:
+                errors.append(ValidationError(
+                    error_type=ErrorType.STRUCTURE,
+                    file_path=str(file_path),
+                    message=f"檔案不在有效目錄中: {file_path}",
+                    details={"path_parts": list(file_path.parts)}
+                ))
+                continue
+            
+            # 4. 驗證檔名格式
+            is_valid, error_msg = validate_filename(file_path.name, dir_type)
+            if not is_valid:
+                errors.append(ValidationError(
+                    error_type=ErrorType.FILENAME,
+                    file_path=str(file_path),
+                    message=error_msg,
+                    details={"dir_type": dir_type, "filename": file_path.name}
+                ))
+                continue
+            
+            # 5. Week 目錄額外檢查星期日
+            if dir_type == "Week":
+                is_sunday, error_msg = validate_weekday(file_path.name)
+                if not is_sunday:
                     errors.append(ValidationError(
-                        error_type=ErrorType.FILENAME,
+                        error_type=ErrorType.WEEKDAY,
                         file_path=str(file_path),
                         message=error_msg,
-                        details={"dir_type": dir_type, "filename": file_path.name}
+                        details={"filename": file_path.name}
                     ))
-                    continue
-                
-                # 5. Week 目錄額外檢查星期日
-                if dir_type == "Week":
-                    is_sunday, error_msg = validate_weekday(file_path.name)
-                    if not is_sunday:
-                        errors.append(ValidationError(
-                            error_type=ErrorType.WEEKDAY,
-                            file_path=str(file_path),
-                            message=error_msg,
-                            details={"filename": file_path.name}
-                        ))
+        
+        # 解壓後的總大小（中央目錄記錄的值），避免 ZIP bomb
+        if total_uncompressed > MAX_EXTRACTED_SIZE:
+            errors.append(ValidationError(
+                error_type=ErrorType.SIZE,
+                file_path="",
+                message=f"解壓後的檔案過大: {total_uncompressed / 1024 / 1024:.2f}MB "
+                        f"(上限 {MAX_EXTRACTED_SIZE // 1024 // 1024}MB)",
+                details={"uncompressed_bytes": total_uncompressed, "max_bytes": MAX_EXTRACTED_SIZE}
+            ))
         
         # 6. 安全性檢查 - Zip Slip
-        with zipfile.ZipFile(temp_zip, 'r') as zipf:
-            for name in zipf.namelist():
-                # 檢查是否包含路徑穿越字元
-                if ".." in name or name.startswith("/"):
-                    errors.append(ValidationError(
-                        error_type=ErrorType.STRUCTURE,
-                        file_path=name,
-                        message=f"偵測到不安全的檔案路徑 (Zip Slip): {name}",
-                        details={"path": name}
-                    ))
+        for name in (zip_info.filename for zip_info in entries):
+            # 檢查是否包含路徑穿越字元
+            if ".." in name or name.startswith("/"):
+                errors.append(ValidationError(
+                    error_type=ErrorType.STRUCTURE,
+                    file_path=name,
+                    message=f"偵測到不安全的檔案路徑 (Zip Slip): {name}",
+                    details={"path": name}
+                ))
         
         return ImportValidation(
             is_valid=len(errors) == 0,
@@ -342,6 +659,21 @@ async def validate_zip_file(file) -> ImportValidation:
             validated_at=datetime.now().isoformat()
         )
         
+    except ValueError as e:
+        errors.append(ValidationError(
+            error_type=ErrorType.STRUCTURE,
+            file_path=MANIFEST_NAME,
+            message=f"匯出 manifest 無效: {str(e)}",
+            details={}
+        ))
+        return ImportValidation(
+            is_valid=False,
+            errors=errors,
+            warnings=warnings,
+            file_count=0,
+            validated_at=datetime.now().isoformat()
+        )
+        
     except Exception as e:
         errors.append(ValidationError(
             error_type=ErrorType.STRUCTURE,
@@ -367,71 +699,6 @@ async def validate_zip_file(file) -> ImportValidation:
 # 匯入相關函數
 # ============================================================================
 
-def backup_current_data() -> Path:
-    """
-    建立當前資料的臨時備份
-    
-    Returns:
-        Path: 備份目錄路徑
-    
-    Raises:
-        IOError: 如果備份失敗
-    """
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    backup_dir = TEMP_DIR / f"backup_data_{timestamp}"
-    
-    try:
-        # 如果 DATA_DIR 存在且有內容,進行備份
-        if DATA_DIR.exists():
-            shutil.copytree(DATA_DIR, backup_dir, dirs_exist_ok=True)
-            print(f"✅ 資料已備份至: {backup_dir}")
-        else:
-            # 如果目錄不存在,建立空備份目錄作為標記
-            backup_dir.mkdir(parents=True, exist_ok=True)
-            print(f"⚠️  原始資料目錄不存在,建立空備份: {backup_dir}")
-        
-        return backup_dir
-        
-    except Exception as e:
-        # 清理失敗的備份
-        if backup_dir.exists():
-            shutil.rmtree(backup_dir)
-        raise IOError(f"備份失敗: {str(e)}")
-
-
-def restore_backup(backup_path: Path) -> None:
-    """
-    從備份還原資料
-    
-    Args:
-        backup_path: 備份目錄路徑
-        
-    Raises:
-        IOError: 如果還原失敗
-    """
-    if not backup_path.exists():
-        raise IOError(f"備份目錄不存在: {backup_path}")
-    
-    try:
-        # 刪除當前資料
-        if DATA_DIR.exists():
-            shutil.rmtree(DATA_DIR)
-        
-        # 從備份還原
-        if any(backup_path.iterdir()):  # 檢查備份是否有內容
-            shutil.copytree(backup_path, DATA_DIR, dirs_exist_ok=True)
-            print(f"✅ 資料已從備份還原: {backup_path}")
-        else:
-            # 空備份表示原本就沒有資料,確保目錄不存在
-            print(f"⚠️  空備份,不進行還原")
-        
-        # 清理備份
-        shutil.rmtree(backup_path)
-        
-    except Exception as e:
-        raise IOError(f"還原失敗: {str(e)}")
-
-
 def safe_extract_member(zip_file: zipfile.ZipFile, member: str, target_dir: Path) -> None:
     """
     安全解壓單一檔案 (防止 Zip Slip)
@@ -467,110 +734,402 @@ def safe_extract_member(zip_file: zipfile.ZipFile, member: str, target_dir: Path
         raise IOError(f"解壓檔案失敗 {member}: {str(e)}")
 
 
-async def execute_import(file) -> ImportSuccessResponse:
+def _data_file_path(relative_path: str, data_dir: Optional[Path] = None) -> Path:
+    """
+    將 manifest 中的相對路徑轉換為資料目錄（預設 DATA_DIR）內的路徑
+    
+    Raises:
+        SecurityError: 路徑不在計畫目錄內（路徑穿越）
+    """
+    parts = Path(relative_path).parts
+    if (
+        len(parts) != 2 or parts[0] not in REQUIRED_DIRS
+        or not relative_path.endswith(".md") or ".." in parts
+    ):
+        raise SecurityError(f"manifest 包含不安全的路徑: {relative_path}")
+    return (data_dir or DATA_DIR) / relative_path
+
+
+def _apply_archive(
+    zip_path: Path, manifest: Optional[Dict[str, Any]], target_dir: Path
+) -> Tuple[int, int, int]:
+    """
+    將 ZIP 的 .md 檔案解壓到 target_dir，並刪除增量 manifest 列出的檔案
+    
+    Returns:
+        Tuple[int, int, int]: (匯入數量, 覆寫數量, 刪除數量)
+    """
+    imported_count = 0
+    overwritten_count = 0
+    deleted_count = 0
+    
+    with zipfile.ZipFile(zip_path, 'r') as zipf:
+        for member in zipf.namelist():
+            # 跳過目錄和非 .md 檔案（包含 manifest.json）
+            if member.endswith('/') or not member.endswith('.md'):
+                continue
+            # 只匯入計畫目錄，其餘目錄不會被替換進 DATA_DIR
+            if Path(member).parts[0] not in REQUIRED_DIRS:
+                continue
+            
+            # ZIP 內的路徑應該直接是 Day/Week/Month/Year 開頭
+            # Day/20251025.md -> 直接使用
+            target_file = target_dir / member
+            
+            # 檢查檔案是否已存在 (用於統計覆寫數量)
+            if target_file.exists():
+                overwritten_count += 1
+                # 暫存檔可能是現有資料的硬連結，先解除連結再寫入，
+                # 避免直接改寫到使用中的檔案
+                target_file.unlink()
+            
+            # 確保目標目錄存在
+            target_file.parent.mkdir(parents=True, exist_ok=True)
+            
+            # 安全解壓到 target_dir
+            safe_extract_member(zipf, member, target_dir)
+            imported_count += 1
+    
+    if manifest is not None:
+        for relative_path in manifest.get("deleted", []):
+            target_file = _data_file_path(relative_path, target_dir)
+            if target_file.exists():
+                target_file.unlink()
+                deleted_count += 1
+    
+    return imported_count, overwritten_count, deleted_count
+
+
+def _list_plan_files(root: Path) -> Dict[str, Path]:
+    """列出 root 下計畫目錄內的 .md 檔案（相對路徑 -> 完整路徑）"""
+    return {
+        item.relative_to(root).as_posix(): item
+        for directory in REQUIRED_DIRS
+        if (root / directory).is_dir()
+        for item in (root / directory).glob("*.md")
+        if item.is_file()
+    }
+
+
+def _changed_plan_files(old_root: Path, new_root: Path) -> Tuple[List[str], List[str]]:
+    """
+    比較換入前後的計畫檔案
+    
+    增量匯入未改動的檔案與舊資料是同一個硬連結，不需比較內容。
+    
+    Returns:
+        Tuple[List[str], List[str]]: (新增或內容不同的檔案, 已刪除的檔案) 相對路徑
+    """
+    old_files = _list_plan_files(old_root)
+    new_files = _list_plan_files(new_root)
+    written = sorted(
+        relative_path for relative_path, item in new_files.items()
+        if relative_path not in old_files
+        or not (
+            os.path.samefile(item, old_files[relative_path])
+            or filecmp.cmp(item, old_files[relative_path], shallow=False)
+        )
+    )
+    deleted = sorted(set(old_files) - set(new_files))
+    return written, deleted
+
+
+def verify_against_manifest(manifest: Dict[str, Any], data_dir: Optional[Path] = None) -> None:
+    """
+    確認資料目錄（預設 DATA_DIR）的計畫檔案與 manifest 記錄的完整狀態一致
+    
+    增量匯入時可確認目前資料正是該增量的基準（基準錯誤或缺少
+    中間的增量時，未打包的檔案會與 manifest 不符）。
+    
+    Raises:
+        ValueError: 檔案缺少、多出或內容不符
+    """
+    data_dir = data_dir or DATA_DIR
+    expected = manifest["files"]
+    actual = set(_list_plan_files(data_dir))
+    
+    missing = sorted(set(expected) - actual)
+    extra = sorted(actual - set(expected))
+    mismatched = sorted(
+        relative_path
+        for relative_path in set(expected) & actual
+        if hashlib.sha256(_data_file_path(relative_path, data_dir).read_bytes()).hexdigest()
+        != expected[relative_path]["sha256"]
+    )
+    if missing or extra or mismatched:
+        sample = (missing + extra + mismatched)[:5]
+        raise ValueError(
+            f"匯入後的資料與 manifest 不符（缺少 {len(missing)}、多出 {len(extra)}、"
+            f"內容不同 {len(mismatched)} 個檔案，例如 {', '.join(sample)}）；"
+            f"增量匯出需套用在其基準資料上"
+        )
+
+
+def _sibling_dir(kind: str) -> Path:
+    """
+    DATA_DIR 旁的暫存目錄路徑（staging / 備份）
+    
+    與 DATA_DIR 位於同一個檔案系統，之後才能以 rename 原子性地搬移目錄。
+    """
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return DATA_DIR.parent / f".{DATA_DIR.name}_{kind}_{timestamp}_{uuid.uuid4().hex[:8]}"
+
+
+def _link_or_copy(src: str, dst: str) -> None:
+    """以硬連結複製檔案（不支援硬連結的檔案系統改為實際複製）"""
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+def _link_current_plans(staging_dir: Path) -> None:
+    """
+    以硬連結在 staging_dir 建立現有計畫目錄的副本，作為增量匯入的基準
+    
+    只建立目錄項目而不複製內容；之後寫入的檔案會先解除連結，
+    不會改動使用中的資料。換入後未變動的檔案與 .data_backup_* 中的
+    舊檔案共用 inode，LocalStorageProvider.write_file 以暫存檔 + rename
+    寫入新的 inode，因此之後編輯計畫不會改到備份中的內容。
+    """
+    for directory in REQUIRED_DIRS:
+        current = DATA_DIR / directory
+        if current.is_dir():
+            shutil.copytree(current, staging_dir / directory, copy_function=_link_or_copy)
+
+
+def _swap_in(staging_dir: Path, backup_dir: Path) -> None:
+    """
+    以 rename 將 staging_dir 的計畫目錄換入 DATA_DIR
+    
+    每個計畫目錄先整個改名移到 backup_dir，再把暫存目錄改名換入；
+    都是同一檔案系統內的 rename，不複製任何檔案。替換並非原子性：
+    兩次 rename 之間該目錄短暫不存在，四個目錄也是逐一替換，期間
+    讀取端可能看到部分舊資料、部分新資料。呼叫端需在 PlanService 的
+    寫入鎖內執行（見 execute_import 的 swap_guard），避免與計畫寫入交錯。
+    DATA_DIR 內的其他目錄（例如 settings）不受影響。
+    
+    Raises:
+        IOError: 換入失敗（已換入的目錄會移回原位）
+    """
+    DATA_DIR.mkdir(parents=True, exist_ok=True)
+    backup_dir.mkdir(parents=True, exist_ok=True)
+    swapped: List[str] = []
+    
+    try:
+        for directory in REQUIRED_DIRS:
+            new_dir = staging_dir / directory
+            new_dir.mkdir(parents=True, exist_ok=True)
+            current = DATA_DIR / directory
+            if current.exists():
+                os.rename(current, backup_dir / directory)
+            swapped.append(directory)
+            os.rename(new_dir, current)
+    except OSError as e:
+        # 還原已移動的目錄
+        for directory in reversed(swapped):
+            current = DATA_DIR / directory
+            old_dir = backup_dir / directory
+            if current.exists():
+                os.rename(current, staging_dir / directory)
+            if old_dir.exists():
+                os.rename(old_dir, current)
+        raise IOError(f"替換資料目錄失敗: {str(e)}")
+
+
+def _check_archive(zip_path: Path) -> Optional[Dict[str, Any]]:
+    """
+    簡單驗證匯入的 ZIP：是否為有效 ZIP、manifest 格式，以及完整匯出的目錄結構
+    
+    Returns:
+        ZIP 內的 manifest（舊版匯出為 None）
+    
+    Raises:
+        ValueError: 驗證失敗
+    """
+    try:
+        with zipfile.ZipFile(zip_path, 'r') as zipf:
+            manifest = read_zip_manifest(zipf)
+            if manifest is not None and manifest["type"] == EXPORT_TYPE_INCREMENTAL:
+                return manifest
+            
+            # 檢查結構
+            missing_dirs = _missing_dirs(zipf.namelist())
+            if missing_dirs:
+                raise ValueError(f"ZIP 檔案缺少必要目錄: {', '.join(missing_dirs)}")
+            return manifest
+    except zipfile.BadZipFile:
+        raise ValueError("上傳的檔案不是有效的 ZIP 格式")
+
+
+def prune_import_backups(keep: Optional[Path] = None) -> None:
+    """
+    刪除較舊的匯入備份（DATA_DIR 旁的 .<DATA_DIR>_backup_* 目錄）
+    
+    只保留最近 KEEP_IMPORT_BACKUPS 份；keep 為剛換下的備份，一定保留。
+    """
+    prefix = f".{DATA_DIR.name}_backup_"
+    try:
+        backups = [
+            path for path in DATA_DIR.parent.iterdir()
+            if path.is_dir() and path.name.startswith(prefix) and path != keep
+        ]
+    except OSError:
+        return
+    backups.sort(key=lambda path: (path.stat().st_mtime_ns, path.name))
+    remaining = max(0, KEEP_IMPORT_BACKUPS - (1 if keep is not None else 0))
+    for path in backups[:max(0, len(backups) - remaining)]:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def _prune_backups_in_background(keep: Path) -> None:
+    """在背景執行緒刪除較舊的匯入備份，不延遲匯入的回應"""
+    threading.Thread(
+        target=prune_import_backups, args=(keep,), name="import-backup-prune", daemon=True
+    ).start()
+
+
+def _import_archives(
+    temp_zips: List[Path],
+    manifests: List[Optional[Dict[str, Any]]],
+    replace_all: bool,
+    swap_guard: Optional[ContextManager],
+    on_swapped: Optional[Callable[[List[str], List[str]], None]]
+) -> ImportSuccessResponse:
+    """
+    在 staging 目錄套用匯入檔案並換入計畫目錄（阻塞操作，於執行緒池執行）
+    
+    換下的舊計畫目錄保留在 DATA_DIR 旁作為最近一次匯入前的備份。
+    
+    Raises:
+        IOError: 匯入失敗（現有資料未變更）
+    """
+    staging_dir = _sibling_dir("import")
+    backup_dir = _sibling_dir("backup")
+    swapped = False
+    
+    try:
+        # 3. 在 DATA_DIR 旁建立 staging 目錄；增量匯入以硬連結取得現有資料
+        staging_dir.mkdir(parents=True)
+        if not replace_all:
+            _link_current_plans(staging_dir)
+        
+        # 4. 依序解壓匯入資料並套用刪除（只寫入 staging，不影響現有資料）
+        imported_count = 0
+        overwritten_count = 0
+        deleted_count = 0
+        for temp_zip, manifest in zip(temp_zips, manifests):
+            imported, overwritten, deleted = _apply_archive(temp_zip, manifest, staging_dir)
+            imported_count += imported
+            overwritten_count += overwritten
+            deleted_count += deleted
+        
+        # 5. 確認結果與最後一個 manifest 一致
+        if manifests[-1] is not None:
+            verify_against_manifest(manifests[-1], staging_dir)
+        
+        # 6. 以 rename 換入計畫目錄，舊目錄移到 backup_dir
+        #    換入後通知變更的檔案（hybrid 模式排入雲端複寫）
+        with swap_guard or nullcontext():
+            _swap_in(staging_dir, backup_dir)
+            swapped = True
+            if on_swapped is not None:
+                on_swapped(*_changed_plan_files(backup_dir, DATA_DIR))
+        
+    except Exception as e:
+        if swapped:
+            raise IOError(f"資料已匯入，但通知變更的檔案失敗: {str(e)}")
+        # 換入前失敗時現有資料從未被修改；換入失敗時 _swap_in 已移回舊目錄
+        raise IOError(f"匯入失敗已回滾，現有資料未變更: {str(e)}")
+    
+    finally:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        if swapped:
+            # 7. 保留剛換下的舊計畫目錄，較舊的備份在背景刪除
+            _prune_backups_in_background(backup_dir)
+        else:
+            # 只移除空的備份目錄；回滾未完成時舊資料仍留在其中
+            try:
+                backup_dir.rmdir()
+            except OSError:
+                pass
+    
+    message = f"成功匯入 {imported_count} 個檔案 (覆寫 {overwritten_count} 個"
+    if deleted_count:
+        message += f"，刪除 {deleted_count} 個"
+    message += ")"
+    return ImportSuccessResponse(
+        success=True,
+        message=message,
+        file_count=imported_count,
+        overwritten_count=overwritten_count,
+        deleted_count=deleted_count,
+        imported_at=datetime.now().isoformat()
+    )
+
+
+async def execute_import(
+    file,
+    increments: Optional[List] = None,
+    swap_guard: Optional[ContextManager] = None,
+    on_swapped: Optional[Callable[[List[str], List[str]], None]] = None
+) -> ImportSuccessResponse:
     """
     執行資料匯入 (含原子性和回滾)
     
+    file 為完整匯出時取代現有資料；為增量匯出時套用在現有資料上。
+    匯入內容先寫入 DATA_DIR 旁的 staging 目錄，驗證通過後才以 rename
+    換入計畫目錄，不需複製現有資料，失敗時現有資料不受影響。
+    換下的舊計畫目錄保留為 DATA_DIR 旁的 .<DATA_DIR>_backup_* 目錄
+    （只保留最近 KEEP_IMPORT_BACKUPS 份）。
+    increments 為依序套用在 file 之後的增量匯出（基準 + 增量鏈）。
+    最後一個檔案有 manifest 時，確認匯入結果與其記錄的狀態一致，
+    不一致則回滾。解壓、驗證與換入都在執行緒池執行，不阻塞事件迴圈。
+    
     Args:
         file: FastAPI UploadFile 物件
+        increments: 依序套用的增量匯出 UploadFile 清單
+        swap_guard: 換入計畫目錄時持有的 context manager
+            （PlanService.exclusive_write()），None 時不加鎖
+        on_swapped: 換入後以 (新增或內容不同的檔案, 已刪除的檔案) 呼叫，
+            在 swap_guard 內執行（例如排入 hybrid 模式的雲端複寫佇列）
         
     Returns:
         ImportSuccessResponse: 匯入結果
         
     Raises:
-        HTTPException: 如果驗證失敗或匯入過程發生錯誤
+        ValueError: 驗證失敗
+        IOError: 匯入過程發生錯誤（已回滾）
     """
-    backup_path = None
-    temp_zip = None
+    temp_zips: List[Path] = []
     
     try:
-        # 1. 先儲存上傳的 ZIP 檔案
-        temp_zip = TEMP_DIR / f"import_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip"
-        content = await file.read()
-        temp_zip.write_bytes(content)
+        # 1. 先分段儲存上傳的 ZIP 檔案（超過大小上限時立即停止）
+        uploads = [file] + list(increments or [])
+        if len(uploads) > MAX_IMPORT_ARCHIVES:
+            raise ValueError(f"一次最多匯入 {MAX_IMPORT_ARCHIVES} 個檔案")
+        for upload in uploads:
+            temp_zip = _temp_upload_path("import")
+            temp_zips.append(temp_zip)
+            await spool_upload(upload, temp_zip)
         
         # 2. 驗證 ZIP 檔案 (使用檔案路徑而非 UploadFile)
-        # 簡單驗證:檢查是否為有效 ZIP 和結構
-        try:
-            with zipfile.ZipFile(temp_zip, 'r') as zipf:
-                # 檢查結構
-                all_paths = [Path(name) for name in zipf.namelist()]
-                missing_dirs = []
-                for required_dir in REQUIRED_DIRS:
-                    found = any(required_dir in str(p) for p in all_paths)
-                    if not found:
-                        missing_dirs.append(required_dir)
-                
-                if missing_dirs:
-                    raise ValueError(f"ZIP 檔案缺少必要目錄: {', '.join(missing_dirs)}")
-        except zipfile.BadZipFile:
-            raise ValueError("上傳的檔案不是有效的 ZIP 格式")
-        
-        # 3. 建立備份
-        backup_path = backup_current_data()
-        
-        # 4. 清空現有資料
-        if DATA_DIR.exists():
-            shutil.rmtree(DATA_DIR)
-        DATA_DIR.mkdir(parents=True, exist_ok=True)
-        
-        # 5. 解壓匯入資料
-        overwritten_count = 0
-        imported_count = 0
+        manifests = [await run_in_threadpool(_check_archive, temp_zip) for temp_zip in temp_zips]
+        for manifest in manifests[1:]:
+            if manifest is None or manifest["type"] != EXPORT_TYPE_INCREMENTAL:
+                raise ValueError("基準之後的匯入檔案必須是增量匯出")
+        replace_all = manifests[0] is None or manifests[0]["type"] == EXPORT_TYPE_FULL
         
-        with zipfile.ZipFile(temp_zip, 'r') as zipf:
-            for member in zipf.namelist():
-                # 跳過目錄和非 .md 檔案
-                if member.endswith('/') or not member.endswith('.md'):
-                    continue
-                
-                # ZIP 內的路徑應該直接是 Day/Week/Month/Year 開頭
-                # Day/20251025.md -> 直接使用
-                target_file = DATA_DIR / member
-                
-                # 檢查檔案是否已存在 (用於統計覆寫數量)
-                if target_file.exists():
-                    overwritten_count += 1
-                
-                # 確保目標目錄存在
-                target_file.parent.mkdir(parents=True, exist_ok=True)
-                
-                # 安全解壓到 DATA_DIR
-                safe_extract_member(zipf, member, DATA_DIR)
-                imported_count += 1
-        
-        # 6. 匯入成功,清理備份
-        if backup_path and backup_path.exists():
-            shutil.rmtree(backup_path)
-        
-        # 7. 清理臨時 ZIP
-        if temp_zip and temp_zip.exists():
-            temp_zip.unlink()
-        
-        return ImportSuccessResponse(
-            success=True,
-            message=f"成功匯入 {imported_count} 個檔案 (覆寫 {overwritten_count} 個)",
-            file_count=imported_count,
-            overwritten_count=overwritten_count,
-            imported_at=datetime.now().isoformat()
+        # 3~7. 套用並換入計畫目錄
+        return await run_in_threadpool(
+            _import_archives, temp_zips, manifests, replace_all, swap_guard, on_swapped
         )
-        
-    except Exception as e:
-        # 匯入失敗,從備份還原
-        if backup_path and backup_path.exists():
-            try:
-                restore_backup(backup_path)
-                error_msg = f"匯入失敗已回滾: {str(e)}"
-            except Exception as restore_error:
-                error_msg = f"匯入失敗且回滾失敗: {str(e)} | 回滾錯誤: {str(restore_error)}"
-        else:
-            error_msg = f"匯入失敗: {str(e)}"
-        
-        # 清理臨時檔案
-        if temp_zip and temp_zip.exists():
-            temp_zip.unlink()
-        
-        raise IOError(error_msg)
+    
+    finally:
+        # 清理臨時 ZIP
+        for temp_zip in temp_zips:
+            if temp_zip.exists():
+                temp_zip.unlink()
 
 
 # 自訂例外
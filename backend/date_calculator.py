@@ -1,5 +1,5 @@
-from datetime import date, timedelta
-from typing import Tuple
+from datetime import date, datetime, timedelta
+from typing import Optional, Tuple
 from .models import PlanType
 
 
@@ -103,16 +103,48 @@ class DateCalculator:
             raise ValueError(f"Unknown plan type: {plan_type}")
     
     @staticmethod
-    def get_file_path(plan_type: PlanType, target_date: date, base_dir: str = "data") -> str:
-        """取得完整檔案路徑"""
+    def get_subdir(plan_type: PlanType) -> str:
+        """取得計畫類型對應的子目錄名稱"""
         subdir_map = {
             PlanType.YEAR: "Year",
             PlanType.MONTH: "Month", 
             PlanType.WEEK: "Week",
             PlanType.DAY: "Day"
         }
+        return subdir_map[plan_type]
+    
+    @staticmethod
+    def parse_filename(plan_type: PlanType, filename: str) -> Optional[date]:
+        """由檔案名稱解析標準日期（get_filename 的反向操作），格式不符時返回 None"""
+        if not filename.endswith(".md"):
+            return None
+        
+        # (格式, 位數)；strptime 可接受少於指定位數的數字，需額外檢查長度
+        formats = {
+            PlanType.YEAR: ("%Y", 4),
+            PlanType.MONTH: ("%Y%m", 6),
+            PlanType.WEEK: ("%Y%m%d", 8),
+            PlanType.DAY: ("%Y%m%d", 8)
+        }
+        name = filename[:-len(".md")]
+        fmt, length = formats[plan_type]
+        if not name.isdigit() or len(name) != length:
+            return None
         
-        subdir = subdir_map[plan_type]
+        try:
+            parsed = datetime.strptime(name, fmt).date()
+        except ValueError:
+            return None
+        
+        # 只接受標準日期（例如週計畫必須為週日）
+        if DateCalculator.get_canonical_date(plan_type, parsed) != parsed:
+            return None
+        return parsed
+    
+    @staticmethod
+    def get_file_path(plan_type: PlanType, target_date: date, base_dir: str = "data") -> str:
+        """取得完整檔案路徑"""
+        subdir = DateCalculator.get_subdir(plan_type)
         filename = DateCalculator.get_filename(plan_type, target_date)
         return f"{base_dir}/{subdir}/{filename}"
     
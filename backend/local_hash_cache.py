@@ -0,0 +1,83 @@
+"""
+LocalHashCache - 本地檔案 MD5 快取
+
+同步比較需要每個本地計畫檔案的 MD5。此快取以 (路徑, 大小, mtime_ns)
+記錄已計算的 MD5 並保存到 data/settings/local_md5_cache.json，
+檔案未變動時不需再讀取內容。
+"""
+
+import logging
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+from .storage.json_store import SETTINGS_DIR, KeyedJsonStore
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = SETTINGS_DIR / "local_md5_cache.json"
+
+
+class LocalHashCache:
+    """以 (大小, mtime_ns) 驗證的本地檔案 MD5 快取
+
+    get/put 只操作記憶體，save() 時才寫入磁碟（內容有變動時）。
+    排程同步與手動同步可能同時使用各自的實例，save() 在共用鎖內
+    讀取最新的檔案，只套用此實例新增、更新或移除的項目。
+    """
+
+    VERSION = 1
+
+    def __init__(self, cache_path: Optional[Path] = None):
+        self.cache_path = Path(cache_path) if cache_path is not None else DEFAULT_CACHE_PATH
+        self._store = KeyedJsonStore(self.cache_path, self.VERSION, "本地 MD5 快取", field="files")
+        self._entries: Dict[str, Tuple[int, int, str]] = self._parse(self._store.get_all())
+        self._updated: Dict[str, Tuple[int, int, str]] = {}
+        self._removed: Set[str] = set()
+
+    @staticmethod
+    def _parse(files: Dict[str, Any]) -> Dict[str, Tuple[int, int, str]]:
+        return {path: (size, mtime_ns, md5) for path, (size, mtime_ns, md5) in files.items()}
+
+    def get(self, relative_path: str, size: int, mtime_ns: Optional[int]) -> Optional[str]:
+        """取得檔案的 MD5；檔案大小或 mtime 已改變時返回 None"""
+        if mtime_ns is None:
+            return None
+        entry = self._entries.get(relative_path)
+        if entry is None or entry[0] != size or entry[1] != mtime_ns:
+            return None
+        return entry[2]
+
+    def put(self, relative_path: str, size: int, mtime_ns: Optional[int], md5: str) -> None:
+        """記錄檔案的 MD5（沒有 mtime_ns 時不快取）"""
+        if mtime_ns is None:
+            return
+        entry = (size, mtime_ns, md5)
+        if self._entries.get(relative_path) != entry:
+            self._entries[relative_path] = entry
+            self._updated[relative_path] = entry
+            self._removed.discard(relative_path)
+
+    def retain(self, relative_paths: Iterable[str]) -> None:
+        """移除不在清單中的檔案（已刪除的檔案）"""
+        keep = set(relative_paths)
+        for path in [path for path in self._entries if path not in keep]:
+            del self._entries[path]
+            self._updated.pop(path, None)
+            self._removed.add(path)
+
+    def save(self) -> None:
+        """將此實例的變動合併寫入磁碟（失敗時只記錄警告）"""
+        if not self._updated and not self._removed:
+            return
+
+        def apply(files: Dict[str, Any]) -> None:
+            for path in self._removed:
+                files.pop(path, None)
+            files.update({path: list(entry) for path, entry in self._updated.items()})
+
+        try:
+            self._entries = self._parse(self._store.update_entries(apply))
+            self._updated.clear()
+            self._removed.clear()
+        except OSError as e:
+            logger.warning(f"寫入本地 MD5 快取失敗: {e}")
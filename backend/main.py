@@ -11,11 +11,13 @@ Work Plan Calendar API - Main Application
   - data.py: 資料匯出/匯入
 """
 
+import logging
 import os
 import sys
+from contextlib import asynccontextmanager
 from pathlib import Path
 
-from fastapi import FastAPI, status
+from fastapi import FastAPI, Request, status
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse, JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
@@ -24,7 +26,8 @@ from fastapi.middleware.cors import CORSMiddleware
 project_root = Path(__file__).parent.parent
 sys.path.append(str(project_root))
 
-from backend.models import ErrorResponse
+from backend.models import ErrorResponse, StorageModeType
+from backend.data_export_service import MAX_ZIP_SIZE, MAX_IMPORT_ARCHIVES
 from backend.routers import (
     plans_router,
     settings_router,
@@ -33,15 +36,45 @@ from backend.routers import (
     data_router,
     sync_router,
 )
+from backend.routers.dependencies import get_plan_service, get_settings_service, get_sync_scheduler
+
+logger = logging.getLogger(__name__)
 
 # ============================================================================
 # Application Setup
 # ============================================================================
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """啟動與關閉背景工作
+
+    - hybrid 模式：恢復本地 + Google Drive 背景複寫（繼續上次未完成的佇列）
+    - 背景排程同步（AUTO_SYNC_INTERVAL_SECONDS 未設定時不啟動）
+    """
+    plan_service = get_plan_service()
+    storage_mode = get_settings_service().get_storage_mode()
+    if storage_mode.mode == StorageModeType.HYBRID:
+        try:
+            plan_service.switch_storage_provider(storage_mode.mode, storage_mode.google_drive_path)
+        except Exception as e:
+            logger.warning(f"無法恢復 Google Drive 背景複寫，暫時使用本地儲存: {e}")
+
+    scheduler = get_sync_scheduler()
+    if scheduler.enabled:
+        plan_service.add_write_listener(scheduler.notify_plan_written)
+        scheduler.start()
+    try:
+        yield
+    finally:
+        scheduler.stop()
+        plan_service.storage.close()
+
+
 app = FastAPI(
     title="Work Plan Calendar API",
     description="REST API for managing hierarchical work plans by calendar periods",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -53,6 +86,31 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 匯入 API 的請求大小上限：依 Content-Length 在接收內容前拒絕過大的上傳
+# （multipart 表單在進入 endpoint 前就會被完整接收）
+MULTIPART_OVERHEAD = 64 * 1024
+IMPORT_REQUEST_LIMITS = {
+    "/api/import/validate": MAX_ZIP_SIZE + MULTIPART_OVERHEAD,
+    "/api/import/execute": MAX_ZIP_SIZE * MAX_IMPORT_ARCHIVES + MULTIPART_OVERHEAD,
+}
+
+
+@app.middleware("http")
+async def reject_oversized_imports(request: Request, call_next):
+    """Content-Length 超過匯入上限時直接回應 413，不接收上傳內容"""
+    limit = IMPORT_REQUEST_LIMITS.get(request.url.path)
+    content_length = request.headers.get("content-length", "")
+    if limit is not None and content_length.isdigit() and int(content_length) > limit:
+        return JSONResponse(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            content=ErrorResponse(
+                error="UPLOAD_TOO_LARGE",
+                message=f"上傳檔案過大 (上限 {MAX_ZIP_SIZE // 1024 // 1024}MB)",
+                details={"content_length": int(content_length), "max_bytes": limit}
+            ).dict()
+        )
+    return await call_next(request)
+
 # ============================================================================
 # Static Files
 # ============================================================================
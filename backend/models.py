@@ -31,6 +31,7 @@ class StorageModeType(str, Enum):
     """儲存模式類型"""
     LOCAL = "local"                    # 本地檔案系統
     GOOGLE_DRIVE = "google_drive"      # Google Drive
+    HYBRID = "hybrid"                  # 本地檔案系統，背景複寫到 Google Drive
 
 
 class GoogleAuthStatus(str, Enum):
@@ -105,6 +106,17 @@ class StorageStatusResponse(BaseModel):
     google_drive_path: Optional[str]
     google_auth: GoogleAuthInfo
     is_ready: bool  # 當前模式是否可用
+    pending_replications: Optional[int] = None   # hybrid 模式尚未複寫到雲端的檔案數
+    replication_error: Optional[str] = None      # hybrid 模式最近一次複寫失敗的原因
+
+
+class DriveRequestMetricsResponse(BaseModel):
+    """Google Drive 請求重試與節流統計（程序啟動後累計）"""
+    requests: int = 0               # 送出的請求數（batch 依其中的請求數計算）
+    retries: int = 0                # 重試次數（含速率限制與伺服器錯誤）
+    rate_limited: int = 0           # 收到 rateLimitExceeded/429 的次數
+    throttled_seconds: float = 0.0  # 等待速率限制配額的總秒數
+    backoff_seconds: float = 0.0    # 錯誤後退避等待的總秒數
 
 
 class GoogleDrivePathUpdateRequest(BaseModel):
@@ -153,6 +165,40 @@ class AllPlans(BaseModel):
     plans: Dict[str, Optional[Plan]]
 
 
+class PlanBatchItem(BaseModel):
+    """批次讀取中的單一計畫"""
+    type: PlanType
+    date: date
+
+
+class PlanBatchRequest(BaseModel):
+    """批次讀取計畫請求"""
+    items: List[PlanBatchItem]
+
+    @validator('items')
+    def items_within_limit(cls, v):
+        if len(v) == 0:
+            raise ValueError("計畫清單不可為空")
+        if len(v) > 400:
+            raise ValueError("單次最多讀取 400 個計畫")
+        return v
+
+
+class PlanBatchResponse(BaseModel):
+    """批次讀取計畫回應，plans 順序與請求 items 相同；讀取失敗的項目為 None"""
+    plans: List[Optional[Plan]]
+
+
+class PlanCacheStats(BaseModel):
+    """計畫內容快取統計"""
+    capacity: int                # 快取容量上限（項目數）
+    size: int                    # 目前快取項目數
+    hits: int                    # 命中次數
+    misses: int                  # 未命中次數（含過期）
+    evictions: int               # 因容量不足被淘汰的次數
+    hit_rate: float              # hits / (hits + misses)
+
+
 class CopyRequest(BaseModel):
     source_type: PlanType
     source_date: date
@@ -268,6 +314,7 @@ class ImportSuccessResponse(BaseModel):
     message: str
     file_count: int = Field(ge=0)
     overwritten_count: int = Field(ge=0)
+    deleted_count: int = Field(default=0, ge=0)  # 增量匯入刪除的檔案數
     imported_at: str
 
 
@@ -287,6 +334,7 @@ class SyncAction(str, Enum):
     """同步操作方向"""
     UPLOAD = "upload"            # 將本地檔案上傳至 Google Drive（覆蓋）
     DOWNLOAD = "download"        # 將 Google Drive 檔案下載至本地（覆蓋）
+    MERGE = "merge"              # 以上次同步的內容為基準三方合併，結果寫入兩端
     SKIP = "skip"                # 不執行同步
 
 
@@ -322,6 +370,10 @@ class SyncComparisonResult(BaseModel):
     total_same: int
     total_different: int
     compared_at: datetime
+    incremental: bool = False  # 是否依上次比較紀錄只檢查有變動的檔案
+    hash_cache_hits: int = 0  # 本地 MD5 由快取取得的檔案數
+    hash_cache_misses: int = 0  # 需讀取檔案計算 MD5 的檔案數
+    hash_cache_hit_rate: float = 0.0
 
 
 class SyncOperationRequest(BaseModel):
@@ -332,7 +384,7 @@ class SyncOperationRequest(BaseModel):
     @validator('action')
     def action_not_skip(cls, v):
         if v == SyncAction.SKIP:
-            raise ValueError("操作不可為 skip，請只包含 upload 或 download")
+            raise ValueError("操作不可為 skip，請只包含 upload、download 或 merge")
         return v
 
 
@@ -353,6 +405,7 @@ class SyncOperationResult(BaseModel):
     action: SyncAction
     success: bool
     error_message: Optional[str]
+    merge_conflicts: int = 0     # merge 操作中以衝突標記保留雙方內容的區塊數
 
 
 class SyncExecuteResult(BaseModel):
@@ -362,3 +415,20 @@ class SyncExecuteResult(BaseModel):
     failed_count: int
     results: List[SyncOperationResult]
     executed_at: datetime
+
+
+class SyncSchedulerStatus(BaseModel):
+    """背景排程同步狀態"""
+    enabled: bool                                  # 是否啟用（AUTO_SYNC_INTERVAL_SECONDS > 0）
+    running: bool                                  # 目前是否正在執行
+    interval_seconds: float
+    debounce_seconds: float
+    total_runs: int = 0
+    last_run_at: Optional[datetime] = None
+    last_duration_seconds: Optional[float] = None
+    last_uploaded: int = 0
+    last_downloaded: int = 0
+    last_failed: int = 0
+    last_skipped: int = 0                          # 需使用者決定、未自動處理的檔案數
+    last_error: Optional[str] = None
+    next_run_at: Optional[datetime] = None
@@ -0,0 +1,99 @@
+"""
+PlanCache - 計畫內容 LRU 快取
+
+快取已讀取的 Plan 物件，以檔案統計資訊（存在狀態、大小、修改時間）
+驗證是否仍然有效，避免每次請求都重新讀取 Markdown 檔案。
+"""
+
+import threading
+from collections import OrderedDict
+from datetime import date, datetime
+from typing import Optional, Tuple
+
+from .models import Plan, PlanType, PlanCacheStats
+from .storage import FileStats
+
+
+PlanKey = Tuple[PlanType, date]
+_Validator = Tuple[bool, int, Optional[datetime]]
+
+
+class PlanCache:
+    """有容量上限的 Plan LRU 快取
+
+    key 為 (plan_type, 標準日期)。每筆快取記錄寫入當下的檔案統計資訊，
+    讀取時與最新的統計資訊比對：本地為 mtime/size，
+    Google Drive 為 modifiedTime/size（皆由 get_file_stats 取得）。
+
+    快取回傳的 Plan 物件為共用實例，呼叫端不可修改。
+    """
+
+    DEFAULT_CAPACITY = 256
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        if capacity < 1:
+            raise ValueError("快取容量必須至少為 1")
+        self.capacity = capacity
+        self._entries: "OrderedDict[PlanKey, Tuple[Plan, _Validator]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @staticmethod
+    def _validator(stats: FileStats) -> _Validator:
+        return stats.exists, stats.size, stats.modified_at
+
+    def get(self, key: PlanKey, stats: FileStats) -> Optional[Plan]:
+        """取得仍然有效的快取計畫
+
+        Args:
+            key: (plan_type, 標準日期)
+            stats: 檔案目前的統計資訊
+
+        Returns:
+            快取的 Plan；未命中或已過期時返回 None
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] != self._validator(stats):
+                if entry is not None:
+                    del self._entries[key]
+                self._misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[0]
+
+    def put(self, key: PlanKey, plan: Plan, stats: FileStats) -> None:
+        """寫入快取，超過容量時淘汰最久未使用的項目"""
+        with self._lock:
+            self._entries[key] = (plan, self._validator(stats))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def discard(self, key: PlanKey) -> None:
+        """移除單一快取項目"""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """清除所有快取項目（保留統計數字）"""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> PlanCacheStats:
+        """取得快取統計"""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return PlanCacheStats(
+                capacity=self.capacity,
+                size=len(self._entries),
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                hit_rate=self._hits / lookups if lookups else 0.0
+            )
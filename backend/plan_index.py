@@ -0,0 +1,123 @@
+"""
+PlanIndex - 計畫檔案存在索引
+
+以各計畫目錄（Year/Month/Week/Day）的單次列舉建立記憶體索引，
+讓日曆的存在狀態查詢不必逐日、逐檔詢問儲存後端。
+"""
+
+import threading
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+from .models import PlanType
+from .date_calculator import DateCalculator
+from .storage import StorageProvider
+
+
+class PlanIndex:
+    """計畫存在索引
+
+    結構為 plan_type -> {標準日期: 檔案大小}。
+    索引在第一次查詢時由 list_files_with_stats 建立，
+    之後由 PlanService 在建立、更新、刪除計畫時同步維護；
+    資料被外部修改（匯入、同步）時需呼叫 invalidate() 重建。
+
+    列舉期間發生的 record/discard 會先記錄下來，列舉完成後套用在
+    新索引上，避免剛寫入的計畫被列舉開始前的結果覆蓋。
+    """
+
+    def __init__(self):
+        self._entries: Dict[PlanType, Dict[date, int]] = {}
+        self._loaded = False
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        # 列舉期間的異動 (plan_type, 日期, 大小；None 表示刪除)
+        self._pending: Optional[List[Tuple[PlanType, date, Optional[int]]]] = None
+        self._generation = 0
+
+    @property
+    def is_loaded(self) -> bool:
+        """索引是否已建立"""
+        return self._loaded
+
+    def ensure_loaded(self, storage: StorageProvider) -> None:
+        """索引尚未建立時建立（同時只有一個執行緒列舉）"""
+        if self._loaded:
+            return
+        with self._load_lock:
+            # 列舉期間被 invalidate() 時重新列舉
+            while not self._loaded:
+                self.load(storage)
+
+    def load(self, storage: StorageProvider) -> None:
+        """由儲存後端重建索引（每個計畫類型一次列舉）
+
+        Raises:
+            列舉目錄失敗時的例外（索引維持未建立狀態）
+        """
+        with self._lock:
+            self._pending = []
+            generation = self._generation
+
+        try:
+            entries: Dict[PlanType, Dict[date, int]] = {}
+            for plan_type in PlanType:
+                subdir = DateCalculator.get_subdir(plan_type)
+                try:
+                    files = storage.list_files_with_stats(subdir)
+                except FileNotFoundError:
+                    files = {}
+
+                type_entries = {}
+                for filename, stats in files.items():
+                    canonical_date = DateCalculator.parse_filename(plan_type, filename)
+                    if canonical_date is not None and stats.exists:
+                        type_entries[canonical_date] = stats.size
+                entries[plan_type] = type_entries
+        except Exception:
+            with self._lock:
+                self._pending = None
+            raise
+
+        with self._lock:
+            pending, self._pending = self._pending or [], None
+            # 列舉期間被 invalidate() 時結果可能已過期，維持未建立狀態
+            if generation != self._generation:
+                return
+            self._entries = entries
+            for plan_type, canonical_date, size in pending:
+                self._apply(plan_type, canonical_date, size)
+            self._loaded = True
+
+    def invalidate(self) -> None:
+        """清除索引，下次查詢時重建"""
+        with self._lock:
+            self._entries = {}
+            self._loaded = False
+            self._generation += 1
+
+    def _apply(self, plan_type: PlanType, canonical_date: date, size: Optional[int]) -> None:
+        """套用單筆異動至索引（呼叫端需持有 _lock）"""
+        if size is None:
+            self._entries.get(plan_type, {}).pop(canonical_date, None)
+        else:
+            self._entries.setdefault(plan_type, {})[canonical_date] = size
+
+    def _change(self, plan_type: PlanType, canonical_date: date, size: Optional[int]) -> None:
+        with self._lock:
+            if self._loaded:
+                self._apply(plan_type, canonical_date, size)
+            if self._pending is not None:
+                self._pending.append((plan_type, canonical_date, size))
+
+    def record(self, plan_type: PlanType, canonical_date: date, size: int) -> None:
+        """記錄計畫檔案已寫入"""
+        self._change(plan_type, canonical_date, size)
+
+    def discard(self, plan_type: PlanType, canonical_date: date) -> None:
+        """記錄計畫檔案已刪除"""
+        self._change(plan_type, canonical_date, None)
+
+    def has_content(self, plan_type: PlanType, canonical_date: date) -> bool:
+        """計畫檔案是否存在且有內容"""
+        return self._entries.get(plan_type, {}).get(canonical_date, 0) > 0
@@ -1,10 +1,21 @@
 import os
-from datetime import datetime, date
+import time
+import asyncio
+import logging
+import functools
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+from datetime import datetime, date, timedelta
 from pathlib import Path
-from typing import Optional, Union
-from .models import Plan, PlanType, AllPlans, CopyRequest, CopyMode, StorageModeType
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional, Union
+from .models import Plan, PlanType, AllPlans, CopyRequest, CopyMode, StorageModeType, PlanCacheStats
 from .date_calculator import DateCalculator
-from .storage import StorageProvider, LocalStorageProvider
+from .plan_cache import PlanCache
+from .plan_index import PlanIndex
+from .storage import StorageProvider, LocalStorageProvider, FileStats
+
+logger = logging.getLogger(__name__)
 
 
 class PlanService:
@@ -13,10 +24,17 @@ class PlanService:
     使用 StorageProvider 抽象層進行檔案操作，支援不同儲存後端。
     """
     
+    # 並行讀取多個計畫時，單一計畫的等待上限（秒）
+    PLAN_FETCH_TIMEOUT = 10.0
+    PLAN_FETCH_WORKERS = 8
+    # 非同步介面執行同步儲存操作的執行緒數
+    ASYNC_IO_WORKERS = 16
+    
     def __init__(
         self, 
         data_dir: Optional[str] = None,
-        storage_provider: Optional[StorageProvider] = None
+        storage_provider: Optional[StorageProvider] = None,
+        cache_capacity: int = PlanCache.DEFAULT_CAPACITY
     ):
         """初始化 PlanService
         
@@ -25,6 +43,7 @@ class PlanService:
                       使用專案根目錄的 data
             storage_provider: 儲存提供者實例。如果提供，data_dir 參數將被忽略。
                              這允許使用不同的儲存後端（本地、Google Drive 等）
+            cache_capacity: 計畫內容快取的容量上限（項目數）
         """
         if storage_provider is not None:
             self.storage = storage_provider
@@ -40,6 +59,25 @@ class PlanService:
             self.storage = LocalStorageProvider(data_dir)
             self.data_dir = self.storage.data_dir
         
+        # 計畫存在索引（延遲建立）與計畫內容快取
+        self._index = PlanIndex()
+        self._cache = PlanCache(cache_capacity)
+        
+        # 並行讀取計畫用的執行緒池（Google Drive 模式下每個計畫需多次 API 往返）
+        self._fetch_executor = ThreadPoolExecutor(
+            max_workers=self.PLAN_FETCH_WORKERS,
+            thread_name_prefix="plan-fetch"
+        )
+        # 非同步介面專用執行緒池（與 plan-fetch 分開，避免巢狀提交互相等待）
+        self._io_executor = ThreadPoolExecutor(
+            max_workers=self.ASYNC_IO_WORKERS,
+            thread_name_prefix="plan-io"
+        )
+        # 序列化寫入，確保快取中的內容與寫入後取得的統計資訊一致
+        self._write_lock = threading.Lock()
+        # 計畫寫入或刪除後通知的回呼（例如背景排程同步）
+        self._write_listeners: List[Callable[[], None]] = []
+        
         self._ensure_directories_exist()
     
     def _ensure_directories_exist(self):
@@ -55,12 +93,12 @@ class PlanService:
         relative = Path(file_path_str).relative_to(self.data_dir)
         return str(relative)
     
-    def _read_file_content(self, relative_path: str) -> str:
-        """讀取檔案內容，如果檔案不存在則返回空字串"""
+    def _read_file_content(self, relative_path: str) -> tuple[str, FileStats]:
+        """讀取檔案內容及統計資訊，如果檔案不存在則返回空字串"""
         try:
-            return self.storage.read_file(relative_path)
+            return self.storage.read_file_with_stats(relative_path)
         except FileNotFoundError:
-            return ""
+            return "", FileStats(exists=False)
         except Exception as e:
             raise IOError(f"Error reading file {relative_path}: {str(e)}")
     
@@ -71,9 +109,48 @@ class PlanService:
         except Exception as e:
             raise IOError(f"Error writing file {relative_path}: {str(e)}")
     
-    def _get_file_stats(self, relative_path: str) -> tuple[datetime, datetime]:
-        """取得檔案的建立和修改時間"""
-        stats = self.storage.get_file_stats(relative_path)
+    def _ensure_index_loaded(self) -> PlanIndex:
+        """確保計畫存在索引已建立"""
+        self._index.ensure_loaded(self.storage)
+        return self._index
+    
+    def invalidate_caches(self) -> None:
+        """清除計畫索引與計畫內容快取
+        
+        資料被 PlanService 以外的途徑修改後（如資料匯入、同步）呼叫。
+        """
+        self._index.invalidate()
+        self._cache.clear()
+    
+    @contextmanager
+    def exclusive_write(self) -> Iterator[None]:
+        """在寫入鎖內由 PlanService 以外的途徑修改資料（如資料匯入換入計畫目錄）
+        
+        期間建立、更新與刪除計畫都會等待；結束時清除計畫索引與內容快取。
+        """
+        with self._write_lock:
+            try:
+                yield
+            finally:
+                self.invalidate_caches()
+    
+    def add_write_listener(self, listener: Callable[[], None]) -> None:
+        """註冊計畫寫入或刪除後的回呼"""
+        self._write_listeners.append(listener)
+    
+    def _notify_write(self) -> None:
+        for listener in self._write_listeners:
+            try:
+                listener()
+            except Exception as e:
+                logger.warning(f"計畫寫入回呼失敗: {e}")
+    
+    def get_cache_stats(self) -> PlanCacheStats:
+        """取得計畫內容快取統計（命中、未命中、淘汰次數）"""
+        return self._cache.get_stats()
+    
+    def _get_file_times(self, stats: FileStats) -> tuple[datetime, datetime]:
+        """由檔案統計資訊取得建立和修改時間"""
         if stats.exists and stats.created_at and stats.modified_at:
             return stats.created_at, stats.modified_at
         else:
@@ -81,12 +158,24 @@ class PlanService:
             return now, now
     
     def get_plan(self, plan_type: PlanType, target_date: date) -> Plan:
-        """取得指定類型和日期的計畫"""
+        """取得指定類型和日期的計畫
+        
+        以檔案統計資訊驗證快取，檔案未變更時不重新讀取內容。
+        """
         canonical_date = DateCalculator.get_canonical_date(plan_type, target_date)
         relative_path = self._get_relative_path(plan_type, canonical_date)
         file_path_str = str(self.data_dir / relative_path)
+        cache_key = (plan_type, canonical_date)
+        
+        stats = self.storage.get_file_stats(relative_path)
+        cached_plan = self._cache.get(cache_key, stats)
+        if cached_plan is not None:
+            return cached_plan
         
-        content = self._read_file_content(relative_path)
+        # 即使 stats 顯示不存在仍實際讀取：Drive 的 get_file_stats 在錯誤時
+        # 也回傳 exists=False，不可因此把暫時性錯誤當成空白計畫。
+        # 讀取時一併取得的統計資訊與內容一致，以此作為快取驗證依據
+        content, stats = self._read_file_content(relative_path)
         
         # 如果檔案不存在或內容為空，創建預設內容
         if not content.strip():
@@ -94,7 +183,7 @@ class PlanService:
             content = f"{title}\n\n"
             # 不自動寫入，讓用戶主動儲存
         
-        created_at, updated_at = self._get_file_stats(relative_path)
+        created_at, updated_at = self._get_file_times(stats)
         
         # 從內容中提取標題（第一行）
         lines = content.strip().split('\n')
@@ -103,7 +192,7 @@ class PlanService:
         else:
             title = DateCalculator.format_title(plan_type, canonical_date)
         
-        return Plan(
+        plan = Plan(
             type=plan_type,
             date=canonical_date,
             title=title,
@@ -112,6 +201,8 @@ class PlanService:
             updated_at=updated_at,
             file_path=file_path_str
         )
+        self._cache.put(cache_key, plan, stats)
+        return plan
     
     def create_plan(self, plan_type: PlanType, target_date: date, content: str) -> Plan:
         """建立新計畫"""
@@ -124,23 +215,29 @@ class PlanService:
             title = DateCalculator.format_title(plan_type, canonical_date)
             content = f"{title}\n\n{content}".strip() + "\n"
         
-        self._write_file_content(relative_path, content)
-        
-        created_at, updated_at = self._get_file_stats(relative_path)
-        
-        # 提取標題
-        lines = content.strip().split('\n')
-        title = lines[0] if lines and lines[0].startswith('#') else DateCalculator.format_title(plan_type, canonical_date)
-        
-        return Plan(
-            type=plan_type,
-            date=canonical_date,
-            title=title,
-            content=content,
-            created_at=created_at,
-            updated_at=updated_at,
-            file_path=file_path_str
-        )
+        with self._write_lock:
+            self._write_file_content(relative_path, content)
+            self._index.record(plan_type, canonical_date, len(content.encode('utf-8')))
+            
+            stats = self.storage.get_file_stats(relative_path)
+            created_at, updated_at = self._get_file_times(stats)
+            
+            # 提取標題
+            lines = content.strip().split('\n')
+            title = lines[0] if lines and lines[0].startswith('#') else DateCalculator.format_title(plan_type, canonical_date)
+            
+            plan = Plan(
+                type=plan_type,
+                date=canonical_date,
+                title=title,
+                content=content,
+                created_at=created_at,
+                updated_at=updated_at,
+                file_path=file_path_str
+            )
+            self._cache.put((plan_type, canonical_date), plan, stats)
+        self._notify_write()
+        return plan
     
     def update_plan(self, plan_type: PlanType, target_date: date, content: str) -> Plan:
         """更新計畫內容"""
@@ -153,33 +250,45 @@ class PlanService:
             title = DateCalculator.format_title(plan_type, canonical_date)
             content = f"{title}\n\n{content}".strip() + "\n"
         
-        self._write_file_content(relative_path, content)
-        
-        created_at, updated_at = self._get_file_stats(relative_path)
-        
-        # 提取標題
-        lines = content.strip().split('\n')
-        title = lines[0] if lines and lines[0].startswith('#') else DateCalculator.format_title(plan_type, canonical_date)
-        
-        return Plan(
-            type=plan_type,
-            date=canonical_date,
-            title=title,
-            content=content,
-            created_at=created_at,
-            updated_at=updated_at,
-            file_path=file_path_str
-        )
+        with self._write_lock:
+            self._write_file_content(relative_path, content)
+            self._index.record(plan_type, canonical_date, len(content.encode('utf-8')))
+            
+            stats = self.storage.get_file_stats(relative_path)
+            created_at, updated_at = self._get_file_times(stats)
+            
+            # 提取標題
+            lines = content.strip().split('\n')
+            title = lines[0] if lines and lines[0].startswith('#') else DateCalculator.format_title(plan_type, canonical_date)
+            
+            plan = Plan(
+                type=plan_type,
+                date=canonical_date,
+                title=title,
+                content=content,
+                created_at=created_at,
+                updated_at=updated_at,
+                file_path=file_path_str
+            )
+            self._cache.put((plan_type, canonical_date), plan, stats)
+        self._notify_write()
+        return plan
     
     def delete_plan(self, plan_type: PlanType, target_date: date) -> bool:
         """刪除計畫檔案"""
         canonical_date = DateCalculator.get_canonical_date(plan_type, target_date)
         relative_path = self._get_relative_path(plan_type, canonical_date)
         
-        try:
-            return self.storage.delete_file(relative_path)
-        except Exception as e:
-            raise IOError(f"Error deleting file {relative_path}: {str(e)}")
+        with self._write_lock:
+            try:
+                deleted = self.storage.delete_file(relative_path)
+            except Exception as e:
+                raise IOError(f"Error deleting file {relative_path}: {str(e)}")
+            
+            self._index.discard(plan_type, canonical_date)
+            self._cache.discard((plan_type, canonical_date))
+        self._notify_write()
+        return deleted
     
     def get_previous_plan(self, plan_type: PlanType, target_date: date) -> Plan:
         """取得前一期計畫"""
@@ -191,22 +300,104 @@ class PlanService:
         next_date = DateCalculator.get_next_period(plan_type, target_date)
         return self.get_plan(plan_type, next_date)
     
-    def get_all_plans_for_date(self, target_date: date) -> AllPlans:
-        """取得指定日期對應的所有類型計畫"""
-        plan_dates = DateCalculator.get_all_plan_dates_for_date(target_date)
+    def _get_plans_concurrently(
+        self, targets: Dict[Hashable, tuple[PlanType, date]]
+    ) -> Dict[Hashable, Optional[Plan]]:
+        """並行讀取多個計畫
         
-        plans = {}
-        for plan_type_str, plan_date in plan_dates.items():
+        Args:
+            targets: 結果 key -> (計畫類型, 日期)
+            
+        Returns:
+            結果 key -> Plan；讀取失敗或逾時的項目為 None
+        """
+        futures = {
+            key: self._fetch_executor.submit(self.get_plan, plan_type, plan_date)
+            for key, (plan_type, plan_date) in targets.items()
+        }
+        
+        # 同一輪（PLAN_FETCH_WORKERS 個）請求同時開始，共用截止時間即等同於
+        # 每個計畫各自的逾時；超過一輪時依輪數放寬
+        rounds = -(-len(futures) // self.PLAN_FETCH_WORKERS)
+        deadline = time.monotonic() + self.PLAN_FETCH_TIMEOUT * max(1, rounds)
+        results: Dict[Hashable, Optional[Plan]] = {}
+        for key, future in futures.items():
             try:
-                plan_type = PlanType(plan_type_str)
-                plan = self.get_plan(plan_type, plan_date)
-                plans[plan_type_str] = plan
+                results[key] = future.result(timeout=max(0.0, deadline - time.monotonic()))
+            except FuturesTimeoutError:
+                future.cancel()
+                logger.warning(f"讀取計畫逾時: {key} ({self.PLAN_FETCH_TIMEOUT}s)")
+                results[key] = None
             except Exception as e:
-                # 如果某個計畫類型讀取失敗，設為 None
-                plans[plan_type_str] = None
+                logger.warning(f"讀取計畫失敗: {key}: {e}")
+                results[key] = None
+        return results
+    
+    def get_all_plans_for_date(self, target_date: date) -> AllPlans:
+        """取得指定日期對應的所有類型計畫
+        
+        四種計畫並行讀取；某個計畫讀取失敗或逾時時該欄位為 None，
+        不影響其他計畫的回應。
+        """
+        plan_dates = DateCalculator.get_all_plan_dates_for_date(target_date)
+        
+        plans = self._get_plans_concurrently({
+            plan_type_str: (PlanType(plan_type_str), plan_date)
+            for plan_type_str, plan_date in plan_dates.items()
+        })
         
         return AllPlans(date=target_date, plans=plans)
     
+    def get_plans_batch(self, items: List[tuple[PlanType, date]]) -> List[Optional[Plan]]:
+        """批次讀取多個計畫
+        
+        多個日期對應到同一個計畫檔案時（如同一週的每一天之於週計畫），
+        以 (計畫類型, 標準日期) 去重，每個檔案只讀取一次。
+        
+        Args:
+            items: (計畫類型, 日期) 清單
+            
+        Returns:
+            與 items 順序相同的 Plan 清單；讀取失敗或逾時的項目為 None
+        """
+        keys = [
+            (plan_type, DateCalculator.get_canonical_date(plan_type, target_date))
+            for plan_type, target_date in items
+        ]
+        plans = self._get_plans_concurrently({key: key for key in dict.fromkeys(keys)})
+        return [plans[key] for key in keys]
+    
+    def iter_plans_in_range(self, plan_type: PlanType, start_date: date, end_date: date) -> Iterator[Plan]:
+        """依日期順序逐一產生範圍內實際存在的計畫
+        
+        只列舉一次計畫類型目錄，以檔名日期篩選，不對範圍內每一期逐一查詢；
+        以 generator 逐筆讀取，呼叫端可串流輸出而不需一次載入全部內容。
+        
+        Args:
+            plan_type: 計畫類型
+            start_date: 開始日期（包含該日期所屬的期間）
+            end_date: 結束日期
+            
+        Yields:
+            範圍內存在的 Plan（依標準日期排序）
+        """
+        subdir = DateCalculator.get_subdir(plan_type)
+        range_start = DateCalculator.get_canonical_date(plan_type, start_date)
+        
+        try:
+            files = self.storage.list_files_with_stats(subdir)
+        except FileNotFoundError:
+            return
+        
+        plan_dates = sorted(
+            plan_date
+            for plan_date in (DateCalculator.parse_filename(plan_type, name) for name in files)
+            if plan_date is not None and range_start <= plan_date <= end_date
+        )
+        
+        for plan_date in plan_dates:
+            yield self.get_plan(plan_type, plan_date)
+    
     def copy_content(self, copy_request: CopyRequest) -> Plan:
         """複製內容到目標計畫"""
         # 取得目標計畫
@@ -227,20 +418,15 @@ class PlanService:
         return self.update_plan(copy_request.target_type, copy_request.target_date, new_content)
     
     def plan_exists(self, plan_type: PlanType, target_date: date) -> bool:
-        """檢查計畫檔案是否存在"""
+        """檢查計畫檔案是否存在且有內容（由存在索引回答）"""
         canonical_date = DateCalculator.get_canonical_date(plan_type, target_date)
-        relative_path = self._get_relative_path(plan_type, canonical_date)
-        
-        if not self.storage.file_exists(relative_path):
-            return False
-        
-        # 檢查檔案是否有內容
-        stats = self.storage.get_file_stats(relative_path)
-        return stats.exists and stats.size > 0
+        return self._ensure_index_loaded().has_content(plan_type, canonical_date)
 
     def get_plans_existence(self, start_date: date, end_date: date) -> dict:
         """取得日期範圍內的計畫存在狀態
 
+        由記憶體中的存在索引回答，不對儲存後端逐日查詢。
+
         Args:
             start_date: 開始日期
             end_date: 結束日期
@@ -253,59 +439,138 @@ class PlanService:
                 ...
             }
         """
+        index = self._ensure_index_loaded()
         result = {}
         current_date = start_date
 
         while current_date <= end_date:
             date_str = current_date.strftime("%Y-%m-%d")
-
-            # Get all plan dates for this date
-            plan_dates = DateCalculator.get_all_plan_dates_for_date(current_date)
-
-            # Check existence for each plan type
-            existence_status = {}
-            for plan_type_str in ["year", "month", "week", "day"]:
-                try:
-                    plan_type = PlanType(plan_type_str)
-                    plan_date = plan_dates[plan_type_str]
-                    existence_status[plan_type_str] = self.plan_exists(plan_type, plan_date)
-                except Exception:
-                    existence_status[plan_type_str] = False
-
-            result[date_str] = existence_status
-
-            # Move to next day
-            from datetime import timedelta
+            result[date_str] = {
+                plan_type.value: index.has_content(
+                    plan_type, DateCalculator.get_canonical_date(plan_type, current_date)
+                )
+                for plan_type in PlanType
+            }
             current_date = current_date + timedelta(days=1)
 
         return result
     
+    # ========================================
+    # 非同步介面
+    # ========================================
+    # async 路由直接呼叫同步方法會在磁碟或 Google Drive I/O 期間阻塞事件迴圈，
+    # 以下方法將整個操作交給 plan-io 執行緒池，讓 worker 持續服務其他請求。
+    
+    async def _run_blocking(self, func: Callable[..., Any], *args) -> Any:
+        """在 I/O 執行緒池中執行同步方法"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._io_executor, functools.partial(func, *args))
+    
+    async def get_plan_async(self, plan_type: PlanType, target_date: date) -> Plan:
+        """get_plan 的非同步版本"""
+        return await self._run_blocking(self.get_plan, plan_type, target_date)
+    
+    async def create_plan_async(self, plan_type: PlanType, target_date: date, content: str) -> Plan:
+        """create_plan 的非同步版本"""
+        return await self._run_blocking(self.create_plan, plan_type, target_date, content)
+    
+    async def update_plan_async(self, plan_type: PlanType, target_date: date, content: str) -> Plan:
+        """update_plan 的非同步版本"""
+        return await self._run_blocking(self.update_plan, plan_type, target_date, content)
+    
+    async def delete_plan_async(self, plan_type: PlanType, target_date: date) -> bool:
+        """delete_plan 的非同步版本"""
+        return await self._run_blocking(self.delete_plan, plan_type, target_date)
+    
+    async def get_previous_plan_async(self, plan_type: PlanType, target_date: date) -> Plan:
+        """get_previous_plan 的非同步版本"""
+        return await self._run_blocking(self.get_previous_plan, plan_type, target_date)
+    
+    async def get_next_plan_async(self, plan_type: PlanType, target_date: date) -> Plan:
+        """get_next_plan 的非同步版本"""
+        return await self._run_blocking(self.get_next_plan, plan_type, target_date)
+    
+    async def get_all_plans_for_date_async(self, target_date: date) -> AllPlans:
+        """get_all_plans_for_date 的非同步版本"""
+        return await self._run_blocking(self.get_all_plans_for_date, target_date)
+    
+    async def get_plans_batch_async(self, items: List[tuple[PlanType, date]]) -> List[Optional[Plan]]:
+        """get_plans_batch 的非同步版本"""
+        return await self._run_blocking(self.get_plans_batch, items)
+    
+    async def copy_content_async(self, copy_request: CopyRequest) -> Plan:
+        """copy_content 的非同步版本"""
+        return await self._run_blocking(self.copy_content, copy_request)
+    
+    async def plan_exists_async(self, plan_type: PlanType, target_date: date) -> bool:
+        """plan_exists 的非同步版本（首次查詢需建立索引）"""
+        return await self._run_blocking(self.plan_exists, plan_type, target_date)
+    
+    async def get_plans_existence_async(self, start_date: date, end_date: date) -> dict:
+        """get_plans_existence 的非同步版本（首次查詢需建立索引）"""
+        return await self._run_blocking(self.get_plans_existence, start_date, end_date)
+    
     def switch_storage_provider(self, mode: StorageModeType, google_drive_path: Optional[str] = None) -> None:
         """動態切換儲存提供者
         
         Args:
             mode: 儲存模式類型
-            google_drive_path: Google Drive 路徑（僅 google_drive 模式使用）
+            google_drive_path: Google Drive 路徑（google_drive 與 hybrid 模式使用）
             
         Note:
             此方法用於在執行期間切換儲存後端。
-            切換到 Google Drive 模式時，需要確保已正確授權。
+            切換到 Google Drive 或 hybrid 模式時，需要確保已正確授權。
         """
+        from .google_auth_service import GoogleAuthService
+        
+        previous = self.storage
+        base_path = google_drive_path or "WorkPlanByCalendar"
         if mode == StorageModeType.LOCAL:
             # 切換回本地儲存
             self.storage = LocalStorageProvider(str(self.data_dir))
         elif mode == StorageModeType.GOOGLE_DRIVE:
             # 切換到 Google Drive 儲存
-            from .storage import GoogleDriveStorageProvider
-            from .google_auth_service import GoogleAuthService
+            self.storage = self._create_google_drive_provider(GoogleAuthService(), base_path)
+            # 預先載入資料夾樹，之後的計畫讀取不需逐段搜尋路徑
+            try:
+                self.storage.warm_up()
+            except Exception as e:
+                logger.warning(f"預先載入 Google Drive 資料夾樹失敗: {e}")
+        elif mode == StorageModeType.HYBRID:
+            # 本地儲存，背景複寫到 Google Drive
+            from .storage import HybridStorageProvider
+            from .storage.write_behind_queue import WriteBehindQueue
             
             auth_service = GoogleAuthService()
-            self.storage = GoogleDriveStorageProvider(
-                base_path=google_drive_path or "WorkPlanByCalendar",
-                auth_service=auth_service
+            queue = WriteBehindQueue.for_auth_service(auth_service, base_path)
+            if queue is None:
+                raise ValueError("請先連結 Google 帳號才能使用本地 + Google Drive 備份模式")
+            self.storage = HybridStorageProvider(
+                local=LocalStorageProvider(str(self.data_dir)),
+                cloud=self._create_google_drive_provider(auth_service, base_path),
+                queue=queue
             )
+            self.storage.start()
         else:
             raise ValueError(f"不支援的儲存模式: {mode}")
         
+        # 停止舊後端的背景工作（hybrid 未複寫完的檔案留在佇列，下次啟用時繼續）
+        previous.close()
+        
+        # 索引與快取屬於舊的儲存後端
+        self.invalidate_caches()
+        
         # 確保目錄結構存在
-        self._ensure_directories_exist()
\ No newline at end of file
+        self._ensure_directories_exist()
+    
+    @staticmethod
+    def _create_google_drive_provider(auth_service: Any, base_path: str):
+        """建立 GoogleDriveStorageProvider（使用磁碟上的 ID 快取）"""
+        from .storage import GoogleDriveStorageProvider
+        from .storage.drive_id_cache import DriveIdCache
+        
+        return GoogleDriveStorageProvider(
+            base_path=base_path,
+            auth_service=auth_service,
+            id_cache=DriveIdCache.for_auth_service(auth_service, base_path)
+        )
@@ -14,6 +14,7 @@ from fastapi.responses import HTMLResponse
 from backend.models import GoogleAuthInfo, GoogleAuthCallbackRequest, ErrorResponse
 from backend.google_auth_service import GoogleAuthService, GoogleAuthError
 from backend.routers.dependencies import get_google_auth_service
+from backend.storage.drive_client import drive_clients
 
 router = APIRouter(prefix="/api/auth/google", tags=["Authentication"])
 
@@ -219,6 +220,8 @@ async def google_logout():
     """登出 Google 帳號"""
     try:
         success = google_auth_service.logout()
+        # 捨棄以舊授權建立的共用 Drive client
+        drive_clients.clear()
         if success:
             return {"message": "已成功登出 Google 帳號"}
         else:
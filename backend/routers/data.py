@@ -8,23 +8,106 @@ import re
 import tempfile
 from pathlib import Path
 from datetime import datetime
+from typing import List
 
 from fastapi import APIRouter, HTTPException, status, UploadFile, File
-from fastapi.responses import FileResponse
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, StreamingResponse
 
 from backend.models import (
     ExportResponse, ImportValidation, ImportSuccessResponse, ErrorResponse
 )
-from backend.data_export_service import create_export_zip, validate_zip_file, execute_import
+from backend.data_export_service import (
+    create_export_zip, validate_zip_file, execute_import,
+    export_filename, list_export_files, stream_export_zip, load_base_manifest
+)
+from backend.routers.dependencies import get_plan_service
+from backend.storage import LocalStorageProvider, HybridStorageProvider
 
 router = APIRouter(prefix="/api", tags=["Data Export/Import"])
 
+# 取得共用的 service 實例
+plan_service = get_plan_service()
+
+
+@router.get("/export/stream")
+async def stream_export():
+    """串流下載資料匯出 ZIP
+    
+    從目前使用中的儲存後端（本地或 Google Drive）讀取，邊壓縮邊傳送，
+    不建立暫存檔；回應標頭 X-Export-File-Count 為檔案數量。
+    """
+    storage = plan_service.storage
+    try:
+        files = await run_in_threadpool(list_export_files, storage)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=ErrorResponse(
+                error="EXPORT_ERROR",
+                message=f"匯出失敗: {str(e)}",
+                details={}
+            ).dict()
+        )
+    
+    filename = export_filename()
+    return StreamingResponse(
+        stream_export_zip(storage, files),
+        media_type="application/zip",
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            "X-Export-File-Count": str(len(files)),
+        }
+    )
+
+
+@router.post("/export/incremental")
+async def stream_incremental_export(base: UploadFile = File(...)):
+    """串流下載增量匯出 ZIP
+    
+    只打包相對於基準新增或修改的檔案，並在 manifest.json 列出已刪除的檔案。
+    
+    Args:
+        base: 前一次匯出的 manifest.json，或前一次匯出的 ZIP（完整或增量皆可）
+    """
+    try:
+        base_manifest = await run_in_threadpool(load_base_manifest, base.file)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=ErrorResponse(
+                error="INVALID_MANIFEST",
+                message=str(e),
+                details={}
+            ).dict()
+        )
+    
+    storage = plan_service.storage
+    try:
+        files = await run_in_threadpool(list_export_files, storage)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=ErrorResponse(
+                error="EXPORT_ERROR",
+                message=f"匯出失敗: {str(e)}",
+                details={}
+            ).dict()
+        )
+    
+    filename = export_filename().replace(".zip", "_incremental.zip")
+    return StreamingResponse(
+        stream_export_zip(storage, files, base_manifest),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
 
 @router.post("/export/create", response_model=ExportResponse)
 async def export_data():
     """建立資料匯出檔案"""
     try:
-        zip_path, file_count = create_export_zip()
+        zip_path, file_count = await run_in_threadpool(create_export_zip, plan_service.storage)
         file_size = zip_path.stat().st_size
         created_at = datetime.now().isoformat()
         
@@ -35,15 +118,6 @@ async def export_data():
             file_count=file_count,
             download_url=f"/api/export/download/{zip_path.name}"
         )
-    except FileNotFoundError as e:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=ErrorResponse(
-                error="DATA_DIR_NOT_FOUND",
-                message=str(e),
-                details={}
-            ).dict()
-        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -105,11 +179,35 @@ async def validate_import(file: UploadFile = File(...)):
 
 
 @router.post("/import/execute", response_model=ImportSuccessResponse)
-async def import_data(file: UploadFile = File(...)):
-    """執行資料匯入 (含驗證、備份、回滾機制)"""
+async def import_data(
+    file: UploadFile = File(...),
+    increments: List[UploadFile] = File(default=[])
+):
+    """執行資料匯入 (含驗證、備份、回滾機制)
+    
+    file 可為完整匯出或增量匯出；increments 為依序套用其後的增量匯出。
+    匯入寫入本地資料目錄：hybrid 模式換入後將變更的檔案排入雲端複寫；
+    Google Drive 模式的資料不在本地，不支援匯入。
+    """
+    storage = plan_service.storage
+    if not isinstance(storage, (LocalStorageProvider, HybridStorageProvider)):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=ErrorResponse(
+                error="IMPORT_NOT_SUPPORTED",
+                message="Google Drive 模式不支援匯入，請切換到本地或本地 + Google Drive 備份模式後再匯入",
+                details={}
+            ).dict()
+        )
+    on_swapped = storage.enqueue_external_changes if isinstance(storage, HybridStorageProvider) else None
+    
     try:
-        import_result = await execute_import(file)
-        return import_result
+        # 換入計畫目錄時暫停計畫寫入，完成後重建計畫索引與快取
+        return await execute_import(
+            file, increments,
+            swap_guard=plan_service.exclusive_write(),
+            on_swapped=on_swapped
+        )
     except ValueError as e:
         # 驗證失敗
         raise HTTPException(
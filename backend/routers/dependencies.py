@@ -4,6 +4,7 @@ Router Dependencies - 共用的依賴注入
 提供各 Router 共用的 Service 實例，確保單例模式。
 """
 
+import os
 from pathlib import Path
 from typing import Optional
 
@@ -11,6 +12,7 @@ from typing import Optional
 _plan_service = None
 _settings_service = None
 _google_auth_service = None
+_sync_scheduler = None
 
 
 def get_project_root() -> Path:
@@ -50,9 +52,29 @@ def get_google_auth_service():
     return _google_auth_service
 
 
+def get_sync_scheduler():
+    """取得背景排程同步單例
+
+    由環境變數設定：AUTO_SYNC_INTERVAL_SECONDS（未設定或 0 表示停用）、
+    AUTO_SYNC_DEBOUNCE_SECONDS（計畫寫入後等待的秒數，預設 30）。
+    """
+    global _sync_scheduler
+    if _sync_scheduler is None:
+        from backend.sync_scheduler import SyncScheduler
+        from backend.routers.sync import get_scheduled_sync_service
+        _sync_scheduler = SyncScheduler(
+            service_factory=get_scheduled_sync_service,
+            interval=float(os.getenv("AUTO_SYNC_INTERVAL_SECONDS", "0")),
+            debounce=float(os.getenv("AUTO_SYNC_DEBOUNCE_SECONDS", "30")),
+            on_synced=get_plan_service().invalidate_caches,
+        )
+    return _sync_scheduler
+
+
 def reset_services():
     """重設所有 Service 實例（用於測試）"""
-    global _plan_service, _settings_service, _google_auth_service
+    global _plan_service, _settings_service, _google_auth_service, _sync_scheduler
     _plan_service = None
     _settings_service = None
     _google_auth_service = None
+    _sync_scheduler = None
@@ -5,27 +5,60 @@ Plans Router - 計畫 CRUD 和導航 API
 以及日期導航和批次查詢功能。
 """
 
+import json
+import logging
 from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import StreamingResponse
 from datetime import date
 
 from backend.models import (
     Plan, PlanType, PlanCreate, PlanUpdate, AllPlans,
-    CopyRequest, ErrorResponse
+    CopyRequest, ErrorResponse, PlanCacheStats,
+    PlanBatchRequest, PlanBatchResponse
 )
 from backend.routers.dependencies import get_plan_service
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/api", tags=["Plans"])
 
 # 取得共用的 service 實例
 plan_service = get_plan_service()
 
 
+# Plan cache statistics endpoint
+# 須註冊在 /plans/{plan_type}/{plan_date} 之前，否則會被該路由攔截
+@router.get("/plans/cache/stats", response_model=PlanCacheStats)
+async def get_plan_cache_stats():
+    """取得計畫內容快取統計"""
+    return plan_service.get_cache_stats()
+
+
+# All plans for a date endpoint
+# 須註冊在 /plans/{plan_type}/{plan_date} 之前，否則 "all" 會被當成 plan_type 而回傳 422
+@router.get("/plans/all/{target_date}", response_model=AllPlans)
+async def get_all_plans_for_date(target_date: date):
+    """取得指定日期的所有類型計畫"""
+    try:
+        all_plans = await plan_service.get_all_plans_for_date_async(target_date)
+        return all_plans
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=ErrorResponse(
+                error="ALL_PLANS_ERROR",
+                message=f"Failed to get all plans: {str(e)}",
+                details={"target_date": str(target_date)}
+            ).dict()
+        )
+
+
 # Plan CRUD endpoints
 @router.get("/plans/{plan_type}/{plan_date}", response_model=Plan)
 async def get_plan(plan_type: PlanType, plan_date: date):
     """取得計畫內容"""
     try:
-        plan = plan_service.get_plan(plan_type, plan_date)
+        plan = await plan_service.get_plan_async(plan_type, plan_date)
         return plan
     except Exception as e:
         raise HTTPException(
@@ -42,7 +75,7 @@ async def get_plan(plan_type: PlanType, plan_date: date):
 async def create_plan(plan_type: PlanType, plan_date: date, plan_data: PlanCreate):
     """建立新計畫"""
     try:
-        plan = plan_service.create_plan(plan_type, plan_date, plan_data.content)
+        plan = await plan_service.create_plan_async(plan_type, plan_date, plan_data.content)
         return plan
     except Exception as e:
         raise HTTPException(
@@ -59,7 +92,7 @@ async def create_plan(plan_type: PlanType, plan_date: date, plan_data: PlanCreat
 async def update_plan(plan_type: PlanType, plan_date: date, plan_data: PlanUpdate):
     """更新計畫內容"""
     try:
-        plan = plan_service.update_plan(plan_type, plan_date, plan_data.content)
+        plan = await plan_service.update_plan_async(plan_type, plan_date, plan_data.content)
         return plan
     except Exception as e:
         raise HTTPException(
@@ -76,7 +109,7 @@ async def update_plan(plan_type: PlanType, plan_date: date, plan_data: PlanUpdat
 async def delete_plan(plan_type: PlanType, plan_date: date):
     """刪除計畫"""
     try:
-        success = plan_service.delete_plan(plan_type, plan_date)
+        success = await plan_service.delete_plan_async(plan_type, plan_date)
         if success:
             return {"message": "Plan deleted successfully"}
         else:
@@ -106,7 +139,7 @@ async def delete_plan(plan_type: PlanType, plan_date: date):
 async def get_previous_plan(plan_type: PlanType, plan_date: date):
     """取得前一期計畫"""
     try:
-        plan = plan_service.get_previous_plan(plan_type, plan_date)
+        plan = await plan_service.get_previous_plan_async(plan_type, plan_date)
         return plan
     except Exception as e:
         raise HTTPException(
@@ -123,7 +156,7 @@ async def get_previous_plan(plan_type: PlanType, plan_date: date):
 async def get_next_plan(plan_type: PlanType, plan_date: date):
     """取得後一期計畫"""
     try:
-        plan = plan_service.get_next_plan(plan_type, plan_date)
+        plan = await plan_service.get_next_plan_async(plan_type, plan_date)
         return plan
     except Exception as e:
         raise HTTPException(
@@ -136,29 +169,65 @@ async def get_next_plan(plan_type: PlanType, plan_date: date):
         )
 
 
-@router.get("/plans/all/{target_date}", response_model=AllPlans)
-async def get_all_plans_for_date(target_date: date):
-    """取得指定日期的所有類型計畫"""
+# Batch fetch endpoint
+@router.post("/plans/batch", response_model=PlanBatchResponse)
+async def get_plans_batch(batch_request: PlanBatchRequest):
+    """批次讀取多個計畫（如預先載入一整週的日計畫）"""
     try:
-        all_plans = plan_service.get_all_plans_for_date(target_date)
-        return all_plans
+        plans = await plan_service.get_plans_batch_async(
+            [(item.type, item.date) for item in batch_request.items]
+        )
+        return PlanBatchResponse(plans=plans)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=ErrorResponse(
-                error="ALL_PLANS_ERROR",
-                message=f"Failed to get all plans: {str(e)}",
-                details={"target_date": str(target_date)}
+                error="BATCH_PLANS_ERROR",
+                message=f"Failed to get plans: {str(e)}",
+                details={"item_count": len(batch_request.items)}
             ).dict()
         )
 
 
+# Range listing endpoint
+@router.get("/plans/range")
+async def stream_plans_in_range(plan_type: PlanType, start_date: date, end_date: date):
+    """以 NDJSON 串流輸出日期範圍內所有存在的計畫（每行一個 Plan）
+
+    只輸出實際存在的檔案；讀取中途失敗時，最後一行為 ErrorResponse。
+    """
+    if start_date > end_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=ErrorResponse(
+                error="INVALID_DATE_RANGE",
+                message="Start date must be before or equal to end date",
+                details={"start_date": str(start_date), "end_date": str(end_date)}
+            ).dict()
+        )
+
+    def generate_lines():
+        # 同步 generator 由 StreamingResponse 在執行緒池中迭代，不阻塞事件迴圈
+        try:
+            for plan in plan_service.iter_plans_in_range(plan_type, start_date, end_date):
+                yield plan.json() + "\n"
+        except Exception as e:
+            logger.error(f"串流計畫範圍失敗 {plan_type} {start_date}~{end_date}: {e}")
+            yield json.dumps(ErrorResponse(
+                error="PLAN_RANGE_ERROR",
+                message=f"Failed to read plans: {str(e)}",
+                details={"plan_type": plan_type.value}
+            ).dict(), ensure_ascii=False) + "\n"
+
+    return StreamingResponse(generate_lines(), media_type="application/x-ndjson")
+
+
 # Content copy endpoint
 @router.post("/plans/copy", response_model=Plan)
 async def copy_plan_content(copy_request: CopyRequest):
     """複製計畫內容"""
     try:
-        plan = plan_service.copy_content(copy_request)
+        plan = await plan_service.copy_content_async(copy_request)
         return plan
     except Exception as e:
         raise HTTPException(
@@ -181,7 +250,7 @@ async def copy_plan_content(copy_request: CopyRequest):
 async def check_plan_exists(plan_type: PlanType, plan_date: date):
     """檢查計畫是否存在"""
     try:
-        exists = plan_service.plan_exists(plan_type, plan_date)
+        exists = await plan_service.plan_exists_async(plan_type, plan_date)
         return {"exists": exists}
     except Exception as e:
         raise HTTPException(
@@ -203,13 +272,14 @@ async def get_plans_existence(start_date: date, end_date: date):
         if start_date > end_date:
             raise ValueError("Start date must be before or equal to end date")
 
-        # Limit the date range to prevent excessive queries (max 60 days)
+        # Existence is answered from the in-memory plan index, so a whole
+        # year (including leap years) can be requested at once
         delta = (end_date - start_date).days
-        if delta > 60:
-            raise ValueError("Date range cannot exceed 60 days")
+        if delta > 366:
+            raise ValueError("Date range cannot exceed 366 days")
 
         # Get plans existence for the date range
-        result = plan_service.get_plans_existence(start_date, end_date)
+        result = await plan_service.get_plans_existence_async(start_date, end_date)
         return result
     except ValueError as e:
         raise HTTPException(
@@ -5,17 +5,19 @@ Storage Router - 儲存模式和 Google Drive 整合 API
 """
 
 from fastapi import APIRouter, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 
 from backend.models import (
     Settings, ErrorResponse, StorageStatusResponse,
     GoogleDrivePathUpdateRequest, StorageMode, StorageModeType,
-    StorageModeUpdateRequest, GoogleAuthStatus
+    StorageModeUpdateRequest, GoogleAuthStatus, DriveRequestMetricsResponse
 )
 from backend.routers.dependencies import (
     get_settings_service, 
     get_google_auth_service,
     get_plan_service
 )
+from backend.storage import HybridStorageProvider, GoogleDriveStorageProvider
 
 router = APIRouter(prefix="/api/storage", tags=["Storage"])
 
@@ -24,6 +26,20 @@ settings_service = get_settings_service()
 google_auth_service = get_google_auth_service()
 plan_service = get_plan_service()
 
+# 需要 Google 授權的儲存模式
+GOOGLE_MODES = (StorageModeType.GOOGLE_DRIVE, StorageModeType.HYBRID)
+
+
+def _replication_status() -> dict:
+    """hybrid 模式的背景複寫狀態（其他模式為空）"""
+    storage = plan_service.storage
+    if not isinstance(storage, HybridStorageProvider):
+        return {}
+    return {
+        "pending_replications": storage.pending_count,
+        "replication_error": storage.last_error,
+    }
+
 
 @router.get("/status", response_model=StorageStatusResponse)
 async def get_storage_status():
@@ -41,15 +57,16 @@ async def get_storage_status():
         
         # 判斷當前模式是否可用
         is_ready = True
-        if storage_mode.mode == StorageModeType.GOOGLE_DRIVE:
-            # Google Drive 模式需要已授權才可用
+        if storage_mode.mode in GOOGLE_MODES:
+            # Google Drive 與 hybrid 模式需要已授權才可用
             is_ready = auth_status.status == GoogleAuthStatus.CONNECTED
         
         return StorageStatusResponse(
             mode=storage_mode.mode,
             google_drive_path=storage_mode.google_drive_path,
             google_auth=auth_status,
-            is_ready=is_ready
+            is_ready=is_ready,
+            **_replication_status()
         )
     except Exception as e:
         raise HTTPException(
@@ -109,8 +126,8 @@ async def update_storage_mode(request: StorageModeUpdateRequest):
         400: 切換到 Google Drive 模式但未授權
     """
     try:
-        # 如果切換到 Google Drive 模式，需要驗證授權狀態
-        if request.mode == StorageModeType.GOOGLE_DRIVE:
+        # 如果切換到 Google Drive 或 hybrid 模式，需要驗證授權狀態
+        if request.mode in GOOGLE_MODES:
             auth_status = google_auth_service.get_auth_status()
             if auth_status.status != GoogleAuthStatus.CONNECTED:
                 raise HTTPException(
@@ -127,22 +144,26 @@ async def update_storage_mode(request: StorageModeUpdateRequest):
             mode=request.mode,
             google_drive_path=request.google_drive_path or settings_service.get_storage_mode().google_drive_path
         )
-        settings_service.update_storage_mode(storage_mode)
         
-        # 動態切換 PlanService 的 StorageProvider
-        plan_service.switch_storage_provider(request.mode)
+        # 動態切換 PlanService 的 StorageProvider（失敗時不保存新的模式）
+        # 切換會預先載入 Drive 資料夾樹、停止舊後端的背景複寫，在執行緒池執行以免阻塞事件迴圈
+        await run_in_threadpool(
+            plan_service.switch_storage_provider, request.mode, storage_mode.google_drive_path
+        )
+        settings_service.update_storage_mode(storage_mode)
         
         # 回傳更新後的狀態
         auth_status = google_auth_service.get_auth_status()
         is_ready = True
-        if request.mode == StorageModeType.GOOGLE_DRIVE:
+        if request.mode in GOOGLE_MODES:
             is_ready = auth_status.status == GoogleAuthStatus.CONNECTED
         
         return StorageStatusResponse(
             mode=storage_mode.mode,
             google_drive_path=storage_mode.google_drive_path,
             google_auth=auth_status,
-            is_ready=is_ready
+            is_ready=is_ready,
+            **_replication_status()
         )
         
     except HTTPException:
@@ -167,6 +188,16 @@ async def update_storage_mode(request: StorageModeUpdateRequest):
         )
 
 
+@router.get("/drive-metrics", response_model=DriveRequestMetricsResponse)
+async def get_drive_request_metrics():
+    """取得 Google Drive 請求的重試與速率限制統計
+    
+    所有 GoogleDriveStorageProvider 實例共用同一份統計，
+    用於觀察大量同步時是否接近 Drive 配額。
+    """
+    return DriveRequestMetricsResponse(**GoogleDriveStorageProvider.get_request_metrics())
+
+
 @router.post("/test-connection")
 async def test_google_drive_connection():
     """測試 Google Drive 連線 (T081)
@@ -188,8 +219,6 @@ async def test_google_drive_connection():
             }
         
         # 建立 GoogleDriveStorageProvider 並測試連線
-        from backend.storage import GoogleDriveStorageProvider
-        
         storage_mode = settings_service.get_storage_mode()
         provider = GoogleDriveStorageProvider(
             base_path=storage_mode.google_drive_path or "WorkPlanByCalendar",
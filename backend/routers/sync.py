@@ -4,26 +4,49 @@ Sync Router - 本地與 Google Drive 差異比較與同步 API
 Feature: sync-files (Issue #19)
 """
 
+import json
+import logging
+from typing import Optional
+
 from fastapi import APIRouter, HTTPException, Query, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 
 from backend.models import (
-    SyncComparisonResult, SyncExecuteRequest, SyncExecuteResult,
-    GoogleAuthStatus, ErrorResponse
+    SyncComparisonResult, SyncExecuteRequest, SyncExecuteResult, FileDiffStats,
+    SyncSchedulerStatus, GoogleAuthStatus, ErrorResponse
+)
+from backend.routers.dependencies import (
+    get_settings_service, get_google_auth_service, get_plan_service, get_sync_scheduler
 )
-from backend.routers.dependencies import get_settings_service, get_google_auth_service
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/sync", tags=["Sync"])
 
 # 取得共用 service 實例
 settings_service = get_settings_service()
 google_auth_service = get_google_auth_service()
+plan_service = get_plan_service()
 
 
-def _get_sync_service():
-    """建立 SyncService 實例（不快取，因需要最新的 auth token）"""
+def _get_sync_service(warm_up: bool = False):
+    """建立 SyncService 實例（不快取，因需要最新的 auth token）
+
+    Drive 服務與 HTTP 連線由 drive_clients 依帳號共用，建立新的 provider
+    不會重新解析 discovery document 或重新建立連線。
+
+    Args:
+        warm_up: 是否預先載入 Google Drive 資料夾樹（比較、批次同步等
+                 會存取大量檔案的操作使用）
+    """
     from backend.storage.local import LocalStorageProvider
     from backend.storage.google_drive import GoogleDriveStorageProvider
+    from backend.storage.drive_id_cache import DriveIdCache
     from backend.sync_service import SyncService
+    from backend.sync_journal import SyncJournal
+    from backend.local_hash_cache import LocalHashCache
+    from backend.sync_base_store import SyncBaseStore
 
     auth_status = google_auth_service.get_auth_status()
     if auth_status.status != GoogleAuthStatus.CONNECTED:
@@ -42,18 +65,52 @@ def _get_sync_service():
     local_provider = LocalStorageProvider()
     google_provider = GoogleDriveStorageProvider(
         base_path=google_drive_path,
-        auth_service=google_auth_service
+        auth_service=google_auth_service,
+        id_cache=DriveIdCache.for_auth_service(google_auth_service, google_drive_path)
+    )
+    # 磁碟快取已有 ID 時不需重新載入整棵資料夾樹；過期的檔案 ID
+    # 由比較時的目錄列舉與 Drive 變更清單更新
+    if warm_up and not google_provider.has_cached_ids:
+        google_provider.warm_up()
+
+    return SyncService(
+        local_provider=local_provider,
+        google_provider=google_provider,
+        journal=SyncJournal.for_auth_service(google_auth_service, google_drive_path),
+        hash_cache=LocalHashCache(),
+        base_store=SyncBaseStore.for_auth_service(google_auth_service, google_drive_path)
     )
 
-    return SyncService(local_provider=local_provider, google_provider=google_provider)
+
+def get_scheduled_sync_service():
+    """背景排程同步使用的 SyncService；Google 帳號未連結時返回 None"""
+    try:
+        return _get_sync_service(warm_up=True)
+    except HTTPException as e:
+        if e.status_code == status.HTTP_401_UNAUTHORIZED:
+            return None
+        raise
+
+
+def _read_or_none(storage, file_path: str) -> Optional[str]:
+    """讀取檔案內容；不存在或讀取失敗時返回 None"""
+    try:
+        return storage.read_file(file_path)
+    except (FileNotFoundError, IOError):
+        return None
 
 
 @router.get("/compare", response_model=SyncComparisonResult)
-async def compare_files():
+async def compare_files(
+    full: bool = Query(False, description="忽略上次比較紀錄，重新比較所有檔案"),
+    with_diff_stats: bool = Query(True, description="是否計算不同檔案的行數差異（需下載雲端內容）")
+):
     """比較本地與 Google Drive 的所有計畫檔案
 
     比較範圍：Year/, Month/, Week/, Day/ 四個子目錄（排除 settings/）
     比較標準：MD5 hash
+    有上次比較紀錄時只檢查之後變動的檔案（Drive Changes API + 本地 mtime）
+    with_diff_stats=false 時不下載雲端內容，行數差異改由 /diff-stats 逐檔取得
 
     Returns:
         SyncComparisonResult 包含所有檔案的同步狀態與統計
@@ -63,8 +120,10 @@ async def compare_files():
         503: Google Drive 連線失敗
     """
     try:
-        sync_service = _get_sync_service()
-        return sync_service.compare()
+        sync_service = await run_in_threadpool(_get_sync_service, True)
+        return await run_in_threadpool(
+            sync_service.compare, full=full, with_diff_stats=with_diff_stats
+        )
     except HTTPException:
         raise
     except Exception as e:
@@ -115,17 +174,9 @@ async def get_file_diff(file_path: str = Query(..., description="計畫檔案相
             ).dict()
         )
     try:
-        sync_service = _get_sync_service()
-        local_content = None
-        cloud_content = None
-        try:
-            local_content = sync_service.local.read_file(file_path)
-        except (FileNotFoundError, IOError):
-            pass
-        try:
-            cloud_content = sync_service.cloud.read_file(file_path)
-        except (FileNotFoundError, IOError):
-            pass
+        sync_service = await run_in_threadpool(_get_sync_service)
+        local_content = await run_in_threadpool(_read_or_none, sync_service.local, file_path)
+        cloud_content = await run_in_threadpool(_read_or_none, sync_service.cloud, file_path)
         if local_content is None and cloud_content is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -163,15 +214,76 @@ async def get_file_diff(file_path: str = Query(..., description="計畫檔案相
         )
 
 
+@router.get("/diff-stats", response_model=FileDiffStats)
+async def get_file_diff_stats(file_path: str = Query(..., description="計畫檔案相對路徑，如 Year/2025.md")):
+    """計算單一檔案本地與 Google Drive 內容的行數差異（difflib）
+
+    供比較時略過行數差異（with_diff_stats=false）的前端逐檔載入。
+
+    Raises:
+        400: file_path 不合法
+        401: Google 帳號未連線
+        404: 兩端皆不存在
+        503: Google Drive 連線失敗
+    """
+    if not file_path or ".." in file_path:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=ErrorResponse(
+                error="INVALID_FILE_PATH",
+                message="file_path 不合法",
+                details={}
+            ).dict()
+        )
+    try:
+        sync_service = await run_in_threadpool(_get_sync_service)
+        return await run_in_threadpool(sync_service.compute_diff_stats, file_path)
+    except HTTPException:
+        raise
+    except FileNotFoundError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=ErrorResponse(
+                error="FILE_NOT_FOUND",
+                message=str(e),
+                details={"file_path": file_path}
+            ).dict()
+        )
+    except Exception as e:
+        error_msg = str(e)
+        if "授權" in error_msg or "auth" in error_msg.lower() or "401" in error_msg:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail=ErrorResponse(
+                    error="AUTH_EXPIRED",
+                    message="Google 授權已過期，請重新登入",
+                    details={}
+                ).dict()
+            )
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=ErrorResponse(
+                error="SYNC_DIFF_ERROR",
+                message=f"計算行數差異失敗：{error_msg}",
+                details={}
+            ).dict()
+        )
+
+
 @router.post("/execute", response_model=SyncExecuteResult)
-async def execute_sync(request: SyncExecuteRequest):
+async def execute_sync(
+    request: SyncExecuteRequest,
+    workers: Optional[int] = Query(None, ge=1, le=16, description="並行執行的操作數")
+):
     """執行選定的同步操作
 
-    依序執行 upload（本地→雲端）或 download（雲端→本地）操作。
+    並行執行 upload（本地→雲端）、download（雲端→本地）或
+    merge（以上次同步內容為基準三方合併，結果寫入兩端）操作。
     部分失敗時仍回傳 HTTP 200，前端應檢查 failed_count > 0。
 
     Args:
         request: 包含操作清單的請求（不可包含 skip，不可為空）
+        workers: 並行數（預設 SyncService.DEFAULT_WORKERS）
 
     Returns:
         SyncExecuteResult 包含每個操作的執行結果
@@ -182,8 +294,14 @@ async def execute_sync(request: SyncExecuteRequest):
         503: Google Drive 連線失敗
     """
     try:
-        sync_service = _get_sync_service()
-        return sync_service.execute(request.operations)
+        sync_service = await run_in_threadpool(_get_sync_service, True)
+        result = await run_in_threadpool(
+            sync_service.execute, request.operations, max_workers=workers
+        )
+        # 同步會繞過 PlanService 直接寫入兩端，重建計畫索引
+        if result.success_count > 0:
+            plan_service.invalidate_caches()
+        return result
     except HTTPException:
         raise
     except ValueError as e:
@@ -214,3 +332,62 @@ async def execute_sync(request: SyncExecuteRequest):
                 details={}
             ).dict()
         )
+
+
+@router.post("/execute/stream")
+async def execute_sync_stream(
+    request: SyncExecuteRequest,
+    workers: Optional[int] = Query(None, ge=1, le=16, description="並行執行的操作數")
+):
+    """執行選定的同步操作，以 NDJSON 串流回報進度
+
+    每完成一個操作輸出一行 SyncOperationResult（依完成順序）；
+    執行中途發生無法繼續的錯誤時，最後一行為 ErrorResponse。
+
+    Raises:
+        401: Google 帳號未連結或授權已過期
+        503: Google Drive 連線失敗
+    """
+    try:
+        sync_service = await run_in_threadpool(_get_sync_service, True)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=ErrorResponse(
+                error="SYNC_EXECUTE_ERROR",
+                message=f"同步執行失敗：{str(e)}",
+                details={}
+            ).dict()
+        )
+
+    def generate_lines():
+        # 同步 generator 由 StreamingResponse 在執行緒池中迭代，不阻塞事件迴圈
+        success_count = 0
+        try:
+            for result in sync_service.iter_execute(request.operations, max_workers=workers):
+                success_count += result.success
+                yield result.json() + "\n"
+        except Exception as e:
+            logger.error(f"串流同步執行失敗: {e}")
+            yield json.dumps(ErrorResponse(
+                error="SYNC_EXECUTE_ERROR",
+                message=f"同步執行失敗：{str(e)}",
+                details={}
+            ).dict(), ensure_ascii=False) + "\n"
+        finally:
+            # 同步會繞過 PlanService 直接寫入兩端，重建計畫索引
+            if success_count > 0:
+                plan_service.invalidate_caches()
+
+    return StreamingResponse(generate_lines(), media_type="application/x-ndjson")
+
+
+@router.get("/scheduler", response_model=SyncSchedulerStatus)
+async def get_scheduler_status():
+    """取得背景排程同步狀態
+
+    包含是否啟用、上次執行時間與耗時、上傳/下載/失敗/待處理數量及下次預定執行時間。
+    """
+    return get_sync_scheduler().get_status()
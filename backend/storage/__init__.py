@@ -9,6 +9,7 @@ Feature: 002-google-drive-storage
 
 from .base import StorageProvider, FileStats
 from .local import LocalStorageProvider
+from .hybrid import HybridStorageProvider
 from .google_drive import (
     GoogleDriveStorageProvider,
     GoogleDriveError,
@@ -21,6 +22,7 @@ __all__ = [
     'StorageProvider',
     'FileStats', 
     'LocalStorageProvider',
+    'HybridStorageProvider',
     'GoogleDriveStorageProvider',
     'GoogleDriveError',
     'NetworkError',
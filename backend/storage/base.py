@@ -9,7 +9,7 @@ Feature: 002-google-drive-storage
 
 from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Union
 from dataclasses import dataclass
 
 
@@ -20,6 +20,7 @@ class FileStats:
     size: int = 0
     created_at: Optional[datetime] = None
     modified_at: Optional[datetime] = None
+    modified_ns: Optional[int] = None  # 奈秒精度的修改時間（僅本地檔案系統提供）
 
 
 class StorageProvider(ABC):
@@ -47,6 +48,26 @@ class StorageProvider(ABC):
         """
         pass
     
+    def read_file_with_stats(self, relative_path: str) -> tuple[str, FileStats]:
+        """
+        讀取檔案內容並同時取得統計資訊
+        
+        預設實作為 read_file 加上 get_file_stats 兩次操作；
+        子類別應盡可能以單次操作完成。
+        
+        Args:
+            relative_path: 相對於資料根目錄的檔案路徑（如 "Year/2025.md"）
+            
+        Returns:
+            (檔案內容字串, FileStats)
+            
+        Raises:
+            FileNotFoundError: 檔案不存在時
+            IOError: 讀取檔案失敗時
+        """
+        content = self.read_file(relative_path)
+        return content, self.get_file_stats(relative_path)
+    
     @abstractmethod
     def write_file(self, relative_path: str, content: str) -> None:
         """
@@ -136,3 +157,106 @@ class StorageProvider(ABC):
             FileNotFoundError: 目錄不存在時
         """
         pass
+    
+    def list_files_with_stats(self, relative_path: str = "") -> dict[str, FileStats]:
+        """
+        列出目錄中的檔案及其統計資訊
+        
+        預設實作為 list_files 加上逐檔 get_file_stats；
+        子類別應盡可能以單次列舉取得所有資訊（避免 N 次查詢）。
+        
+        Args:
+            relative_path: 相對於資料根目錄的目錄路徑，空字串表示根目錄
+            
+        Returns:
+            檔案名稱 -> FileStats 的字典（不含子目錄）
+            
+        Raises:
+            FileNotFoundError: 目錄不存在時
+        """
+        prefix = f"{relative_path.rstrip('/')}/" if relative_path else ""
+        return {
+            name: self.get_file_stats(f"{prefix}{name}")
+            for name in self.list_files(relative_path)
+            if not name.endswith('/')
+        }
+    
+    def create_file(self, relative_path: str, content: str) -> None:
+        """
+        建立新檔案，檔案已存在時不覆寫
+        
+        供自動同步只建立對方沒有的檔案使用，不會蓋掉其他裝置剛寫入的內容。
+        預設實作為 file_exists 確認後再 write_file；後端應盡可能以
+        不會覆寫的建立操作實作。
+        
+        Args:
+            relative_path: 相對於資料根目錄的檔案路徑（如 "Year/2025.md"）
+            content: 要寫入的內容
+            
+        Raises:
+            FileExistsError: 檔案已存在
+            IOError: 寫入檔案失敗時
+        """
+        if self.file_exists(relative_path):
+            raise FileExistsError(relative_path)
+        self.write_file(relative_path, content)
+    
+    def prefetch(self, relative_paths: list[str]) -> None:
+        """
+        預先解析多個檔案的位置，供之後逐檔讀寫使用
+        
+        預設不做任何事；遠端後端可覆寫以批次查詢檔案 ID。
+        
+        Args:
+            relative_paths: 相對於資料根目錄的檔案路徑清單
+        """
+    
+    def read_many(self, relative_paths: list[str]) -> dict[str, Union[str, Exception]]:
+        """
+        批次讀取多個檔案
+        
+        預設實作為逐一 read_file；遠端後端應覆寫以減少往返次數。
+        單一檔案失敗不影響其他檔案。
+        
+        Args:
+            relative_paths: 相對於資料根目錄的檔案路徑清單
+            
+        Returns:
+            檔案路徑 -> 檔案內容；讀取失敗的檔案對應其例外物件
+        """
+        results: dict[str, Union[str, Exception]] = {}
+        for relative_path in relative_paths:
+            try:
+                results[relative_path] = self.read_file(relative_path)
+            except Exception as e:
+                results[relative_path] = e
+        return results
+    
+    def write_many(self, files: dict[str, str]) -> dict[str, Optional[Exception]]:
+        """
+        批次寫入多個檔案
+        
+        預設實作為逐一 write_file；遠端後端應覆寫以減少往返次數。
+        單一檔案失敗不影響其他檔案。
+        
+        Args:
+            files: 檔案路徑 -> 要寫入的內容
+            
+        Returns:
+            檔案路徑 -> None（成功）或例外物件（失敗）
+        """
+        results: dict[str, Optional[Exception]] = {}
+        for relative_path, content in files.items():
+            try:
+                self.write_file(relative_path, content)
+                results[relative_path] = None
+            except Exception as e:
+                results[relative_path] = e
+        return results
+    
+    def close(self) -> None:
+        """
+        釋放背景資源（如背景複寫執行緒）
+        
+        預設不做任何事；切換儲存後端或應用程式關閉時呼叫。
+        """
@@ -0,0 +1,115 @@
+"""
+DriveClientFactory - 程序內共用的 Google Drive API client
+
+GoogleDriveStorageProvider 經常以短生命週期建立（例如每次同步請求），
+若每個實例都呼叫 build('drive', 'v3')，就要重新解析 discovery document
+並為每個執行緒建立新的 TLS 連線。此模組以憑證（帳號）為單位共用：
+
+- discovery document 只解析一次，之後以 build_from_document 建立服務
+- 每個帳號一個 DriveClient，各執行緒保留自己的 keep-alive HTTP 連線
+- access token 刷新時直接更新共用的 Credentials，不需重建服務與連線
+"""
+
+import json
+import logging
+import threading
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+
+import httplib2
+import google_auth_httplib2
+from googleapiclient import discovery_cache
+from googleapiclient.discovery import build, build_from_document
+from googleapiclient.http import HttpRequest
+from google.oauth2.credentials import Credentials
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=None)
+def _discovery_document() -> Optional[Dict[str, Any]]:
+    """googleapiclient 內附的 Drive v3 discovery document（解析一次後共用）
+
+    沒有內附文件時返回 None，改由 build() 自行取得。
+    """
+    document = discovery_cache.get_static_doc('drive', 'v3')
+    if document is None:
+        return None
+    return json.loads(document)
+
+
+class DriveClient:
+    """單一帳號的 Drive API 服務與 HTTP 連線
+
+    服務實例可跨執行緒共用：每個請求透過 requestBuilder
+    使用所在執行緒自己的 HTTP 連線（httplib2.Http 不是 thread-safe），
+    連線在同一執行緒的後續請求（包括其他 provider 實例）中重複使用。
+    """
+
+    def __init__(self, credentials: Credentials):
+        self.credentials = credentials
+        self._thread_local = threading.local()
+        document = _discovery_document()
+        if document is not None:
+            self.service = build_from_document(
+                document, http=self.get_http(), requestBuilder=self._build_request
+            )
+        else:
+            self.service = build(
+                'drive', 'v3', http=self.get_http(), requestBuilder=self._build_request
+            )
+
+    def get_http(self) -> google_auth_httplib2.AuthorizedHttp:
+        """取得目前執行緒專用的已授權 HTTP 連線"""
+        http = getattr(self._thread_local, 'http', None)
+        if http is None:
+            http = google_auth_httplib2.AuthorizedHttp(self.credentials, http=httplib2.Http())
+            self._thread_local.http = http
+        return http
+
+    def _build_request(self, http, *args, **kwargs) -> HttpRequest:
+        """googleapiclient requestBuilder：改用目前執行緒的 HTTP 連線"""
+        return HttpRequest(self.get_http(), *args, **kwargs)
+
+    def update_token(self, access_token: str) -> None:
+        """以刷新後的 access token 更新憑證（所有執行緒的連線立即使用新 token）"""
+        self.credentials.token = access_token
+
+
+class DriveClientFactory:
+    """依憑證快取 DriveClient（程序內共用）"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._clients: Dict[Tuple[Optional[str], str], DriveClient] = {}
+
+    @staticmethod
+    def _key(credentials: Credentials) -> Tuple[Optional[str], str]:
+        # refresh token 在 access token 刷新後不變，可識別同一個授權
+        return (credentials.client_id, credentials.refresh_token or credentials.token)
+
+    def get_client(self, credentials: Credentials) -> DriveClient:
+        """
+        取得憑證對應的 DriveClient
+
+        已有同一授權的 client 時沿用，並在 access token 不同時就地更新
+        （例如 token 已由 GoogleAuthService 在別處刷新）。
+        """
+        key = self._key(credentials)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = DriveClient(credentials)
+                self._clients[key] = client
+                logger.debug("已建立 Google Drive client")
+            elif credentials.token and client.credentials.token != credentials.token:
+                client.update_token(credentials.token)
+            return client
+
+    def clear(self) -> None:
+        """捨棄所有快取的 client（例如登出或測試）"""
+        with self._lock:
+            self._clients.clear()
+
+
+drive_clients = DriveClientFactory()
@@ -0,0 +1,100 @@
+"""
+DriveIdCache - Google Drive 資料夾/檔案 ID 的磁碟快取
+
+GoogleDriveStorageProvider 的 ID 快取只存在記憶體中，每個新的 provider
+實例（例如每次同步請求）都要重新搜尋路徑。此模組將快取寫入
+data/settings/drive_id_cache.json，以帳號與 base_path 區分，
+讓冷啟動或新的實例立即知道每個計畫檔案在 Drive 上的 ID。
+"""
+
+import logging
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+from .json_store import SETTINGS_DIR, AccountScoped, KeyedJsonStore
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = SETTINGS_DIR / "drive_id_cache.json"
+
+
+class DriveIdCache(AccountScoped):
+    """單一帳號 + base_path 的 Drive ID 磁碟快取
+
+    檔案格式：
+        {
+            "version": 1,
+            "entries": {
+                "<account>|<base_path>": {
+                    "base_folder_id": "...",
+                    "folders": {"<parent_id>/<name>": "<folder_id>", ...},
+                    "files": {"<parent_id>/<name>": "<file_id>", ...}
+                }
+            }
+        }
+
+    快取內容可能已過期（檔案在其他裝置被刪除或重建），
+    使用端遇到 404 時需清除快取並重新解析。
+    多個 provider 實例共用同一個項目：save() 只合併各自的變更，
+    不以自己的完整快取覆蓋其他實例的寫入。
+    """
+
+    VERSION = 1
+
+    def __init__(self, account: str, base_path: str, cache_path: Optional[Path] = None):
+        self.account = account
+        self.base_path = base_path
+        self.cache_path = Path(cache_path) if cache_path is not None else DEFAULT_CACHE_PATH
+        self._store = KeyedJsonStore(self.cache_path, self.VERSION, "Drive ID 快取")
+
+    def load(self) -> Dict[str, Any]:
+        """讀取此帳號與 base_path 的快取
+
+        Returns:
+            包含 base_folder_id、folders、files 的字典（沒有快取時為空值）
+        """
+        entry = self._store.get(self.key) or {}
+        return {
+            "base_folder_id": entry.get("base_folder_id"),
+            "folders": dict(entry.get("folders", {})),
+            "files": dict(entry.get("files", {})),
+        }
+
+    def save(
+        self,
+        base_folder_id: Optional[str],
+        folders: Dict[str, str],
+        files: Dict[str, str],
+        removed_folders: Iterable[str] = (),
+        removed_files: Iterable[str] = ()
+    ) -> None:
+        """將變更合併寫入此帳號與 base_path 的快取（失敗時只記錄警告）
+
+        只更新 folders/files 中的項目並移除 removed_* 列出的項目，
+        其他實例寫入的項目保留；base_folder_id 為 None 時不變更。
+        """
+        def merge(entry: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+            entry = entry or {}
+            if base_folder_id is not None:
+                entry["base_folder_id"] = base_folder_id
+            for name, updates, removed in (
+                ("folders", folders, removed_folders),
+                ("files", files, removed_files),
+            ):
+                current = entry.setdefault(name, {})
+                current.update(updates)
+                for cache_key in removed:
+                    current.pop(cache_key, None)
+            return entry
+
+        try:
+            self._store.update(self.key, merge)
+        except OSError as e:
+            logger.warning(f"寫入 Drive ID 快取失敗: {e}")
+
+    def clear(self) -> None:
+        """移除此帳號與 base_path 的快取"""
+        try:
+            self._store.remove(self.key)
+        except OSError as e:
+            logger.warning(f"清除 Drive ID 快取失敗: {e}")
@@ -0,0 +1,103 @@
+"""
+Drive 請求速率限制與重試統計
+
+所有 GoogleDriveStorageProvider 實例（例如同步的多個 worker、hybrid 模式的
+背景複寫）共用同一個 token bucket，讓整個程序送往 Drive 的請求速率
+維持在配額以下；遇到 rateLimitExceeded 時由 pause() 讓所有請求一起暫停。
+"""
+
+import threading
+import time
+from typing import Any, Dict
+
+
+class TokenBucket:
+    """執行緒安全的 token bucket
+
+    Args:
+        rate: 每秒補充的 token 數（平均請求速率）
+        capacity: bucket 容量（允許的瞬間突發請求數）
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._cond = threading.Condition()
+
+    def _refill(self, now: float) -> None:
+        # 暫停期間不補充 token，暫停結束後才從結束時間開始累積
+        if now < self._paused_until:
+            self._updated = now
+            return
+        since = max(self._updated, self._paused_until)
+        self._tokens = min(self.capacity, self._tokens + (now - since) * self.rate)
+        self._updated = now
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """
+        取得 token，不足或暫停中時等待
+
+        超過容量的請求（例如一次 batch）只需等到 bucket 滿，
+        不足的部分以負餘額由之後的請求分攤。
+
+        Returns:
+            等待的秒數
+        """
+        start = time.monotonic()
+        needed = min(tokens, self.capacity)
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self._paused_until:
+                    delay = self._paused_until - now
+                elif self._tokens < needed:
+                    delay = (needed - self._tokens) / self.rate
+                else:
+                    self._tokens -= tokens
+                    return time.monotonic() - start
+                self._cond.wait(delay)
+
+    def pause(self, seconds: float) -> None:
+        """暫停所有請求 seconds 秒（已有更長的暫停時不縮短）"""
+        with self._cond:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            # 剩餘的 token 也捨棄（_refill 在暫停期間不補充），
+            # 避免暫停結束時湧出大量請求
+            self._tokens = min(self._tokens, 1.0)
+            self._cond.notify_all()
+
+
+class DriveRequestMetrics:
+    """Drive 請求的重試與節流統計（程序內累計）"""
+
+    _FIELDS = ("requests", "retries", "rate_limited", "throttled_seconds", "backoff_seconds")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values: Dict[str, Any] = {
+                "requests": 0,
+                "retries": 0,
+                "rate_limited": 0,
+                "throttled_seconds": 0.0,
+                "backoff_seconds": 0.0,
+            }
+
+    def add(self, **increments: float) -> None:
+        """累加統計值，例如 add(requests=1, throttled_seconds=0.2)"""
+        with self._lock:
+            for name, value in increments.items():
+                if name not in self._FIELDS:
+                    raise KeyError(name)
+                self._values[name] += value
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._values)
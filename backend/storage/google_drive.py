@@ -6,19 +6,26 @@ Google Drive Storage Provider
 
 import builtins
 import io
+import random
 import time
 import logging
+import threading
 from datetime import datetime
+from email.utils import parsedate_to_datetime
 from pathlib import PurePosixPath
-from typing import Optional, Dict, List, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, List, Any, Union, Callable
 from functools import lru_cache
 
-from googleapiclient.discovery import build
-from googleapiclient.http import MediaIoBaseUpload, MediaIoBaseDownload
+import httplib2
+from googleapiclient.http import HttpRequest, MediaIoBaseUpload, MediaIoBaseDownload
 from googleapiclient.errors import HttpError
 from google.oauth2.credentials import Credentials
 
 from .base import StorageProvider, FileStats
+from .drive_client import DriveClient, drive_clients
+from .drive_id_cache import DriveIdCache
+from .drive_rate_limiter import TokenBucket, DriveRequestMetrics
 
 # 設置日誌
 logger = logging.getLogger(__name__)
@@ -61,6 +68,15 @@ class FileNotFoundError(GoogleDriveError, builtins.FileNotFoundError):
         self.path = path
 
 
+class StaleFileIdError(FileNotFoundError):
+    """快取的檔案 ID 指向已移到垃圾桶的檔案
+
+    Drive 對垃圾桶中的檔案不會回應 404，讀寫仍會成功，
+    需由回應的 trashed 欄位判斷並重新解析路徑。
+    """
+    pass
+
+
 # ========================================
 # GoogleDriveStorageProvider (T067-T083)
 # ========================================
@@ -72,8 +88,8 @@ class GoogleDriveStorageProvider(StorageProvider):
     所有路徑都是相對於 base_path（預設為 "WorkPlanByCalendar"）。
     
     Features:
-    - 檔案 ID 快取機制減少 API 呼叫
-    - 指數退避重試機制處理暫時性錯誤
+    - 檔案 ID 快取機制減少 API 呼叫（可選擇以 DriveIdCache 保存到磁碟）
+    - 共用 token bucket 限制請求速率，jitter 指數退避重試暫時性錯誤與速率限制
     - 友善的錯誤訊息轉換
     """
     
@@ -81,16 +97,49 @@ class GoogleDriveStorageProvider(StorageProvider):
     FOLDER_MIME_TYPE = 'application/vnd.google-apps.folder'
     TEXT_MIME_TYPE = 'text/markdown'
     
+    # 檔案搜尋、列舉與 files().get 共用的 metadata 欄位（可直接轉換為 FileStats）
+    FILE_INFO_FIELDS = 'id,name,size,createdTime,modifiedTime,trashed'
+    
+    # 預先載入資料夾樹時，單次查詢合併的父資料夾數量上限（避免查詢字串過長）
+    WARM_UP_PARENTS_PER_QUERY = 40
+    
+    # 批次操作設定：Drive batch endpoint 單次最多 100 個請求；
+    # 媒體上傳/下載不支援 batch，改以有上限的執行緒池並行
+    BATCH_MAX_REQUESTS = 100
+    MEDIA_TRANSFER_WORKERS = 8
+    
+    # 分段傳輸設定：超過門檻的內容以可續傳上傳（每段須為 256 KB 的倍數），
+    # 下載以 Range 分段；網路中斷時從伺服器最後確認的位置繼續
+    UPLOAD_CHUNK_SIZE = 256 * 1024
+    RESUMABLE_UPLOAD_THRESHOLD = UPLOAD_CHUNK_SIZE
+    DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+    RETRYABLE_STATUS_CODES = (500, 502, 503, 504)
+    
     # 重試設定
     MAX_RETRIES = 3
     INITIAL_BACKOFF = 1.0  # 秒
     BACKOFF_MULTIPLIER = 2.0
+    MAX_BACKOFF = 32.0
+    RATE_LIMIT_RETRIES = 5
+    MAX_RETRY_AFTER = 120.0  # Retry-After 超過此秒數時以此為上限
+    
+    # 速率限制：所有實例共用，預設低於 Drive 每位使用者約 12,000 次/分鐘的配額
+    REQUESTS_PER_SECOND = 10.0
+    REQUEST_BURST = 20
+    _rate_limiter = TokenBucket(REQUESTS_PER_SECOND, REQUEST_BURST)
+    _metrics = DriveRequestMetrics()
+    
+    # ID 磁碟快取的寫入時機：批次與列舉操作結束、close()，
+    # 或單一查詢累積到一定數量 / 距上次寫入超過一定秒數時
+    ID_CACHE_FLUSH_CHANGES = 50
+    ID_CACHE_FLUSH_INTERVAL = 30.0
     
     def __init__(
         self,
         base_path: str = "WorkPlanByCalendar",
         credentials: Optional[Credentials] = None,
-        auth_service: Optional[Any] = None
+        auth_service: Optional[Any] = None,
+        id_cache: Optional[DriveIdCache] = None
     ):
         """初始化 Google Drive Storage Provider
         
@@ -98,27 +147,56 @@ class GoogleDriveStorageProvider(StorageProvider):
             base_path: Google Drive 中的根資料夾路徑
             credentials: Google OAuth2 憑證（可選）
             auth_service: GoogleAuthService 實例，用於取得和刷新憑證
+            id_cache: 資料夾/檔案 ID 的磁碟快取（可選），跨實例沿用已知的 ID
         """
         self.base_path = base_path
         self._credentials = credentials
         self._auth_service = auth_service
         self._service = None
+        self._client: Optional[DriveClient] = None
+        
+        # 序列化資料夾查詢/建立，避免並行請求重複建立同名資料夾
+        self._folder_lock = threading.RLock()
         
         # 檔案 ID 快取 (T077)
+        # 批次讀寫與同步的執行緒池會同時存取，所有讀取、寫入與走訪都需持有
+        # _cache_lock；持有期間不呼叫 API，也不再取得其他鎖
+        self._cache_lock = threading.Lock()
         self._folder_cache: Dict[str, str] = {}  # path -> folder_id
         self._file_cache: Dict[str, str] = {}    # path -> file_id
         
+        # 目前執行緒最近一次檔案搜尋取得的 metadata，
+        # 讓接著的 read_file_with_stats 不必再呼叫 files().get
+        self._last_lookup = threading.local()
+        
         # 根資料夾 ID 快取
         self._base_folder_id: Optional[str] = None
+        
+        self._id_cache = id_cache
+        self._id_cache_lock = threading.RLock()
+        self._id_cache_pending = 0
+        self._id_cache_flushed_at = time.monotonic()
+        if id_cache is not None:
+            cached = id_cache.load()
+            self._base_folder_id = cached["base_folder_id"]
+            self._folder_cache.update(cached["folders"])
+            self._file_cache.update(cached["files"])
+        # 最近一次寫入磁碟時的 ID 快取，寫入時只送出與其不同的項目
+        self._persisted_ids = self._id_snapshot()
     
     @property
     def service(self):
-        """取得 Google Drive API 服務實例（延遲初始化）"""
+        """取得 Google Drive API 服務實例（延遲初始化）
+        
+        服務實例由 drive_clients 依帳號共用：同一帳號的所有 provider
+        沿用已解析的 discovery document 與各執行緒的 keep-alive 連線。
+        """
         if self._service is None:
             credentials = self._get_credentials()
             if credentials is None:
                 raise AuthExpiredError("無法取得 Google 授權憑證")
-            self._service = build('drive', 'v3', credentials=credentials)
+            self._client = drive_clients.get_client(credentials)
+            self._service = self._client.service
         return self._service
     
     def _get_credentials(self) -> Optional[Credentials]:
@@ -149,20 +227,105 @@ class GoogleDriveStorageProvider(StorageProvider):
         
         return None
     
-    def _invalidate_service(self):
-        """重置服務實例（用於憑證刷新後）"""
-        self._service = None
+    @property
+    def has_cached_ids(self) -> bool:
+        """是否已知根資料夾 ID（例如由磁碟快取載入）"""
+        return self._base_folder_id is not None
+    
+    def _id_snapshot(self) -> tuple[Optional[str], Dict[str, str], Dict[str, str]]:
+        with self._cache_lock:
+            return self._base_folder_id, dict(self._folder_cache), dict(self._file_cache)
+    
+    def _cached_id(self, cache: Dict[str, str], cache_key: str) -> Optional[str]:
+        """讀取 _folder_cache 或 _file_cache 的項目"""
+        with self._cache_lock:
+            return cache.get(cache_key)
+    
+    def _cache_id(self, cache: Dict[str, str], cache_key: str, item_id: str) -> None:
+        """寫入 _folder_cache 或 _file_cache 的項目"""
+        with self._cache_lock:
+            cache[cache_key] = item_id
+    
+    def _save_id_cache(self, flush: bool = False) -> None:
+        """記錄 ID 快取已變更（未設定 id_cache 時不做任何事）
+        
+        單一查詢只累計變更數，達到 ID_CACHE_FLUSH_CHANGES 或距上次寫入
+        超過 ID_CACHE_FLUSH_INTERVAL 秒才寫入磁碟；flush=True（批次與列舉
+        操作結束時）立即寫入。
+        """
+        if self._id_cache is None:
+            return
+        with self._id_cache_lock:
+            self._id_cache_pending += 1
+            due = (
+                flush
+                or self._id_cache_pending >= self.ID_CACHE_FLUSH_CHANGES
+                or time.monotonic() - self._id_cache_flushed_at >= self.ID_CACHE_FLUSH_INTERVAL
+            )
+        if due:
+            self.flush_id_cache()
+    
+    def flush_id_cache(self) -> None:
+        """將上次寫入後的 ID 變更合併寫入磁碟快取"""
+        if self._id_cache is None:
+            return
+        with self._id_cache_lock:
+            base_folder_id, folders, files = self._id_snapshot()
+            persisted_base, persisted_folders, persisted_files = self._persisted_ids
+            changed_folders = {k: v for k, v in folders.items() if persisted_folders.get(k) != v}
+            changed_files = {k: v for k, v in files.items() if persisted_files.get(k) != v}
+            removed_folders = [k for k in persisted_folders if k not in folders]
+            removed_files = [k for k in persisted_files if k not in files]
+            
+            if (
+                base_folder_id != persisted_base or changed_folders or changed_files
+                or removed_folders or removed_files
+            ):
+                self._id_cache.save(
+                    base_folder_id if base_folder_id != persisted_base else None,
+                    changed_folders, changed_files, removed_folders, removed_files
+                )
+            self._persisted_ids = (base_folder_id, folders, files)
+            self._id_cache_pending = 0
+            self._id_cache_flushed_at = time.monotonic()
+    
+    def close(self) -> None:
+        """寫入尚未保存的 ID 快取變更"""
+        self.flush_id_cache()
+    
+    def _refresh_credentials(self) -> bool:
+        """刷新 access token 並就地更新共用的憑證
+        
+        已建立的服務、連線與尚未送出的請求都會改用新的 token。
+        
+        Returns:
+            刷新成功返回 True
+        """
+        if self._auth_service is None:
+            return False
+        token = self._auth_service.refresh_token()
+        if token is None:
+            return False
+        if self._client is not None:
+            self._client.update_token(token.access_token)
+        return True
     
     # ========================================
     # 重試機制 (T078)
     # ========================================
     
-    def _execute_with_retry(self, request, description: str = "operation"):
-        """執行 API 請求，帶有指數退避重試機制
+    def _execute_with_retry(self, request, description: str = "operation", cost: int = 1):
+        """執行 API 請求，帶有速率限制與退避重試機制
+        
+        每次嘗試前先向共用的 token bucket 取得配額。伺服器錯誤以
+        jitter 指數退避重試；rateLimitExceeded/429 依 Retry-After
+        （或退避時間）暫停所有 Drive 請求後重試，重試用盡才拋出
+        QuotaExceededError。
         
         Args:
             request: Google API 請求物件
             description: 操作描述（用於日誌）
+            cost: 消耗的配額數（batch 請求為其中的請求數）
             
         Returns:
             API 回應結果
@@ -170,55 +333,209 @@ class GoogleDriveStorageProvider(StorageProvider):
         Raises:
             GoogleDriveError: 操作失敗
         """
-        backoff = self.INITIAL_BACKOFF
-        last_error = None
+        server_errors = 0
+        rate_limits = 0
+        refreshed = False
         
-        for attempt in range(self.MAX_RETRIES):
+        while True:
+            self._acquire_rate_limit(cost)
             try:
                 return request.execute()
             except HttpError as e:
-                last_error = e
                 error_code = e.resp.status
                 
                 # 處理特定錯誤 (T083)
                 if error_code == 401:
-                    # 授權失敗，嘗試刷新憑證
-                    if self._auth_service is not None:
-                        self._auth_service.refresh_token()
-                        self._invalidate_service()
+                    # 授權失敗，嘗試刷新憑證（只刷新一次）
+                    if not refreshed and self._refresh_credentials():
+                        refreshed = True
+                        self._metrics.add(retries=1)
                         continue
                     raise AuthExpiredError()
                 
-                elif error_code == 403:
-                    error_reason = e.error_details[0].get('reason', '') if e.error_details else ''
-                    if 'quotaExceeded' in str(e) or 'rateLimitExceeded' in str(e):
+                elif self._is_rate_limited(e):
+                    rate_limits += 1
+                    if rate_limits > self.RATE_LIMIT_RETRIES:
                         raise QuotaExceededError()
-                    raise GoogleDriveError(f"存取被拒絕: {self._translate_error(e)}")
+                    self._pause_for_rate_limit(e, rate_limits, description)
+                    continue
                 
-                elif error_code == 404:
-                    raise FileNotFoundError(description)
-                
-                elif error_code in (500, 502, 503, 504):
+                elif error_code in self.RETRYABLE_STATUS_CODES:
                     # 伺服器錯誤，可重試
+                    server_errors += 1
                     logger.warning(
-                        f"Google Drive {description} 失敗 (嘗試 {attempt + 1}/{self.MAX_RETRIES}): {e}"
+                        f"Google Drive {description} 失敗 (嘗試 {server_errors}/{self.MAX_RETRIES}): {e}"
                     )
-                    if attempt < self.MAX_RETRIES - 1:
-                        time.sleep(backoff)
-                        backoff *= self.BACKOFF_MULTIPLIER
-                        continue
+                    if server_errors >= self.MAX_RETRIES:
+                        break
+                    self._sleep_backoff(self._retry_delay(e, server_errors))
+                    continue
                 
                 else:
-                    raise GoogleDriveError(f"Google Drive 操作失敗: {self._translate_error(e)}")
+                    raise self._to_drive_error(e, description)
             
             except Exception as e:
-                if 'ConnectionError' in str(type(e)) or 'timeout' in str(e).lower():
+                if self._is_network_error(e):
                     raise NetworkError()
                 raise GoogleDriveError(f"未預期的錯誤: {str(e)}")
         
         # 所有重試都失敗
         raise GoogleDriveError(f"操作 '{description}' 在 {self.MAX_RETRIES} 次嘗試後失敗")
     
+    @classmethod
+    def get_request_metrics(cls) -> Dict[str, Any]:
+        """取得程序內所有 provider 共用的請求、重試與節流統計"""
+        return cls._metrics.snapshot()
+    
+    def _acquire_rate_limit(self, cost: int = 1) -> None:
+        """向共用的 token bucket 取得配額並記錄等待時間"""
+        waited = self._rate_limiter.acquire(cost)
+        self._metrics.add(requests=cost, throttled_seconds=waited)
+    
+    @staticmethod
+    def _is_rate_limited(error: HttpError) -> bool:
+        """是否為可重試的速率限制（429 或 403 rateLimitExceeded/userRateLimitExceeded）
+        
+        每日配額用盡（quotaExceeded/dailyLimitExceeded）不在此列，重試也不會成功。
+        """
+        if error.resp.status == 429:
+            return True
+        return error.resp.status == 403 and 'ateLimitExceeded' in str(error)
+    
+    @staticmethod
+    def _retry_after(error: HttpError) -> Optional[float]:
+        """解析 Retry-After 標頭（秒數或 HTTP 日期），沒有或無法解析時返回 None"""
+        try:
+            value = error.resp.get('retry-after')
+        except AttributeError:
+            return None
+        if not isinstance(value, str):
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        return max(0.0, retry_at.timestamp() - time.time())
+    
+    def _retry_delay(self, error: Optional[HttpError], attempt: int) -> float:
+        """第 attempt 次重試前的等待秒數
+        
+        採 equal jitter 指數退避（上限的一半 ~ 上限之間隨機）：至少保留
+        一半的退避時間，又避免多個 worker 同時重試；伺服器提供
+        Retry-After 時至少等待該時間。
+        """
+        ceiling = min(self.MAX_BACKOFF, self.INITIAL_BACKOFF * self.BACKOFF_MULTIPLIER ** (attempt - 1))
+        delay = random.uniform(ceiling / 2, ceiling)
+        retry_after = self._retry_after(error) if error is not None else None
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.MAX_RETRY_AFTER))
+        return delay
+    
+    def _sleep_backoff(self, delay: float) -> None:
+        self._metrics.add(retries=1, backoff_seconds=delay)
+        time.sleep(delay)
+    
+    def _pause_for_rate_limit(self, error: HttpError, attempt: int, description: str) -> None:
+        """遇到速率限制：暫停所有共用 token bucket 的請求，下次取得配額時等待"""
+        delay = self._retry_delay(error, attempt)
+        logger.warning(
+            f"Google Drive {description} 超過速率限制 (嘗試 {attempt}/{self.RATE_LIMIT_RETRIES})，"
+            f"暫停 {delay:.1f} 秒"
+        )
+        self._metrics.add(retries=1, rate_limited=1)
+        self._rate_limiter.pause(delay)
+    
+    def _to_drive_error(self, error: HttpError, description: str) -> GoogleDriveError:
+        """將不可重試的 HttpError 轉換為對應的 GoogleDriveError (T083)"""
+        error_code = error.resp.status
+        if error_code == 401:
+            return AuthExpiredError()
+        if error_code == 429:
+            return QuotaExceededError()
+        if error_code == 403:
+            if 'quotaExceeded' in str(error) or 'rateLimitExceeded' in str(error):
+                return QuotaExceededError()
+            return GoogleDriveError(f"存取被拒絕: {self._translate_error(error)}")
+        if error_code == 404:
+            return FileNotFoundError(description)
+        return GoogleDriveError(f"Google Drive 操作失敗: {self._translate_error(error)}")
+    
+    @staticmethod
+    def _is_network_error(error: Exception) -> bool:
+        """是否為連線中斷或逾時等網路錯誤"""
+        return (
+            isinstance(error, (ConnectionError, TimeoutError, httplib2.HttpLib2Error))
+            or 'ConnectionError' in str(type(error))
+            or 'timeout' in str(error).lower()
+        )
+    
+    def _execute_chunked(
+        self,
+        next_chunk: Callable[[], tuple],
+        description: str,
+        on_network_error: Optional[Callable[[], None]] = None
+    ) -> Any:
+        """逐段執行可續傳的上傳或下載
+        
+        每段成功後重設重試次數；網路錯誤或伺服器錯誤時退避後重送，
+        由伺服器最後確認的位置繼續，不需從頭傳輸。
+        同一段連續失敗 MAX_RETRIES 次才放棄；速率限制依
+        RATE_LIMIT_RETRIES 另外計算。
+        
+        Args:
+            next_chunk: 傳輸下一段，返回 (進度, 結果)；結果為真值時表示完成
+            description: 操作描述（用於日誌與錯誤訊息）
+            on_network_error: 網路錯誤後、重送前呼叫（例如要求先查詢伺服器進度）
+            
+        Returns:
+            最後一段的結果
+        """
+        failures = 0
+        rate_limits = 0
+        
+        while True:
+            self._acquire_rate_limit()
+            try:
+                _, result = next_chunk()
+            except HttpError as e:
+                if self._is_rate_limited(e):
+                    rate_limits += 1
+                    if rate_limits > self.RATE_LIMIT_RETRIES:
+                        raise QuotaExceededError()
+                    self._pause_for_rate_limit(e, rate_limits, description)
+                    continue
+                if e.resp.status not in self.RETRYABLE_STATUS_CODES:
+                    raise self._to_drive_error(e, description)
+                retry_error: Optional[HttpError] = e
+                error: Exception = GoogleDriveError(f"操作 '{description}' 在 {self.MAX_RETRIES} 次嘗試後失敗")
+            except Exception as e:
+                if not self._is_network_error(e):
+                    raise GoogleDriveError(f"未預期的錯誤: {str(e)}")
+                if on_network_error is not None:
+                    on_network_error()
+                retry_error = None
+                error = NetworkError()
+            else:
+                if result:
+                    return result
+                failures = 0
+                rate_limits = 0
+                continue
+            
+            failures += 1
+            if failures >= self.MAX_RETRIES:
+                raise error
+            delay = self._retry_delay(retry_error, failures)
+            logger.warning(
+                f"Google Drive {description} 分段傳輸中斷 (嘗試 {failures}/{self.MAX_RETRIES})，"
+                f"{delay:.1f} 秒後續傳"
+            )
+            self._sleep_backoff(delay)
+    
     def _translate_error(self, error: HttpError) -> str:
         """將 Google API 錯誤轉換為友善訊息 (T083)"""
         try:
@@ -262,6 +579,7 @@ class GoogleDriveStorageProvider(StorageProvider):
             parent_id = folder_id
         
         self._base_folder_id = parent_id
+        self._save_id_cache()
         return self._base_folder_id
     
     def _get_or_create_folder(self, name: str, parent_id: str = 'root') -> str:
@@ -277,9 +595,22 @@ class GoogleDriveStorageProvider(StorageProvider):
         cache_key = f"{parent_id}/{name}"
         
         # 檢查快取
-        if cache_key in self._folder_cache:
-            return self._folder_cache[cache_key]
+        folder_id = self._cached_id(self._folder_cache, cache_key)
+        if folder_id is not None:
+            return folder_id
+        
+        with self._folder_lock:
+            # 取得鎖後再檢查一次，其他執行緒可能已建立
+            folder_id = self._cached_id(self._folder_cache, cache_key)
+            if folder_id is not None:
+                return folder_id
+            folder_id = self._lookup_or_create_folder(name, parent_id, cache_key)
         
+        self._save_id_cache()
+        return folder_id
+    
+    def _lookup_or_create_folder(self, name: str, parent_id: str, cache_key: str) -> str:
+        """搜尋資料夾，不存在時建立（呼叫端需持有 _folder_lock）"""
         # 搜尋現有資料夾
         query = (
             f"name = '{name}' and "
@@ -297,7 +628,7 @@ class GoogleDriveStorageProvider(StorageProvider):
         
         if results.get('files'):
             folder_id = results['files'][0]['id']
-            self._folder_cache[cache_key] = folder_id
+            self._cache_id(self._folder_cache, cache_key, folder_id)
             return folder_id
         
         # 建立新資料夾
@@ -314,17 +645,18 @@ class GoogleDriveStorageProvider(StorageProvider):
         folder = self._execute_with_retry(request, f"建立資料夾 '{name}'")
         
         folder_id = folder['id']
-        self._folder_cache[cache_key] = folder_id
+        self._cache_id(self._folder_cache, cache_key, folder_id)
         logger.info(f"已建立資料夾: {name} (ID: {folder_id})")
         
         return folder_id
     
-    def _find_file(self, name: str, parent_id: str) -> Optional[str]:
+    def _find_file(self, name: str, parent_id: str, use_cache: bool = True) -> Optional[str]:
         """搜尋檔案 (T069)
         
         Args:
             name: 檔案名稱
             parent_id: 父資料夾 ID
+            use_cache: False 時略過 ID 快取，以 API 確認檔案目前是否存在
             
         Returns:
             檔案 ID 或 None（如果不存在）
@@ -332,29 +664,116 @@ class GoogleDriveStorageProvider(StorageProvider):
         cache_key = f"{parent_id}/{name}"
         
         # 檢查快取
-        if cache_key in self._file_cache:
-            return self._file_cache[cache_key]
+        if use_cache:
+            file_id = self._cached_id(self._file_cache, cache_key)
+            if file_id is not None:
+                return file_id
         
+        request = self._file_lookup_request(name, parent_id)
+        results = self._execute_with_retry(request, f"搜尋檔案 '{name}'")
+        
+        if results.get('files'):
+            file_info = results['files'][0]
+            file_id = file_info['id']
+            self._cache_id(self._file_cache, cache_key, file_id)
+            self._last_lookup.info = (cache_key, file_info)
+            self._save_id_cache()
+            return file_id
+        
+        return None
+    
+    def _take_lookup_info(self, cache_key: str, file_id: str) -> Optional[Dict[str, Any]]:
+        """取出目前執行緒剛搜尋到的檔案 metadata（不是同一檔案時返回 None）"""
+        last = getattr(self._last_lookup, 'info', None)
+        self._last_lookup.info = None
+        if last is None or last[0] != cache_key or last[1].get('id') != file_id:
+            return None
+        return last[1]
+    
+    def _file_lookup_request(self, name: str, parent_id: str) -> HttpRequest:
+        """建立依名稱搜尋檔案的 files().list 請求"""
         query = (
             f"name = '{name}' and "
             f"'{parent_id}' in parents and "
             f"mimeType != '{self.FOLDER_MIME_TYPE}' and "
             f"trashed = false"
         )
-        
-        request = self.service.files().list(
+        return self.service.files().list(
             q=query,
             spaces='drive',
-            fields='files(id, name)'
+            fields=f'files({self.FILE_INFO_FIELDS})'
         )
-        results = self._execute_with_retry(request, f"搜尋檔案 '{name}'")
+    
+    def _execute_batch(self, requests: Dict[str, HttpRequest], description: str) -> Dict[str, Any]:
+        """以 Drive batch endpoint 送出多個 metadata 請求
         
-        if results.get('files'):
-            file_id = results['files'][0]['id']
-            self._file_cache[cache_key] = file_id
-            return file_id
+        每 BATCH_MAX_REQUESTS 個請求合併為一次 HTTP 往返。
+        整批傳輸失敗時依 _execute_with_retry 重試並拋出例外；
+        個別請求的錯誤則以 HttpError 物件回傳，由呼叫端決定如何處理。
         
-        return None
+        Args:
+            requests: request_id -> 請求物件
+            description: 操作描述（用於日誌）
+            
+        Returns:
+            request_id -> API 回應或 HttpError
+        """
+        responses: Dict[str, Any] = {}
+        
+        def callback(request_id, response, exception):
+            responses[request_id] = exception if exception is not None else response
+        
+        items = list(requests.items())
+        for start in range(0, len(items), self.BATCH_MAX_REQUESTS):
+            batch = self.service.new_batch_http_request(callback=callback)
+            for request_id, request in items[start:start + self.BATCH_MAX_REQUESTS]:
+                batch.add(request, request_id=request_id)
+            self._execute_with_retry(batch, description, cost=len(items[start:start + self.BATCH_MAX_REQUESTS]))
+        
+        return responses
+    
+    def _find_files(self, relative_paths: List[str]) -> Dict[str, tuple[str, str, Optional[str]]]:
+        """批次解析多個檔案路徑
+        
+        資料夾由快取（或逐一查詢/建立）取得；未快取的檔案 ID
+        以 batch 請求一次查詢。個別查詢失敗時退回 _find_file。
+        
+        Returns:
+            路徑 -> (folder_id, filename, file_id 或 None)
+        """
+        resolved: Dict[str, tuple[str, str, Optional[str]]] = {}
+        pending: Dict[str, tuple[str, str, str]] = {}
+        
+        for relative_path in relative_paths:
+            folder_id, filename = self._resolve_path(relative_path)
+            file_id = self._cached_id(self._file_cache, f"{folder_id}/{filename}")
+            if file_id is not None:
+                resolved[relative_path] = (folder_id, filename, file_id)
+            else:
+                pending[str(len(pending))] = (relative_path, folder_id, filename)
+        
+        if not pending:
+            return resolved
+        
+        requests = {
+            request_id: self._file_lookup_request(filename, folder_id)
+            for request_id, (_, folder_id, filename) in pending.items()
+        }
+        responses = self._execute_batch(requests, f"批次搜尋 {len(requests)} 個檔案")
+        
+        for request_id, (relative_path, folder_id, filename) in pending.items():
+            response = responses.get(request_id)
+            if response is None or isinstance(response, Exception):
+                file_id = self._find_file(filename, folder_id)
+            elif response.get('files'):
+                file_id = response['files'][0]['id']
+                self._cache_id(self._file_cache, f"{folder_id}/{filename}", file_id)
+            else:
+                file_id = None
+            resolved[relative_path] = (folder_id, filename, file_id)
+        
+        self._save_id_cache(flush=True)
+        return resolved
     
     def _build_folder_path(self, relative_path: str) -> str:
         """建立資料夾路徑並返回最終資料夾 ID (T070)
@@ -385,14 +804,86 @@ class GoogleDriveStorageProvider(StorageProvider):
         filename = path.name
         return folder_id, filename
     
+    @staticmethod
+    def _parse_drive_time(value: str) -> datetime:
+        """將 Drive RFC 3339 時間字串轉換為 naive datetime"""
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).replace(tzinfo=None)
+    
+    def _to_file_stats(self, file_info: Dict[str, Any]) -> FileStats:
+        """將 Drive 檔案 metadata 轉換為 FileStats"""
+        return FileStats(
+            exists=True,
+            size=int(file_info.get('size', 0)),
+            created_at=self._parse_drive_time(file_info['createdTime']),
+            modified_at=self._parse_drive_time(file_info['modifiedTime'])
+        )
+    
     def _invalidate_cache(self, relative_path: str):
         """清除指定路徑的快取"""
         path = PurePosixPath(relative_path)
         
         # 清除檔案快取
-        for key in list(self._file_cache.keys()):
-            if path.name in key:
+        with self._cache_lock:
+            for key in [key for key in self._file_cache if path.name in key]:
                 del self._file_cache[key]
+        self._save_id_cache()
+    
+    def _forget_file_id(self, file_id: str) -> None:
+        """移除指向 file_id 的快取項目（檔案已刪除或移到垃圾桶）"""
+        with self._cache_lock:
+            for key in [key for key, value in self._file_cache.items() if value == file_id]:
+                del self._file_cache[key]
+        self._save_id_cache()
+    
+    def _refresh_folder_files(self, folder_id: str, files: Dict[str, str]) -> None:
+        """以資料夾的完整列舉結果（名稱 -> ID）更新檔案 ID 快取
+        
+        列舉只包含未在垃圾桶的檔案：快取中該資料夾下沒有出現的項目
+        （已刪除、移到垃圾桶或移走）一併移除，重建的同名檔案改用新 ID。
+        """
+        prefix = f"{folder_id}/"
+        with self._cache_lock:
+            for key in [key for key in self._file_cache if key.startswith(prefix)]:
+                if key[len(prefix):] not in files:
+                    del self._file_cache[key]
+            for name, file_id in files.items():
+                self._file_cache[prefix + name] = file_id
+        self._save_id_cache(flush=True)
+    
+    def _call_with_file_id(
+        self,
+        relative_path: str,
+        operation: Callable[[str, str, Optional[str]], Any],
+        create_missing: bool = False,
+        use_cache: bool = True
+    ) -> Any:
+        """解析路徑後呼叫 operation(folder_id, filename, file_id)
+        
+        檔案不存在時：create_missing 為 True 則以 file_id=None 呼叫
+        （由 operation 建立檔案），否則不呼叫並返回 None。
+        use_cache 為 False 時一律以 API 搜尋檔案，不使用快取的檔案 ID。
+        
+        ID 可能來自磁碟快取而已失效（檔案或資料夾在其他裝置被刪除、重建），
+        此時 API 回應 404：清除所有 ID 快取後重新解析路徑，再試一次。
+        檔案只是被移到垃圾桶時（StaleFileIdError）只需重新搜尋該檔案。
+        """
+        for attempt in range(2):
+            try:
+                folder_id, filename = self._resolve_path(relative_path)
+                file_id = self._find_file(filename, folder_id, use_cache=use_cache)
+                if file_id is None and not create_missing:
+                    return None
+                return operation(folder_id, filename, file_id)
+            except StaleFileIdError:
+                # 只有這個檔案的 ID 失效（已由拋出端移除），重新搜尋即可
+                if attempt > 0:
+                    raise
+                logger.info(f"Google Drive 檔案已在垃圾桶，重新解析路徑: {relative_path}")
+            except FileNotFoundError:
+                if attempt > 0:
+                    raise
+                logger.info(f"Google Drive ID 快取已失效，重新解析路徑: {relative_path}")
+                self.clear_cache()
     
     # ========================================
     # StorageProvider 介面實作 (T071-T076)
@@ -400,44 +891,124 @@ class GoogleDriveStorageProvider(StorageProvider):
     
     def read_file(self, relative_path: str) -> str:
         """讀取檔案內容 (T071)"""
-        folder_id, filename = self._resolve_path(relative_path)
-        file_id = self._find_file(filename, folder_id)
+        content = self._call_with_file_id(
+            relative_path,
+            lambda folder_id, filename, file_id: self._download_content(file_id)
+        )
         
-        if file_id is None:
+        if content is None:
             raise FileNotFoundError(relative_path)
         
-        request = self.service.files().get_media(fileId=file_id)
+        logger.debug(f"已讀取檔案: {relative_path}")
+        return content
+    
+    def read_file_with_stats(self, relative_path: str) -> tuple[str, FileStats]:
+        """讀取檔案內容並同時取得統計資訊
         
-        # 下載檔案內容
-        buffer = io.BytesIO()
-        downloader = MediaIoBaseDownload(buffer, request)
+        一次 metadata 請求加上一次 media 下載：檔案 ID 需要搜尋時，
+        搜尋結果已包含大小與時間；ID 已快取時以一次 files().get 取得。
+        """
+        def read(folder_id: str, filename: str, file_id: str) -> tuple[str, FileStats]:
+            file_info = self._take_lookup_info(f"{folder_id}/{filename}", file_id)
+            if file_info is None:
+                file_info = self._get_file_info(relative_path, file_id)
+            return self._download_content(file_id), self._to_file_stats(file_info)
         
-        done = False
-        while not done:
-            status, done = downloader.next_chunk()
+        result = self._call_with_file_id(relative_path, read)
         
-        buffer.seek(0)
-        content = buffer.read().decode('utf-8')
+        if result is None:
+            raise FileNotFoundError(relative_path)
         
         logger.debug(f"已讀取檔案: {relative_path}")
-        return content
+        return result
+    
+    def _get_file_info(self, relative_path: str, file_id: str) -> Dict[str, Any]:
+        """取得檔案 metadata（大小與建立/修改時間）"""
+        request = self.service.files().get(
+            fileId=file_id,
+            fields=self.FILE_INFO_FIELDS
+        )
+        file_info = self._execute_with_retry(request, f"取得檔案資訊 '{relative_path}'")
+        if file_info.get('trashed'):
+            self._forget_file_id(file_id)
+            raise StaleFileIdError(relative_path)
+        return file_info
+    
+    def _download_content(self, file_id: str) -> str:
+        """下載檔案內容並以 UTF-8 解碼
+        
+        以 Range 分段下載；連線中斷時從已收到的位置繼續。
+        """
+        request = self.service.files().get_media(fileId=file_id)
+        
+        buffer = io.BytesIO()
+        downloader = MediaIoBaseDownload(buffer, request, chunksize=self.DOWNLOAD_CHUNK_SIZE)
+        # 分段失敗時 downloader 的進度不會前進，下一次 next_chunk 由同一位置重新請求
+        self._execute_chunked(downloader.next_chunk, f"下載檔案 '{file_id}'")
+        
+        return buffer.getvalue().decode('utf-8')
     
     def write_file(self, relative_path: str, content: str) -> None:
         """寫入檔案內容（建立或更新）(T072)"""
-        folder_id, filename = self._resolve_path(relative_path)
-        file_id = self._find_file(filename, folder_id)
+        self._call_with_file_id(
+            relative_path,
+            lambda folder_id, filename, file_id: self._upload_content(
+                relative_path, folder_id, filename, file_id, content
+            ),
+            create_missing=True
+        )
+    
+    def create_file(self, relative_path: str, content: str) -> None:
+        """建立新檔案，檔案已存在時不覆寫
+        
+        不使用 ID 快取，以 API 重新搜尋確認檔案不存在後才建立；
+        搜尋到檔案時不更新，改為拋出 FileExistsError。
+        
+        Raises:
+            FileExistsError: 檔案已存在
+        """
+        def create(folder_id: str, filename: str, file_id: Optional[str]) -> None:
+            if file_id is not None:
+                raise FileExistsError(relative_path)
+            self._upload_content(relative_path, folder_id, filename, None, content)
+        
+        self._call_with_file_id(relative_path, create, create_missing=True, use_cache=False)
+    
+    def _upload_content(
+        self,
+        relative_path: str,
+        folder_id: str,
+        filename: str,
+        file_id: Optional[str],
+        content: str
+    ) -> None:
+        """上傳檔案內容（file_id 為 None 時建立新檔案）
         
+        小檔案以單一請求上傳；超過 RESUMABLE_UPLOAD_THRESHOLD 時以可續傳上傳
+        分段傳送，連線中斷時從伺服器已確認的位置繼續。
+        """
         # 準備內容
-        buffer = io.BytesIO(content.encode('utf-8'))
-        media = MediaIoBaseUpload(buffer, mimetype=self.TEXT_MIME_TYPE, resumable=True)
+        data = content.encode('utf-8')
+        resumable = len(data) > self.RESUMABLE_UPLOAD_THRESHOLD
+        media = MediaIoBaseUpload(
+            io.BytesIO(data),
+            mimetype=self.TEXT_MIME_TYPE,
+            chunksize=self.UPLOAD_CHUNK_SIZE,
+            resumable=resumable
+        )
         
         if file_id is not None:
             # 更新現有檔案
             request = self.service.files().update(
                 fileId=file_id,
-                media_body=media
+                media_body=media,
+                fields='id,trashed'
             )
-            self._execute_with_retry(request, f"更新檔案 '{relative_path}'")
+            result = self._execute_upload(request, resumable, f"更新檔案 '{relative_path}'")
+            if result.get('trashed'):
+                # 寫入的是垃圾桶中的舊檔案：捨棄 ID，由呼叫端重新搜尋或建立
+                self._forget_file_id(file_id)
+                raise StaleFileIdError(relative_path)
             logger.debug(f"已更新檔案: {relative_path}")
         else:
             # 建立新檔案
@@ -450,13 +1021,115 @@ class GoogleDriveStorageProvider(StorageProvider):
                 media_body=media,
                 fields='id'
             )
-            result = self._execute_with_retry(request, f"建立檔案 '{relative_path}'")
+            result = self._execute_upload(request, resumable, f"建立檔案 '{relative_path}'")
             
             # 更新快取
-            cache_key = f"{folder_id}/{filename}"
-            self._file_cache[cache_key] = result['id']
+            self._cache_id(self._file_cache, f"{folder_id}/{filename}", result['id'])
+            self._save_id_cache()
             logger.debug(f"已建立檔案: {relative_path}")
     
+    def _execute_upload(self, request: HttpRequest, resumable: bool, description: str) -> Dict[str, Any]:
+        """執行上傳請求；可續傳上傳逐段送出"""
+        if not resumable:
+            return self._execute_with_retry(request, description)
+        
+        def query_progress() -> None:
+            # 連線中斷時無法得知伺服器收到多少資料：讓下一次 next_chunk
+            # 先以空的 PUT 查詢已確認的位置（googleapiclient 的錯誤恢復流程）
+            request._in_error_state = True
+        
+        return self._execute_chunked(
+            lambda: request.next_chunk(num_retries=0),
+            description,
+            on_network_error=query_progress
+        )
+    
+    def prefetch(self, relative_paths: List[str]) -> None:
+        """以 batch 請求解析多個檔案的 ID 並寫入快取"""
+        if relative_paths:
+            self._find_files(relative_paths)
+    
+    def read_many(self, relative_paths: List[str]) -> Dict[str, Union[str, Exception]]:
+        """批次讀取多個檔案
+        
+        檔案 ID 以 batch 請求一次解析，內容再以有上限的執行緒池並行下載。
+        """
+        results: Dict[str, Union[str, Exception]] = {}
+        if not relative_paths:
+            return results
+        
+        resolved = self._find_files(relative_paths)
+        downloads = {}
+        for relative_path in relative_paths:
+            file_id = resolved[relative_path][2]
+            if file_id is None:
+                results[relative_path] = FileNotFoundError(relative_path)
+            else:
+                downloads[relative_path] = file_id
+        
+        if downloads:
+            workers = min(self.MEDIA_TRANSFER_WORKERS, len(downloads))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="drive-media") as executor:
+                futures = {
+                    relative_path: executor.submit(self._download_content, file_id)
+                    for relative_path, file_id in downloads.items()
+                }
+                for relative_path, future in futures.items():
+                    try:
+                        results[relative_path] = future.result()
+                    except FileNotFoundError:
+                        # 快取的 ID 已失效，改由 read_file 重新解析
+                        results[relative_path] = self._read_or_error(relative_path)
+                    except Exception as e:
+                        results[relative_path] = e
+        
+        return results
+    
+    def _read_or_error(self, relative_path: str) -> Union[str, Exception]:
+        try:
+            return self.read_file(relative_path)
+        except Exception as e:
+            return e
+    
+    def write_many(self, files: Dict[str, str]) -> Dict[str, Optional[Exception]]:
+        """批次寫入多個檔案
+        
+        檔案 ID 以 batch 請求一次解析，內容再以有上限的執行緒池並行上傳。
+        """
+        results: Dict[str, Optional[Exception]] = {}
+        if not files:
+            return results
+        
+        resolved = self._find_files(list(files))
+        workers = min(self.MEDIA_TRANSFER_WORKERS, len(files))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="drive-media") as executor:
+            futures = {
+                relative_path: executor.submit(
+                    self._upload_content, relative_path, *resolved[relative_path], content
+                )
+                for relative_path, content in files.items()
+            }
+            for relative_path, future in futures.items():
+                try:
+                    future.result()
+                    results[relative_path] = None
+                except FileNotFoundError:
+                    # 快取的 ID 已失效，改由 write_file 重新解析
+                    results[relative_path] = self._write_or_error(relative_path, files[relative_path])
+                except Exception as e:
+                    results[relative_path] = e
+        
+        # 新建立的檔案 ID
+        self._save_id_cache(flush=True)
+        return results
+    
+    def _write_or_error(self, relative_path: str, content: str) -> Optional[Exception]:
+        try:
+            self.write_file(relative_path, content)
+            return None
+        except Exception as e:
+            return e
+    
     def file_exists(self, relative_path: str) -> bool:
         """檢查檔案是否存在 (T073)"""
         try:
@@ -467,15 +1140,14 @@ class GoogleDriveStorageProvider(StorageProvider):
     
     def delete_file(self, relative_path: str) -> bool:
         """刪除檔案 (T074)"""
-        folder_id, filename = self._resolve_path(relative_path)
-        file_id = self._find_file(filename, folder_id)
+        def delete(folder_id: str, filename: str, file_id: str) -> bool:
+            request = self.service.files().delete(fileId=file_id)
+            self._execute_with_retry(request, f"刪除檔案 '{relative_path}'")
+            return True
         
-        if file_id is None:
+        if self._call_with_file_id(relative_path, delete) is None:
             return False
         
-        request = self.service.files().delete(fileId=file_id)
-        self._execute_with_retry(request, f"刪除檔案 '{relative_path}'")
-        
         # 清除快取
         self._invalidate_cache(relative_path)
         
@@ -494,28 +1166,15 @@ class GoogleDriveStorageProvider(StorageProvider):
     def get_file_stats(self, relative_path: str) -> FileStats:
         """取得檔案統計資訊 (T076)"""
         try:
-            folder_id, filename = self._resolve_path(relative_path)
-            file_id = self._find_file(filename, folder_id)
+            file_info = self._call_with_file_id(
+                relative_path,
+                lambda folder_id, filename, file_id: self._get_file_info(relative_path, file_id)
+            )
             
-            if file_id is None:
+            if file_info is None:
                 return FileStats(exists=False)
             
-            request = self.service.files().get(
-                fileId=file_id,
-                fields='id,name,size,createdTime,modifiedTime'
-            )
-            file_info = self._execute_with_retry(request, f"取得檔案資訊 '{relative_path}'")
-            
-            return FileStats(
-                exists=True,
-                size=int(file_info.get('size', 0)),
-                created_at=datetime.fromisoformat(
-                    file_info['createdTime'].replace('Z', '+00:00')
-                ).replace(tzinfo=None),
-                modified_at=datetime.fromisoformat(
-                    file_info['modifiedTime'].replace('Z', '+00:00')
-                ).replace(tzinfo=None)
-            )
+            return self._to_file_stats(file_info)
         except FileNotFoundError:
             return FileStats(exists=False)
         except Exception as e:
@@ -553,33 +1212,235 @@ class GoogleDriveStorageProvider(StorageProvider):
         """列出目錄內的檔案，包含 md5Checksum 和 modifiedTime 等 metadata
 
         用於同步功能的差異比較，不更改既有 list_files() 的介面。
+        列舉成功時以結果更新該目錄的檔案 ID 快取（見 _refresh_folder_files）。
 
         Returns:
-            List of dicts with keys: name, md5Checksum, modifiedTime
+            List of dicts with keys: id, name, md5Checksum, modifiedTime
+
+        Raises:
+            GoogleDriveError: 列出失敗（不返回空清單，避免同步把失敗誤判為
+                              雲端沒有檔案而上傳覆寫）
         """
-        try:
-            if relative_path:
-                folder_id = self._build_folder_path(relative_path + "/dummy")
-            else:
-                folder_id = self._get_base_folder_id()
+        if relative_path:
+            folder_id = self._build_folder_path(relative_path + "/dummy")
+        else:
+            folder_id = self._get_base_folder_id()
 
-            query = (
-                f"'{folder_id}' in parents and "
-                f"mimeType != '{self.FOLDER_MIME_TYPE}' and "
-                f"trashed = false"
-            )
+        query = (
+            f"'{folder_id}' in parents and "
+            f"mimeType != '{self.FOLDER_MIME_TYPE}' and "
+            f"trashed = false"
+        )
+
+        files = sorted(
+            self._list_all_pages(
+                query, 'id,name,md5Checksum,modifiedTime', f"列出檔案 metadata '{relative_path}'"
+            ),
+            key=lambda file_info: file_info['name']
+        )
+
+        self._refresh_folder_files(folder_id, {f['name']: f['id'] for f in files})
+        return files
+
+    def list_files_with_stats(self, relative_path: str = "") -> Dict[str, FileStats]:
+        """列出目錄內的檔案及統計資訊（單次分頁查詢，不逐檔取得資訊）
+
+        同時以列舉結果更新 _file_cache，後續讀取可略過檔案搜尋。
+
+        Raises:
+            GoogleDriveError: 列出失敗（不同於 list_files，不吞掉錯誤，
+                              避免呼叫端把失敗誤判為「沒有檔案」）
+        """
+        if relative_path:
+            folder_id = self._build_folder_path(relative_path + "/dummy")
+        else:
+            folder_id = self._get_base_folder_id()
+
+        query = (
+            f"'{folder_id}' in parents and "
+            f"mimeType != '{self.FOLDER_MIME_TYPE}' and "
+            f"trashed = false"
+        )
+
+        result: Dict[str, FileStats] = {}
+        file_ids: Dict[str, str] = {}
+        for file_info in self._list_all_pages(
+            query, self.FILE_INFO_FIELDS, f"列出檔案資訊 '{relative_path}'"
+        ):
+            name = file_info['name']
+            result[name] = self._to_file_stats(file_info)
+            file_ids[name] = file_info['id']
+
+        self._refresh_folder_files(folder_id, file_ids)
+        return result
+
+    def _list_all_pages(self, query: str, file_fields: str, description: str):
+        """執行 files().list 並逐頁取得所有結果
 
+        Args:
+            query: Drive 搜尋條件
+            file_fields: 每個檔案要取得的欄位（如 "id,name"）
+            description: 操作描述（用於日誌與錯誤訊息）
+
+        Yields:
+            檔案 metadata 字典
+        """
+        page_token = None
+        while True:
             request = self.service.files().list(
                 q=query,
                 spaces='drive',
-                fields='files(name,md5Checksum,modifiedTime)',
-                orderBy='name'
+                fields=f'nextPageToken, files({file_fields})',
+                pageSize=1000,
+                pageToken=page_token
             )
-            results = self._execute_with_retry(request, f"列出檔案 metadata '{relative_path}'")
-            return results.get('files', [])
-        except Exception as e:
-            logger.warning(f"列出檔案 metadata 失敗: {relative_path}, {e}")
-            return []
+            response = self._execute_with_retry(request, description)
+            yield from response.get('files', [])
+            page_token = response.get('nextPageToken')
+            if not page_token:
+                break
+
+    # ========================================
+    # 變更追蹤 (Drive Changes API)
+    # ========================================
+
+    def get_folder_id(self, relative_path: str = "") -> str:
+        """取得（必要時建立）目錄的資料夾 ID，空字串為根資料夾"""
+        if not relative_path:
+            return self._get_base_folder_id()
+        return self._build_folder_path(relative_path + "/dummy")
+
+    def get_changes_start_token(self) -> str:
+        """取得目前的變更起始標記，之後的變更可由 list_changes 取得"""
+        request = self.service.changes().getStartPageToken()
+        response = self._execute_with_retry(request, "取得變更起始標記")
+        return response['startPageToken']
+
+    def list_changes(self, page_token: str) -> tuple[List[Dict[str, Any]], str]:
+        """列出 page_token 之後雲端硬碟的所有檔案變更
+
+        Args:
+            page_token: 上次取得的起始標記
+
+        Returns:
+            (變更清單, 下次使用的起始標記)。每筆變更包含 fileId、removed，
+            以及 file（id, name, mimeType, parents, md5Checksum, modifiedTime, trashed）
+
+        Raises:
+            GoogleDriveError: 查詢失敗（包含標記已失效）
+        """
+        changes: List[Dict[str, Any]] = []
+        while True:
+            request = self.service.changes().list(
+                pageToken=page_token,
+                spaces='drive',
+                pageSize=1000,
+                includeRemoved=True,
+                fields=(
+                    'nextPageToken, newStartPageToken, changes(fileId, removed, '
+                    'file(id, name, mimeType, parents, md5Checksum, modifiedTime, trashed))'
+                )
+            )
+            response = self._execute_with_retry(request, "列出檔案變更")
+            changes.extend(response.get('changes', []))
+            if 'newStartPageToken' in response:
+                self._apply_changes_to_cache(changes)
+                return changes, response['newStartPageToken']
+            page_token = response['nextPageToken']
+
+    def _apply_changes_to_cache(self, changes: List[Dict[str, Any]]) -> None:
+        """以 Drive 變更更新檔案 ID 快取
+
+        刪除或移到垃圾桶的檔案移除其快取；已知資料夾內新增、改名或移入的
+        檔案（包含在其他裝置重建的同名檔案）改用變更中的 ID。
+        """
+        with self._cache_lock:
+            known_folders = set(self._folder_cache.values())
+            if self._base_folder_id is not None:
+                known_folders.add(self._base_folder_id)
+            keys_by_id: Dict[str, List[str]] = {}
+            for key, file_id in self._file_cache.items():
+                keys_by_id.setdefault(file_id, []).append(key)
+
+            for change in changes:
+                file_id = change.get('fileId')
+                file_info = change.get('file') or {}
+                if file_info.get('mimeType') == self.FOLDER_MIME_TYPE:
+                    continue
+                for key in keys_by_id.pop(file_id, []):
+                    if self._file_cache.get(key) == file_id:
+                        del self._file_cache[key]
+                if change.get('removed') or file_info.get('trashed', False):
+                    continue
+                for parent_id in file_info.get('parents', []):
+                    if parent_id in known_folders and file_info.get('name'):
+                        key = f"{parent_id}/{file_info['name']}"
+                        self._file_cache[key] = file_id
+                        keys_by_id.setdefault(file_id, []).append(key)
+
+        self._save_id_cache(flush=True)
+
+    # ========================================
+    # 資料夾樹預先載入
+    # ========================================
+
+    def warm_up(self) -> int:
+        """預先載入根資料夾下整棵資料夾樹的 ID
+
+        逐層以 "'<id1>' in parents or '<id2>' in parents ..." 合併查詢，
+        每層只需少數幾次分頁的 files().list，即可填滿 _folder_cache
+        與 _file_cache，之後的讀取不需再逐段搜尋路徑。
+
+        只快取存在的項目；快取中沒有的檔案仍會實際查詢，
+        避免其他裝置新增的檔案被誤判為不存在而重複建立。
+        列舉結果覆寫既有的快取項目（可能來自已過期的磁碟快取）。
+
+        Returns:
+            載入快取的資料夾與檔案數量
+        """
+        try:
+            return self._load_folder_tree()
+        except FileNotFoundError:
+            # 磁碟快取中的根資料夾 ID 已失效
+            logger.info("Google Drive 根資料夾 ID 已失效，重新解析後載入")
+            self.clear_cache()
+            return self._load_folder_tree()
+
+    def _load_folder_tree(self) -> int:
+        level = [self._get_base_folder_id()]
+        folders: Dict[str, str] = {}
+        files: Dict[str, str] = {}
+        loaded = 0
+
+        while level:
+            next_level = []
+            for start in range(0, len(level), self.WARM_UP_PARENTS_PER_QUERY):
+                parent_ids = level[start:start + self.WARM_UP_PARENTS_PER_QUERY]
+                parents_clause = " or ".join(f"'{parent_id}' in parents" for parent_id in parent_ids)
+                query = f"({parents_clause}) and trashed = false"
+
+                for item in self._list_all_pages(
+                    query, 'id,name,mimeType,parents', "預先載入資料夾樹"
+                ):
+                    for parent_id in item.get('parents', []):
+                        if parent_id not in parent_ids:
+                            continue
+                        cache_key = f"{parent_id}/{item['name']}"
+                        if item.get('mimeType') == self.FOLDER_MIME_TYPE:
+                            # 重複的同名資料夾只採用第一個，其餘不展開
+                            if folders.setdefault(cache_key, item['id']) == item['id']:
+                                next_level.append(item['id'])
+                        else:
+                            files.setdefault(cache_key, item['id'])
+                        loaded += 1
+            level = next_level
+
+        with self._cache_lock:
+            self._folder_cache.update(folders)
+            self._file_cache.update(files)
+        self._save_id_cache(flush=True)
+        logger.info(f"已預先載入 Google Drive 資料夾樹: {loaded} 個項目")
+        return loaded
 
     # ========================================
     # 連線測試
@@ -639,7 +1500,13 @@ class GoogleDriveStorageProvider(StorageProvider):
             }
     
     def clear_cache(self):
-        """清除所有快取"""
-        self._folder_cache.clear()
-        self._file_cache.clear()
-        self._base_folder_id = None
+        """清除所有快取（包含磁碟快取）"""
+        with self._cache_lock:
+            self._folder_cache.clear()
+            self._file_cache.clear()
+            self._base_folder_id = None
+        if self._id_cache is not None:
+            with self._id_cache_lock:
+                self._id_cache.clear()
+                self._persisted_ids = self._id_snapshot()
+                self._id_cache_pending = 0
@@ -0,0 +1,253 @@
+"""
+HybridStorageProvider - 本地儲存 + 背景複寫到 Google Drive
+
+讀寫都在本地檔案系統完成（本地磁碟的儲存延遲），寫入與刪除另外記錄到
+磁碟上的 WriteBehindQueue，由背景執行緒複寫到 Google Drive（雲端備份）。
+同一檔案在複寫前的多次寫入只會上傳最後的內容。
+
+Feature: 002-google-drive-storage
+"""
+
+import logging
+import threading
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Union
+
+from .base import StorageProvider, FileStats
+from .local import LocalStorageProvider
+from .write_behind_queue import WriteBehindQueue, OP_WRITE, OP_DELETE
+
+logger = logging.getLogger(__name__)
+
+
+class HybridStorageProvider(StorageProvider):
+    """
+    本地優先、背景複寫到雲端的儲存提供者
+
+    Args:
+        local: 本地儲存（所有讀寫的來源）
+        cloud: 複寫目標（GoogleDriveStorageProvider）
+        queue: 待複寫佇列
+        replicate_delay: 收到寫入後等待的秒數，合併連續的儲存後再上傳
+    """
+
+    REPLICATE_DELAY = 2.0
+    RETRY_BACKOFF = 5.0      # 複寫失敗後第一次重試的等待秒數，之後加倍
+    MAX_BACKOFF = 300.0
+    CLOSE_TIMEOUT = 5.0      # 關閉時等待剩餘檔案複寫的秒數（未完成的留在佇列中）
+
+    def __init__(
+        self,
+        local: LocalStorageProvider,
+        cloud: StorageProvider,
+        queue: WriteBehindQueue,
+        replicate_delay: float = REPLICATE_DELAY
+    ):
+        self.local = local
+        self.cloud = cloud
+        self.queue = queue
+        self.replicate_delay = replicate_delay
+        # PlanService 以 data_dir 組出計畫的完整路徑
+        self.data_dir = local.data_dir
+
+        self._wake = threading.Event()
+        self._flush_requested = threading.Event()
+        self._stopping = threading.Event()
+        self._drained = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._retry_delay = 0.0
+
+        self.last_replicated_at: Optional[datetime] = None
+        self.last_error: Optional[str] = None
+
+    # ============================================================
+    # 背景複寫
+    # ============================================================
+
+    def start(self) -> None:
+        """啟動背景複寫執行緒；佇列中有上次未完成的檔案時立即開始複寫"""
+        if self._thread is not None:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="drive-write-behind", daemon=True)
+        self._thread.start()
+        if len(self.queue):
+            self._wake.set()
+
+    def close(self) -> None:
+        """停止背景複寫；短暫等待剩餘檔案上傳，未完成的留待下次啟動"""
+        if self._thread is not None:
+            self.flush(self.CLOSE_TIMEOUT)
+            self._stopping.set()
+            self._flush_requested.set()
+            self._wake.set()
+            self._thread.join(self.CLOSE_TIMEOUT)
+            self._thread = None
+        self.cloud.close()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        立即複寫佇列中的檔案並等待完成
+
+        Returns:
+            佇列已清空返回 True；逾時（例如 Drive 無法連線）返回 False
+        """
+        if self._thread is None:
+            return len(self.queue) == 0
+        self._flush_requested.set()
+        self._wake.set()
+        try:
+            with self._drained:
+                return self._drained.wait_for(lambda: len(self.queue) == 0, timeout)
+        finally:
+            self._flush_requested.clear()
+
+    @property
+    def pending_count(self) -> int:
+        """尚未複寫到雲端的檔案數"""
+        return len(self.queue)
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            if self._stopping.is_set():
+                return
+
+            if self._retry_delay:
+                # 上次複寫失敗：退避後重試（只有關閉時提前結束）
+                self._stopping.wait(self._retry_delay)
+            else:
+                # 等待連續的寫入結束後合併上傳，flush 或關閉時立即執行
+                self._flush_requested.wait(self.replicate_delay)
+            if self._stopping.is_set():
+                return
+
+            if self._replicate_pending():
+                self._retry_delay = 0.0
+            else:
+                self._retry_delay = min(max(self._retry_delay * 2, self.RETRY_BACKOFF), self.MAX_BACKOFF)
+            with self._drained:
+                self._drained.notify_all()
+
+            # 複寫期間有新的寫入，或有失敗需要重試
+            if len(self.queue):
+                self._wake.set()
+
+    def _replicate_pending(self) -> bool:
+        """
+        將佇列中的檔案複寫到雲端
+
+        Returns:
+            全部成功返回 True
+        """
+        pending = self.queue.snapshot()
+        if not pending:
+            return True
+
+        contents: Dict[str, str] = {}
+        deletes: List[str] = []
+        errors: Dict[str, Exception] = {}
+        for path, entry in pending.items():
+            if entry["op"] == OP_DELETE:
+                deletes.append(path)
+                continue
+            try:
+                contents[path] = self.local.read_file(path)
+            except FileNotFoundError:
+                # 寫入後又在本地被刪除
+                deletes.append(path)
+            except Exception as e:
+                errors[path] = e
+
+        completed: Dict[str, int] = {}
+        if contents:
+            for path, error in self.cloud.write_many(contents).items():
+                if error is None:
+                    completed[path] = pending[path]["seq"]
+                else:
+                    errors[path] = error
+        for path in deletes:
+            try:
+                self.cloud.delete_file(path)
+                completed[path] = pending[path]["seq"]
+            except Exception as e:
+                errors[path] = e
+
+        self.queue.complete(completed)
+        if completed:
+            self.last_replicated_at = datetime.now(timezone.utc)
+
+        if errors:
+            path, error = next(iter(errors.items()))
+            self.last_error = f"{path}: {error}"
+            logger.warning(f"複寫到 Google Drive 失敗 {len(errors)} 個檔案，稍後重試（{self.last_error}）")
+            return False
+
+        self.last_error = None
+        logger.info(f"已複寫 {len(completed)} 個檔案到 Google Drive")
+        return True
+
+    def _enqueue(self, relative_path: str, op: str) -> None:
+        self.queue.enqueue(relative_path, op)
+        self._wake.set()
+
+    def enqueue_external_changes(self, written: List[str], deleted: List[str]) -> None:
+        """
+        本地檔案由 provider 以外的途徑修改後（如資料匯入），將變更排入複寫佇列
+
+        Args:
+            written: 新增或內容改變的檔案
+            deleted: 已刪除的檔案
+        """
+        operations = {relative_path: OP_WRITE for relative_path in written}
+        operations.update((relative_path, OP_DELETE) for relative_path in deleted)
+        if operations:
+            self.queue.enqueue_many(operations)
+            self._wake.set()
+
+    # ============================================================
+    # StorageProvider 介面：讀取由本地提供，寫入後排入複寫佇列
+    # ============================================================
+
+    def read_file(self, relative_path: str) -> str:
+        return self.local.read_file(relative_path)
+
+    def read_file_with_stats(self, relative_path: str) -> tuple[str, FileStats]:
+        return self.local.read_file_with_stats(relative_path)
+
+    def read_many(self, relative_paths: list[str]) -> dict[str, Union[str, Exception]]:
+        return self.local.read_many(relative_paths)
+
+    def write_file(self, relative_path: str, content: str) -> None:
+        self.local.write_file(relative_path, content)
+        self._enqueue(relative_path, OP_WRITE)
+
+    def write_many(self, files: dict[str, str]) -> dict[str, Optional[Exception]]:
+        results = self.local.write_many(files)
+        for relative_path, error in results.items():
+            if error is None:
+                self._enqueue(relative_path, OP_WRITE)
+        return results
+
+    def delete_file(self, relative_path: str) -> bool:
+        deleted = self.local.delete_file(relative_path)
+        # 本地不存在時雲端仍可能有舊的複本
+        self._enqueue(relative_path, OP_DELETE)
+        return deleted
+
+    def file_exists(self, relative_path: str) -> bool:
+        return self.local.file_exists(relative_path)
+
+    def ensure_directory(self, relative_path: str) -> None:
+        # 雲端的資料夾在複寫檔案時自動建立
+        self.local.ensure_directory(relative_path)
+
+    def get_file_stats(self, relative_path: str) -> FileStats:
+        return self.local.get_file_stats(relative_path)
+
+    def list_files(self, relative_path: str = "") -> list[str]:
+        return self.local.list_files(relative_path)
+
+    def list_files_with_stats(self, relative_path: str = "") -> dict[str, FileStats]:
+        return self.local.list_files_with_stats(relative_path)
@@ -0,0 +1,207 @@
+"""
+data/settings 下的 JSON 狀態檔案
+
+Drive ID 快取、同步比較紀錄、待複寫佇列、本地 MD5 快取與同步基準索引
+都以帶版本號的 JSON 檔案保存在 data/settings/，此模組提供共用的讀寫：
+
+- read_versioned_json / write_json_atomic：整個檔案的讀取與原子寫入
+  （先寫入同目錄下唯一名稱的暫存檔再 os.replace，中途失敗不會留下半個檔案，
+  同時寫入的執行緒也不會互相覆蓋暫存檔）
+- KeyedJsonStore：{"version": N, "entries": {key: value}} 格式，
+  多個帳號 + base_path 的資料存在同一個檔案；
+  也用於以其他欄位名稱保存項目的檔案（如 "files"）
+- AccountScoped：以 "<帳號>|<base_path>" 為 key 的狀態物件共用的建立方式
+"""
+
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+SETTINGS_DIR = Path(__file__).parent.parent.parent / "data" / "settings"
+
+
+def write_text_atomic(path: Path, text: str) -> None:
+    """以暫存檔 + os.replace 寫入文字檔
+
+    暫存檔建立在同一目錄且名稱唯一，同時寫入同一個檔案時不會互相覆蓋暫存檔；
+    目標檔案已存在時沿用其權限。
+
+    Raises:
+        OSError: 寫入失敗
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_file = tempfile.NamedTemporaryFile(
+        'w', encoding='utf-8', dir=path.parent, prefix=f".{path.name}.", suffix='.tmp', delete=False
+    )
+    temp_path = Path(temp_file.name)
+    try:
+        with temp_file:
+            temp_file.write(text)
+        if path.exists():
+            shutil.copymode(path, temp_path)
+        os.replace(temp_path, path)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+
+
+def write_json_atomic(path: Path, data: Dict[str, Any]) -> None:
+    """以暫存檔 + os.replace 寫入 JSON
+
+    Raises:
+        OSError: 寫入失敗
+    """
+    write_text_atomic(path, json.dumps(data, ensure_ascii=False))
+
+
+def read_versioned_json(path: Path, version: int, description: str) -> Optional[Dict[str, Any]]:
+    """讀取帶 "version" 欄位的 JSON 檔案
+
+    Args:
+        description: 用於警告訊息的名稱（如「同步紀錄」）
+
+    Returns:
+        檔案內容；檔案不存在、無法解析或版本不同時返回 None
+    """
+    try:
+        data = json.loads(path.read_text(encoding='utf-8'))
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning(f"讀取{description}失敗，將重新建立: {e}")
+        return None
+    if not isinstance(data, dict) or data.get("version") != version:
+        return None
+    return data
+
+
+class KeyedJsonStore:
+    """{"version": N, "entries": {key: value}} 格式的 JSON 檔案
+
+    每次操作都讀取最新的檔案內容，只修改自己的 key，
+    同一程序內對同一個檔案的讀寫以同一把鎖序列化。
+    檔案中 "version" 與項目欄位以外的欄位會原樣保留。
+    """
+
+    _locks: Dict[Path, threading.Lock] = {}
+    _locks_guard = threading.Lock()
+
+    def __init__(self, path: Path, version: int, description: str, field: str = "entries"):
+        self.path = Path(path)
+        self.version = version
+        self.description = description
+        self.field = field
+        with self._locks_guard:
+            self._lock = self._locks.setdefault(self.path.resolve(), threading.Lock())
+
+    def _read(self) -> Dict[str, Any]:
+        data = read_versioned_json(self.path, self.version, self.description) or {}
+        data["version"] = self.version
+        if not isinstance(data.get(self.field), dict):
+            data[self.field] = {}
+        return data
+
+    def _read_entries(self) -> Dict[str, Any]:
+        return self._read()[self.field]
+
+    def get(self, key: str) -> Optional[Any]:
+        """讀取 key 的內容；不存在時返回 None"""
+        with self._lock:
+            return self._read_entries().get(key)
+
+    def get_all(self) -> Dict[str, Any]:
+        """讀取所有項目"""
+        with self._lock:
+            return self._read_entries()
+
+    def update_entries(
+        self, func: Callable[[Dict[str, Any]], None], extra: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """在鎖內以 func 直接修改最新的所有項目，有變更時才寫回
+
+        供一次修改多個 key 的操作使用，其他寫入者在期間新增的 key 會保留。
+
+        Args:
+            func: 接收項目 dict 並就地修改
+            extra: 寫入時一併設定的其他頂層欄位
+
+        Returns:
+            修改後的所有項目
+
+        Raises:
+            OSError: 寫入失敗
+        """
+        with self._lock:
+            data = self._read()
+            entries = data[self.field]
+            before = dict(entries)
+            func(entries)
+            if entries != before:
+                data.update(extra or {})
+                write_json_atomic(self.path, data)
+            return dict(entries)
+
+    def update(self, key: str, func: Callable[[Optional[Any]], Optional[Any]]) -> None:
+        """以 func(目前內容) 的結果取代 key 的內容，結果為 None 時移除
+
+        Raises:
+            OSError: 寫入失敗
+        """
+        with self._lock:
+            data = self._read()
+            entries = data[self.field]
+            current = entries.get(key)
+            value = func(current)
+            if value is None:
+                if current is None:
+                    return
+                del entries[key]
+            else:
+                entries[key] = value
+            write_json_atomic(self.path, data)
+
+    def set(self, key: str, value: Optional[Any]) -> None:
+        """寫入 key 的內容（None 表示移除）
+
+        Raises:
+            OSError: 寫入失敗
+        """
+        self.update(key, lambda current: value)
+
+    def remove(self, key: str) -> None:
+        """移除 key
+
+        Raises:
+            OSError: 寫入失敗
+        """
+        self.set(key, None)
+
+
+class AccountScoped:
+    """以 Google 帳號 + base_path 區分的狀態物件"""
+
+    account: str
+    base_path: str
+
+    @classmethod
+    def for_auth_service(cls, auth_service: Any, base_path: str, *args, **kwargs):
+        """以已登入的 Google 帳號建立
+
+        Returns:
+            實例；尚未登入時返回 None
+        """
+        token = auth_service.load_token()
+        if token is None:
+            return None
+        return cls(token.user_email, base_path, *args, **kwargs)
+
+    @property
+    def key(self) -> str:
+        return f"{self.account}|{self.base_path}"
@@ -14,6 +14,7 @@ from pathlib import Path
 from typing import Optional
 
 from .base import StorageProvider, FileStats
+from .json_store import write_text_atomic
 
 
 class LocalStorageProvider(StorageProvider):
@@ -80,20 +81,56 @@ class LocalStorageProvider(StorageProvider):
         file_path = self._resolve_path(relative_path)
         
         try:
-            if not file_path.exists():
-                raise FileNotFoundError(f"檔案不存在: {relative_path}")
             return file_path.read_text(encoding='utf-8')
         except FileNotFoundError:
-            raise
+            raise FileNotFoundError(f"檔案不存在: {relative_path}")
         except Exception as e:
             raise IOError(f"讀取檔案失敗 {relative_path}: {str(e)}")
     
+    def read_file_with_stats(self, relative_path: str) -> tuple[str, FileStats]:
+        """
+        讀取檔案內容並同時取得統計資訊
+        
+        以單一 open 取得檔案描述子，再以 fstat 取得統計資訊，
+        內容與統計資訊來自同一個檔案實體。
+        
+        Args:
+            relative_path: 相對於資料根目錄的檔案路徑
+            
+        Returns:
+            (檔案內容字串, FileStats)
+            
+        Raises:
+            FileNotFoundError: 檔案不存在時
+            IOError: 讀取檔案失敗時
+        """
+        file_path = self._resolve_path(relative_path)
+        
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                stat = os.fstat(f.fileno())
+                content = f.read()
+        except FileNotFoundError:
+            raise FileNotFoundError(f"檔案不存在: {relative_path}")
+        except Exception as e:
+            raise IOError(f"讀取檔案失敗 {relative_path}: {str(e)}")
+        
+        return content, FileStats(
+            exists=True,
+            size=stat.st_size,
+            created_at=datetime.fromtimestamp(stat.st_ctime),
+            modified_at=datetime.fromtimestamp(stat.st_mtime),
+            modified_ns=stat.st_mtime_ns
+        )
+    
     def write_file(self, relative_path: str, content: str) -> None:
         """
         寫入檔案內容
         
         若檔案不存在則建立，若已存在則覆蓋。
         若父目錄不存在會自動建立。
+        以暫存檔 + rename 寫入新檔案，不改寫原檔案的內容：匯入後未變動的
+        檔案與 .data_backup_* 備份共用硬連結，原地寫入會一併改掉備份。
         
         Args:
             relative_path: 相對於資料根目錄的檔案路徑
@@ -105,9 +142,26 @@ class LocalStorageProvider(StorageProvider):
         file_path = self._resolve_path(relative_path)
         
         try:
-            # 確保父目錄存在
+            write_text_atomic(file_path, content)
+        except Exception as e:
+            raise IOError(f"寫入檔案失敗 {relative_path}: {str(e)}")
+    
+    def create_file(self, relative_path: str, content: str) -> None:
+        """
+        建立新檔案（以獨占模式開啟，檔案已存在時不覆寫）
+        
+        Raises:
+            FileExistsError: 檔案已存在
+            IOError: 寫入檔案失敗時
+        """
+        file_path = self._resolve_path(relative_path)
+        
+        try:
             file_path.parent.mkdir(parents=True, exist_ok=True)
-            file_path.write_text(content, encoding='utf-8')
+            with open(file_path, 'x', encoding='utf-8') as f:
+                f.write(content)
+        except FileExistsError:
+            raise
         except Exception as e:
             raise IOError(f"寫入檔案失敗 {relative_path}: {str(e)}")
     
@@ -187,7 +241,8 @@ class LocalStorageProvider(StorageProvider):
                 exists=True,
                 size=stat.st_size,
                 created_at=datetime.fromtimestamp(stat.st_ctime),
-                modified_at=datetime.fromtimestamp(stat.st_mtime)
+                modified_at=datetime.fromtimestamp(stat.st_mtime),
+                modified_ns=stat.st_mtime_ns
             )
         except Exception:
             return FileStats(exists=False)
@@ -221,3 +276,43 @@ class LocalStorageProvider(StorageProvider):
                 result.append(item.name)
         
         return result
+    
+    def list_files_with_stats(self, relative_path: str = "") -> dict[str, FileStats]:
+        """
+        列出目錄中的檔案及其統計資訊
+        
+        使用 os.scandir 單次列舉目錄，避免逐檔 exists/stat。
+        
+        Args:
+            relative_path: 相對於資料根目錄的目錄路徑，空字串表示根目錄
+            
+        Returns:
+            檔案名稱 -> FileStats 的字典（不含子目錄）
+            
+        Raises:
+            FileNotFoundError: 目錄不存在時
+        """
+        dir_path = self._resolve_path(relative_path) if relative_path else self._data_dir
+        
+        if not dir_path.exists():
+            raise FileNotFoundError(f"目錄不存在: {relative_path}")
+        
+        result = {}
+        with os.scandir(dir_path) as entries:
+            for entry in entries:
+                if not entry.is_file():
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    # 列舉期間被刪除或改名（例如 write_file 的暫存檔）
+                    continue
+                result[entry.name] = FileStats(
+                    exists=True,
+                    size=stat.st_size,
+                    created_at=datetime.fromtimestamp(stat.st_ctime),
+                    modified_at=datetime.fromtimestamp(stat.st_mtime),
+                    modified_ns=stat.st_mtime_ns
+                )
+        
+        return result
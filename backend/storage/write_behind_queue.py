@@ -0,0 +1,96 @@
+"""
+WriteBehindQueue - 待複寫到 Google Drive 的檔案佇列
+
+HybridStorageProvider 寫入本地後，將檔案路徑記錄在此佇列，
+由背景執行緒複寫到 Google Drive。佇列只記錄「哪些檔案待複寫」，
+內容在複寫時才從本地讀取，因此同一檔案的多次寫入自然合併為一次上傳。
+
+佇列存放於 data/settings/write_behind_queue.json，以帳號與 base_path 區分，
+應用程式重新啟動後會繼續複寫尚未完成的檔案。
+"""
+
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from .json_store import SETTINGS_DIR, AccountScoped, KeyedJsonStore
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUEUE_PATH = SETTINGS_DIR / "write_behind_queue.json"
+
+OP_WRITE = "write"
+OP_DELETE = "delete"
+
+
+class WriteBehindQueue(AccountScoped):
+    """單一帳號 + base_path 的待複寫佇列
+
+    每個檔案只保留最後一次操作：
+        {"Day/20250701.md": {"op": "write", "seq": 12, "queued_at": 1720000000.0}, ...}
+    seq 單調遞增，複寫完成時只有 seq 未改變（期間沒有新的寫入）才移除。
+    """
+
+    VERSION = 1
+
+    def __init__(self, account: str, base_path: str, queue_path: Optional[Path] = None):
+        self.account = account
+        self.base_path = base_path
+        self.queue_path = Path(queue_path) if queue_path is not None else DEFAULT_QUEUE_PATH
+        self._store = KeyedJsonStore(self.queue_path, self.VERSION, "待複寫佇列")
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Any]] = dict(self._store.get(self.key) or {})
+        self._seq = max((entry["seq"] for entry in self._entries.values()), default=0)
+
+    def _persist(self) -> None:
+        """將佇列寫入磁碟（呼叫端需持有 self._lock）"""
+        try:
+            self._store.set(self.key, dict(self._entries) or None)
+        except OSError as e:
+            logger.warning(f"寫入待複寫佇列失敗: {e}")
+
+    def enqueue(self, relative_path: str, op: str) -> None:
+        """記錄檔案待複寫（取代該檔案先前尚未複寫的操作）"""
+        with self._lock:
+            self._seq += 1
+            self._entries[relative_path] = {"op": op, "seq": self._seq, "queued_at": time.time()}
+            self._persist()
+
+    def enqueue_many(self, operations: Dict[str, str]) -> None:
+        """一次記錄多個檔案待複寫（檔案路徑 -> 操作），只寫入磁碟一次"""
+        if not operations:
+            return
+        with self._lock:
+            queued_at = time.time()
+            for relative_path, op in operations.items():
+                self._seq += 1
+                self._entries[relative_path] = {"op": op, "seq": self._seq, "queued_at": queued_at}
+            self._persist()
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """取得目前所有待複寫的檔案"""
+        with self._lock:
+            return {path: dict(entry) for path, entry in self._entries.items()}
+
+    def complete(self, completed: Dict[str, int]) -> None:
+        """
+        移除已複寫的檔案
+
+        Args:
+            completed: 檔案路徑 -> 複寫時的 seq；之後又有新寫入的檔案保留在佇列中
+        """
+        with self._lock:
+            removed = False
+            for path, seq in completed.items():
+                entry = self._entries.get(path)
+                if entry is not None and entry["seq"] == seq:
+                    del self._entries[path]
+                    removed = True
+            if removed:
+                self._persist()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
@@ -0,0 +1,96 @@
+"""
+SyncBaseStore - 上次同步內容的基準快照
+
+每次檔案同步完成（或比較時兩端已相同）後，保存該檔案的內容作為
+兩端的共同基準。下次比較時以基準判斷是哪一端有修改，
+兩端都有修改時供三方合併使用。
+
+快照存放於 data/settings/sync_base/<帳號與 base_path 的雜湊>/，
+index.json 記錄每個檔案快照的 MD5，內容存於 files/ 下的相同相對路徑。
+排程同步與手動同步可能同時更新同一個帳號的基準，每次寫入都在
+index.json 的共用鎖內讀取最新索引，只修改自己的檔案後寫回。
+"""
+
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+from .storage.json_store import SETTINGS_DIR, AccountScoped, KeyedJsonStore, write_text_atomic
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ROOT = SETTINGS_DIR / "sync_base"
+
+
+class SyncBaseStore(AccountScoped):
+    """單一帳號 + base_path 的同步基準快照"""
+
+    VERSION = 1
+
+    def __init__(self, account: str, base_path: str, root: Optional[Path] = None):
+        self.account = account
+        self.base_path = base_path
+        key_hash = hashlib.sha1(self.key.encode('utf-8')).hexdigest()[:16]
+        self.directory = (Path(root) if root is not None else DEFAULT_ROOT) / key_hash
+        self._store = KeyedJsonStore(
+            self.directory / "index.json", self.VERSION, "同步基準索引", field="files"
+        )
+        self._lock = threading.Lock()
+        self._index: Dict[str, str] = self._store.get_all()
+
+    def _file_path(self, relative_path: str) -> Path:
+        files_dir = (self.directory / "files").resolve()
+        path = (files_dir / relative_path).resolve()
+        if files_dir not in path.parents:
+            raise ValueError(f"無效的檔案路徑：{relative_path}")
+        return path
+
+    def get_md5(self, relative_path: str) -> Optional[str]:
+        """取得基準內容的 MD5；沒有基準時返回 None"""
+        return self._index.get(relative_path)
+
+    def get(self, relative_path: str) -> Optional[str]:
+        """讀取基準內容；沒有基準時返回 None"""
+        if relative_path not in self._index:
+            return None
+        try:
+            return self._file_path(relative_path).read_text(encoding='utf-8')
+        except (OSError, ValueError) as e:
+            logger.warning(f"讀取同步基準失敗 {relative_path}: {e}")
+            return None
+
+    def put(self, relative_path: str, content: str) -> None:
+        """以內容更新檔案的基準（失敗時只記錄警告）"""
+        md5 = hashlib.md5(content.encode('utf-8')).hexdigest()
+        if self._index.get(relative_path) == md5:
+            return
+
+        def apply(index: Dict[str, Any]) -> None:
+            if index.get(relative_path) != md5:
+                write_text_atomic(self._file_path(relative_path), content)
+                index[relative_path] = md5
+
+        try:
+            with self._lock:
+                self._index = self._store.update_entries(apply, extra={"key": self.key})
+        except (OSError, ValueError) as e:
+            logger.warning(f"寫入同步基準失敗 {relative_path}: {e}")
+
+    def retain(self, relative_paths: Iterable[str]) -> None:
+        """移除不在清單中的檔案基準（兩端皆已刪除的檔案）"""
+        keep = set(relative_paths)
+        if all(path in keep for path in self._index):
+            return
+
+        def apply(index: Dict[str, Any]) -> None:
+            for path in [path for path in self._index if path not in keep and path in index]:
+                del index[path]
+                self._file_path(path).unlink(missing_ok=True)
+
+        try:
+            with self._lock:
+                self._index = self._store.update_entries(apply)
+        except (OSError, ValueError) as e:
+            logger.warning(f"移除同步基準失敗: {e}")
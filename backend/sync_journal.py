@@ -0,0 +1,68 @@
+"""
+SyncJournal - 同步比較紀錄
+
+保存上一次比較時兩端每個計畫檔案的狀態（本地 md5/大小/mtime、
+雲端 ID/md5/modifiedTime）以及 Drive Changes API 的 startPageToken，
+讓下一次比較只需檢查之後有變動的檔案。
+
+紀錄存放於 data/settings/sync_journal.json，以帳號與 base_path 區分。
+"""
+
+import logging
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from .storage.json_store import SETTINGS_DIR, AccountScoped, KeyedJsonStore
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_JOURNAL_PATH = SETTINGS_DIR / "sync_journal.json"
+
+
+class SyncJournal(AccountScoped):
+    """單一帳號 + base_path 的同步比較紀錄
+
+    紀錄格式（load/save 的字典）：
+        {
+            "start_page_token": "<Drive changes token>",
+            "base_folder_id": "<根資料夾 ID>",
+            "folders": {"Day": "<folder_id>", ...},
+            "files": {
+                "Day/20250701.md": {
+                    "local": {"md5": ..., "size": ..., "modified_at": ...} 或 None,
+                    "cloud": {"id": ..., "md5": ..., "modified_at": ...} 或 None,
+                    "diff_stats": {...} 或 None
+                }
+            }
+        }
+    """
+
+    VERSION = 1
+
+    def __init__(self, account: str, base_path: str, journal_path: Optional[Path] = None):
+        self.account = account
+        self.base_path = base_path
+        self.journal_path = Path(journal_path) if journal_path is not None else DEFAULT_JOURNAL_PATH
+        self._store = KeyedJsonStore(self.journal_path, self.VERSION, "同步紀錄")
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """讀取紀錄
+
+        Returns:
+            紀錄字典；尚未建立紀錄時返回 None
+        """
+        return self._store.get(self.key)
+
+    def save(self, state: Dict[str, Any]) -> None:
+        """寫入紀錄（失敗時只記錄警告，下次比較會改為完整比較）"""
+        try:
+            self._store.set(self.key, state)
+        except OSError as e:
+            logger.warning(f"寫入同步紀錄失敗: {e}")
+
+    def clear(self) -> None:
+        """移除紀錄，下次比較為完整比較"""
+        try:
+            self._store.remove(self.key)
+        except OSError as e:
+            logger.warning(f"清除同步紀錄失敗: {e}")
@@ -0,0 +1,216 @@
+"""
+SyncScheduler - 背景排程同步
+
+在應用程式程序內以背景執行緒定期執行增量比較，自動套用安全的同步操作：
+只存在於一端、且從未同步過的檔案（LOCAL_ONLY 上傳、CLOUD_ONLY 下載）。
+列出任一端失敗時整次排程中止；上傳與下載只建立目標端不存在的檔案，
+即使比較結果過期，也不會覆寫另一端的內容。
+兩端內容不同的檔案，以及曾同步過但一端已不存在（可能是刪除）的檔案，
+仍留給使用者在同步面板決定。
+
+計畫寫入後會在寫入停止 debounce 秒後提前執行一次，
+讓本地模式的修改不需等待完整的排程間隔即備份到 Google Drive。
+"""
+
+import logging
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable, List, Optional, Tuple
+
+from backend.models import (
+    FileSyncStatus, SyncAction, SyncOperationRequest, SyncSchedulerStatus
+)
+from backend.sync_service import SyncService
+
+logger = logging.getLogger(__name__)
+
+
+class SyncScheduler:
+    """背景排程同步
+
+    Args:
+        service_factory: 每次執行時建立 SyncService；未連結 Google 帳號時返回 None
+        interval: 排程間隔（秒），0 表示停用
+        debounce: 計畫寫入後等待的秒數，期間再有寫入則重新計時
+        on_synced: 有操作成功後的回呼（例如清除計畫快取）
+    """
+
+    STOP_TIMEOUT = 30.0   # 停止時等待執行中同步完成的秒數
+
+    def __init__(
+        self,
+        service_factory: Callable[[], Optional[SyncService]],
+        interval: float,
+        debounce: float = 30.0,
+        on_synced: Optional[Callable[[], None]] = None
+    ):
+        self.service_factory = service_factory
+        self.interval = interval
+        self.debounce = debounce
+        self.on_synced = on_synced
+
+        self._lock = threading.Lock()
+        self._run_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        # 以 time.monotonic() 表示的下次排程時間與寫入觸發時間
+        self._interval_due: Optional[float] = None
+        self._write_due: Optional[float] = None
+
+        self._status = SyncSchedulerStatus(
+            enabled=self.enabled,
+            running=False,
+            interval_seconds=interval,
+            debounce_seconds=debounce,
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.interval > 0
+
+    # ============================================================
+    # 生命週期
+    # ============================================================
+
+    def start(self) -> None:
+        """啟動背景執行緒（停用或已啟動時不做任何事）"""
+        if not self.enabled or self._thread is not None:
+            return
+        with self._lock:
+            # 啟動後先等待 debounce 秒再執行第一次，避免拖慢應用程式啟動
+            self._interval_due = time.monotonic() + self.debounce
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._loop, name="sync-scheduler", daemon=True)
+        self._thread.start()
+        logger.info(f"背景排程同步已啟動，間隔 {self.interval} 秒")
+
+    def stop(self) -> None:
+        """停止背景執行緒，等待執行中的同步完成"""
+        if self._thread is None:
+            return
+        self._stopping.set()
+        self._wake.set()
+        self._thread.join(self.STOP_TIMEOUT)
+        self._thread = None
+
+    def notify_plan_written(self) -> None:
+        """計畫寫入後呼叫：寫入停止 debounce 秒後執行一次同步"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._write_due = time.monotonic() + self.debounce
+        self._wake.set()
+
+    def _next_due(self) -> float:
+        with self._lock:
+            dues = [due for due in (self._interval_due, self._write_due) if due is not None]
+        return min(dues) if dues else time.monotonic() + self.interval
+
+    def _loop(self) -> None:
+        while not self._stopping.is_set():
+            delay = self._next_due() - time.monotonic()
+            if delay > 0:
+                self._wake.wait(delay)
+                self._wake.clear()
+                continue
+            self.run_once()
+
+    # ============================================================
+    # 執行
+    # ============================================================
+
+    def run_once(self) -> SyncSchedulerStatus:
+        """執行一次增量比較並套用安全的同步操作
+
+        Returns:
+            執行後的排程狀態
+        """
+        with self._run_lock:
+            with self._lock:
+                self._write_due = None
+                self._interval_due = time.monotonic() + self.interval
+                self._status.running = True
+
+            started_at = datetime.now(timezone.utc)
+            started = time.monotonic()
+            uploaded = downloaded = failed = skipped = 0
+            error: Optional[str] = None
+            try:
+                service = self.service_factory()
+                if service is None:
+                    error = "尚未連結 Google 帳號，略過排程同步"
+                else:
+                    operations, skipped = self._safe_operations(service)
+                    if operations:
+                        result = service.execute(operations, create_only=True)
+                        for op_result in result.results:
+                            if not op_result.success:
+                                failed += 1
+                            elif op_result.action == SyncAction.UPLOAD:
+                                uploaded += 1
+                            else:
+                                downloaded += 1
+                        if result.success_count > 0 and self.on_synced is not None:
+                            self.on_synced()
+            except Exception as e:
+                logger.error(f"排程同步失敗: {e}")
+                error = str(e)
+
+            duration = time.monotonic() - started
+            if error is None:
+                logger.info(
+                    f"排程同步完成: 上傳 {uploaded}、下載 {downloaded}、失敗 {failed}、"
+                    f"待處理 {skipped}（{duration:.2f} 秒）"
+                )
+
+            with self._lock:
+                status = self._status
+                status.running = False
+                status.total_runs += 1
+                status.last_run_at = started_at
+                status.last_duration_seconds = duration
+                status.last_uploaded = uploaded
+                status.last_downloaded = downloaded
+                status.last_failed = failed
+                status.last_skipped = skipped
+                status.last_error = error
+                return status.copy()
+
+    @staticmethod
+    def _safe_operations(service: SyncService) -> Tuple[List[SyncOperationRequest], int]:
+        """
+        增量比較並挑出可自動套用的操作
+
+        Returns:
+            (操作清單, 需使用者決定的檔案數)
+        """
+        comparison = service.compare(with_diff_stats=False)
+        base_store = service.base_store
+        operations: List[SyncOperationRequest] = []
+        skipped = 0
+
+        for file_info in comparison.files:
+            if file_info.status == FileSyncStatus.SAME:
+                continue
+            # 曾同步過的檔案只剩一端，表示另一端已刪除，不可自動復原
+            synced_before = base_store is not None and base_store.get_md5(file_info.relative_path) is not None
+            if file_info.status == FileSyncStatus.LOCAL_ONLY and not synced_before:
+                operations.append(SyncOperationRequest(file_path=file_info.relative_path, action=SyncAction.UPLOAD))
+            elif file_info.status == FileSyncStatus.CLOUD_ONLY and not synced_before:
+                operations.append(SyncOperationRequest(file_path=file_info.relative_path, action=SyncAction.DOWNLOAD))
+            else:
+                skipped += 1
+
+        return operations, skipped
+
+    def get_status(self) -> SyncSchedulerStatus:
+        """取得排程狀態（含下次預定執行時間）"""
+        with self._lock:
+            status = self._status.copy()
+        if self._thread is not None and not status.running:
+            remaining = max(0.0, self._next_due() - time.monotonic())
+            status.next_run_at = datetime.now(timezone.utc) + timedelta(seconds=remaining)
+        return status
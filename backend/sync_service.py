@@ -7,13 +7,22 @@ SyncService - 本地與 Google Drive 差異比較與同步服務
 Feature: sync-files (Issue #19)
 """
 
+import difflib
 import hashlib
 import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional, Set, Tuple
 
 from backend.storage.local import LocalStorageProvider
 from backend.storage.google_drive import GoogleDriveStorageProvider
+from backend.sync_journal import SyncJournal
+from backend.local_hash_cache import LocalHashCache
+from backend.sync_base_store import SyncBaseStore
+from backend.three_way_merge import merge_texts
 from backend.models import (
     FileSyncStatus, SyncAction, FileDiffStats, FileSyncInfo,
     SyncComparisonResult, SyncOperationRequest, SyncOperationResult,
@@ -26,6 +35,74 @@ logger = logging.getLogger(__name__)
 PLAN_DIRECTORIES = ["Year", "Month", "Week", "Day"]
 
 
+# 行數差異（difflib）為 CPU 密集計算：檔案數達門檻時交給 process pool，避免佔住 GIL
+DIFF_PROCESS_THRESHOLD = 8
+DIFF_PROCESS_WORKERS = max(1, min(4, os.cpu_count() or 1))
+
+_diff_executor: Optional[ProcessPoolExecutor] = None
+_diff_executor_lock = threading.Lock()
+
+
+def _get_diff_executor() -> ProcessPoolExecutor:
+    """取得共用的行數差異 process pool（首次使用時建立）"""
+    global _diff_executor
+    with _diff_executor_lock:
+        if _diff_executor is None:
+            # 伺服器程序內有多個執行緒，使用 spawn 避免 fork 複製鎖的狀態
+            _diff_executor = ProcessPoolExecutor(
+                max_workers=DIFF_PROCESS_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _diff_executor
+
+
+def _line_diff_counts(local_content: str, cloud_content: str) -> Tuple[int, int, int, int]:
+    """
+    以 difflib 比對兩端內容的行差異
+
+    Returns:
+        (本地行數, 雲端行數, 雲端新增行數, 雲端刪除行數)
+    """
+    local_lines = local_content.splitlines()
+    cloud_lines = cloud_content.splitlines()
+    added = removed = 0
+    matcher = difflib.SequenceMatcher(None, local_lines, cloud_lines, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag in ('replace', 'delete'):
+            removed += i2 - i1
+        if tag in ('replace', 'insert'):
+            added += j2 - j1
+    return len(local_lines), len(cloud_lines), added, removed
+
+
+def _to_diff_stats(counts: Tuple[int, int, int, int]) -> FileDiffStats:
+    local_lines, cloud_lines, added, removed = counts
+    return FileDiffStats(
+        local_lines=local_lines,
+        cloud_lines=cloud_lines,
+        added_lines=added,
+        removed_lines=removed,
+    )
+
+
+def _parse_drive_time(value: Optional[str]) -> Optional[datetime]:
+    """解析 Drive 的 RFC 3339 時間字串"""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+
+
+def _format_time(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value is not None else None
+
+
+def _parse_time(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+
 class SyncService:
     """
     本地與 Google Drive 同步服務
@@ -33,47 +110,68 @@ class SyncService:
     同時持有兩個 StorageProvider，獨立於 PlanService 的單一 Provider 策略。
     """
 
+    # 執行同步的並行設定
+    DEFAULT_WORKERS = 4
+    MAX_WORKERS = 16
+
     def __init__(
         self,
         local_provider: LocalStorageProvider,
-        google_provider: GoogleDriveStorageProvider
+        google_provider: GoogleDriveStorageProvider,
+        journal: Optional[SyncJournal] = None,
+        hash_cache: Optional[LocalHashCache] = None,
+        base_store: Optional[SyncBaseStore] = None
     ):
         self.local = local_provider
         self.cloud = google_provider
+        # 比較紀錄（可選），有紀錄時 compare 使用增量模式
+        self.journal = journal
+        # 本地 MD5 快取（可選），檔案未變動時不重新讀取
+        self.hash_cache = hash_cache
+        self._hash_hits = 0
+        self._hash_misses = 0
+        # 上次同步的內容（可選），用於判斷修改的一端與三方合併
+        self.base_store = base_store
 
     # ============================================================
     # 內部輔助方法
     # ============================================================
 
-    def _compute_local_md5(self, relative_path: str) -> str:
-        """計算本地檔案的 MD5 hash"""
+    def _compute_local_md5(self, relative_path: str) -> Tuple[str, str]:
+        """
+        讀取本地檔案並計算 MD5 hash
+
+        Returns:
+            (MD5, 檔案內容)
+        """
         content = self.local.read_file(relative_path)
-        return hashlib.md5(content.encode('utf-8')).hexdigest()
+        return hashlib.md5(content.encode('utf-8')).hexdigest(), content
 
     def _list_all_local_files(self) -> Dict[str, dict]:
         """
         列出所有計畫目錄中的本地 .md 檔案
 
         Returns:
-            Dict mapping relative_path -> {'modified_at': datetime}
+            Dict mapping relative_path -> {'modified_at': datetime, 'size': int, 'modified_ns': int}
+
+        Raises:
+            Exception: 列出目錄失敗（不當作沒有檔案，避免以不完整的結果比較）
         """
         result = {}
         for directory in PLAN_DIRECTORIES:
             try:
-                files = self.local.list_files(directory)
-                for filename in files:
+                files = self.local.list_files_with_stats(directory)
+                for filename, stats in files.items():
                     if not filename.endswith('.md'):
                         continue
-                    relative_path = f"{directory}/{filename}"
-                    stats = self.local.get_file_stats(relative_path)
-                    result[relative_path] = {
+                    result[f"{directory}/{filename}"] = {
                         'modified_at': stats.modified_at,
+                        'size': stats.size,
+                        'modified_ns': stats.modified_ns,
                     }
             except FileNotFoundError:
                 # 目錄不存在本地，跳過
                 pass
-            except Exception as e:
-                logger.warning(f"列出本地目錄 {directory} 失敗: {e}")
         return result
 
     def _list_all_cloud_files(self) -> Dict[str, dict]:
@@ -81,122 +179,363 @@ class SyncService:
         列出所有計畫目錄中的 Google Drive .md 檔案
 
         Returns:
-            Dict mapping relative_path -> {'md5': str, 'modified_at': datetime}
+            Dict mapping relative_path -> {'id': str, 'md5': str, 'modified_at': datetime}
+
+        Raises:
+            Exception: 列出目錄失敗（不當作雲端沒有檔案，避免以不完整的結果比較）
         """
         result = {}
         for directory in PLAN_DIRECTORIES:
+            for meta in self.cloud.list_files_with_metadata(directory):
+                name = meta.get('name', '')
+                if not name.endswith('.md'):
+                    continue
+                relative_path = f"{directory}/{name}"
+                result[relative_path] = {
+                    'id': meta.get('id'),
+                    'md5': meta.get('md5Checksum'),
+                    'modified_at': _parse_drive_time(meta.get('modifiedTime')),
+                }
+        return result
+
+    def _local_entry(self, relative_path: str, local_info: dict, contents: Dict[str, str]) -> dict:
+        """
+        建立比較紀錄中的本地狀態
+
+        MD5 優先由 hash 快取取得；需要讀取檔案時，內容存入 contents
+        供行數差異計算沿用，不需再讀一次。
+        狀態改變後行數差異需重新計算，由呼叫端將 diff_stats 設為 None。
+        """
+        size, modified_ns = local_info['size'], local_info['modified_ns']
+        local_md5 = None
+        if self.hash_cache is not None:
+            local_md5 = self.hash_cache.get(relative_path, size, modified_ns)
+
+        if local_md5 is not None:
+            self._hash_hits += 1
+        else:
+            self._hash_misses += 1
             try:
-                files_meta = self.cloud.list_files_with_metadata(directory)
-                for meta in files_meta:
-                    name = meta.get('name', '')
-                    if not name.endswith('.md'):
-                        continue
-                    relative_path = f"{directory}/{name}"
-                    modified_at = None
-                    if meta.get('modifiedTime'):
-                        try:
-                            modified_at = datetime.fromisoformat(
-                                meta['modifiedTime'].replace('Z', '+00:00')
-                            )
-                        except Exception:
-                            pass
-                    result[relative_path] = {
-                        'md5': meta.get('md5Checksum'),
-                        'modified_at': modified_at,
-                    }
+                local_md5, contents[relative_path] = self._compute_local_md5(relative_path)
+                if self.hash_cache is not None:
+                    self.hash_cache.put(relative_path, size, modified_ns, local_md5)
             except Exception as e:
-                logger.warning(f"列出雲端目錄 {directory} 失敗: {e}")
-        return result
+                logger.warning(f"計算本地 MD5 失敗 {relative_path}: {e}")
+
+        return {
+            'md5': local_md5,
+            'size': local_info['size'],
+            'modified_at': _format_time(local_info['modified_at']),
+        }
+
+    @staticmethod
+    def _cloud_entry(file_id: Optional[str], md5: Optional[str], modified_at: Optional[datetime]) -> dict:
+        """建立比較紀錄中的雲端狀態"""
+        return {'id': file_id, 'md5': md5, 'modified_at': _format_time(modified_at)}
+
+    @staticmethod
+    def _is_same(entry: dict) -> bool:
+        local_md5 = entry['local']['md5']
+        return bool(local_md5 and local_md5 == entry['cloud']['md5'])
+
+    def _is_different(self, entry: dict) -> bool:
+        return bool(entry['local'] and entry['cloud'] and not self._is_same(entry))
+
+    def _fill_diff_stats(self, entries: Dict[str, dict], contents: Dict[str, str]) -> None:
+        """
+        為尚未計算行數差異的 DIFFERENT 檔案計算差異
+
+        雲端內容以 read_many 批次下載；本地內容優先沿用計算 MD5 時讀取的內容。
+        """
+        paths = [
+            path for path, entry in entries.items()
+            if self._is_different(entry) and entry['diff_stats'] is None
+        ]
+        if not paths:
+            return
+
+        cloud_contents = self.cloud.read_many(paths)
+        missing_local = [path for path in paths if path not in contents]
+        local_contents = {**self.local.read_many(missing_local), **contents}
+
+        pairs = {}
+        for path in paths:
+            local_content, cloud_content = local_contents.get(path), cloud_contents.get(path)
+            if isinstance(local_content, Exception) or isinstance(cloud_content, Exception):
+                error = local_content if isinstance(local_content, Exception) else cloud_content
+                logger.warning(f"計算行數差異失敗 {path}: {error}")
+                continue
+            pairs[path] = (local_content, cloud_content)
+
+        for path, counts in self._run_line_diffs(pairs).items():
+            entries[path]['diff_stats'] = _to_diff_stats(counts).dict()
+
+    @staticmethod
+    def _run_line_diffs(pairs: Dict[str, Tuple[str, str]]) -> Dict[str, Tuple[int, int, int, int]]:
+        """計算多個檔案的行數差異，檔案數達門檻時使用 process pool"""
+        if len(pairs) >= DIFF_PROCESS_THRESHOLD:
+            try:
+                executor = _get_diff_executor()
+                futures = {
+                    path: executor.submit(_line_diff_counts, local_content, cloud_content)
+                    for path, (local_content, cloud_content) in pairs.items()
+                }
+                return {path: future.result() for path, future in futures.items()}
+            except Exception as e:
+                logger.warning(f"行數差異 process pool 失敗，改為在目前程序計算: {e}")
+
+        return {
+            path: _line_diff_counts(local_content, cloud_content)
+            for path, (local_content, cloud_content) in pairs.items()
+        }
 
     # ============================================================
     # 核心操作：比較
     # ============================================================
 
-    def compare(self) -> SyncComparisonResult:
+    def compare(self, full: bool = False, with_diff_stats: bool = True) -> SyncComparisonResult:
         """
         比較本地與 Google Drive 的所有計畫檔案
 
+        有比較紀錄（journal）時使用增量模式：雲端只讀取 Drive Changes API
+        回報的變更，本地只重新計算大小或 mtime 有變動的檔案 MD5。
+        沒有紀錄、紀錄失效或 full=True 時，列出並比較所有檔案並重建紀錄。
+
+        Args:
+            full: 強制完整比較
+            with_diff_stats: 是否計算 DIFFERENT 檔案的行數差異（需下載雲端內容）；
+                             False 時只回傳紀錄中已計算過的差異，
+                             其餘可由 compute_diff_stats 個別取得
+
         Returns:
             SyncComparisonResult 包含所有檔案的同步狀態
+
+        Raises:
+            Exception: 列出本地或雲端檔案失敗（不更新比較紀錄）
         """
-        local_files = self._list_all_local_files()
-        cloud_files = self._list_all_cloud_files()
+        self._hash_hits = 0
+        self._hash_misses = 0
 
-        all_paths = sorted(set(local_files.keys()) | set(cloud_files.keys()))
+        if self.journal is not None and not full:
+            state = self.journal.load()
+            if state and state.get('start_page_token'):
+                try:
+                    return self._compare_incremental(state, with_diff_stats)
+                except Exception as e:
+                    logger.warning(f"增量比較失敗，改為完整比較: {e}")
 
-        file_infos: List[FileSyncInfo] = []
+        return self._compare_full(with_diff_stats)
+
+    def _compare_full(self, with_diff_stats: bool) -> SyncComparisonResult:
+        """
+        列出並比較兩端所有檔案
 
-        for path in all_paths:
+        任一端列出失敗時直接拋出例外，不以不完整的結果建立比較紀錄。
+        """
+        # 變更標記需在列出檔案之前取得，列出期間的變更才會在下次比較時補上
+        start_token = None
+        if self.journal is not None:
+            try:
+                start_token = self.cloud.get_changes_start_token()
+            except Exception as e:
+                logger.warning(f"取得 Drive 變更標記失敗，不建立比較紀錄: {e}")
+
+        local_files = self._list_all_local_files()
+        cloud_files = self._list_all_cloud_files()
+
+        entries: Dict[str, dict] = {}
+        contents: Dict[str, str] = {}
+        for path in sorted(set(local_files.keys()) | set(cloud_files.keys())):
             local_info = local_files.get(path)
             cloud_info = cloud_files.get(path)
+            entry = {
+                'local': self._local_entry(path, local_info, contents) if local_info else None,
+                'cloud': self._cloud_entry(
+                    cloud_info['id'], cloud_info['md5'], cloud_info['modified_at']
+                ) if cloud_info else None,
+                'diff_stats': None,
+            }
+            entries[path] = entry
+
+        if with_diff_stats:
+            self._fill_diff_stats(entries, contents)
+        self._update_bases(entries, contents)
+
+        if start_token is not None:
+            try:
+                self.journal.save({
+                    'start_page_token': start_token,
+                    'base_folder_id': self.cloud.get_folder_id(""),
+                    'folders': {d: self.cloud.get_folder_id(d) for d in PLAN_DIRECTORIES},
+                    'files': entries,
+                })
+            except Exception as e:
+                logger.warning(f"建立同步比較紀錄失敗: {e}")
 
-            if local_info and not cloud_info:
-                # 僅本地存在
-                try:
-                    local_md5 = self._compute_local_md5(path)
-                except Exception as e:
-                    logger.warning(f"計算 MD5 失敗 {path}: {e}")
-                    local_md5 = None
-
-                file_infos.append(FileSyncInfo(
-                    relative_path=path,
-                    status=FileSyncStatus.LOCAL_ONLY,
-                    local_modified_at=local_info['modified_at'],
-                    local_md5=local_md5,
-                    cloud_modified_at=None,
-                    cloud_md5=None,
-                    diff_stats=None,
-                    suggested_action=SyncAction.UPLOAD,
-                ))
-
-            elif not local_info and cloud_info:
-                # 僅雲端存在
-                file_infos.append(FileSyncInfo(
-                    relative_path=path,
-                    status=FileSyncStatus.CLOUD_ONLY,
-                    local_modified_at=None,
-                    local_md5=None,
-                    cloud_modified_at=cloud_info['modified_at'],
-                    cloud_md5=cloud_info['md5'],
-                    diff_stats=None,
-                    suggested_action=SyncAction.DOWNLOAD,
-                ))
+        return self._build_result(entries, incremental=False)
+
+    def _compare_incremental(self, state: dict, with_diff_stats: bool) -> SyncComparisonResult:
+        """依比較紀錄只檢查有變動的檔案"""
+        entries: Dict[str, dict] = state['files']
+        folders: Dict[str, str] = state['folders']
 
+        contents: Dict[str, str] = {}
+        changes, next_token = self.cloud.list_changes(state['start_page_token'])
+        changed = self._apply_cloud_changes(changes, entries, folders)
+        changed |= self._apply_local_changes(entries, contents)
+
+        for path in changed:
+            entry = entries[path]
+            if entry['local'] is None and entry['cloud'] is None:
+                del entries[path]
             else:
-                # 兩邊都存在，比較 MD5
-                try:
-                    local_md5 = self._compute_local_md5(path)
-                except Exception as e:
-                    logger.warning(f"計算本地 MD5 失敗 {path}: {e}")
-                    local_md5 = None
-
-                cloud_md5 = cloud_info['md5']
-
-                if local_md5 and cloud_md5 and local_md5 == cloud_md5:
-                    # SAME
-                    file_infos.append(FileSyncInfo(
-                        relative_path=path,
-                        status=FileSyncStatus.SAME,
-                        local_modified_at=local_info['modified_at'],
-                        local_md5=local_md5,
-                        cloud_modified_at=cloud_info['modified_at'],
-                        cloud_md5=cloud_md5,
-                        diff_stats=None,
-                        suggested_action=SyncAction.SKIP,
-                    ))
-                else:
-                    # DIFFERENT - 計算行數差異
-                    diff_stats = self._compute_diff_stats(path)
-                    file_infos.append(FileSyncInfo(
-                        relative_path=path,
-                        status=FileSyncStatus.DIFFERENT,
-                        local_modified_at=local_info['modified_at'],
-                        local_md5=local_md5,
-                        cloud_modified_at=cloud_info['modified_at'],
-                        cloud_md5=cloud_md5,
-                        diff_stats=diff_stats,
-                        suggested_action=SyncAction.SKIP,
-                    ))
+                entry['diff_stats'] = None
+
+        if with_diff_stats:
+            self._fill_diff_stats(entries, contents)
+        self._update_bases(entries, contents)
+
+        self.journal.save({**state, 'start_page_token': next_token, 'files': entries})
+        logger.info(f"增量比較完成: {len(changes)} 筆雲端變更，{len(changed)} 個檔案需重新比較")
+
+        return self._build_result(entries, incremental=True)
+
+    def _apply_cloud_changes(
+        self,
+        changes: List[dict],
+        entries: Dict[str, dict],
+        folders: Dict[str, str]
+    ) -> Set[str]:
+        """
+        將 Drive 變更套用到比較紀錄
+
+        Returns:
+            雲端狀態有變動的檔案路徑
+
+        Raises:
+            RuntimeError: 計畫目錄本身被移動或刪除（需完整比較）
+        """
+        directory_by_folder = {folder_id: directory for directory, folder_id in folders.items()}
+        path_by_id = {
+            entry['cloud']['id']: path
+            for path, entry in entries.items()
+            if entry['cloud'] and entry['cloud']['id']
+        }
+        changed: Set[str] = set()
+
+        for change in changes:
+            file_id = change.get('fileId')
+            file_info = change.get('file') or {}
+            removed = change.get('removed') or file_info.get('trashed', False)
+
+            if file_info.get('mimeType') == GoogleDriveStorageProvider.FOLDER_MIME_TYPE:
+                directory = directory_by_folder.get(file_id)
+                if directory is not None and (removed or file_info.get('name') != directory):
+                    raise RuntimeError(f"計畫目錄 {directory} 已被移動或刪除")
+                continue
+
+            # 檔案被刪除、移動或改名：先移除原路徑的雲端狀態
+            old_path = path_by_id.pop(file_id, None)
+            if old_path is not None:
+                entries[old_path]['cloud'] = None
+                changed.add(old_path)
+            if removed:
+                continue
+
+            name = file_info.get('name', '')
+            directory = next(
+                (directory_by_folder[parent] for parent in file_info.get('parents', [])
+                 if parent in directory_by_folder),
+                None
+            )
+            if directory is None or not name.endswith('.md'):
+                continue
+
+            path = f"{directory}/{name}"
+            entry = entries.setdefault(path, {'local': None, 'cloud': None, 'diff_stats': None})
+            entry['cloud'] = self._cloud_entry(
+                file_id, file_info.get('md5Checksum'), _parse_drive_time(file_info.get('modifiedTime'))
+            )
+            path_by_id[file_id] = path
+            changed.add(path)
+
+        return changed
+
+    def _apply_local_changes(self, entries: Dict[str, dict], contents: Dict[str, str]) -> Set[str]:
+        """
+        以大小與 mtime 找出本地有變動的檔案，只重新計算這些檔案的 MD5
+
+        Returns:
+            本地狀態有變動的檔案路徑
+        """
+        local_files = self._list_all_local_files()
+        changed: Set[str] = set()
+
+        for path, entry in entries.items():
+            if entry['local'] is not None and path not in local_files:
+                entry['local'] = None
+                changed.add(path)
+
+        for path, local_info in local_files.items():
+            entry = entries.setdefault(path, {'local': None, 'cloud': None, 'diff_stats': None})
+            local = entry['local']
+            if (
+                local is not None
+                and local['size'] == local_info['size']
+                and local['modified_at'] == _format_time(local_info['modified_at'])
+            ):
+                continue
+            entry['local'] = self._local_entry(path, local_info, contents)
+            changed.add(path)
+
+        return changed
+
+    def _update_bases(self, entries: Dict[str, dict], contents: Dict[str, str]) -> None:
+        """
+        兩端內容相同的檔案即為新的共同基準；兩端皆已刪除的檔案移除基準
+
+        只有基準的 MD5 與目前內容不同時才讀取本地檔案。
+        """
+        if self.base_store is None:
+            return
+        self.base_store.retain(entries.keys())
+        for path, entry in entries.items():
+            if not (entry['local'] and entry['cloud'] and self._is_same(entry)):
+                continue
+            if self.base_store.get_md5(path) == entry['local']['md5']:
+                continue
+            try:
+                content = contents.get(path)
+                if content is None:
+                    content = self.local.read_file(path)
+                self.base_store.put(path, content)
+            except Exception as e:
+                logger.warning(f"更新同步基準失敗 {path}: {e}")
+
+    def _suggest_for_different(self, relative_path: str, entry: dict) -> SyncAction:
+        """
+        依上次同步的基準判斷 DIFFERENT 檔案的建議操作
+
+        只有一端與基準不同時，該端即為修改的一端；兩端都與基準不同時建議合併；
+        沒有基準時由使用者決定方向。
+        """
+        base_md5 = self.base_store.get_md5(relative_path) if self.base_store is not None else None
+        if base_md5 is None:
+            return SyncAction.SKIP
+        if entry['local']['md5'] == base_md5:
+            return SyncAction.DOWNLOAD
+        if entry['cloud']['md5'] == base_md5:
+            return SyncAction.UPLOAD
+        return SyncAction.MERGE
+
+    def _build_result(self, entries: Dict[str, dict], incremental: bool) -> SyncComparisonResult:
+        """由比較紀錄建立比較結果（並保存本地 MD5 快取）"""
+        if self.hash_cache is not None:
+            self.hash_cache.retain(path for path, entry in entries.items() if entry['local'])
+            self.hash_cache.save()
+
+        file_infos = [self._to_file_info(path, entries[path]) for path in sorted(entries)]
+        hash_lookups = self._hash_hits + self._hash_misses
 
         return SyncComparisonResult(
             files=file_infos,
@@ -205,67 +544,210 @@ class SyncService:
             total_same=sum(1 for f in file_infos if f.status == FileSyncStatus.SAME),
             total_different=sum(1 for f in file_infos if f.status == FileSyncStatus.DIFFERENT),
             compared_at=datetime.now(timezone.utc),
+            incremental=incremental,
+            hash_cache_hits=self._hash_hits,
+            hash_cache_misses=self._hash_misses,
+            hash_cache_hit_rate=self._hash_hits / hash_lookups if hash_lookups else 0.0,
         )
 
-    def _compute_diff_stats(self, relative_path: str) -> Optional[FileDiffStats]:
-        """計算兩端檔案的行數差異（僅在 DIFFERENT 狀態使用）"""
-        try:
-            local_content = self.local.read_file(relative_path)
-            cloud_content = self.cloud.read_file(relative_path)
-            local_lines = len(local_content.splitlines())
-            cloud_lines = len(cloud_content.splitlines())
-            return FileDiffStats(
-                local_lines=local_lines,
-                cloud_lines=cloud_lines,
-                added_lines=max(0, cloud_lines - local_lines),
-                removed_lines=max(0, local_lines - cloud_lines),
-            )
-        except Exception as e:
-            logger.warning(f"計算行數差異失敗 {relative_path}: {e}")
-            return None
+    def _to_file_info(self, relative_path: str, entry: dict) -> FileSyncInfo:
+        """由單一檔案的比較紀錄判斷同步狀態與建議操作"""
+        local, cloud = entry['local'], entry['cloud']
+
+        if local and not cloud:
+            # 僅本地存在
+            status, action = FileSyncStatus.LOCAL_ONLY, SyncAction.UPLOAD
+        elif cloud and not local:
+            # 僅雲端存在
+            status, action = FileSyncStatus.CLOUD_ONLY, SyncAction.DOWNLOAD
+        elif self._is_same(entry):
+            status, action = FileSyncStatus.SAME, SyncAction.SKIP
+        else:
+            status = FileSyncStatus.DIFFERENT
+            action = self._suggest_for_different(relative_path, entry)
+
+        return FileSyncInfo(
+            relative_path=relative_path,
+            status=status,
+            local_modified_at=_parse_time(local['modified_at']) if local else None,
+            local_md5=local['md5'] if local else None,
+            cloud_modified_at=_parse_time(cloud['modified_at']) if cloud else None,
+            cloud_md5=cloud['md5'] if cloud else None,
+            diff_stats=FileDiffStats(**entry['diff_stats']) if entry['diff_stats'] else None,
+            suggested_action=action,
+        )
+
+    def compute_diff_stats(self, relative_path: str) -> FileDiffStats:
+        """
+        計算單一檔案兩端的行數差異（不存在的一端視為空檔案）
+
+        Raises:
+            FileNotFoundError: 兩端皆不存在
+        """
+        contents = []
+        for provider in (self.local, self.cloud):
+            try:
+                contents.append(provider.read_file(relative_path))
+            except FileNotFoundError:
+                contents.append(None)
+
+        if contents[0] is None and contents[1] is None:
+            raise FileNotFoundError(f"本地與 Google Drive 皆找不到檔案：{relative_path}")
+
+        return _to_diff_stats(_line_diff_counts(contents[0] or "", contents[1] or ""))
 
     # ============================================================
     # 核心操作：執行同步
     # ============================================================
 
-    def execute(self, operations: List[SyncOperationRequest]) -> SyncExecuteResult:
+    def _merge_file(self, relative_path: str) -> int:
+        """
+        以上次同步的基準三方合併兩端內容，結果寫入兩端並成為新的基準
+
+        重疊的修改以衝突標記寫入，使用者在任一端整理後，
+        下次比較會因只有該端與基準不同而建議單向同步。
+
+        Returns:
+            衝突區塊數
+
+        Raises:
+            ValueError: 沒有上次同步的基準
+        """
+        base = self.base_store.get(relative_path) if self.base_store is not None else None
+        if base is None:
+            raise ValueError(f"沒有上次同步的基準內容，無法自動合併：{relative_path}")
+
+        local_content = self.local.read_file(relative_path)
+        cloud_content = self.cloud.read_file(relative_path)
+        result = merge_texts(base, local_content, cloud_content)
+
+        if result.content != cloud_content:
+            self.cloud.write_file(relative_path, result.content)
+        if result.content != local_content:
+            self.local.write_file(relative_path, result.content)
+        self.base_store.put(relative_path, result.content)
+        return result.conflicts
+
+    def _transfer(self, op: SyncOperationRequest, create_only: bool = False) -> int:
+        """
+        執行單一操作的讀寫，返回合併衝突區塊數
+
+        create_only 為 True 時上傳/下載只建立目標端不存在的檔案
+        （目標端已有檔案時拋出 FileExistsError，不覆寫）。
+        """
+        if op.action == SyncAction.MERGE:
+            return self._merge_file(op.file_path)
+
+        if op.action == SyncAction.UPLOAD:
+            source, target = self.local, self.cloud
+        else:
+            source, target = self.cloud, self.local
+        content = source.read_file(op.file_path)
+        if create_only:
+            target.create_file(op.file_path, content)
+        else:
+            target.write_file(op.file_path, content)
+        if self.base_store is not None:
+            self.base_store.put(op.file_path, content)
+        return 0
+
+    def _run_operation(self, op: SyncOperationRequest, create_only: bool = False) -> SyncOperationResult:
+        """
+        執行單一同步操作
+
+        速率限制由 GoogleDriveStorageProvider 的共用 token bucket 與退避重試處理；
+        仍拋出 QuotaExceededError 時（重試用盡或每日配額用盡）此處不再重試，
+        直接記錄為失敗。
+        """
+        try:
+            conflicts = self._transfer(op, create_only)
+        except Exception as e:
+            logger.error(f"同步操作失敗 {op.action} {op.file_path}: {e}")
+            return SyncOperationResult(
+                file_path=op.file_path,
+                action=op.action,
+                success=False,
+                error_message=str(e),
+            )
+        return SyncOperationResult(
+            file_path=op.file_path,
+            action=op.action,
+            success=True,
+            error_message=None,
+            merge_conflicts=conflicts,
+        )
+
+    def _iter_execute_indexed(
+        self,
+        operations: List[SyncOperationRequest],
+        max_workers: Optional[int] = None,
+        create_only: bool = False
+    ) -> Iterator[Tuple[int, SyncOperationResult]]:
+        """並行執行同步操作，依完成順序產生 (操作索引, 結果)"""
+        # skip 不應出現在 operations 中（Validator 已阻擋，此為防禦性程式碼）
+        indexed = [
+            (index, op) for index, op in enumerate(operations)
+            if op.action in (SyncAction.UPLOAD, SyncAction.DOWNLOAD, SyncAction.MERGE)
+        ]
+        if not indexed:
+            return
+
+        # 以批次請求一次解析所有雲端檔案 ID，之後每個 worker 不需各自搜尋
+        try:
+            self.cloud.prefetch([op.file_path for _, op in indexed])
+        except Exception as e:
+            logger.warning(f"預先解析雲端檔案失敗: {e}")
+
+        workers = max(1, min(max_workers or self.DEFAULT_WORKERS, self.MAX_WORKERS, len(indexed)))
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="sync-execute")
+        try:
+            futures = {
+                executor.submit(self._run_operation, op, create_only): index
+                for index, op in indexed
+            }
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+        finally:
+            # 呼叫端提前停止（例如串流連線中斷）時，取消尚未開始的操作
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def iter_execute(
+        self,
+        operations: List[SyncOperationRequest],
+        max_workers: Optional[int] = None
+    ) -> Iterator[SyncOperationResult]:
+        """
+        並行執行同步操作，每完成一筆即產生其結果（供串流進度使用）
+
+        Args:
+            operations: 操作清單（upload/download/merge，不含 skip）
+            max_workers: 並行數，None 時使用 DEFAULT_WORKERS（上限 MAX_WORKERS）
+        """
+        for _, result in self._iter_execute_indexed(operations, max_workers):
+            yield result
+
+    def execute(
+        self,
+        operations: List[SyncOperationRequest],
+        max_workers: Optional[int] = None,
+        create_only: bool = False
+    ) -> SyncExecuteResult:
         """
         執行批次同步操作
 
+        以有上限的執行緒池並行執行，結果依 operations 的順序回傳。
+
         Args:
-            operations: 操作清單（只包含 upload/download，不含 skip）
+            operations: 操作清單（upload/download/merge，不含 skip）
+            max_workers: 並行數，None 時使用 DEFAULT_WORKERS（上限 MAX_WORKERS）
+            create_only: 上傳/下載只建立目標端不存在的檔案，已存在時該操作失敗
+                         （背景排程同步使用，不會覆寫另一端較新的內容）
 
         Returns:
             SyncExecuteResult 包含每個操作的執行結果
         """
-        results: List[SyncOperationResult] = []
-
-        for op in operations:
-            try:
-                if op.action == SyncAction.UPLOAD:
-                    content = self.local.read_file(op.file_path)
-                    self.cloud.write_file(op.file_path, content)
-                elif op.action == SyncAction.DOWNLOAD:
-                    content = self.cloud.read_file(op.file_path)
-                    self.local.write_file(op.file_path, content)
-                else:
-                    # skip 不應出現在 operations 中（Validator 已阻擋，此為防禦性程式碼）
-                    continue
-
-                results.append(SyncOperationResult(
-                    file_path=op.file_path,
-                    action=op.action,
-                    success=True,
-                    error_message=None,
-                ))
-            except Exception as e:
-                logger.error(f"同步操作失敗 {op.action} {op.file_path}: {e}")
-                results.append(SyncOperationResult(
-                    file_path=op.file_path,
-                    action=op.action,
-                    success=False,
-                    error_message=str(e),
-                ))
+        completed = dict(self._iter_execute_indexed(operations, max_workers, create_only))
+        results = [completed[index] for index in sorted(completed)]
 
         return SyncExecuteResult(
             total=len(results),
@@ -274,3 +756,4 @@ class SyncService:
             results=results,
             executed_at=datetime.now(timezone.utc),
         )
+
@@ -0,0 +1,116 @@
+"""
+三方合併（three-way merge）
+
+以上次同步時的內容為共同基準，將本地與雲端各自的修改以行為單位合併。
+兩端修改的區塊不重疊時自動合併；重疊且內容不同時輸出衝突標記。
+"""
+
+import difflib
+from dataclasses import dataclass
+from typing import List, Tuple
+
+CONFLICT_START = "<<<<<<< 本地"
+CONFLICT_SEPARATOR = "======="
+CONFLICT_END = ">>>>>>> Google Drive"
+
+# (基準起始行, 基準結束行, 取代內容, 來源) - 來源 0 為本地，1 為雲端
+_Hunk = Tuple[int, int, List[str], int]
+
+
+@dataclass
+class MergeResult:
+    """合併結果"""
+    content: str
+    conflicts: int      # 衝突區塊數，0 表示自動合併成功
+
+
+def _hunks(base: List[str], other: List[str], side: int) -> List[_Hunk]:
+    """取得 other 相對於 base 的修改區塊"""
+    matcher = difflib.SequenceMatcher(None, base, other, autojunk=False)
+    return [
+        (i1, i2, other[j1:j2], side)
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes()
+        if tag != 'equal'
+    ]
+
+
+def _apply(base: List[str], start: int, end: int, hunks: List[_Hunk]) -> List[str]:
+    """將同一來源的修改套用到 base[start:end]"""
+    result: List[str] = []
+    position = start
+    for h_start, h_end, lines, _ in hunks:
+        result.extend(base[position:h_start])
+        result.extend(lines)
+        position = h_end
+    result.extend(base[position:end])
+    return result
+
+
+def _with_newline(lines: List[str]) -> List[str]:
+    """確保區塊最後一行有換行，避免與衝突標記接在同一行"""
+    if lines and not lines[-1].endswith(('\n', '\r')):
+        return lines[:-1] + [lines[-1] + '\n']
+    return lines
+
+
+def merge_texts(base: str, local: str, cloud: str) -> MergeResult:
+    """
+    三方合併本地與雲端內容
+
+    相鄰或重疊的修改視為同一區塊：只有一端修改時採用該端內容，
+    兩端修改相同時採用其一，兩端修改不同時以衝突標記保留雙方內容。
+
+    Args:
+        base: 上次同步時的內容（共同基準）
+        local: 本地目前內容
+        cloud: 雲端目前內容
+
+    Returns:
+        MergeResult
+    """
+    base_lines = base.splitlines(keepends=True)
+    local_lines = local.splitlines(keepends=True)
+    cloud_lines = cloud.splitlines(keepends=True)
+
+    # 同一來源的修改之間必有相同的行，因此只有不同來源的修改會相鄰或重疊
+    hunks = sorted(
+        _hunks(base_lines, local_lines, 0) + _hunks(base_lines, cloud_lines, 1),
+        key=lambda h: (h[0], h[1])
+    )
+
+    merged: List[str] = []
+    conflicts = 0
+    position = 0
+    index = 0
+    while index < len(hunks):
+        group = [hunks[index]]
+        start, end = hunks[index][0], hunks[index][1]
+        index += 1
+        while index < len(hunks) and hunks[index][0] <= end:
+            group.append(hunks[index])
+            end = max(end, hunks[index][1])
+            index += 1
+
+        merged.extend(base_lines[position:start])
+        position = end
+
+        local_hunks = [h for h in group if h[3] == 0]
+        cloud_hunks = [h for h in group if h[3] == 1]
+        local_region = _apply(base_lines, start, end, local_hunks)
+        cloud_region = _apply(base_lines, start, end, cloud_hunks)
+
+        if not cloud_hunks or local_region == cloud_region:
+            merged.extend(local_region)
+        elif not local_hunks:
+            merged.extend(cloud_region)
+        else:
+            conflicts += 1
+            merged = _with_newline(merged)
+            merged.append(CONFLICT_START + '\n')
+            merged.extend(_with_newline(local_region))
+            merged.append(CONFLICT_SEPARATOR + '\n')
+            merged.extend(_with_newline(cloud_region))
+            merged.append(CONFLICT_END + '\n')
+
+    merged.extend(base_lines[position:])
+    return MergeResult(content=''.join(merged), conflicts=conflicts)
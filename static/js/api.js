@@ -131,6 +131,19 @@ class PlanAPI {
         return await this.request(`/plans/all/${date}`);
     }
 
+    /**
+     * Get multiple plans in one request
+     * @param {Array<{type: string, date: string}>} items - Plan types and dates (YYYY-MM-DD)
+     * @returns {Promise<Array<object|null>>} Plans in the same order as items
+     */
+    async getPlansBatch(items) {
+        const result = await this.request('/plans/batch', {
+            method: 'POST',
+            body: JSON.stringify({ items })
+        });
+        return result.plans;
+    }
+
     /**
      * Copy content between plans
      * @param {object} copyRequest - Copy request data
@@ -246,6 +259,13 @@ class PlanAPI {
         return await response.json();
     }
 
+    /**
+     * Stream export ZIP directly to the browser (no server-side temp file)
+     */
+    streamExport() {
+        window.location.href = `${this.baseURL}/api/export/stream`;
+    }
+
     /**
      * Trigger browser download of exported ZIP file
      * @param {string} filename - ZIP filename to download
@@ -412,8 +432,17 @@ class PlanAPI {
      * Compare local and Google Drive plan files using MD5 hash
      * @returns {Promise<object>} SyncComparisonResult with file list and statistics
      */
-    async compareSync() {
-        return await this.request('/sync/compare');
+    async compareSync({ withDiffStats = true } = {}) {
+        return await this.request(`/sync/compare?with_diff_stats=${withDiffStats}`);
+    }
+
+    /**
+     * Get line diff statistics of a single file (local vs Google Drive)
+     * @param {string} filePath - Relative path, e.g. "Year/2025.md"
+     * @returns {Promise<object>} FileDiffStats
+     */
+    async getSyncDiffStats(filePath) {
+        return await this.request(`/sync/diff-stats?file_path=${encodeURIComponent(filePath)}`);
     }
 
     /**
@@ -428,6 +457,58 @@ class PlanAPI {
         });
     }
 
+    /**
+     * Execute sync operations and report each result as it completes
+     * @param {Array<object>} operations - [{ file_path, action }]
+     * @param {Function} onResult - Called with each SyncOperationResult
+     * @returns {Promise<object>} Aggregated result { total, success_count, failed_count, results }
+     */
+    async executeSyncStream(operations, onResult) {
+        const response = await fetch(`${this.baseURL}/api/sync/execute/stream`, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ operations })
+        });
+
+        if (!response.ok) {
+            const errorData = await response.json().catch(() => ({}));
+            throw new Error(errorData.detail?.message || `HTTP ${response.status}: ${response.statusText}`);
+        }
+
+        const results = [];
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+
+        const handleLine = (line) => {
+            if (!line.trim()) return;
+            const item = JSON.parse(line);
+            if (item.error) {
+                throw new Error(item.message);
+            }
+            results.push(item);
+            if (onResult) onResult(item);
+        };
+
+        while (true) {
+            const { value, done } = await reader.read();
+            if (done) break;
+            buffer += decoder.decode(value, { stream: true });
+            const lines = buffer.split('\n');
+            buffer = lines.pop();
+            lines.forEach(handleLine);
+        }
+        handleLine(buffer);
+
+        const successCount = results.filter(r => r.success).length;
+        return {
+            total: results.length,
+            success_count: successCount,
+            failed_count: results.length - successCount,
+            results
+        };
+    }
+
     /**
      * Get file content from both local and Google Drive for diff view
      * @param {string} filePath - Relative file path (e.g. "Year/2025.md")
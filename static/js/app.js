@@ -853,6 +853,14 @@ class WorkPlanApp {
                 icon.innerHTML = `<svg class="w-4 h-4" fill="none" stroke="currentColor" viewBox="0 0 24 24"><path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M7 16a4 4 0 01-.88-7.903A5 5 0 1115.9 6L16 6a5 5 0 011 9.9M9 19l3 3m0 0l3-3m-3 3V10"/></svg>`;
             }
             if (text) text.textContent = '雲端';
+        } else if (mode === 'hybrid') {
+            indicator.classList.remove('storage-local');
+            indicator.classList.add('storage-cloud');
+            indicator.title = '本地儲存，背景備份到 Google Drive';
+            if (icon) {
+                icon.innerHTML = `<svg class="w-4 h-4" fill="none" stroke="currentColor" viewBox="0 0 24 24"><path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M7 16a4 4 0 01-.88-7.903A5 5 0 1115.9 6L16 6a5 5 0 011 9.9M15 13l-3-3m0 0l-3 3m3-3v12"/></svg>`;
+            }
+            if (text) text.textContent = '本地+雲端';
         } else {
             indicator.classList.remove('storage-cloud');
             indicator.classList.add('storage-local');
@@ -44,14 +44,10 @@ class SettingsDataSection {
      */
     async handleExport() {
         try {
-            Utils.showLoading('正在匯出資料...');
+            // 伺服器邊壓縮邊傳送，瀏覽器立即開始下載
+            window.planAPI.streamExport();
 
-            const result = await window.planAPI.exportData();
-
-            Utils.showSuccess(`成功匯出 ${result.file_count} 個檔案`);
-
-            // Trigger download
-            window.planAPI.downloadExport(result.filename);
+            Utils.showSuccess('已開始下載匯出檔案');
 
         } catch (error) {
             console.error('Export failed:', error);
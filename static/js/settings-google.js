@@ -408,7 +408,7 @@ class SettingsGoogleSection {
 
     /**
      * Handle storage mode change
-     * @param {string} newMode - New storage mode ('local' or 'google_drive')
+     * @param {string} newMode - New storage mode ('local', 'google_drive' or 'hybrid')
      */
     async handleStorageModeChange(newMode) {
         const currentMode = this.storageStatus?.mode || 'local';
@@ -418,8 +418,8 @@ class SettingsGoogleSection {
             return;
         }
 
-        // If switching to Google Drive, check auth status
-        if (newMode === 'google_drive') {
+        // If switching to Google Drive or hybrid, check auth status
+        if (newMode === 'google_drive' || newMode === 'hybrid') {
             if (this.googleAuthStatus?.status !== 'connected') {
                 Utils.showError('請先連結 Google 帳號才能切換到 Google Drive 模式');
                 // Reset radio button
@@ -428,7 +428,7 @@ class SettingsGoogleSection {
             }
 
             // Show confirmation dialog
-            if (!await this.confirmStorageModeSwitch('google_drive')) {
+            if (!await this.confirmStorageModeSwitch(newMode)) {
                 this.updateStorageModeUI();
                 return;
             }
@@ -458,6 +458,12 @@ class SettingsGoogleSection {
                 `• 計畫資料將儲存到 Google Drive\n` +
                 `• 需要網路連線才能存取資料\n` +
                 `• 現有本地資料不會自動同步`;
+        } else if (targetMode === 'hybrid') {
+            message = `確定要切換到本地 + Google Drive 備份模式嗎？\n\n` +
+                `切換後：\n` +
+                `• 計畫資料儲存在本機，儲存速度與本地模式相同\n` +
+                `• 每次儲存後會在背景備份到 Google Drive\n` +
+                `• 離線時的修改會在恢復連線後自動上傳`;
         } else {
             message = `確定要切換回本地模式嗎？\n\n` +
                 `切換後：\n` +
@@ -491,7 +497,7 @@ class SettingsGoogleSection {
 
             Utils.hideLoading();
 
-            const modeText = newMode === 'google_drive' ? 'Google Drive' : '本地';
+            const modeText = { google_drive: 'Google Drive', hybrid: '本地 + Google Drive 備份' }[newMode] || '本地';
             Utils.showSuccess(`已切換到${modeText}模式`);
 
             // Dispatch event for other components to react
@@ -527,18 +533,26 @@ class SettingsGoogleSection {
     updateStorageModeUI() {
         const currentMode = this.storageStatus?.mode || 'local';
         const localRadio = document.getElementById('storage-mode-local');
-        const googleDriveRadio = document.getElementById('storage-mode-google-drive');
 
         if (localRadio) {
             localRadio.checked = currentMode === 'local';
         }
-        if (googleDriveRadio) {
-            googleDriveRadio.checked = currentMode === 'google_drive';
-            // Disable Google Drive option if not connected
-            const isConnected = this.googleAuthStatus?.status === 'connected';
-            googleDriveRadio.disabled = !isConnected;
 
-            const label = document.querySelector('label[for="storage-mode-google-drive"]');
+        // Google Drive 與 hybrid 模式都需要已連結 Google 帳號
+        const isConnected = this.googleAuthStatus?.status === 'connected';
+        const googleModes = {
+            'storage-mode-google-drive': 'google_drive',
+            'storage-mode-hybrid': 'hybrid'
+        };
+        Object.entries(googleModes).forEach(([radioId, mode]) => {
+            const radio = document.getElementById(radioId);
+            if (!radio) return;
+
+            radio.checked = currentMode === mode;
+            // Disable Google Drive options if not connected
+            radio.disabled = !isConnected;
+
+            const label = document.querySelector(`label[for="${radioId}"]`);
             if (label) {
                 if (isConnected) {
                     label.classList.remove('opacity-50', 'cursor-not-allowed');
@@ -546,7 +560,7 @@ class SettingsGoogleSection {
                     label.classList.add('opacity-50', 'cursor-not-allowed');
                 }
             }
-        }
+        });
     }
 
     /**
@@ -14,7 +14,7 @@ class SyncPanel {
             isComparing: false,
             isSyncing: false,
             comparisonResult: null,          // SyncComparisonResult | null
-            userSelections: new Map(),       // Map<filePath, 'upload'|'download'|'skip'>
+            userSelections: new Map(),       // Map<filePath, 'upload'|'download'|'merge'|'skip'>
             filter: 'all',                   // 'all'|'local_only'|'cloud_only'|'different'|'same'
             syncProgress: null,              // { current, total } | null
             syncResult: null,                // SyncExecuteResult | null
@@ -263,7 +263,8 @@ class SyncPanel {
         this._setCompareButtonLoading(true);
 
         try {
-            const result = await window.planAPI.compareSync();
+            // 行數差異需下載雲端內容，比較完成後再逐檔載入
+            const result = await window.planAPI.compareSync({ withDiffStats: false });
             this.state.comparisonResult = result;
             this.state.lastComparedAt = new Date();
 
@@ -273,6 +274,7 @@ class SyncPanel {
             });
 
             this._renderResult();
+            this._loadDiffStats(result);
         } catch (error) {
             console.error('Compare failed:', error);
             this._showError(`比較失敗：${error.message}`);
@@ -283,6 +285,26 @@ class SyncPanel {
         }
     }
 
+    async _loadDiffStats(result, concurrency = 4) {
+        const pending = result.files.filter(f => f.status === 'different' && !f.diff_stats);
+
+        const worker = async () => {
+            while (pending.length > 0) {
+                const fileInfo = pending.shift();
+                try {
+                    fileInfo.diff_stats = await window.planAPI.getSyncDiffStats(fileInfo.relative_path);
+                } catch (error) {
+                    console.warn(`Diff stats failed: ${fileInfo.relative_path}`, error);
+                    continue;
+                }
+                // 重新比較後舊結果不再顯示
+                if (this.state.comparisonResult === result) this._renderTable();
+            }
+        };
+
+        await Promise.all(Array.from({ length: concurrency }, worker));
+    }
+
     // ============================================================
     // 核心操作：執行同步
     // ============================================================
@@ -306,9 +328,13 @@ class SyncPanel {
         this.state.syncProgress = { current: 0, total: operations.length };
 
         this._showSyncProgress();
+        this._updateSyncProgress();
 
         try {
-            const result = await window.planAPI.executeSync(operations);
+            const result = await window.planAPI.executeSyncStream(operations, () => {
+                this.state.syncProgress.current++;
+                this._updateSyncProgress();
+            });
             this.state.syncResult = result;
             this._showSyncResult(result);
         } catch (error) {
@@ -459,6 +485,15 @@ class SyncPanel {
         const activeSkip = currentAction === 'skip'
             ? 'bg-gray-400 text-white border-gray-400'
             : 'bg-white text-gray-500 border-gray-300 hover:border-gray-400';
+        const activeMerge = currentAction === 'merge'
+            ? 'bg-amber-500 text-white border-amber-500'
+            : 'bg-white text-gray-500 border-gray-300 hover:border-amber-400 hover:text-amber-600';
+
+        // 合併只適用於兩端都存在的檔案
+        const mergeButton = status === 'different' ? `
+            <button class="${btnBase} ${activeMerge}"
+                    data-action-btn data-file-path="${escapedPath}" data-action="merge"
+                    title="以上次同步的內容為基準合併兩端修改">⇄ 合併</button>` : '';
 
         return `
         <div class="flex gap-1">
@@ -467,7 +502,7 @@ class SyncPanel {
                     title="上傳本地檔案至 Google Drive">↑ 上傳</button>
             <button class="${btnBase} ${activeDownload}"
                     data-action-btn data-file-path="${escapedPath}" data-action="download"
-                    title="從 Google Drive 下載至本地">↓ 下載</button>
+                    title="從 Google Drive 下載至本地">↓ 下載</button>${mergeButton}
             <button class="${btnBase} ${activeSkip}"
                     data-action-btn data-file-path="${escapedPath}" data-action="skip"
                     title="跳過，保持不同步">✕ 跳過</button>
@@ -525,14 +560,15 @@ class SyncPanel {
         const el = document.getElementById('sync-footer-summary');
         if (!el) return;
 
-        let upload = 0, download = 0, skip = 0;
+        let upload = 0, download = 0, merge = 0, skip = 0;
         this.state.userSelections.forEach(action => {
             if (action === 'upload') upload++;
             else if (action === 'download') download++;
+            else if (action === 'merge') merge++;
             else skip++;
         });
 
-        el.textContent = `上傳 ${upload} 個・下載 ${download} 個・跳過 ${skip} 個`;
+        el.textContent = `上傳 ${upload} 個・下載 ${download} 個・合併 ${merge} 個・跳過 ${skip} 個`;
         this._updateExecuteButton();
     }
 
@@ -564,6 +600,15 @@ class SyncPanel {
         if (resultMsg) resultMsg.classList.add('hidden');
     }
 
+    _updateSyncProgress() {
+        const progress = this.state.syncProgress;
+        if (!progress) return;
+        const text = document.getElementById('sync-progress-text');
+        const fill = document.getElementById('sync-progress-fill');
+        if (text) text.textContent = `${progress.current} / ${progress.total}`;
+        if (fill) fill.style.width = `${progress.total ? (progress.current / progress.total) * 100 : 0}%`;
+    }
+
     _hideSyncProgress() {
         const bar = document.getElementById('sync-progress-bar');
         if (bar) bar.classList.add('hidden');
@@ -573,8 +618,16 @@ class SyncPanel {
         const el = document.getElementById('sync-result-message');
         if (!el) return;
 
+        const conflicted = result.results.filter(r => r.success && r.merge_conflicts > 0);
+        const conflictNote = conflicted.length === 0 ? '' : `
+            <div class="text-xs text-amber-700 mt-1">以下檔案有重疊的修改，已以衝突標記寫入，請手動整理：
+                <ul class="list-disc list-inside">${conflicted
+                    .map(r => `<li>${this._escapeHtml(r.file_path)}（${r.merge_conflicts} 處）</li>`)
+                    .join('')}</ul>
+            </div>`;
+
         if (result.failed_count === 0) {
-            el.innerHTML = `<span class="text-green-700 font-medium">✓ 同步完成！成功 ${result.success_count} 個操作</span>`;
+            el.innerHTML = `<span class="text-green-700 font-medium">✓ 同步完成！成功 ${result.success_count} 個操作</span>${conflictNote}`;
         } else {
             const failedFiles = result.results
                 .filter(r => !r.success)
@@ -583,6 +636,7 @@ class SyncPanel {
             el.innerHTML = `
                 <div class="text-yellow-700 font-medium mb-1">⚠ 部分成功：成功 ${result.success_count} 個，失敗 ${result.failed_count} 個</div>
                 <ul class="text-xs text-red-600 list-disc list-inside">${failedFiles}</ul>
+                ${conflictNote}
             `;
         }
 
@@ -9,25 +9,42 @@
 - 原子性匯入和回滾機制
 """
 
+import io
+import json
+import os
 import pytest
 from pathlib import Path
 from datetime import datetime
 import zipfile
 import tempfile
 import shutil
+from contextlib import contextmanager
+from unittest.mock import patch
 
 from backend.data_export_service import (
     create_export_zip,
+    list_export_files,
+    stream_export_zip,
+    load_base_manifest,
+    read_zip_manifest,
+    execute_import,
+    prune_import_backups,
+    validate_zip_file,
+    spool_upload,
+    UploadTooLargeError,
+    MAX_ZIP_SIZE,
+    MANIFEST_NAME,
+    EXPORT_TYPE_FULL,
+    EXPORT_TYPE_INCREMENTAL,
     validate_zip_structure,
     validate_filename,
     validate_weekday,
-    backup_current_data,
-    restore_backup,
     safe_extract_member,
     DATA_DIR,
     REQUIRED_DIRS
 )
 from backend.models import ErrorType
+from backend.storage import LocalStorageProvider
 
 
 class TestExportFunctions:
@@ -49,6 +66,392 @@ class TestExportFunctions:
         pass
 
 
+class TestStreamingExport:
+    """測試串流匯出"""
+    
+    @pytest.fixture
+    def storage(self, tmp_path, monkeypatch):
+        storage = LocalStorageProvider(str(tmp_path / "data"))
+        storage.write_file("Day/20251025.md", "# 今日計畫")
+        storage.write_file("Year/2025.md", "# 年度計畫\n" * 5000)
+        storage.write_file("Day/notes.txt", "ignored")
+        monkeypatch.setattr("backend.data_export_service.STREAM_CHUNK_SIZE", 1024)
+        return storage
+    
+    def test_stream_is_valid_zip(self, storage):
+        """測試串流產生的內容為完整的 ZIP，只包含 .md 檔案"""
+        files = list_export_files(storage)
+        data = b"".join(stream_export_zip(storage, files))
+        
+        with zipfile.ZipFile(io.BytesIO(data)) as zipf:
+            assert sorted(zipf.namelist()) == ["Day/20251025.md", "Year/2025.md", MANIFEST_NAME]
+            assert zipf.read("Year/2025.md").decode("utf-8") == "# 年度計畫\n" * 5000
+            assert zipf.testzip() is None
+    
+    def test_stream_yields_before_archive_complete(self, storage):
+        """測試壓縮途中即開始產生資料，不等整個 ZIP 完成"""
+        chunks = stream_export_zip(storage, list_export_files(storage))
+        
+        first = next(chunks)
+        
+        assert first.startswith(b"PK\x03\x04")
+        assert len(list(chunks)) > 1
+    
+    def test_empty_storage(self, tmp_path):
+        """測試沒有任何計畫目錄時匯出空的 ZIP"""
+        storage = LocalStorageProvider(str(tmp_path / "empty"))
+        files = list_export_files(storage)
+        data = b"".join(stream_export_zip(storage, files))
+        
+        assert files == []
+        with zipfile.ZipFile(io.BytesIO(data)) as zipf:
+            assert zipf.namelist() == [MANIFEST_NAME]
+    
+    def test_reads_from_active_provider_in_batches(self, storage, monkeypatch):
+        """測試透過 StorageProvider 的 read_many 分批讀取（Drive 可並行下載）"""
+        monkeypatch.setattr("backend.data_export_service.EXPORT_BATCH_SIZE", 1)
+        with patch.object(storage, 'read_many', wraps=storage.read_many) as mock_read_many:
+            b"".join(stream_export_zip(storage, list_export_files(storage)))
+        
+        assert [call.args[0] for call in mock_read_many.call_args_list] == [
+            ["Day/20251025.md"], ["Year/2025.md"]
+        ]
+    
+    def test_read_failure_aborts_export(self, storage):
+        """測試讀取失敗時中止匯出，不產生缺檔的 ZIP"""
+        with patch.object(storage, 'read_many', return_value={
+            "Day/20251025.md": IOError("network"), "Year/2025.md": "x"
+        }):
+            with pytest.raises(IOError):
+                b"".join(stream_export_zip(storage, list_export_files(storage)))
+
+
+class FakeUpload:
+    """模擬 FastAPI UploadFile"""
+    
+    def __init__(self, data: bytes, size=None):
+        self.file = io.BytesIO(data)
+        self.filename = "upload.zip"
+        self.size = size
+        self.bytes_read = 0
+    
+    async def read(self, size: int = -1) -> bytes:
+        chunk = self.file.read(size)
+        self.bytes_read += len(chunk)
+        return chunk
+
+
+def export_bytes(storage, base_manifest=None) -> bytes:
+    return b"".join(stream_export_zip(storage, list_export_files(storage), base_manifest))
+
+
+def zip_manifest(data: bytes) -> dict:
+    with zipfile.ZipFile(io.BytesIO(data)) as zipf:
+        return read_zip_manifest(zipf)
+
+
+class TestIncrementalExport:
+    """測試增量匯出與基準 + 增量鏈匯入"""
+    
+    @pytest.fixture
+    def storage(self, tmp_path):
+        storage = LocalStorageProvider(str(tmp_path / "source"))
+        storage.write_file("Day/20251025.md", "# 今日計畫")
+        storage.write_file("Week/20251019.md", "# 週計畫")
+        storage.write_file("Month/202510.md", "# 月計畫")
+        storage.write_file("Year/2025.md", "# 年度計畫")
+        return storage
+    
+    @pytest.fixture
+    def data_dir(self, tmp_path, monkeypatch):
+        data_dir = tmp_path / "data"
+        monkeypatch.setattr("backend.data_export_service.DATA_DIR", data_dir)
+        monkeypatch.setattr("backend.data_export_service.TEMP_DIR", tmp_path)
+        return data_dir
+    
+    def test_full_export_manifest(self, storage):
+        """測試完整匯出的 manifest 記錄所有檔案的大小與 sha256"""
+        manifest = zip_manifest(export_bytes(storage))
+        
+        assert manifest["type"] == EXPORT_TYPE_FULL
+        assert len(manifest["files"]) == 4
+        assert manifest["files"]["Day/20251025.md"]["size"] == len("# 今日計畫".encode("utf-8"))
+        assert manifest["deleted"] == []
+    
+    def test_incremental_packs_only_changes(self, storage):
+        """測試增量匯出只打包新增或修改的檔案，並列出刪除的檔案"""
+        base = zip_manifest(export_bytes(storage))
+        storage.write_file("Day/20251025.md", "# 今日計畫（修改）")
+        storage.write_file("Day/20251026.md", "# 新計畫")
+        storage.delete_file("Month/202510.md")
+        
+        data = export_bytes(storage, base)
+        
+        with zipfile.ZipFile(io.BytesIO(data)) as zipf:
+            assert sorted(zipf.namelist()) == ["Day/20251025.md", "Day/20251026.md", MANIFEST_NAME]
+        manifest = zip_manifest(data)
+        assert manifest["type"] == EXPORT_TYPE_INCREMENTAL
+        assert manifest["deleted"] == ["Month/202510.md"]
+        assert sorted(manifest["files"]) == ["Day/20251025.md", "Day/20251026.md", "Week/20251019.md", "Year/2025.md"]
+    
+    def test_base_from_previous_zip_or_manifest(self, storage):
+        """測試增量基準可為前一次匯出的 ZIP 或其中的 manifest.json"""
+        full = export_bytes(storage)
+        manifest = zip_manifest(full)
+        
+        assert load_base_manifest(io.BytesIO(full)) == manifest
+        assert load_base_manifest(io.BytesIO(json.dumps(manifest).encode("utf-8"))) == manifest
+        with pytest.raises(ValueError):
+            load_base_manifest(io.BytesIO(b"not a manifest"))
+    
+    @pytest.mark.asyncio
+    async def test_import_base_plus_chain(self, storage, data_dir):
+        """測試匯入完整匯出加上多個增量後，結果與來源一致"""
+        full = export_bytes(storage)
+        storage.write_file("Day/20251026.md", "# 新計畫")
+        first = export_bytes(storage, zip_manifest(full))
+        storage.delete_file("Month/202510.md")
+        storage.write_file("Year/2025.md", "# 年度計畫（修改）")
+        second = export_bytes(storage, zip_manifest(first))
+        
+        result = await execute_import(FakeUpload(full), [FakeUpload(first), FakeUpload(second)])
+        
+        assert result.deleted_count == 1
+        assert (data_dir / "Day" / "20251026.md").read_text(encoding="utf-8") == "# 新計畫"
+        assert (data_dir / "Year" / "2025.md").read_text(encoding="utf-8") == "# 年度計畫（修改）"
+        assert not (data_dir / "Month" / "202510.md").exists()
+    
+    @pytest.mark.asyncio
+    async def test_increment_on_wrong_base_rolled_back(self, storage, data_dir):
+        """測試增量套用在不是其基準的資料上時回滾"""
+        full = export_bytes(storage)
+        storage.write_file("Day/20251026.md", "# 新計畫")
+        increment = export_bytes(storage, zip_manifest(full))
+        (data_dir / "Day").mkdir(parents=True)
+        (data_dir / "Day" / "20251001.md").write_text("其他資料", encoding="utf-8")
+        
+        with pytest.raises(IOError, match="回滾"):
+            await execute_import(FakeUpload(increment))
+        
+        assert (data_dir / "Day" / "20251001.md").read_text(encoding="utf-8") == "其他資料"
+        assert not (data_dir / "Day" / "20251026.md").exists()
+    
+    @pytest.mark.asyncio
+    async def test_full_import_keeps_settings(self, storage, data_dir):
+        """測試完整匯入只替換計畫目錄，保留 settings 等其他資料"""
+        (data_dir / "settings").mkdir(parents=True)
+        (data_dir / "settings" / "token.json").write_text("{}", encoding="utf-8")
+        (data_dir / "Day").mkdir()
+        (data_dir / "Day" / "20251001.md").write_text("舊資料", encoding="utf-8")
+        
+        await execute_import(FakeUpload(export_bytes(storage)))
+        
+        assert (data_dir / "settings" / "token.json").read_text(encoding="utf-8") == "{}"
+        assert not (data_dir / "Day" / "20251001.md").exists()
+        assert (data_dir / "Day" / "20251025.md").read_text(encoding="utf-8") == "# 今日計畫"
+        backups = [p for p in data_dir.parent.iterdir() if p.name.startswith(".")]
+        assert [p.name.startswith(".data_backup_") for p in backups] == [True]
+        assert (backups[0] / "Day" / "20251001.md").read_text(encoding="utf-8") == "舊資料"
+    
+    @pytest.mark.asyncio
+    async def test_only_latest_backup_kept(self, storage, data_dir, monkeypatch):
+        """測試只保留最近一次匯入前的備份，較舊的備份被刪除"""
+        monkeypatch.setattr(
+            "backend.data_export_service._prune_backups_in_background", prune_import_backups
+        )
+        full = export_bytes(storage)
+        await execute_import(FakeUpload(full))
+        storage.write_file("Day/20251025.md", "# 今日計畫（修改）")
+        await execute_import(FakeUpload(export_bytes(storage, zip_manifest(full))))
+        
+        backups = [p for p in data_dir.parent.iterdir() if p.name.startswith(".data_backup_")]
+        assert len(backups) == 1
+        assert (backups[0] / "Day" / "20251025.md").read_text(encoding="utf-8") == "# 今日計畫"
+    
+    @pytest.mark.asyncio
+    async def test_swap_runs_inside_guard(self, storage, data_dir):
+        """測試計畫目錄在 swap_guard 內換入（期間 PlanService 的寫入會等待）"""
+        seen = []
+    
+        @contextmanager
+        def guard():
+            seen.append((data_dir / "Day" / "20251025.md").exists())
+            yield
+            seen.append((data_dir / "Day" / "20251025.md").exists())
+    
+        await execute_import(FakeUpload(export_bytes(storage)), swap_guard=guard())
+    
+        assert seen == [False, True]
+    
+    @pytest.mark.asyncio
+    async def test_on_swapped_reports_changed_files(self, storage, data_dir):
+        """測試換入後只回報新增、內容改變與刪除的檔案"""
+        full = export_bytes(storage)
+        await execute_import(FakeUpload(full))
+        storage.write_file("Day/20251025.md", "# 今日計畫（修改）")
+        storage.write_file("Day/20251026.md", "# 新計畫")
+        storage.delete_file("Month/202510.md")
+        changes = []
+        
+        await execute_import(
+            FakeUpload(export_bytes(storage, zip_manifest(full))),
+            on_swapped=lambda written, deleted: changes.append((written, deleted))
+        )
+        
+        assert changes == [(["Day/20251025.md", "Day/20251026.md"], ["Month/202510.md"])]
+    
+    @pytest.mark.asyncio
+    async def test_increment_does_not_touch_linked_files(self, storage, data_dir):
+        """測試增量匯入改寫檔案時不會修改舊資料的檔案內容（硬連結）"""
+        full = export_bytes(storage)
+        await execute_import(FakeUpload(full))
+        old_file = data_dir / "Day" / "20251025.md"
+        with open(old_file, encoding="utf-8") as reader:
+            storage.write_file("Day/20251025.md", "# 今日計畫（修改）")
+            await execute_import(FakeUpload(export_bytes(storage, zip_manifest(full))))
+            
+            # 已開啟的讀取端仍看到完整的舊內容
+            assert reader.read() == "# 今日計畫"
+        assert old_file.read_text(encoding="utf-8") == "# 今日計畫（修改）"
+    
+    @pytest.mark.asyncio
+    async def test_backup_unaffected_by_later_edits(self, storage, data_dir, monkeypatch):
+        """測試增量匯入後編輯未變動（硬連結）的計畫，備份中的內容不受影響"""
+        monkeypatch.setattr(
+            "backend.data_export_service._prune_backups_in_background", prune_import_backups
+        )
+        full = export_bytes(storage)
+        await execute_import(FakeUpload(full))
+        storage.write_file("Week/20251019.md", "# 週計畫（修改）")
+        await execute_import(FakeUpload(export_bytes(storage, zip_manifest(full))))
+        
+        LocalStorageProvider(str(data_dir)).write_file("Day/20251025.md", "匯入後編輯")
+        
+        backups = [p for p in data_dir.parent.iterdir() if p.name.startswith(".data_backup_")]
+        assert len(backups) == 1
+        assert (backups[0] / "Day" / "20251025.md").read_text(encoding="utf-8") == "# 今日計畫"
+        assert (data_dir / "Day" / "20251025.md").read_text(encoding="utf-8") == "匯入後編輯"
+    
+    @pytest.mark.asyncio
+    async def test_failed_swap_restores_data(self, storage, data_dir, monkeypatch):
+        """測試換入目錄途中失敗時，已換入的目錄移回原位"""
+        (data_dir / "Day").mkdir(parents=True)
+        (data_dir / "Day" / "20251001.md").write_text("舊資料", encoding="utf-8")
+        real_rename = os.rename
+        
+        def failing_rename(src, dst):
+            if Path(dst) == data_dir / "Month":
+                raise OSError("磁碟錯誤")
+            real_rename(src, dst)
+        
+        monkeypatch.setattr("backend.data_export_service.os.rename", failing_rename)
+        
+        with pytest.raises(IOError, match="磁碟錯誤"):
+            await execute_import(FakeUpload(export_bytes(storage)))
+        
+        assert sorted(p.name for p in data_dir.iterdir()) == ["Day"]
+        assert [p.name for p in (data_dir / "Day").iterdir()] == ["20251001.md"]
+        assert [p.name for p in data_dir.parent.iterdir() if p.name.startswith(".")] == []
+
+
+class TestUploadSpooling:
+    """測試上傳檔案分段寫入磁碟與大小上限"""
+    
+    @pytest.fixture(autouse=True)
+    def small_limits(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("backend.data_export_service.TEMP_DIR", tmp_path)
+        monkeypatch.setattr("backend.data_export_service.UPLOAD_CHUNK_SIZE", 1024)
+    
+    @pytest.mark.asyncio
+    async def test_spool_in_chunks(self, tmp_path):
+        """測試分段寫入後內容完整"""
+        data = bytes(range(256)) * 20
+        dest = tmp_path / "upload.zip"
+        
+        assert await spool_upload(FakeUpload(data), dest) == len(data)
+        assert dest.read_bytes() == data
+    
+    @pytest.mark.asyncio
+    async def test_oversized_stopped_early(self, tmp_path):
+        """測試未知大小的上傳超過上限時立即停止讀取並刪除暫存檔"""
+        upload = FakeUpload(b"x" * 10000)
+        dest = tmp_path / "upload.zip"
+        
+        with pytest.raises(UploadTooLargeError):
+            await spool_upload(upload, dest, max_size=2048)
+        
+        assert upload.bytes_read <= 2048 + 1024
+        assert not dest.exists()
+    
+    @pytest.mark.asyncio
+    async def test_declared_size_rejected_without_reading(self, tmp_path):
+        """測試已知大小超過上限時不讀取任何內容"""
+        upload = FakeUpload(b"x" * 100, size=MAX_ZIP_SIZE + 1)
+        
+        with pytest.raises(UploadTooLargeError):
+            await spool_upload(upload, tmp_path / "upload.zip")
+        
+        assert upload.bytes_read == 0
+    
+    @pytest.mark.asyncio
+    async def test_validate_reports_oversized_upload(self, tmp_path):
+        """測試驗證時回報檔案過大，且不留下暫存檔"""
+        result = await validate_zip_file(FakeUpload(b"x", size=MAX_ZIP_SIZE + 1))
+        
+        assert not result.is_valid
+        assert result.errors[0].error_type == ErrorType.SIZE
+        assert list(tmp_path.iterdir()) == []
+    
+    @pytest.mark.asyncio
+    async def test_validate_rejects_zip_bomb_from_central_directory(self, monkeypatch):
+        """測試由中央目錄記錄的解壓大小拒絕過大的內容"""
+        monkeypatch.setattr("backend.data_export_service.MAX_EXTRACTED_SIZE", 1000)
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zipf:
+            for dir_name in REQUIRED_DIRS:
+                zipf.writestr(f"{dir_name}/", "")
+            zipf.writestr("Day/20251025.md", "x" * 5000)
+        
+        result = await validate_zip_file(FakeUpload(buffer.getvalue()))
+        
+        assert not result.is_valid
+        assert [error.error_type for error in result.errors] == [ErrorType.SIZE]
+
+
+def test_oversized_import_request_rejected_before_body():
+    """測試 Content-Length 超過上限的匯入請求直接回應 413"""
+    from fastapi.testclient import TestClient
+    from backend.main import app
+    
+    response = TestClient(app).post(
+        "/api/import/validate",
+        content=b"",
+        headers={
+            "content-type": "multipart/form-data; boundary=x",
+            "content-length": str(MAX_ZIP_SIZE * 2),
+        },
+    )
+    
+    assert response.status_code == 413
+    assert response.json()["error"] == "UPLOAD_TOO_LARGE"
+
+
+def test_import_rejected_in_google_drive_mode():
+    """測試 Google Drive 模式（資料不在本地）拒絕匯入"""
+    from fastapi.testclient import TestClient
+    from backend.main import app
+    from backend.routers import data as data_router
+    
+    with patch.object(data_router.plan_service, "storage", object()):
+        response = TestClient(app).post(
+            "/api/import/execute",
+            files={"file": ("upload.zip", b"PK", "application/zip")},
+        )
+    
+    assert response.status_code == 400
+    assert response.json()["detail"]["error"] == "IMPORT_NOT_SUPPORTED"
+
+
 class TestValidationFunctions:
     """測試驗證相關函數"""
     
@@ -94,16 +497,6 @@ class TestValidationFunctions:
 class TestImportFunctions:
     """測試匯入相關函數"""
     
-    def test_backup_current_data(self, tmp_path):
-        """測試備份功能"""
-        # TODO: 實作測試
-        pass
-    
-    def test_restore_backup(self, tmp_path):
-        """測試還原功能"""
-        # TODO: 實作測試
-        pass
-    
     def test_safe_extract_member_normal(self, tmp_path):
         """測試正常解壓"""
         # TODO: 實作測試
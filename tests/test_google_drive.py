@@ -4,6 +4,7 @@ Google Drive Storage Provider 單元測試
 使用 mock 測試 GoogleDriveStorageProvider 的各項功能。
 """
 
+import json
 import pytest
 from datetime import datetime
 from unittest.mock import Mock, MagicMock, patch
@@ -18,6 +19,17 @@ from backend.storage.google_drive import (
     FileNotFoundError
 )
 from backend.storage.base import FileStats
+from backend.storage.drive_client import DriveClient, DriveClientFactory
+from backend.storage.drive_id_cache import DriveIdCache
+from backend.storage.drive_rate_limiter import TokenBucket, DriveRequestMetrics
+
+
+@pytest.fixture(autouse=True)
+def isolated_rate_limiter():
+    """每個測試使用獨立且不限速的 token bucket 與統計"""
+    with patch.object(GoogleDriveStorageProvider, '_rate_limiter', TokenBucket(10000, 10000)), \
+            patch.object(GoogleDriveStorageProvider, '_metrics', DriveRequestMetrics()):
+        yield
 
 
 class TestGoogleDriveStorageProviderInit:
@@ -237,6 +249,64 @@ class TestGoogleDriveStorageProviderMocked:
         # 應該排序
         assert files == ['2023.md', '2024.md', '2025.md']
     
+    def test_list_files_with_stats_paginated(self, provider, mock_service):
+        """測試列出檔案統計資訊（分頁並寫入檔案 ID 快取）"""
+        provider._folder_cache['base_folder_id/Day'] = 'day_folder_id'
+        provider._base_folder_id = 'base_folder_id'
+        mock_service.files().list().execute.side_effect = [
+            {
+                'files': [{
+                    'id': 'id_1', 'name': '20250701.md', 'size': '12',
+                    'createdTime': '2025-07-01T01:00:00.000Z',
+                    'modifiedTime': '2025-07-01T02:00:00.000Z'
+                }],
+                'nextPageToken': 'page_2'
+            },
+            {
+                'files': [{
+                    'id': 'id_2', 'name': '20250702.md', 'size': '0',
+                    'createdTime': '2025-07-02T01:00:00.000Z',
+                    'modifiedTime': '2025-07-02T02:00:00.000Z'
+                }]
+            }
+        ]
+        
+        result = provider.list_files_with_stats('Day')
+        
+        assert result['20250701.md'].size == 12
+        assert result['20250702.md'].size == 0
+        assert result['20250701.md'].modified_at == datetime(2025, 7, 1, 2, 0)
+        assert provider._file_cache['day_folder_id/20250702.md'] == 'id_2'
+    
+    def test_warm_up_populates_caches(self, provider, mock_service):
+        """測試預先載入資料夾樹後，讀取路徑不需再搜尋"""
+        provider._base_folder_id = 'base_id'
+        mock_service.files().list().execute.side_effect = [
+            # 第一層：根資料夾的子項目
+            {'files': [
+                {'id': 'year_id', 'name': 'Year', 'mimeType': provider.FOLDER_MIME_TYPE, 'parents': ['base_id']},
+                {'id': 'day_id', 'name': 'Day', 'mimeType': provider.FOLDER_MIME_TYPE, 'parents': ['base_id']},
+            ]},
+            # 第二層：以單次合併查詢列出兩個資料夾的子項目
+            {'files': [
+                {'id': 'f_2025', 'name': '2025.md', 'mimeType': 'text/markdown', 'parents': ['year_id']},
+                {'id': 'f_0701', 'name': '20250701.md', 'mimeType': 'text/markdown', 'parents': ['day_id']},
+            ]},
+        ]
+        
+        loaded = provider.warm_up()
+        
+        assert loaded == 4
+        assert provider._folder_cache['base_id/Year'] == 'year_id'
+        assert provider._file_cache['day_id/20250701.md'] == 'f_0701'
+        second_query = mock_service.files().list.call_args_list[-1].kwargs['q']
+        assert "'year_id' in parents or 'day_id' in parents" in second_query
+        
+        mock_service.files().list.reset_mock()
+        folder_id, filename = provider._resolve_path('Year/2025.md')
+        assert provider._find_file(filename, folder_id) == 'f_2025'
+        mock_service.files().list.assert_not_called()
+    
     def test_ensure_directory(self, provider, mock_service):
         """測試確保目錄存在"""
         mock_service.files().list().execute.return_value = {'files': []}
@@ -262,6 +332,197 @@ class TestGoogleDriveStorageProviderMocked:
         assert provider._base_folder_id is None
 
 
+class TestGoogleDriveThreadSafety:
+    """跨執行緒共用 provider 測試"""
+    
+    @staticmethod
+    def _credentials(refresh_token='refresh', token='access'):
+        from google.oauth2.credentials import Credentials
+        return Credentials(token=token, refresh_token=refresh_token, client_id='client')
+    
+    def test_each_thread_uses_own_http(self):
+        """測試每個執行緒使用各自的 HTTP 連線"""
+        import threading
+        
+        client = DriveClient(self._credentials())
+        
+        https = []
+        def collect():
+            https.append(client.get_http())
+            https.append(client.get_http())
+        
+        thread = threading.Thread(target=collect)
+        thread.start()
+        thread.join()
+        main_http = client.get_http()
+        
+        assert https[0] is https[1]
+        assert https[0] is not main_http
+    
+    def test_id_caches_accessed_under_lock(self):
+        """測試執行緒池同時查詢、列舉與套用變更時，ID 快取的存取都持有 _cache_lock"""
+        import threading
+        
+        provider = GoogleDriveStorageProvider(base_path="TestFolder")
+        provider._service = MagicMock()
+        provider._service.files().list().execute.return_value = {
+            'files': [{'id': 'found_id', 'name': 'new.md'}]
+        }
+        provider._base_folder_id = 'base_id'
+        provider._folder_cache = LockCheckedDict(provider._cache_lock, {'base_id/Day': 'day_id'})
+        provider._file_cache = LockCheckedDict(provider._cache_lock, {'day_id/20250701.md': 'f_0701'})
+        change = {'fileId': 'f_0702', 'removed': False, 'file': {
+            'id': 'f_0702', 'name': '20250702.md', 'parents': ['day_id'],
+            'mimeType': 'text/markdown', 'trashed': False}}
+        
+        def operations(index):
+            provider._get_or_create_folder('Day', 'base_id')
+            provider._find_file('20250701.md', 'day_id')
+            provider._find_file(f'new_{index}.md', 'day_id')
+            provider._refresh_folder_files('day_id', {'20250701.md': 'f_0701', f'{index}.md': f'f_{index}'})
+            provider._apply_changes_to_cache([change])
+            provider._forget_file_id(f'f_{index}')
+            provider._invalidate_cache(f'Day/new_{index}.md')
+            provider._id_snapshot()
+        
+        errors = []
+        
+        def worker(index):
+            try:
+                for _ in range(20):
+                    operations(index)
+            except AssertionError as e:
+                errors.append(e)
+        
+        operations(0)
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(1, 9)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert errors == []
+        with provider._cache_lock:
+            assert provider._file_cache['day_id/20250702.md'] == 'f_0702'
+        provider.clear_cache()
+
+
+class LockCheckedDict(dict):
+    """存取時確認 provider 的 _cache_lock 已被持有的 dict"""
+    
+    def __init__(self, lock, *args):
+        super().__init__(*args)
+        self._lock = lock
+    
+    def _check(self):
+        assert self._lock.locked(), "未持有 _cache_lock 就存取 ID 快取"
+    
+    def __getitem__(self, key):
+        self._check()
+        return super().__getitem__(key)
+    
+    def __setitem__(self, key, value):
+        self._check()
+        super().__setitem__(key, value)
+    
+    def __delitem__(self, key):
+        self._check()
+        super().__delitem__(key)
+    
+    def __contains__(self, key):
+        self._check()
+        return super().__contains__(key)
+    
+    def __iter__(self):
+        self._check()
+        return super().__iter__()
+    
+    def get(self, key, default=None):
+        self._check()
+        return super().get(key, default)
+    
+    def keys(self):
+        self._check()
+        return super().keys()
+    
+    def items(self):
+        self._check()
+        return super().items()
+    
+    def values(self):
+        self._check()
+        return super().values()
+    
+    def update(self, *args, **kwargs):
+        self._check()
+        super().update(*args, **kwargs)
+    
+    def clear(self):
+        self._check()
+        super().clear()
+
+
+class TestDriveClientFactory:
+    """程序內共用 Drive client 測試"""
+    
+    @pytest.fixture
+    def factory(self):
+        return DriveClientFactory()
+    
+    _credentials = staticmethod(TestGoogleDriveThreadSafety._credentials)
+    
+    def test_providers_share_client_per_account(self, factory):
+        """測試同一帳號的 provider 共用服務與連線，不同帳號各自獨立"""
+        with patch('backend.storage.google_drive.drive_clients', factory):
+            first = GoogleDriveStorageProvider(credentials=self._credentials())
+            second = GoogleDriveStorageProvider(credentials=self._credentials())
+            other = GoogleDriveStorageProvider(credentials=self._credentials(refresh_token='other'))
+            
+            assert first.service is second.service
+            assert first._client.get_http() is second._client.get_http()
+            assert other.service is not first.service
+    
+    def test_discovery_document_parsed_once(self, factory):
+        """測試建立多個 client 時不重新取得 discovery document"""
+        factory.get_client(self._credentials(refresh_token='first'))
+        with patch('backend.storage.drive_client.discovery_cache.get_static_doc') as mock_get_doc:
+            factory.get_client(self._credentials(refresh_token='a'))
+            factory.get_client(self._credentials(refresh_token='b'))
+        
+        mock_get_doc.assert_not_called()
+    
+    def test_newer_token_updated_in_place(self, factory):
+        """測試 token 在別處刷新後，沿用既有 client 並就地更新憑證"""
+        client = factory.get_client(self._credentials(token='old'))
+        http = client.get_http()
+        
+        assert factory.get_client(self._credentials(token='new')) is client
+        assert client.credentials.token == 'new'
+        assert client.get_http() is http
+    
+    def test_refresh_on_401_keeps_connections(self, factory):
+        """測試 401 時刷新 token 並就地更新，重試沿用同一個服務與連線"""
+        from googleapiclient.errors import HttpError
+        auth_service = Mock()
+        auth_service.refresh_token.return_value = Mock(access_token='refreshed')
+        
+        with patch('backend.storage.google_drive.drive_clients', factory):
+            provider = GoogleDriveStorageProvider(credentials=self._credentials(), auth_service=auth_service)
+            service = provider.service
+            http = provider._client.get_http()
+            
+            response = Mock()
+            response.status = 401
+            request = Mock()
+            request.execute.side_effect = [HttpError(response, b'Unauthorized'), {'ok': True}]
+            
+            assert provider._execute_with_retry(request, 'test operation') == {'ok': True}
+        
+        assert provider.service is service
+        assert provider._client.get_http() is http
+        assert provider._client.credentials.token == 'refreshed'
+
+
 class TestGoogleDriveRetryMechanism:
     """重試機制測試"""
     
@@ -291,6 +552,106 @@ class TestGoogleDriveRetryMechanism:
         assert result == {'success': True}
         assert mock_sleep.call_count == 2  # 重試了兩次
 
+    @staticmethod
+    def _http_error(status, reason='', headers=None):
+        import httplib2
+        from googleapiclient.errors import HttpError
+        response = httplib2.Response({'status': status, **(headers or {})})
+        content = json.dumps({'error': {
+            'code': status,
+            'message': reason or 'error',
+            'errors': [{'reason': reason, 'message': reason}],
+        }}).encode()
+        return HttpError(response, content)
+    
+    def test_rate_limit_retried_with_shared_pause(self, provider):
+        """測試 rateLimitExceeded 時暫停共用的 token bucket 後重試，而非直接失敗"""
+        mock_request = Mock()
+        mock_request.execute.side_effect = [
+            self._http_error(403, 'userRateLimitExceeded'),
+            {'success': True},
+        ]
+        
+        with patch.object(provider._rate_limiter, 'pause') as mock_pause:
+            result = provider._execute_with_retry(mock_request, 'test operation')
+        
+        assert result == {'success': True}
+        mock_pause.assert_called_once()
+        metrics = GoogleDriveStorageProvider.get_request_metrics()
+        assert metrics['requests'] == 2
+        assert metrics['retries'] == 1
+        assert metrics['rate_limited'] == 1
+    
+    def test_retry_after_honored(self, provider):
+        """測試依 Retry-After 標頭決定暫停時間"""
+        mock_request = Mock()
+        mock_request.execute.side_effect = [
+            self._http_error(429, headers={'retry-after': '7'}),
+            {'success': True},
+        ]
+        
+        with patch.object(provider._rate_limiter, 'pause') as mock_pause:
+            provider._execute_with_retry(mock_request, 'test operation')
+        
+        assert mock_pause.call_args.args[0] >= 7
+    
+    def test_rate_limit_exhausted_raises_quota_error(self, provider):
+        """測試速率限制重試用盡後拋出 QuotaExceededError"""
+        mock_request = Mock()
+        mock_request.execute.side_effect = self._http_error(403, 'rateLimitExceeded')
+        
+        with patch.object(provider._rate_limiter, 'pause'):
+            with pytest.raises(QuotaExceededError):
+                provider._execute_with_retry(mock_request, 'test operation')
+        
+        assert mock_request.execute.call_count == provider.RATE_LIMIT_RETRIES + 1
+    
+    def test_daily_quota_not_retried(self, provider):
+        """測試每日配額用盡時不重試"""
+        mock_request = Mock()
+        mock_request.execute.side_effect = self._http_error(403, 'quotaExceeded')
+        
+        with pytest.raises(QuotaExceededError):
+            provider._execute_with_retry(mock_request, 'test operation')
+        
+        assert mock_request.execute.call_count == 1
+    
+    @patch('backend.storage.google_drive.time.sleep')
+    def test_backoff_jittered_and_capped(self, mock_sleep, provider):
+        """測試退避時間含 jitter 且不超過上限"""
+        delays = [provider._retry_delay(None, attempt) for attempt in range(1, 10)]
+        
+        assert provider.INITIAL_BACKOFF / 2 <= delays[0] <= provider.INITIAL_BACKOFF
+        assert all(provider.MAX_BACKOFF / 2 <= delay <= provider.MAX_BACKOFF for delay in delays[-3:])
+
+
+class TestTokenBucket:
+    """共用速率限制測試"""
+    
+    def test_burst_then_throttled(self):
+        """測試突發請求用完容量後依速率等待"""
+        bucket = TokenBucket(rate=50, capacity=2)
+        
+        assert bucket.acquire() < 0.01
+        assert bucket.acquire() < 0.01
+        assert bucket.acquire() >= 0.01
+    
+    def test_pause_blocks_acquire(self):
+        """測試 pause 讓之後的請求等待"""
+        bucket = TokenBucket(rate=1000, capacity=10)
+        bucket.pause(0.05)
+        
+        assert bucket.acquire() >= 0.04
+    
+    def test_no_burst_after_pause(self):
+        """測試暫停期間不補充 token，暫停結束後不會一次湧出請求"""
+        bucket = TokenBucket(rate=100, capacity=10)
+        bucket.pause(0.05)
+        bucket.acquire()
+        
+        # 暫停期間若照常補充，bucket 會累積約 5 個 token 而不需等待
+        assert bucket.acquire(5) >= 0.03
+
 
 class TestGoogleDriveConnectionTest:
     """連線測試功能測試"""
@@ -357,6 +718,67 @@ class TestGoogleDriveReadWrite:
                 # 由於 BytesIO mock 複雜，這裡簡化測試
                 pass
     
+    @patch('backend.storage.google_drive.MediaIoBaseDownload')
+    def test_read_file_with_stats(self, mock_downloader_class, provider):
+        """測試讀取內容並同時取得統計資訊"""
+        def fake_downloader(buffer, request, chunksize=None):
+            buffer.write('# 2025 年度計畫'.encode('utf-8'))
+            downloader = MagicMock()
+            downloader.next_chunk.return_value = (None, True)
+            return downloader
+        mock_downloader_class.side_effect = fake_downloader
+        provider._service.files().get().execute.return_value = {
+            'id': 'file_id',
+            'name': '2025.md',
+            'size': '19',
+            'createdTime': '2025-01-01T10:00:00.000Z',
+            'modifiedTime': '2025-01-15T15:30:00.000Z'
+        }
+        
+        with patch.object(provider, '_find_file', return_value='file_id'):
+            with patch.object(provider, '_resolve_path', return_value=('folder_id', '2025.md')):
+                content, stats = provider.read_file_with_stats('Year/2025.md')
+        
+        assert content == '# 2025 年度計畫'
+        assert stats.exists is True
+        assert stats.size == 19
+        assert stats.modified_at == datetime(2025, 1, 15, 15, 30)
+    
+    @patch('backend.storage.google_drive.MediaIoBaseDownload')
+    def test_read_file_with_stats_uses_lookup_metadata(self, mock_downloader_class, provider):
+        """測試檔案 ID 需搜尋時，沿用搜尋結果的 metadata 而不再呼叫 files().get"""
+        def fake_downloader(buffer, request, chunksize=None):
+            buffer.write(b'# 2025')
+            downloader = MagicMock()
+            downloader.next_chunk.return_value = (None, True)
+            return downloader
+        mock_downloader_class.side_effect = fake_downloader
+        provider._folder_cache['base_folder_id/Year'] = 'year_folder'
+        provider._service.files().list().execute.return_value = {
+            'files': [{
+                'id': 'file_id',
+                'name': '2025.md',
+                'size': '6',
+                'createdTime': '2025-01-01T10:00:00.000Z',
+                'modifiedTime': '2025-01-15T15:30:00.000Z'
+            }]
+        }
+        provider._service.files().get.reset_mock()
+        
+        content, stats = provider.read_file_with_stats('Year/2025.md')
+        
+        assert content == '# 2025'
+        assert stats.size == 6
+        assert stats.modified_at == datetime(2025, 1, 15, 15, 30)
+        provider._service.files().get.assert_not_called()
+    
+    def test_read_file_with_stats_not_found(self, provider):
+        """測試讀取不存在的檔案"""
+        with patch.object(provider, '_find_file', return_value=None):
+            with patch.object(provider, '_resolve_path', return_value=('folder_id', 'missing.md')):
+                with pytest.raises(FileNotFoundError):
+                    provider.read_file_with_stats('Year/missing.md')
+    
     @patch('backend.storage.google_drive.MediaIoBaseUpload')
     def test_write_file_new(self, mock_uploader_class, provider):
         """測試寫入新檔案"""
@@ -373,11 +795,428 @@ class TestGoogleDriveReadWrite:
     def test_write_file_update(self, mock_uploader_class, provider):
         """測試更新現有檔案"""
         # Mock 檔案存在
+        provider._service.files().update().execute.return_value = {
+            'id': 'existing_file_id', 'trashed': False
+        }
         with patch.object(provider, '_find_file', return_value='existing_file_id'):
             with patch.object(provider, '_resolve_path', return_value=('folder_id', 'existing.md')):
                 provider.write_file('Year/existing.md', '# Updated Content')
                 
                 provider._service.files().update.assert_called_with(
                     fileId='existing_file_id',
-                    media_body=mock_uploader_class.return_value
+                    media_body=mock_uploader_class.return_value,
+                    fields='id,trashed'
                 )
+
+    @patch('backend.storage.google_drive.MediaIoBaseUpload')
+    def test_create_file_refuses_existing(self, mock_uploader_class, provider):
+        """測試 create_file 不使用快取 ID，搜尋到檔案時不更新而拋出 FileExistsError"""
+        provider._folder_cache['base_folder_id/Day'] = 'day_folder'
+        provider._service.files().list().execute.return_value = {
+            'files': [{'id': 'cloud_file_id', 'name': '20250701.md'}]
+        }
+        provider._service.files().update.reset_mock()
+        provider._service.files().create.reset_mock()
+    
+        with pytest.raises(FileExistsError):
+            provider.create_file('Day/20250701.md', '# local')
+    
+        provider._service.files().update.assert_not_called()
+        provider._service.files().create.assert_not_called()
+    
+    @patch('backend.storage.google_drive.MediaIoBaseUpload')
+    def test_create_file_ignores_stale_cached_id(self, mock_uploader_class, provider):
+        """測試快取中有 ID 但雲端已沒有檔案時建立新檔案"""
+        provider._folder_cache['base_folder_id/Day'] = 'day_folder'
+        provider._file_cache['day_folder/20250701.md'] = 'deleted_id'
+        provider._service.files().list().execute.return_value = {'files': []}
+        provider._service.files().create().execute.return_value = {'id': 'new_id'}
+        provider._service.files().update.reset_mock()
+    
+        provider.create_file('Day/20250701.md', '# local')
+    
+        provider._service.files().update.assert_not_called()
+        assert provider._file_cache['day_folder/20250701.md'] == 'new_id'
+    
+    def test_list_files_with_metadata_raises_on_error(self, provider):
+        """測試列出失敗時拋出例外，不返回空清單（避免被當成雲端沒有檔案）"""
+        provider._folder_cache['base_folder_id/Day'] = 'day_folder'
+        with patch.object(provider, '_list_all_pages', side_effect=NetworkError("連線失敗")):
+            with pytest.raises(NetworkError):
+                provider.list_files_with_metadata('Day')
+
+
+class TestGoogleDriveChunkedTransfer:
+    """大型檔案分段上傳、下載與續傳測試"""
+    
+    @pytest.fixture
+    def provider(self):
+        """建立 provider（縮小分段以測試多段傳輸）"""
+        provider = GoogleDriveStorageProvider()
+        provider._service = MagicMock()
+        provider._base_folder_id = 'base_folder_id'
+        provider.RESUMABLE_UPLOAD_THRESHOLD = 16
+        return provider
+    
+    @patch('backend.storage.google_drive.time.sleep')
+    @patch('backend.storage.google_drive.MediaIoBaseUpload')
+    def test_small_file_single_request(self, mock_uploader_class, mock_sleep, provider):
+        """測試小檔案以單一請求上傳，不使用可續傳上傳"""
+        provider._service.files().update().execute.return_value = {'id': 'file_id', 'trashed': False}
+        with patch.object(provider, '_find_file', return_value='file_id'):
+            with patch.object(provider, '_resolve_path', return_value=('folder_id', 'a.md')):
+                provider.write_file('Day/a.md', 'short')
+        
+        assert mock_uploader_class.call_args.kwargs['resumable'] is False
+        provider._service.files().update().execute.assert_called_once()
+        provider._service.files().update().next_chunk.assert_not_called()
+    
+    @patch('backend.storage.google_drive.time.sleep')
+    @patch('backend.storage.google_drive.MediaIoBaseUpload')
+    def test_upload_resumes_after_network_error(self, mock_uploader_class, mock_sleep, provider):
+        """測試網路中斷後查詢伺服器進度並續傳，而非從頭上傳"""
+        request = provider._service.files().update.return_value
+        request._in_error_state = False
+        request.next_chunk.side_effect = [
+            (MagicMock(), None),
+            ConnectionError("connection reset"),
+            (MagicMock(), None),
+            (None, {'id': 'file_id'}),
+        ]
+        
+        with patch.object(provider, '_find_file', return_value='file_id'):
+            with patch.object(provider, '_resolve_path', return_value=('folder_id', 'big.md')):
+                provider.write_file('Day/big.md', 'x' * 100)
+        
+        assert mock_uploader_class.call_args.kwargs['resumable'] is True
+        assert request.next_chunk.call_count == 4
+        # 中斷後下一段先查詢伺服器已確認的位置
+        assert request._in_error_state is True
+        request.execute.assert_not_called()
+        mock_sleep.assert_called_once()
+    
+    @patch('backend.storage.google_drive.time.sleep')
+    @patch('backend.storage.google_drive.MediaIoBaseUpload')
+    def test_upload_gives_up_after_repeated_failures(self, mock_uploader_class, mock_sleep, provider):
+        """測試同一段連續失敗 MAX_RETRIES 次後拋出 NetworkError"""
+        request = provider._service.files().update.return_value
+        request.next_chunk.side_effect = ConnectionError("connection reset")
+        
+        with patch.object(provider, '_find_file', return_value='file_id'):
+            with patch.object(provider, '_resolve_path', return_value=('folder_id', 'big.md')):
+                with pytest.raises(NetworkError):
+                    provider.write_file('Day/big.md', 'x' * 100)
+        
+        assert request.next_chunk.call_count == provider.MAX_RETRIES
+    
+    @patch('backend.storage.google_drive.time.sleep')
+    @patch('backend.storage.google_drive.MediaIoBaseDownload')
+    def test_download_resumes_from_offset(self, mock_downloader_class, mock_sleep, provider):
+        """測試下載中斷後由已收到的位置繼續，不重複寫入已下載的部分"""
+        chunks = iter([b'# 2025 ', ConnectionError("timeout"), '年度計畫'.encode('utf-8')])
+        
+        def fake_downloader(buffer, request, chunksize=None):
+            def next_chunk():
+                chunk = next(chunks)
+                if isinstance(chunk, Exception):
+                    raise chunk
+                buffer.write(chunk)
+                return None, buffer.tell() >= len('# 2025 年度計畫'.encode('utf-8'))
+            downloader = MagicMock()
+            downloader.next_chunk.side_effect = next_chunk
+            return downloader
+        mock_downloader_class.side_effect = fake_downloader
+        
+        with patch.object(provider, '_find_file', return_value='file_id'):
+            with patch.object(provider, '_resolve_path', return_value=('folder_id', '2025.md')):
+                assert provider.read_file('Year/2025.md') == '# 2025 年度計畫'
+        
+        assert mock_downloader_class.call_args.kwargs['chunksize'] == provider.DOWNLOAD_CHUNK_SIZE
+        mock_sleep.assert_called_once()
+
+
+class FakeBatch:
+    """模擬 BatchHttpRequest：execute 時依請求內容呼叫 callback"""
+    
+    def __init__(self, callback, responses, executed):
+        self._callback = callback
+        self._responses = responses
+        self._executed = executed
+        self._requests = []
+    
+    def add(self, request, request_id):
+        self._requests.append((request_id, request))
+    
+    def execute(self):
+        self._executed.append(len(self._requests))
+        for request_id, request in self._requests:
+            response = self._responses[request]
+            if isinstance(response, Exception):
+                self._callback(request_id, None, response)
+            else:
+                self._callback(request_id, response, None)
+
+
+class TestGoogleDriveBatchOperations:
+    """批次讀寫測試"""
+    
+    @pytest.fixture
+    def provider(self):
+        provider = GoogleDriveStorageProvider()
+        provider._service = MagicMock()
+        provider._base_folder_id = 'base_folder_id'
+        provider._folder_cache['base_folder_id/Day'] = 'day_folder_id'
+        return provider
+    
+    def install_batch(self, provider, responses):
+        """以 FakeBatch 取代 batch endpoint，請求以檔名代表"""
+        executed = []
+        provider._service.new_batch_http_request.side_effect = (
+            lambda callback: FakeBatch(callback, responses, executed)
+        )
+        return executed
+    
+    def test_lookups_sent_in_one_batch(self, provider):
+        """測試未快取的檔案 ID 以單次 batch 查詢"""
+        executed = self.install_batch(provider, {
+            '20250701.md': {'files': [{'id': 'id_1'}]},
+            '20250702.md': {'files': []},
+        })
+        provider._file_cache['day_folder_id/20250703.md'] = 'id_3'
+        
+        with patch.object(provider, '_file_lookup_request', side_effect=lambda name, parent: name):
+            resolved = provider._find_files(['Day/20250701.md', 'Day/20250702.md', 'Day/20250703.md'])
+        
+        assert executed == [2]
+        assert resolved['Day/20250701.md'] == ('day_folder_id', '20250701.md', 'id_1')
+        assert resolved['Day/20250702.md'][2] is None
+        assert resolved['Day/20250703.md'][2] == 'id_3'
+        assert provider._file_cache['day_folder_id/20250701.md'] == 'id_1'
+    
+    def test_batches_split_at_max_requests(self, provider):
+        """測試超過單批上限時分成多次 batch"""
+        names = [f"2025{i:04d}.md" for i in range(5)]
+        executed = self.install_batch(provider, {name: {'files': []} for name in names})
+        
+        with patch.object(provider, '_file_lookup_request', side_effect=lambda name, parent: name), \
+             patch.object(GoogleDriveStorageProvider, 'BATCH_MAX_REQUESTS', 2):
+            provider._find_files([f"Day/{name}" for name in names])
+        
+        assert executed == [2, 2, 1]
+    
+    def test_failed_lookup_falls_back_to_single_request(self, provider):
+        """測試 batch 中個別查詢失敗時改為單獨查詢"""
+        self.install_batch(provider, {'20250701.md': Exception('backendError')})
+        
+        with patch.object(provider, '_file_lookup_request', side_effect=lambda name, parent: name), \
+             patch.object(provider, '_find_file', return_value='id_1') as mock_find:
+            resolved = provider._find_files(['Day/20250701.md'])
+        
+        mock_find.assert_called_once_with('20250701.md', 'day_folder_id')
+        assert resolved['Day/20250701.md'][2] == 'id_1'
+    
+    def test_read_many(self, provider):
+        """測試批次讀取：不存在的檔案回傳例外，其餘並行下載"""
+        resolved = {
+            'Day/20250701.md': ('day_folder_id', '20250701.md', 'id_1'),
+            'Day/20250702.md': ('day_folder_id', '20250702.md', None),
+        }
+        with patch.object(provider, '_find_files', return_value=resolved), \
+             patch.object(provider, '_download_content', side_effect=lambda file_id: f"content of {file_id}"):
+            results = provider.read_many(list(resolved))
+        
+        assert results['Day/20250701.md'] == 'content of id_1'
+        assert isinstance(results['Day/20250702.md'], FileNotFoundError)
+    
+    def test_write_many_reports_per_file_errors(self, provider):
+        """測試批次寫入：單一檔案失敗不影響其他檔案"""
+        resolved = {
+            'Day/20250701.md': ('day_folder_id', '20250701.md', 'id_1'),
+            'Day/20250702.md': ('day_folder_id', '20250702.md', None),
+        }
+        
+        def upload(relative_path, folder_id, filename, file_id, content):
+            if file_id is None:
+                raise NetworkError()
+        
+        with patch.object(provider, '_find_files', return_value=resolved), \
+             patch.object(provider, '_upload_content', side_effect=upload) as mock_upload:
+            results = provider.write_many({'Day/20250701.md': 'a', 'Day/20250702.md': 'b'})
+        
+        assert results['Day/20250701.md'] is None
+        assert isinstance(results['Day/20250702.md'], NetworkError)
+        mock_upload.assert_any_call('Day/20250701.md', 'day_folder_id', '20250701.md', 'id_1', 'a')
+
+
+class TestGoogleDriveIdCache:
+    """ID 磁碟快取測試"""
+    
+    @pytest.fixture
+    def id_cache(self, tmp_path):
+        return DriveIdCache("user@example.com", "WorkPlanByCalendar", cache_path=tmp_path / "ids.json")
+    
+    def make_provider(self, id_cache):
+        provider = GoogleDriveStorageProvider(id_cache=id_cache)
+        provider._service = MagicMock()
+        return provider
+    
+    def test_entries_keyed_by_account_and_base_path(self, id_cache, tmp_path):
+        """測試不同帳號或根資料夾的快取互不影響"""
+        id_cache.save('base_id', {'base_id/Day': 'day_id'}, {'day_id/20250701.md': 'f_0701'})
+        other_account = DriveIdCache("other@example.com", "WorkPlanByCalendar", cache_path=tmp_path / "ids.json")
+        other_path = DriveIdCache("user@example.com", "Other", cache_path=tmp_path / "ids.json")
+        
+        assert id_cache.load()['files'] == {'day_id/20250701.md': 'f_0701'}
+        assert other_account.load()['base_folder_id'] is None
+        assert other_path.load()['folders'] == {}
+    
+    def test_new_instance_resolves_without_queries(self, id_cache):
+        """測試新的 provider 實例沿用已寫入磁碟的 ID"""
+        first = self.make_provider(id_cache)
+        first._base_folder_id = 'base_id'
+        first._service.files().list().execute.side_effect = [
+            {'files': [{'id': 'day_id', 'name': 'Day'}]},
+            {'files': [{'id': 'f_0701', 'name': '20250701.md'}]},
+        ]
+        folder_id, filename = first._resolve_path('Day/20250701.md')
+        first._find_file(filename, folder_id)
+        first.close()
+        
+        second = self.make_provider(id_cache)
+        assert second.has_cached_ids
+        folder_id, filename = second._resolve_path('Day/20250701.md')
+        
+        assert second._find_file(filename, folder_id) == 'f_0701'
+        second._service.files().list.assert_not_called()
+    
+    def test_stale_id_cleared_on_404(self, id_cache):
+        """測試快取的 ID 已失效（404）時清除快取並重新解析"""
+        id_cache.save('base_id', {'base_id/Day': 'day_id'}, {'day_id/20250701.md': 'stale_id'})
+        provider = self.make_provider(id_cache)
+        provider._service.files().list().execute.return_value = {
+            'files': [{'id': 'new_id', 'name': '20250701.md'}]
+        }
+        
+        def download(file_id):
+            if file_id == 'stale_id':
+                raise FileNotFoundError('下載檔案')
+            return 'content'
+        
+        with patch.object(provider, '_download_content', side_effect=download), \
+             patch.object(provider, '_get_or_create_folder', return_value='day_id'), \
+             patch.object(provider, '_get_base_folder_id', return_value='base_id'):
+            assert provider.read_file('Day/20250701.md') == 'content'
+        provider.close()
+        
+        assert provider._file_cache['day_id/20250701.md'] == 'new_id'
+        assert id_cache.load()['files']['day_id/20250701.md'] == 'new_id'
+    
+    def test_delete_removes_persisted_id(self, id_cache):
+        """測試刪除檔案後磁碟快取同步移除"""
+        id_cache.save('base_id', {'base_id/Day': 'day_id'}, {'day_id/20250701.md': 'f_0701'})
+        provider = self.make_provider(id_cache)
+        
+        assert provider.delete_file('Day/20250701.md') is True
+        provider.close()
+        
+        provider._service.files().delete.assert_called_with(fileId='f_0701')
+        assert 'day_id/20250701.md' not in id_cache.load()['files']
+    
+    @patch('backend.storage.google_drive.MediaIoBaseUpload')
+    def test_trashed_file_recreated_on_write(self, mock_uploader_class, id_cache):
+        """測試快取的檔案已在垃圾桶時（Drive 不回應 404）改為建立新檔案"""
+        id_cache.save('base_id', {'base_id/Day': 'day_id'}, {'day_id/20250701.md': 'trashed_id'})
+        provider = self.make_provider(id_cache)
+        files = provider._service.files()
+        files.update().execute.return_value = {'id': 'trashed_id', 'trashed': True}
+        files.list().execute.return_value = {'files': []}
+        files.create().execute.return_value = {'id': 'new_id'}
+        
+        with patch.object(provider, '_get_or_create_folder', return_value='day_id'), \
+             patch.object(provider, '_get_base_folder_id', return_value='base_id'):
+            provider.write_file('Day/20250701.md', 'content')
+        provider.close()
+        
+        assert provider._file_cache['day_id/20250701.md'] == 'new_id'
+        assert id_cache.load()['files']['day_id/20250701.md'] == 'new_id'
+    
+    def test_listing_replaces_stale_ids(self, id_cache):
+        """測試列舉目錄後以結果取代該目錄的快取 ID（移除不在列舉中的項目）"""
+        id_cache.save('base_id', {'base_id/Day': 'day_id'}, {
+            'day_id/20250701.md': 'old_id',
+            'day_id/20250702.md': 'gone_id',
+            'other_id/2025.md': 'year_id',
+        })
+        provider = self.make_provider(id_cache)
+        provider._service.files().list().execute.return_value = {'files': [
+            {'id': 'new_id', 'name': '20250701.md', 'md5Checksum': 'abc',
+             'modifiedTime': '2025-07-01T00:00:00.000Z'},
+        ]}
+        
+        files = provider.list_files_with_metadata('Day')
+        
+        assert [f['id'] for f in files] == ['new_id']
+        assert provider._file_cache == {'day_id/20250701.md': 'new_id', 'other_id/2025.md': 'year_id'}
+    
+    def test_changes_update_ids(self, id_cache):
+        """測試變更清單中移到垃圾桶與重建的檔案更新快取 ID"""
+        id_cache.save('base_id', {'base_id/Day': 'day_id'}, {
+            'day_id/20250701.md': 'old_id',
+            'day_id/20250702.md': 'trashed_id',
+        })
+        provider = self.make_provider(id_cache)
+        provider._service.changes().list().execute.return_value = {
+            'changes': [
+                {'fileId': 'new_id', 'removed': False, 'file': {
+                    'id': 'new_id', 'name': '20250701.md', 'parents': ['day_id'],
+                    'mimeType': 'text/markdown', 'trashed': False}},
+                {'fileId': 'old_id', 'removed': False, 'file': {
+                    'id': 'old_id', 'name': '20250701.md', 'parents': ['day_id'],
+                    'mimeType': 'text/markdown', 'trashed': True}},
+                {'fileId': 'trashed_id', 'removed': False, 'file': {
+                    'id': 'trashed_id', 'name': '20250702.md', 'parents': ['day_id'],
+                    'mimeType': 'text/markdown', 'trashed': True}},
+            ],
+            'newStartPageToken': 'token_2'
+        }
+        
+        changes, token = provider.list_changes('token_1')
+        
+        assert token == 'token_2'
+        assert provider._file_cache == {'day_id/20250701.md': 'new_id'}
+        assert id_cache.load()['files'] == {'day_id/20250701.md': 'new_id'}
+    
+    def test_single_lookups_batched_until_close(self, id_cache):
+        """測試單一查詢不逐次寫入磁碟，close() 時一次寫入"""
+        provider = self.make_provider(id_cache)
+        provider._base_folder_id = 'base_id'
+        provider._folder_cache['base_id/Day'] = 'day_id'
+        provider._service.files().list().execute.side_effect = [
+            {'files': [{'id': f'f_{day}', 'name': f'202507{day:02d}.md'}]} for day in (1, 2, 3)
+        ]
+        
+        with patch.object(id_cache, 'save', wraps=id_cache.save) as mock_save:
+            for day in (1, 2, 3):
+                provider._find_file(f'202507{day:02d}.md', 'day_id')
+            assert mock_save.call_count == 0
+            provider.close()
+        
+        assert mock_save.call_count == 1
+        assert len(id_cache.load()['files']) == 3
+    
+    def test_instances_merge_instead_of_overwriting(self, id_cache):
+        """測試多個實例各自寫入變更，不以完整快取覆蓋其他實例的刪除或新增"""
+        id_cache.save('base_id', {'base_id/Day': 'day_id'}, {
+            'day_id/20250701.md': 'f_0701', 'day_id/20250702.md': 'f_0702'
+        })
+        first = self.make_provider(id_cache)
+        second = self.make_provider(id_cache)
+        
+        assert first.delete_file('Day/20250701.md') is True
+        first.close()
+        second._file_cache['day_id/20250703.md'] = 'f_0703'
+        second._save_id_cache(flush=True)
+        
+        assert id_cache.load()['files'] == {
+            'day_id/20250702.md': 'f_0702', 'day_id/20250703.md': 'f_0703'
+        }
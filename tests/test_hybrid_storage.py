@@ -0,0 +1,157 @@
+"""
+HybridStorageProvider 單元測試
+
+以 LocalStorageProvider 模擬 Google Drive，測試本地寫入後的背景複寫、
+重複寫入合併，以及佇列在重新啟動後繼續複寫。
+
+Feature: 002-google-drive-storage
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from backend.storage import HybridStorageProvider, LocalStorageProvider, StorageProvider
+from backend.storage.write_behind_queue import WriteBehindQueue, OP_WRITE
+
+
+@pytest.fixture
+def local(tmp_path):
+    return LocalStorageProvider(str(tmp_path / "local"))
+
+
+@pytest.fixture
+def cloud(tmp_path):
+    return LocalStorageProvider(str(tmp_path / "cloud"))
+
+
+@pytest.fixture
+def queue_path(tmp_path):
+    return tmp_path / "write_behind_queue.json"
+
+
+def make_queue(queue_path):
+    return WriteBehindQueue("user@example.com", "Plans", queue_path)
+
+
+@pytest.fixture
+def hybrid(local, cloud, queue_path):
+    # 合併等待時間設長，測試以 flush 控制複寫時機
+    provider = HybridStorageProvider(local, cloud, make_queue(queue_path), replicate_delay=60)
+    provider.start()
+    yield provider
+    provider.close()
+
+
+class TestHybridStorageProvider:
+    """本地寫入與背景複寫測試"""
+
+    def test_implements_storage_provider_interface(self, hybrid):
+        """測試實作 StorageProvider 介面"""
+        assert isinstance(hybrid, StorageProvider)
+
+    def test_write_is_local_then_replicated(self, hybrid, local, cloud):
+        """測試寫入立即在本地完成，flush 後才出現在雲端"""
+        hybrid.write_file("Day/20250701.md", "# 今日計畫")
+
+        assert local.read_file("Day/20250701.md") == "# 今日計畫"
+        assert hybrid.read_file("Day/20250701.md") == "# 今日計畫"
+        assert not cloud.file_exists("Day/20250701.md")
+        assert hybrid.pending_count == 1
+
+        assert hybrid.flush(timeout=5)
+        assert cloud.read_file("Day/20250701.md") == "# 今日計畫"
+        assert hybrid.pending_count == 0
+
+    def test_repeated_writes_coalesced(self, hybrid, cloud):
+        """測試同一檔案複寫前的多次寫入只上傳最後的內容一次"""
+        for version in range(5):
+            hybrid.write_file("Day/20250701.md", f"version {version}")
+
+        with patch.object(cloud, 'write_many', wraps=cloud.write_many) as mock_write_many:
+            assert hybrid.flush(timeout=5)
+
+        mock_write_many.assert_called_once_with({"Day/20250701.md": "version 4"})
+        assert cloud.read_file("Day/20250701.md") == "version 4"
+
+    def test_delete_replicated(self, hybrid, local, cloud):
+        """測試刪除也會複寫到雲端"""
+        hybrid.write_file("Day/20250701.md", "content")
+        assert hybrid.flush(timeout=5)
+
+        assert hybrid.delete_file("Day/20250701.md")
+        assert not local.file_exists("Day/20250701.md")
+        assert hybrid.flush(timeout=5)
+        assert not cloud.file_exists("Day/20250701.md")
+
+    def test_failed_replication_retried(self, local, cloud, queue_path):
+        """測試複寫失敗時檔案留在佇列中，並記錄錯誤"""
+        provider = HybridStorageProvider(local, cloud, make_queue(queue_path), replicate_delay=0)
+        provider.RETRY_BACKOFF = 0.05
+        original_write_many = cloud.write_many
+        attempts = []
+
+        def flaky_write_many(files):
+            attempts.append(files)
+            if len(attempts) == 1:
+                return {path: IOError("網路錯誤") for path in files}
+            return original_write_many(files)
+
+        with patch.object(cloud, 'write_many', side_effect=flaky_write_many):
+            provider.start()
+            try:
+                provider.write_file("Day/20250701.md", "content")
+                assert provider.flush(timeout=5)
+            finally:
+                provider.close()
+
+        assert len(attempts) == 2
+        assert cloud.read_file("Day/20250701.md") == "content"
+        assert provider.last_error is None
+
+    def test_pending_queue_survives_restart(self, local, cloud, queue_path):
+        """測試關閉前未複寫的檔案，在新的實例啟動後繼續複寫"""
+        first = HybridStorageProvider(local, cloud, make_queue(queue_path), replicate_delay=60)
+        first.write_file("Day/20250701.md", "written before restart")
+        assert first.pending_count == 1
+
+        second = HybridStorageProvider(local, cloud, make_queue(queue_path), replicate_delay=60)
+        assert second.pending_count == 1
+        second.start()
+        try:
+            assert second.flush(timeout=5)
+        finally:
+            second.close()
+
+        assert cloud.read_file("Day/20250701.md") == "written before restart"
+        assert make_queue(queue_path).snapshot() == {}
+
+    def test_external_changes_replicated(self, hybrid, local, cloud):
+        """測試 provider 以外寫入本地的變更（如資料匯入）排入後複寫到雲端"""
+        hybrid.write_file("Day/20250701.md", "old")
+        assert hybrid.flush(timeout=5)
+        local.write_file("Day/20250702.md", "imported")
+        local.delete_file("Day/20250701.md")
+
+        hybrid.enqueue_external_changes(["Day/20250702.md"], ["Day/20250701.md"])
+
+        assert hybrid.pending_count == 2
+        assert hybrid.flush(timeout=5)
+        assert cloud.read_file("Day/20250702.md") == "imported"
+        assert not cloud.file_exists("Day/20250701.md")
+
+
+class TestWriteBehindQueue:
+    """待複寫佇列測試"""
+
+    def test_newer_write_kept_after_complete(self, queue_path):
+        """測試複寫期間有新的寫入時，完成舊的複寫不會移除新的紀錄"""
+        queue = make_queue(queue_path)
+        queue.enqueue("Day/20250701.md", OP_WRITE)
+        replicated_seq = queue.snapshot()["Day/20250701.md"]["seq"]
+        queue.enqueue("Day/20250701.md", OP_WRITE)
+
+        queue.complete({"Day/20250701.md": replicated_seq})
+
+        assert len(queue) == 1
+        assert len(make_queue(queue_path)) == 1
@@ -0,0 +1,98 @@
+"""
+data/settings JSON 狀態檔案輔助函數測試
+"""
+
+import json
+import threading
+
+from backend.storage.json_store import (
+    KeyedJsonStore, read_versioned_json, write_json_atomic, write_text_atomic
+)
+
+
+class TestKeyedJsonStore:
+    """KeyedJsonStore 測試"""
+
+    def test_keys_isolated_and_removed(self, tmp_path):
+        """測試不同 key 的內容互不影響，移除後檔案只剩其他 key"""
+        path = tmp_path / "state.json"
+        first = KeyedJsonStore(path, 1, "測試狀態")
+        second = KeyedJsonStore(path, 1, "測試狀態")
+
+        first.set("a|Plans", {"value": 1})
+        second.set("b|Plans", {"value": 2})
+        first.remove("a|Plans")
+
+        assert first.get("a|Plans") is None
+        assert second.get("b|Plans") == {"value": 2}
+        assert json.loads(path.read_text(encoding="utf-8")) == {
+            "version": 1, "entries": {"b|Plans": {"value": 2}}
+        }
+
+    def test_update_reads_latest_entry(self, tmp_path):
+        """測試 update 以磁碟上的最新內容為基礎"""
+        path = tmp_path / "state.json"
+        store = KeyedJsonStore(path, 1, "測試狀態")
+        store.set("a|Plans", {"x": 1})
+        KeyedJsonStore(path, 1, "測試狀態").update("a|Plans", lambda entry: {**entry, "y": 2})
+
+        assert store.get("a|Plans") == {"x": 1, "y": 2}
+
+    def test_update_entries_merges_and_keeps_other_fields(self, tmp_path):
+        """測試 update_entries 以最新項目為基礎修改，並保留其他頂層欄位"""
+        path = tmp_path / "index.json"
+        first = KeyedJsonStore(path, 1, "測試索引", field="files")
+        first.update_entries(lambda files: files.update({"a.md": "1"}), extra={"key": "a|Plans"})
+        KeyedJsonStore(path, 1, "測試索引", field="files").update("b.md", lambda current: "2")
+
+        assert first.update_entries(lambda files: files.pop("a.md")) == {"b.md": "2"}
+        assert json.loads(path.read_text(encoding="utf-8")) == {
+            "version": 1, "key": "a|Plans", "files": {"b.md": "2"}
+        }
+
+    def test_other_version_or_corrupt_file_ignored(self, tmp_path):
+        """測試版本不同或無法解析的檔案視為空的"""
+        path = tmp_path / "state.json"
+        write_json_atomic(path, {"version": 0, "entries": {"a|Plans": 1}})
+        assert KeyedJsonStore(path, 1, "測試狀態").get("a|Plans") is None
+
+        path.write_text("{not json", encoding="utf-8")
+        assert read_versioned_json(path, 1, "測試狀態") is None
+
+
+class TestWriteTextAtomic:
+    """原子寫入測試"""
+
+    def test_concurrent_writers_use_separate_temp_files(self, tmp_path):
+        """測試同時寫入同一個檔案時不會互相覆蓋暫存檔，也不留下暫存檔"""
+        path = tmp_path / "state.json"
+        errors = []
+
+        def write(value):
+            try:
+                for _ in range(20):
+                    write_text_atomic(path, value * 1000)
+            except OSError as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=write, args=(str(i),)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        content = path.read_text(encoding="utf-8")
+        assert content in {str(i) * 1000 for i in range(8)}
+        assert [p.name for p in tmp_path.iterdir()] == ["state.json"]
+
+    def test_keeps_existing_permissions(self, tmp_path):
+        """測試覆寫時沿用原檔案的權限"""
+        path = tmp_path / "plan.md"
+        path.write_text("old", encoding="utf-8")
+        path.chmod(0o640)
+
+        write_text_atomic(path, "new")
+
+        assert path.read_text(encoding="utf-8") == "new"
+        assert path.stat().st_mode & 0o777 == 0o640
@@ -0,0 +1,295 @@
+"""
+PlanService 單元測試
+
+使用 LocalStorageProvider 與臨時目錄測試計畫服務的業務邏輯。
+"""
+
+import pytest
+import tempfile
+import shutil
+import threading
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+from backend.plan_service import PlanService
+from backend.models import PlanType
+
+
+@pytest.fixture
+def temp_data_dir():
+    """建立臨時測試目錄"""
+    temp_dir = tempfile.mkdtemp()
+    yield temp_dir
+    shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+@pytest.fixture
+def service(temp_data_dir):
+    """建立使用臨時目錄的 PlanService"""
+    return PlanService(data_dir=temp_data_dir)
+
+
+class TestPlanExistenceIndex:
+    """計畫存在索引測試"""
+
+    def test_existence_from_existing_files(self, service, temp_data_dir):
+        """測試索引由既有檔案建立"""
+        (Path(temp_data_dir) / "Year" / "2025.md").write_text("# 2025", encoding='utf-8')
+        (Path(temp_data_dir) / "Week" / "20250629.md").write_text("# week", encoding='utf-8')
+        (Path(temp_data_dir) / "Day" / "20250701.md").write_text("", encoding='utf-8')
+
+        result = service.get_plans_existence(date(2025, 7, 1), date(2025, 7, 6))
+
+        assert result["2025-07-01"] == {
+            "year": True, "month": False, "week": True, "day": False
+        }
+        # 2025-07-06 屬於下一週
+        assert result["2025-07-06"]["week"] is False
+        assert len(result) == 6
+
+    def test_existence_does_not_stat_per_day(self, service):
+        """測試查詢整年範圍不逐日存取儲存後端"""
+        with patch.object(service.storage, 'get_file_stats') as mock_stats, \
+             patch.object(service.storage, 'file_exists') as mock_exists:
+            service.get_plans_existence(date(2025, 1, 1), date(2025, 12, 31))
+
+        mock_stats.assert_not_called()
+        mock_exists.assert_not_called()
+
+    def test_index_updated_on_create_and_delete(self, service):
+        """測試建立與刪除計畫後索引同步更新"""
+        target = date(2025, 3, 4)
+        assert service.plan_exists(PlanType.DAY, target) is False
+
+        service.create_plan(PlanType.DAY, target, "content")
+        assert service.plan_exists(PlanType.DAY, target) is True
+
+        service.delete_plan(PlanType.DAY, target)
+        assert service.plan_exists(PlanType.DAY, target) is False
+
+    def test_write_during_index_load_kept(self, service):
+        """測試索引列舉期間建立的計畫不會被列舉結果覆蓋"""
+        original_list = service.storage.list_files_with_stats
+        target = date(2025, 3, 4)
+
+        def list_then_write(subdir):
+            result = original_list(subdir)
+            if subdir == "Day":
+                # 列舉結果已取得後才寫入
+                service.create_plan(PlanType.DAY, target, "content")
+            return result
+
+        with patch.object(service.storage, 'list_files_with_stats', side_effect=list_then_write):
+            service.get_plans_existence(target, target)
+
+        assert service.plan_exists(PlanType.DAY, target) is True
+
+    def test_invalidate_caches_picks_up_external_changes(self, service, temp_data_dir):
+        """測試外部修改後重建索引"""
+        assert service.plan_exists(PlanType.MONTH, date(2025, 2, 10)) is False
+
+        (Path(temp_data_dir) / "Month" / "202502.md").write_text("# 2025-02", encoding='utf-8')
+        assert service.plan_exists(PlanType.MONTH, date(2025, 2, 10)) is False
+
+        service.invalidate_caches()
+        assert service.plan_exists(PlanType.MONTH, date(2025, 2, 10)) is True
+
+    def test_exclusive_write_blocks_writes_and_invalidates(self, service, temp_data_dir):
+        """測試 exclusive_write 期間計畫寫入會等待，結束後重建索引"""
+        assert service.plan_exists(PlanType.MONTH, date(2025, 2, 10)) is False
+        done = threading.Event()
+
+        with service.exclusive_write():
+            writer = threading.Thread(
+                target=lambda: (service.create_plan(PlanType.DAY, date(2025, 2, 11), "# x"), done.set())
+            )
+            writer.start()
+            (Path(temp_data_dir) / "Month" / "202502.md").write_text("# 2025-02", encoding='utf-8')
+            assert not done.wait(0.05)
+
+        writer.join(timeout=5)
+        assert done.is_set()
+        assert service.plan_exists(PlanType.MONTH, date(2025, 2, 10)) is True
+
+    def test_non_canonical_filenames_ignored(self, service, temp_data_dir):
+        """測試非標準檔名不列入索引"""
+        # 2025-07-01 為週二，不是合法的週計畫檔名
+        (Path(temp_data_dir) / "Week" / "20250701.md").write_text("# week", encoding='utf-8')
+        (Path(temp_data_dir) / "Day" / "notes.md").write_text("notes", encoding='utf-8')
+
+        result = service.get_plans_existence(date(2025, 7, 1), date(2025, 7, 1))
+
+        assert result["2025-07-01"]["week"] is False
+        assert result["2025-07-01"]["day"] is False
+
+
+class TestPlanContentCache:
+    """計畫內容快取測試"""
+
+    def test_repeated_get_hits_cache(self, service):
+        """測試重複讀取同一計畫時命中快取"""
+        service.create_plan(PlanType.DAY, date(2025, 7, 1), "content")
+
+        with patch.object(service.storage, 'read_file', wraps=service.storage.read_file) as mock_read:
+            first = service.get_plan(PlanType.DAY, date(2025, 7, 1))
+            second = service.get_plan(PlanType.DAY, date(2025, 7, 1))
+
+        mock_read.assert_not_called()
+        assert first.content == second.content
+        assert service.get_cache_stats().hits == 2
+
+    def test_external_modification_invalidates_entry(self, service, temp_data_dir):
+        """測試檔案被外部修改（mtime/size 改變）時重新讀取"""
+        service.get_plan(PlanType.YEAR, date(2025, 5, 5))
+
+        (Path(temp_data_dir) / "Year" / "2025.md").write_text("# 2025 新內容\n", encoding='utf-8')
+        plan = service.get_plan(PlanType.YEAR, date(2025, 5, 5))
+
+        assert plan.content == "# 2025 新內容\n"
+        assert service.get_cache_stats().misses == 2
+
+    def test_lru_eviction(self, temp_data_dir):
+        """測試超過容量時淘汰最久未使用的項目"""
+        service = PlanService(data_dir=temp_data_dir, cache_capacity=2)
+
+        service.get_plan(PlanType.DAY, date(2025, 1, 1))
+        service.get_plan(PlanType.DAY, date(2025, 1, 2))
+        service.get_plan(PlanType.DAY, date(2025, 1, 1))
+        service.get_plan(PlanType.DAY, date(2025, 1, 3))
+
+        stats = service.get_cache_stats()
+        assert stats.size == 2
+        assert stats.evictions == 1
+
+        # 2025-01-02 已被淘汰，2025-01-01 仍在快取中
+        service.get_plan(PlanType.DAY, date(2025, 1, 1))
+        assert service.get_cache_stats().hits == 2
+
+    def test_delete_removes_cached_plan(self, service):
+        """測試刪除計畫後不再回傳快取內容"""
+        service.create_plan(PlanType.MONTH, date(2025, 7, 1), "keep me")
+        service.delete_plan(PlanType.MONTH, date(2025, 7, 1))
+
+        plan = service.get_plan(PlanType.MONTH, date(2025, 7, 1))
+
+        assert "keep me" not in plan.content
+
+
+class TestGetAllPlansForDate:
+    """並行讀取四種計畫測試"""
+
+    def test_returns_all_plan_types(self, service):
+        """測試回傳四種計畫"""
+        service.create_plan(PlanType.WEEK, date(2025, 7, 2), "week content")
+
+        all_plans = service.get_all_plans_for_date(date(2025, 7, 2))
+
+        assert set(all_plans.plans.keys()) == {"year", "month", "week", "day"}
+        assert "week content" in all_plans.plans["week"].content
+        assert all_plans.plans["week"].date == date(2025, 6, 29)
+
+    def test_plans_fetched_concurrently(self, service):
+        """測試四個計畫並行讀取"""
+        original_read = service.storage.read_file_with_stats
+        active = []
+        peak = []
+        lock = threading.Lock()
+
+        def slow_read(relative_path):
+            with lock:
+                active.append(relative_path)
+                peak.append(len(active))
+            time.sleep(0.1)
+            with lock:
+                active.remove(relative_path)
+            return original_read(relative_path)
+
+        with patch.object(service.storage, 'read_file_with_stats', side_effect=slow_read):
+            service.get_all_plans_for_date(date(2025, 7, 2))
+
+        assert max(peak) == 4
+
+    def test_slow_plan_times_out_to_none(self, service):
+        """測試單一計畫逾時時該欄位為 None，其他計畫正常回傳"""
+        original_read = service.storage.read_file_with_stats
+
+        def read_with_slow_year(relative_path):
+            if relative_path.startswith("Year"):
+                time.sleep(0.5)
+            return original_read(relative_path)
+
+        with patch.object(service.storage, 'read_file_with_stats', side_effect=read_with_slow_year), \
+             patch.object(PlanService, 'PLAN_FETCH_TIMEOUT', 0.2):
+            all_plans = service.get_all_plans_for_date(date(2025, 7, 2))
+
+        assert all_plans.plans["year"] is None
+        assert all_plans.plans["day"] is not None
+
+
+class TestGetPlansBatch:
+    """批次讀取計畫測試"""
+
+    def test_results_follow_request_order(self, service):
+        """測試回傳順序與請求相同"""
+        service.create_plan(PlanType.DAY, date(2025, 7, 2), "day two")
+
+        plans = service.get_plans_batch([
+            (PlanType.DAY, date(2025, 7, 2)),
+            (PlanType.YEAR, date(2025, 7, 2)),
+            (PlanType.DAY, date(2025, 7, 1)),
+        ])
+
+        assert [plan.type for plan in plans] == [PlanType.DAY, PlanType.YEAR, PlanType.DAY]
+        assert "day two" in plans[0].content
+        assert plans[2].date == date(2025, 7, 1)
+
+    def test_same_canonical_date_read_once(self, service):
+        """測試對應到同一檔案的日期只讀取一次"""
+        week_days = [(PlanType.WEEK, date(2025, 6, 29) + timedelta(days=i)) for i in range(7)]
+
+        with patch.object(service, 'get_plan', wraps=service.get_plan) as mock_get:
+            plans = service.get_plans_batch(week_days)
+
+        assert mock_get.call_count == 1
+        assert len(plans) == 7
+        assert all(plan.date == date(2025, 6, 29) for plan in plans)
+
+
+class TestIterPlansInRange:
+    """日期範圍計畫列舉測試"""
+
+    def test_only_existing_plans_in_range(self, service, temp_data_dir):
+        """測試只產生範圍內實際存在的計畫，並依日期排序"""
+        day_dir = Path(temp_data_dir) / "Day"
+        for name in ["20250630.md", "20250702.md", "20250701.md", "20250801.md"]:
+            (day_dir / name).write_text(f"# {name}", encoding='utf-8')
+
+        plans = list(service.iter_plans_in_range(PlanType.DAY, date(2025, 7, 1), date(2025, 7, 31)))
+
+        assert [plan.date for plan in plans] == [date(2025, 7, 1), date(2025, 7, 2)]
+
+    def test_range_start_uses_canonical_date(self, service, temp_data_dir):
+        """測試範圍起點落在週中時，仍包含該週的週計畫"""
+        (Path(temp_data_dir) / "Week" / "20250629.md").write_text("# week", encoding='utf-8')
+
+        plans = list(service.iter_plans_in_range(PlanType.WEEK, date(2025, 7, 2), date(2025, 7, 31)))
+
+        assert [plan.date for plan in plans] == [date(2025, 6, 29)]
+
+
+class TestWriteListeners:
+    """計畫寫入回呼測試"""
+
+    def test_listeners_called_after_writes(self, service):
+        """測試建立、更新、刪除計畫後通知回呼，回呼失敗不影響寫入"""
+        calls = []
+        service.add_write_listener(lambda: calls.append(True))
+        service.add_write_listener(lambda: 1 / 0)
+
+        service.create_plan(PlanType.DAY, date(2025, 7, 1), "內容")
+        service.update_plan(PlanType.DAY, date(2025, 7, 1), "新內容")
+        service.delete_plan(PlanType.DAY, date(2025, 7, 1))
+
+        assert len(calls) == 3
@@ -0,0 +1,194 @@
+"""
+Plans Router 測試
+
+以 httpx.AsyncClient 透過 ASGI 直接呼叫路由，
+驗證儲存延遲期間事件迴圈不被阻塞（並行用戶端的儲存操作互相重疊，
+整體耗時與每個請求的 p99 延遲接近單一請求），
+以及 NDJSON 範圍串流的輸出格式。
+"""
+
+import asyncio
+import json
+import math
+import shutil
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from backend.plan_service import PlanService
+from backend.models import Plan, PlanType
+from backend.routers import plans as plans_router_module
+from backend.storage import LocalStorageProvider
+
+
+STORAGE_LATENCY = 0.05  # 每次儲存操作模擬的延遲（秒）
+
+
+class SlowLocalStorageProvider(LocalStorageProvider):
+    """模擬高延遲後端（如 Google Drive）的本地儲存
+
+    記錄同時進行中的儲存操作數量的最大值（max_active）。
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._active_lock = threading.Lock()
+        self._active = 0
+        self.max_active = 0
+
+    def _slow(self, operation, relative_path):
+        with self._active_lock:
+            self._active += 1
+            self.max_active = max(self.max_active, self._active)
+        try:
+            time.sleep(STORAGE_LATENCY)
+            return operation(relative_path)
+        finally:
+            with self._active_lock:
+                self._active -= 1
+
+    def get_file_stats(self, relative_path):
+        return self._slow(super().get_file_stats, relative_path)
+
+    def read_file_with_stats(self, relative_path):
+        return self._slow(super().read_file_with_stats, relative_path)
+
+
+@pytest.fixture
+def slow_plan_service(monkeypatch):
+    """以高延遲儲存建立 PlanService 並替換路由使用的實例"""
+    temp_dir = tempfile.mkdtemp()
+    service = PlanService(storage_provider=SlowLocalStorageProvider(temp_dir))
+    monkeypatch.setattr(plans_router_module, "plan_service", service)
+    yield service
+    shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+@pytest.fixture
+def plan_service(monkeypatch):
+    """以臨時目錄建立 PlanService 並替換路由使用的實例"""
+    temp_dir = tempfile.mkdtemp()
+    service = PlanService(data_dir=temp_dir)
+    monkeypatch.setattr(plans_router_module, "plan_service", service)
+    yield service
+    shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+@pytest.fixture
+def app():
+    application = FastAPI()
+    application.include_router(plans_router_module.router)
+    return application
+
+
+class TestPlansRouterConcurrency:
+    """並行用戶端負載測試"""
+
+    @pytest.mark.asyncio
+    async def test_storage_calls_overlap_under_concurrent_clients(self, app, slow_plan_service):
+        """測試並行用戶端讀取計畫時，儲存操作在執行緒池中同時進行
+
+        若路由阻塞事件迴圈，同一時間只會有一個儲存操作（max_active 為 1），
+        所有請求依序執行，整體耗時約為 請求總數 × 單一請求的延遲
+        （每個請求兩次儲存操作，約 2 × STORAGE_LATENCY）。
+
+        用戶端與路由共用同一個事件迴圈，阻塞期間其他用戶端還沒送出請求，
+        排隊時間不會計入個別請求的延遲；p99 上限（用戶端數 × STORAGE_LATENCY，
+        約為單一請求延遲的四倍）用於回報延遲並防止退化，是否阻塞由
+        max_active 與整體耗時判斷。
+        """
+        clients = 8
+        requests_per_client = 4
+        latencies = []
+
+        async def client_session(client, offset):
+            for i in range(requests_per_client):
+                target = date(2025, 1, 1) + timedelta(days=offset * requests_per_client + i)
+                started = time.perf_counter()
+                response = await client.get(f"/api/plans/day/{target.isoformat()}")
+                latencies.append(time.perf_counter() - started)
+                assert response.status_code == 200
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            started = time.perf_counter()
+            await asyncio.gather(*(client_session(client, n) for n in range(clients)))
+            elapsed = time.perf_counter() - started
+
+        latencies.sort()
+        p99 = latencies[math.ceil(len(latencies) * 0.99) - 1]
+        assert slow_plan_service.storage.max_active > 1
+        assert elapsed < clients * requests_per_client * STORAGE_LATENCY, f"整體耗時 {elapsed:.3f} 秒"
+        assert p99 < clients * STORAGE_LATENCY, f"p99 延遲 {p99:.3f} 秒"
+
+
+class TestStreamPlansInRange:
+    """GET /api/plans/range NDJSON 串流測試"""
+
+    @pytest.fixture
+    def client(self, app):
+        transport = httpx.ASGITransport(app=app)
+        return httpx.AsyncClient(transport=transport, base_url="http://test")
+
+    @pytest.mark.asyncio
+    async def test_one_plan_per_line_in_order(self, client, plan_service):
+        """測試回應為 NDJSON，每行一個 Plan 並依日期排序"""
+        for day in (3, 1, 2):
+            plan_service.create_plan(PlanType.DAY, date(2025, 7, day), f"第 {day} 天")
+
+        async with client:
+            response = await client.get(
+                "/api/plans/range",
+                params={"plan_type": "day", "start_date": "2025-07-01", "end_date": "2025-07-31"}
+            )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        plans = [Plan.parse_raw(line) for line in response.text.splitlines()]
+        assert [plan.date for plan in plans] == [date(2025, 7, 1), date(2025, 7, 2), date(2025, 7, 3)]
+        assert "第 2 天" in plans[1].content
+
+    @pytest.mark.asyncio
+    async def test_error_line_when_stream_fails(self, client, plan_service, monkeypatch):
+        """測試讀取中途失敗時，已輸出的計畫之後最後一行為 ErrorResponse"""
+        for day in (1, 2):
+            plan_service.create_plan(PlanType.DAY, date(2025, 7, day), f"第 {day} 天")
+        original_get_plan = plan_service.get_plan
+
+        def failing_get_plan(plan_type, target_date):
+            if target_date == date(2025, 7, 2):
+                raise IOError("讀取失敗")
+            return original_get_plan(plan_type, target_date)
+
+        monkeypatch.setattr(plan_service, "get_plan", failing_get_plan)
+
+        async with client:
+            response = await client.get(
+                "/api/plans/range",
+                params={"plan_type": "day", "start_date": "2025-07-01", "end_date": "2025-07-31"}
+            )
+
+        lines = response.text.splitlines()
+        assert response.status_code == 200
+        assert len(lines) == 2
+        assert Plan.parse_raw(lines[0]).date == date(2025, 7, 1)
+        error = json.loads(lines[1])
+        assert error["error"] == "PLAN_RANGE_ERROR"
+        assert "讀取失敗" in error["message"]
+
+    @pytest.mark.asyncio
+    async def test_start_after_end_rejected(self, client, plan_service):
+        """測試開始日期晚於結束日期時回應 400"""
+        async with client:
+            response = await client.get(
+                "/api/plans/range",
+                params={"plan_type": "day", "start_date": "2025-07-31", "end_date": "2025-07-01"}
+            )
+
+        assert response.status_code == 400
+        assert response.json()["detail"]["error"] == "INVALID_DATE_RANGE"
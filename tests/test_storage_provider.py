@@ -77,6 +77,25 @@ class TestLocalStorageProvider:
         with pytest.raises(ValueError, match="不可包含"):
             storage.read_file("../etc/passwd")
     
+    # === read_file_with_stats 測試 ===
+    
+    def test_read_file_with_stats_success(self, storage, temp_data_dir):
+        """測試讀取檔案內容並取得統計資訊"""
+        test_content = "# 2025 年計畫\n\n內容"
+        (Path(temp_data_dir) / "plan.md").write_text(test_content, encoding='utf-8')
+        
+        content, stats = storage.read_file_with_stats("plan.md")
+        
+        assert content == test_content
+        assert stats.exists is True
+        assert stats.size == len(test_content.encode('utf-8'))
+        assert stats == storage.get_file_stats("plan.md")
+    
+    def test_read_file_with_stats_not_found(self, storage):
+        """測試讀取不存在的檔案"""
+        with pytest.raises(FileNotFoundError):
+            storage.read_file_with_stats("nonexistent.md")
+    
     # === write_file 測試 ===
     
     def test_write_file_new_file(self, storage, temp_data_dir):
@@ -246,6 +265,28 @@ class TestLocalStorageProvider:
         assert file_names == sorted(file_names)
 
 
+    # === list_files_with_stats 測試 ===
+    
+    def test_list_files_with_stats(self, storage, temp_data_dir):
+        """測試列出檔案及統計資訊"""
+        subdir = Path(temp_data_dir) / "Day"
+        subdir.mkdir()
+        (subdir / "20250701.md").write_text("abc", encoding='utf-8')
+        (subdir / "nested").mkdir()
+        
+        result = storage.list_files_with_stats("Day")
+        
+        assert list(result.keys()) == ["20250701.md"]
+        assert result["20250701.md"].exists is True
+        assert result["20250701.md"].size == 3
+        assert isinstance(result["20250701.md"].modified_at, datetime)
+    
+    def test_list_files_with_stats_nonexistent_directory(self, storage):
+        """測試列出不存在目錄的統計資訊"""
+        with pytest.raises(FileNotFoundError):
+            storage.list_files_with_stats("nonexistent_dir")
+
+
 class TestLocalStorageProviderDefaultDataDir:
     """測試預設資料目錄"""
     
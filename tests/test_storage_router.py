@@ -0,0 +1,70 @@
+"""
+Storage Router 測試
+
+以 httpx.AsyncClient 透過 ASGI 呼叫儲存模式 API，
+PlanService 使用臨時目錄的本地儲存。
+"""
+
+import threading
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from backend.models import GoogleAuthInfo, StorageMode, StorageModeType
+from backend.plan_service import PlanService
+from backend.routers import storage as storage_router_module
+
+
+class FakeSettingsService:
+    """只記錄儲存模式，不寫入 data/settings"""
+
+    def __init__(self):
+        self.storage_mode = None
+
+    def get_storage_mode(self):
+        return self.storage_mode or StorageMode()
+
+    def update_storage_mode(self, storage_mode):
+        self.storage_mode = storage_mode
+
+
+@pytest.fixture
+def plan_service(tmp_path, monkeypatch):
+    service = PlanService(data_dir=str(tmp_path))
+    monkeypatch.setattr(storage_router_module, "plan_service", service)
+    return service
+
+
+@pytest.fixture
+def app(plan_service, monkeypatch):
+    monkeypatch.setattr(storage_router_module, "settings_service", FakeSettingsService())
+    monkeypatch.setattr(storage_router_module.google_auth_service, "get_auth_status", GoogleAuthInfo)
+    application = FastAPI()
+    application.include_router(storage_router_module.router)
+    return application
+
+
+class TestUpdateStorageMode:
+    """PUT /api/storage/mode 測試"""
+
+    @pytest.mark.asyncio
+    async def test_switch_runs_in_threadpool(self, app, plan_service, monkeypatch):
+        """測試切換儲存後端不在事件迴圈執行緒上進行"""
+        threads = []
+        original_switch = plan_service.switch_storage_provider
+
+        def record_switch(*args, **kwargs):
+            threads.append(threading.current_thread())
+            return original_switch(*args, **kwargs)
+
+        monkeypatch.setattr(plan_service, "switch_storage_provider", record_switch)
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.put("/api/storage/mode", json={"mode": "local"})
+
+        assert response.status_code == 200
+        assert response.json()["mode"] == StorageModeType.LOCAL.value
+        assert len(threads) == 1
+        assert threads[0] is not threading.current_thread()
@@ -0,0 +1,157 @@
+"""
+Sync Router 測試
+
+以 httpx.AsyncClient 透過 ASGI 呼叫同步 API，
+SyncService 使用本地目錄模擬雲端。
+"""
+
+import json
+import threading
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from backend.routers import sync as sync_router_module
+from backend.storage import LocalStorageProvider
+from backend.sync_scheduler import SyncScheduler
+from backend.sync_service import SyncService
+from tests.test_sync_service import FakeDriveProvider
+
+
+@pytest.fixture
+def providers(tmp_path):
+    """建立本地與模擬雲端的儲存"""
+    return LocalStorageProvider(str(tmp_path / "local")), FakeDriveProvider(str(tmp_path / "cloud"))
+
+
+@pytest.fixture
+def app(providers, monkeypatch):
+    local, cloud = providers
+    monkeypatch.setattr(
+        sync_router_module, "_get_sync_service",
+        lambda warm_up=False: SyncService(local, cloud)
+    )
+    application = FastAPI()
+    application.include_router(sync_router_module.router)
+    return application
+
+
+class TestExecuteStream:
+    """同步進度串流測試"""
+
+    @pytest.mark.asyncio
+    async def test_streams_one_result_per_operation(self, app, providers):
+        """測試每個操作輸出一行 NDJSON 結果"""
+        local, cloud = providers
+        local.write_file("Day/20250701.md", "local day")
+        cloud.write_file("Year/2025.md", "cloud year")
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.post("/api/sync/execute/stream?workers=2", json={"operations": [
+                {"file_path": "Day/20250701.md", "action": "upload"},
+                {"file_path": "Year/2025.md", "action": "download"},
+                {"file_path": "Day/20250799.md", "action": "upload"},
+            ]})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        by_path = {line["file_path"]: line for line in lines}
+        assert len(lines) == 3
+        assert by_path["Day/20250701.md"]["success"] is True
+        assert by_path["Year/2025.md"]["success"] is True
+        assert by_path["Day/20250799.md"]["success"] is False
+        assert local.read_file("Year/2025.md") == "cloud year"
+
+    @pytest.mark.asyncio
+    async def test_rejects_skip_operations(self, app):
+        """測試操作清單包含 skip 時回傳 422"""
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.post("/api/sync/execute/stream", json={"operations": [
+                {"file_path": "Day/20250701.md", "action": "skip"},
+            ]})
+
+        assert response.status_code == 422
+
+
+class TestBlockingCallsOffEventLoop:
+    """比較與同步執行不在事件迴圈執行緒上進行"""
+
+    @pytest.mark.asyncio
+    async def test_compare_and_execute_run_in_threadpool(self, app, providers, monkeypatch):
+        local, _ = providers
+        local.write_file("Day/20250701.md", "local day")
+        threads = {}
+        original_compare = SyncService.compare
+        original_execute = SyncService.execute
+
+        def record_compare(self, *args, **kwargs):
+            threads["compare"] = threading.current_thread()
+            return original_compare(self, *args, **kwargs)
+
+        def record_execute(self, *args, **kwargs):
+            threads["execute"] = threading.current_thread()
+            return original_execute(self, *args, **kwargs)
+
+        monkeypatch.setattr(SyncService, "compare", record_compare)
+        monkeypatch.setattr(SyncService, "execute", record_execute)
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            compared = await client.get("/api/sync/compare")
+            executed = await client.post("/api/sync/execute", json={"operations": [
+                {"file_path": "Day/20250701.md", "action": "upload"},
+            ]})
+
+        assert compared.status_code == 200
+        assert executed.status_code == 200
+        assert threads["compare"] is not threading.current_thread()
+        assert threads["execute"] is not threading.current_thread()
+
+
+class TestDiffStatsEndpoint:
+    """單檔行數差異 API 測試"""
+
+    @pytest.mark.asyncio
+    async def test_returns_stats_and_404(self, app, providers):
+        local, cloud = providers
+        local.write_file("Day/20250701.md", "a\nb")
+        cloud.write_file("Day/20250701.md", "a\nc")
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            found = await client.get("/api/sync/diff-stats", params={"file_path": "Day/20250701.md"})
+            missing = await client.get("/api/sync/diff-stats", params={"file_path": "Day/20250702.md"})
+
+        assert found.status_code == 200
+        assert found.json()["added_lines"] == 1
+        assert found.json()["removed_lines"] == 1
+        assert missing.status_code == 404
+        assert missing.json()["detail"]["error"] == "FILE_NOT_FOUND"
+
+
+class TestSchedulerStatusEndpoint:
+    """背景排程同步狀態端點測試"""
+
+    @pytest.mark.asyncio
+    async def test_returns_last_run(self, app, providers, monkeypatch):
+        """測試回傳上次執行的時間與數量"""
+        local, cloud = providers
+        local.write_file("Day/20250701.md", "local day")
+        scheduler = SyncScheduler(lambda: SyncService(local, cloud), interval=60)
+        scheduler.run_once()
+        monkeypatch.setattr(sync_router_module, "get_sync_scheduler", lambda: scheduler)
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get("/api/sync/scheduler")
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["enabled"] is True
+        assert body["total_runs"] == 1
+        assert body["last_uploaded"] == 1
+        assert body["last_duration_seconds"] is not None
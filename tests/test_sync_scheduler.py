@@ -0,0 +1,133 @@
+"""
+SyncScheduler 單元測試
+
+以本地目錄模擬雲端，測試排程同步只自動套用安全的操作，以及寫入後的 debounce。
+"""
+
+import threading
+import time
+
+import pytest
+from unittest.mock import patch
+
+from backend.models import FileSyncStatus
+from backend.storage import LocalStorageProvider
+from backend.sync_base_store import SyncBaseStore
+from backend.sync_scheduler import SyncScheduler
+from backend.sync_service import SyncService
+from tests.test_sync_service import FakeDriveProvider
+
+
+@pytest.fixture
+def providers(tmp_path):
+    """建立本地與模擬雲端的儲存"""
+    return LocalStorageProvider(str(tmp_path / "local")), FakeDriveProvider(str(tmp_path / "cloud"))
+
+
+@pytest.fixture
+def service(providers, tmp_path):
+    local, cloud = providers
+    return SyncService(local, cloud, base_store=SyncBaseStore("user@example.com", "Plans", tmp_path / "base"))
+
+
+class TestRunOnce:
+    """單次排程同步測試"""
+
+    def test_new_files_synced_both_ways(self, service, providers):
+        """測試只存在於一端的新檔案自動上傳或下載"""
+        local, cloud = providers
+        local.write_file("Day/20250701.md", "local day")
+        cloud.write_file("Year/2025.md", "cloud year")
+        synced = []
+        scheduler = SyncScheduler(lambda: service, interval=60, on_synced=lambda: synced.append(True))
+
+        status = scheduler.run_once()
+
+        assert (status.last_uploaded, status.last_downloaded, status.last_failed) == (1, 1, 0)
+        assert status.total_runs == 1
+        assert status.last_run_at is not None
+        assert status.last_error is None
+        assert cloud.read_file("Day/20250701.md") == "local day"
+        assert local.read_file("Year/2025.md") == "cloud year"
+        assert synced == [True]
+
+    def test_conflicts_and_deletions_left_to_user(self, service, providers):
+        """測試內容不同或曾同步過但一端已刪除的檔案不自動處理"""
+        local, cloud = providers
+        local.write_file("Day/20250701.md", "synced")
+        cloud.write_file("Day/20250701.md", "synced")
+        local.write_file("Day/20250702.md", "local")
+        cloud.write_file("Day/20250702.md", "cloud")
+        service.compare()
+        local.delete_file("Day/20250701.md")
+
+        status = SyncScheduler(lambda: service, interval=60).run_once()
+
+        assert (status.last_uploaded, status.last_downloaded, status.last_skipped) == (0, 0, 2)
+        assert not local.file_exists("Day/20250701.md")
+        statuses = {f.relative_path: f.status for f in service.compare().files}
+        assert statuses["Day/20250701.md"] == FileSyncStatus.CLOUD_ONLY
+
+    def test_cloud_listing_failure_aborts_run(self, service, providers):
+        """測試列出雲端失敗時中止排程，不把雲端已有的檔案當成 LOCAL_ONLY 上傳"""
+        local, cloud = providers
+        cloud.write_file("Day/20250701.md", "newer cloud edit")
+        local.write_file("Day/20250701.md", "older local")
+
+        with patch.object(cloud, 'list_files_with_metadata', side_effect=IOError("Drive 無法連線")):
+            status = SyncScheduler(lambda: service, interval=60).run_once()
+
+        assert status.last_error
+        assert status.last_uploaded == 0
+        assert cloud.read_file("Day/20250701.md") == "newer cloud edit"
+
+    def test_upload_never_overwrites_existing_cloud_file(self, service, providers):
+        """測試比較結果過期（雲端其實已有檔案）時上傳失敗而不覆寫"""
+        local, cloud = providers
+        cloud.write_file("Day/20250701.md", "newer cloud edit")
+        local.write_file("Day/20250701.md", "older local")
+
+        with patch.object(cloud, 'list_files_with_metadata', return_value=[]):
+            status = SyncScheduler(lambda: service, interval=60).run_once()
+
+        assert (status.last_uploaded, status.last_failed) == (0, 1)
+        assert cloud.read_file("Day/20250701.md") == "newer cloud edit"
+
+    def test_not_connected_recorded(self):
+        """測試未連結 Google 帳號時記錄原因而不拋出例外"""
+        status = SyncScheduler(lambda: None, interval=60).run_once()
+        assert status.total_runs == 1
+        assert "Google" in status.last_error
+
+    def test_disabled_without_interval(self, service):
+        """測試間隔為 0 時不啟動背景執行緒"""
+        scheduler = SyncScheduler(lambda: service, interval=0)
+        scheduler.start()
+        assert not scheduler.enabled
+        assert scheduler.get_status().next_run_at is None
+        scheduler.stop()
+
+
+class TestDebounce:
+    """寫入後提前同步測試"""
+
+    def test_write_triggers_run_after_debounce(self, service, providers):
+        """測試寫入停止後 debounce 秒內執行同步，不需等待排程間隔"""
+        local, cloud = providers
+        ran = threading.Event()
+        scheduler = SyncScheduler(lambda: service, interval=3600, debounce=0.05, on_synced=ran.set)
+        scheduler.start()
+        try:
+            # 啟動後的第一次執行（沒有檔案）完成後再寫入
+            for _ in range(100):
+                if scheduler.get_status().total_runs:
+                    break
+                time.sleep(0.02)
+            local.write_file("Day/20250701.md", "local day")
+            scheduler.notify_plan_written()
+            assert ran.wait(5)
+        finally:
+            scheduler.stop()
+
+        assert cloud.read_file("Day/20250701.md") == "local day"
+        assert scheduler.get_status().last_uploaded == 1
@@ -0,0 +1,585 @@
+"""
+SyncService 單元測試
+
+以 LocalStorageProvider 分別模擬本地與雲端，測試比較與同步執行邏輯。
+"""
+
+import hashlib
+import shutil
+import tempfile
+import threading
+import time
+from pathlib import PurePosixPath
+
+import pytest
+from unittest.mock import patch
+
+from backend.models import FileSyncStatus, SyncAction, SyncOperationRequest
+from backend.storage import LocalStorageProvider, QuotaExceededError
+from backend.local_hash_cache import LocalHashCache
+from backend.sync_journal import SyncJournal
+from backend.sync_base_store import SyncBaseStore
+from backend.three_way_merge import MergeResult, merge_texts
+from backend import sync_service as sync_service_module
+from backend.sync_service import SyncService, PLAN_DIRECTORIES
+
+
+class FakeDriveProvider(LocalStorageProvider):
+    """以本地目錄模擬 Google Drive：提供檔案 metadata 與變更紀錄"""
+
+    def __init__(self, data_dir):
+        super().__init__(data_dir)
+        self.changes = []
+
+    def _metadata(self, relative_path):
+        path = PurePosixPath(relative_path)
+        # 直接讀取檔案，不經過測試中可能被 patch 的 read_file
+        content = LocalStorageProvider.read_file(self, relative_path)
+        return {
+            'id': f"id-{relative_path}",
+            'name': path.name,
+            'mimeType': 'text/markdown',
+            'parents': [self.get_folder_id(str(path.parent))],
+            'md5Checksum': hashlib.md5(content.encode('utf-8')).hexdigest(),
+            'modifiedTime': self.get_file_stats(relative_path).modified_at.isoformat() + 'Z',
+        }
+
+    def write_file(self, relative_path, content):
+        super().write_file(relative_path, content)
+        self.changes.append({
+            'fileId': f"id-{relative_path}", 'removed': False, 'file': self._metadata(relative_path)
+        })
+
+    def create_file(self, relative_path, content):
+        super().create_file(relative_path, content)
+        self.changes.append({
+            'fileId': f"id-{relative_path}", 'removed': False, 'file': self._metadata(relative_path)
+        })
+
+    def delete_file(self, relative_path):
+        deleted = super().delete_file(relative_path)
+        self.changes.append({'fileId': f"id-{relative_path}", 'removed': True})
+        return deleted
+
+    def list_files_with_metadata(self, relative_path=""):
+        try:
+            names = self.list_files(relative_path)
+        except FileNotFoundError:
+            return []
+        return [self._metadata(f"{relative_path}/{name}") for name in names]
+
+    def get_folder_id(self, relative_path=""):
+        return f"folder-{relative_path}" if relative_path in PLAN_DIRECTORIES else "base"
+
+    def get_changes_start_token(self):
+        return str(len(self.changes))
+
+    def list_changes(self, page_token):
+        return self.changes[int(page_token):], str(len(self.changes))
+
+
+@pytest.fixture
+def providers():
+    """建立本地與模擬雲端的儲存"""
+    local_dir = tempfile.mkdtemp()
+    cloud_dir = tempfile.mkdtemp()
+    yield LocalStorageProvider(local_dir), FakeDriveProvider(cloud_dir)
+    shutil.rmtree(local_dir, ignore_errors=True)
+    shutil.rmtree(cloud_dir, ignore_errors=True)
+
+
+@pytest.fixture
+def sync_service(providers):
+    local, cloud = providers
+    return SyncService(local, cloud)
+
+
+class TestSyncExecute:
+    """同步執行測試"""
+
+    def test_results_follow_operation_order(self, sync_service, providers):
+        """測試上傳與下載完成後，結果依操作順序回傳"""
+        local, cloud = providers
+        local.write_file("Day/20250701.md", "local day")
+        local.write_file("Day/20250702.md", "local day 2")
+        cloud.write_file("Year/2025.md", "cloud year")
+
+        operations = [
+            SyncOperationRequest(file_path="Day/20250701.md", action=SyncAction.UPLOAD),
+            SyncOperationRequest(file_path="Year/2025.md", action=SyncAction.DOWNLOAD),
+            SyncOperationRequest(file_path="Day/20250702.md", action=SyncAction.UPLOAD),
+        ]
+        with patch.object(cloud, 'prefetch') as mock_prefetch:
+            result = sync_service.execute(operations)
+
+        mock_prefetch.assert_called_once_with(["Day/20250701.md", "Year/2025.md", "Day/20250702.md"])
+        assert result.success_count == 3
+        assert [r.file_path for r in result.results] == [op.file_path for op in operations]
+        assert cloud.read_file("Day/20250702.md") == "local day 2"
+        assert local.read_file("Year/2025.md") == "cloud year"
+
+    def test_operations_run_concurrently(self, sync_service, providers):
+        """測試操作以指定的並行數同時執行"""
+        local, cloud = providers
+        operations = []
+        for day in range(1, 9):
+            path = f"Day/202507{day:02d}.md"
+            local.write_file(path, f"day {day}")
+            operations.append(SyncOperationRequest(file_path=path, action=SyncAction.UPLOAD))
+
+        original_write = cloud.write_file
+        active, peak = [], []
+        lock = threading.Lock()
+
+        def slow_write(relative_path, content):
+            with lock:
+                active.append(relative_path)
+                peak.append(len(active))
+            time.sleep(0.05)
+            with lock:
+                active.remove(relative_path)
+            original_write(relative_path, content)
+
+        with patch.object(cloud, 'write_file', side_effect=slow_write):
+            result = sync_service.execute(operations, max_workers=4)
+
+        assert result.success_count == 8
+        assert max(peak) == 4
+
+    def test_quota_exceeded_not_retried(self, sync_service, providers):
+        """測試 provider 拋出配額錯誤時不再於同步層重試，其他操作照常執行"""
+        local, cloud = providers
+        local.write_file("Day/20250701.md", "local day")
+        local.write_file("Day/20250702.md", "other day")
+        original_write = cloud.write_file
+        attempts = []
+
+        def write_with_quota(relative_path, content):
+            attempts.append(relative_path)
+            if relative_path == "Day/20250701.md":
+                raise QuotaExceededError()
+            original_write(relative_path, content)
+
+        with patch.object(cloud, 'write_file', side_effect=write_with_quota):
+            result = sync_service.execute([
+                SyncOperationRequest(file_path="Day/20250701.md", action=SyncAction.UPLOAD),
+                SyncOperationRequest(file_path="Day/20250702.md", action=SyncAction.UPLOAD),
+            ])
+
+        assert attempts.count("Day/20250701.md") == 1
+        assert result.success_count == 1
+        assert result.results[0].success is False
+
+    def test_iter_execute_yields_as_completed(self, sync_service, providers):
+        """測試 iter_execute 依完成順序逐筆產生結果"""
+        local, cloud = providers
+        local.write_file("Day/20250701.md", "slow")
+        local.write_file("Day/20250702.md", "fast")
+        original_write = cloud.write_file
+
+        def write(relative_path, content):
+            if content == "slow":
+                time.sleep(0.1)
+            original_write(relative_path, content)
+
+        with patch.object(cloud, 'write_file', side_effect=write):
+            results = list(sync_service.iter_execute([
+                SyncOperationRequest(file_path="Day/20250701.md", action=SyncAction.UPLOAD),
+                SyncOperationRequest(file_path="Day/20250702.md", action=SyncAction.UPLOAD),
+            ]))
+
+        assert [r.file_path for r in results] == ["Day/20250702.md", "Day/20250701.md"]
+
+    def test_failed_file_does_not_abort_others(self, sync_service, providers):
+        """測試單一檔案失敗時其他操作仍完成"""
+        local, cloud = providers
+        local.write_file("Day/20250701.md", "local day")
+
+        result = sync_service.execute([
+            SyncOperationRequest(file_path="Day/20250799.md", action=SyncAction.UPLOAD),
+            SyncOperationRequest(file_path="Day/20250701.md", action=SyncAction.UPLOAD),
+        ])
+
+        assert result.failed_count == 1
+        assert result.results[0].success is False
+        assert result.results[0].error_message
+        assert result.results[1].success is True
+        assert cloud.read_file("Day/20250701.md") == "local day"
+
+
+@pytest.fixture
+def journaled_service(providers, tmp_path):
+    local, cloud = providers
+    journal = SyncJournal("user@example.com", "WorkPlanByCalendar", journal_path=tmp_path / "journal.json")
+    return SyncService(local, cloud, journal=journal)
+
+
+def statuses(result):
+    return {f.relative_path: f.status for f in result.files}
+
+
+class TestIncrementalCompare:
+    """增量比較測試"""
+
+    @pytest.fixture
+    def synced(self, journaled_service, providers):
+        """兩端各有相同與不同的檔案，並已完成一次完整比較"""
+        local, cloud = providers
+        local.write_file("Day/20250701.md", "same")
+        cloud.write_file("Day/20250701.md", "same")
+        local.write_file("Day/20250702.md", "local only")
+        cloud.write_file("Year/2025.md", "cloud only")
+        first = journaled_service.compare()
+        assert first.incremental is False
+        return first
+
+    def test_unchanged_files_not_reexamined(self, journaled_service, providers, synced):
+        """測試沒有變動時不重新讀取任何檔案"""
+        local, cloud = providers
+        with patch.object(local, 'read_file', wraps=local.read_file) as mock_local_read, \
+             patch.object(cloud, 'list_files_with_metadata') as mock_list:
+            result = journaled_service.compare()
+
+        assert result.incremental is True
+        assert statuses(result) == statuses(synced)
+        mock_local_read.assert_not_called()
+        mock_list.assert_not_called()
+
+    def test_cloud_changes_applied(self, journaled_service, providers, synced):
+        """測試雲端修改與刪除由變更紀錄套用"""
+        local, cloud = providers
+        cloud.write_file("Day/20250701.md", "changed in cloud\nline 2")
+        cloud.delete_file("Year/2025.md")
+        cloud.write_file("Month/202507.md", "new month")
+
+        result = journaled_service.compare()
+
+        assert statuses(result) == {
+            "Day/20250701.md": FileSyncStatus.DIFFERENT,
+            "Day/20250702.md": FileSyncStatus.LOCAL_ONLY,
+            "Month/202507.md": FileSyncStatus.CLOUD_ONLY,
+        }
+        different = next(f for f in result.files if f.relative_path == "Day/20250701.md")
+        assert different.diff_stats.cloud_lines == 2
+
+    def test_only_modified_local_files_rehashed(self, journaled_service, providers, synced):
+        """測試只重新計算大小或 mtime 有變動的本地檔案"""
+        local, cloud = providers
+        local.write_file("Day/20250702.md", "local only, edited")
+
+        with patch.object(local, 'read_file', wraps=local.read_file) as mock_local_read:
+            result = journaled_service.compare()
+
+        assert [call.args[0] for call in mock_local_read.call_args_list] == ["Day/20250702.md"]
+        edited = next(f for f in result.files if f.relative_path == "Day/20250702.md")
+        assert edited.local_md5 == hashlib.md5("local only, edited".encode('utf-8')).hexdigest()
+
+    def test_executed_uploads_compare_same(self, journaled_service, synced):
+        """測試上傳後的增量比較顯示兩端相同"""
+        journaled_service.execute([
+            SyncOperationRequest(file_path="Day/20250702.md", action=SyncAction.UPLOAD),
+        ])
+
+        result = journaled_service.compare()
+
+        assert statuses(result)["Day/20250702.md"] == FileSyncStatus.SAME
+
+    def test_full_compare_ignores_journal(self, journaled_service, synced):
+        """測試 full=True 時重新完整比較"""
+        result = journaled_service.compare(full=True)
+
+        assert result.incremental is False
+        assert statuses(result) == statuses(synced)
+
+    def test_listing_failure_keeps_journal(self, journaled_service, providers, synced):
+        """測試列出雲端失敗時中止比較，不以不完整的結果覆寫比較紀錄"""
+        local, cloud = providers
+        state = journaled_service.journal.load()
+        with patch.object(cloud, 'list_files_with_metadata', side_effect=IOError("Drive 無法連線")):
+            with pytest.raises(IOError):
+                journaled_service.compare(full=True)
+
+        assert journaled_service.journal.load() == state
+        result = journaled_service.compare()
+        assert result.incremental is True
+        assert statuses(result) == statuses(synced)
+
+    def test_invalid_token_falls_back_to_full(self, journaled_service, providers, synced):
+        """測試變更標記失效時改為完整比較"""
+        local, cloud = providers
+        with patch.object(cloud, 'list_changes', side_effect=RuntimeError("invalid token")):
+            result = journaled_service.compare()
+
+        assert result.incremental is False
+        assert statuses(result) == statuses(synced)
+
+
+class TestLocalHashCache:
+    """本地 MD5 快取測試"""
+
+    @pytest.fixture
+    def cache_path(self, tmp_path):
+        return tmp_path / "md5.json"
+
+    @pytest.fixture
+    def files(self, providers):
+        local, cloud = providers
+        local.write_file("Day/20250701.md", "same")
+        cloud.write_file("Day/20250701.md", "same")
+        local.write_file("Day/20250702.md", "local\nversion")
+        cloud.write_file("Day/20250702.md", "cloud version")
+        return providers
+
+    def test_unchanged_files_not_reread(self, files, cache_path):
+        """測試第二次完整比較（新的快取實例）不重新讀取本地檔案"""
+        local, cloud = files
+        SyncService(local, cloud, hash_cache=LocalHashCache(cache_path)).compare()
+
+        service = SyncService(local, cloud, hash_cache=LocalHashCache(cache_path))
+        with patch.object(local, 'read_file', wraps=local.read_file) as mock_read:
+            result = service.compare()
+
+        # 只有 DIFFERENT 檔案的行數差異需要讀取內容
+        assert [call.args[0] for call in mock_read.call_args_list] == ["Day/20250702.md"]
+        assert result.hash_cache_hits == 2
+        assert result.hash_cache_hit_rate == 1.0
+
+    def test_modified_file_rehashed(self, files, cache_path):
+        """測試大小或 mtime 改變的檔案重新計算"""
+        local, cloud = files
+        service = SyncService(local, cloud, hash_cache=LocalHashCache(cache_path))
+        service.compare()
+
+        local.write_file("Day/20250701.md", "edited")
+        result = service.compare()
+
+        assert result.hash_cache_hits == 1
+        assert result.hash_cache_misses == 1
+        edited = next(f for f in result.files if f.relative_path == "Day/20250701.md")
+        assert edited.status == FileSyncStatus.DIFFERENT
+
+    def test_concurrent_instances_merge_on_save(self, cache_path):
+        """測試兩個實例各自儲存時保留對方寫入的項目，只移除自己移除的項目"""
+        scheduled = LocalHashCache(cache_path)
+        manual = LocalHashCache(cache_path)
+        scheduled.put("Day/20250701.md", 4, 1, "a")
+        scheduled.put("Day/20250702.md", 4, 1, "b")
+        scheduled.save()
+
+        manual.put("Day/20250703.md", 4, 1, "c")
+        manual.save()
+        scheduled.retain(["Day/20250701.md"])
+        scheduled.save()
+
+        reloaded = LocalHashCache(cache_path)
+        assert reloaded.get("Day/20250701.md", 4, 1) == "a"
+        assert reloaded.get("Day/20250702.md", 4, 1) is None
+        assert reloaded.get("Day/20250703.md", 4, 1) == "c"
+        assert scheduled.get("Day/20250703.md", 4, 1) == "c"
+
+    def test_content_reused_for_diff_stats(self, files):
+        """測試計算 MD5 時讀取的內容沿用於行數差異，不重複讀取"""
+        local, cloud = files
+        service = SyncService(local, cloud)
+
+        with patch.object(local, 'read_file', wraps=local.read_file) as mock_read:
+            result = service.compare()
+
+        assert sorted(call.args[0] for call in mock_read.call_args_list) == [
+            "Day/20250701.md", "Day/20250702.md"
+        ]
+        different = next(f for f in result.files if f.relative_path == "Day/20250702.md")
+        assert different.diff_stats.local_lines == 2
+        assert result.hash_cache_hit_rate == 0.0
+
+
+class TestDiffStats:
+    """行數差異測試"""
+
+    @pytest.fixture
+    def diverged(self, providers):
+        local, cloud = providers
+        local.write_file("Day/20250701.md", "a\nb\nc")
+        cloud.write_file("Day/20250701.md", "a\nx\nc\nd")
+        return providers
+
+    def test_line_diff_is_accurate(self, sync_service, diverged):
+        """測試以實際行差異計算新增與刪除行數（而非行數相減）"""
+        result = sync_service.compare()
+
+        stats = result.files[0].diff_stats
+        assert (stats.local_lines, stats.cloud_lines) == (3, 4)
+        assert (stats.added_lines, stats.removed_lines) == (2, 1)
+
+    def test_compare_without_diff_stats_skips_cloud_download(self, sync_service, diverged):
+        """測試 with_diff_stats=False 時不下載雲端內容"""
+        local, cloud = diverged
+        with patch.object(cloud, 'read_file') as mock_cloud_read, \
+             patch.object(cloud, 'read_many') as mock_cloud_read_many:
+            result = sync_service.compare(with_diff_stats=False)
+
+        mock_cloud_read.assert_not_called()
+        mock_cloud_read_many.assert_not_called()
+        assert result.files[0].status == FileSyncStatus.DIFFERENT
+        assert result.files[0].diff_stats is None
+
+    def test_incremental_compare_fills_missing_diff_stats(self, journaled_service, diverged):
+        """測試先前略過的行數差異在之後要求時補算"""
+        journaled_service.compare(with_diff_stats=False)
+
+        result = journaled_service.compare()
+
+        assert result.incremental is True
+        assert result.files[0].diff_stats.added_lines == 2
+
+    def test_many_files_use_process_pool(self, sync_service, diverged):
+        """測試檔案數達門檻時以 process pool 計算，結果相同"""
+        with patch.object(sync_service_module, 'DIFF_PROCESS_THRESHOLD', 1):
+            result = sync_service.compare()
+
+        assert sync_service_module._diff_executor is not None
+        assert result.files[0].diff_stats.removed_lines == 1
+
+    def test_compute_diff_stats_single_file(self, sync_service, providers):
+        """測試單檔行數差異：不存在的一端視為空檔案"""
+        local, cloud = providers
+        cloud.write_file("Year/2025.md", "one\ntwo")
+
+        stats = sync_service.compute_diff_stats("Year/2025.md")
+
+        assert (stats.local_lines, stats.cloud_lines, stats.added_lines) == (0, 2, 2)
+        with pytest.raises(FileNotFoundError):
+            sync_service.compute_diff_stats("Year/2024.md")
+
+
+class TestThreeWayMerge:
+    """三方合併測試"""
+
+    BASE = "# 今日計畫\n\n- 早上：寫報告\n- 中午：開會\n- 下午：整理資料\n- 晚上：運動\n"
+
+    @pytest.fixture
+    def merging_service(self, providers, tmp_path):
+        local, cloud = providers
+        return SyncService(local, cloud, base_store=SyncBaseStore("user@example.com", "Plans", tmp_path))
+
+    @pytest.fixture
+    def synced(self, merging_service, providers):
+        """兩端內容相同時比較，建立同步基準"""
+        local, cloud = providers
+        local.write_file("Day/20250701.md", self.BASE)
+        cloud.write_file("Day/20250701.md", self.BASE)
+        merging_service.compare()
+        return "Day/20250701.md"
+
+    def test_merge_texts_non_overlapping(self):
+        """測試兩端修改不同區塊時自動合併"""
+        local = self.BASE.replace("寫報告", "寫週報")
+        cloud = self.BASE.replace("運動", "跑步")
+        result = merge_texts(self.BASE, local, cloud)
+        assert result.conflicts == 0
+        assert result.content == self.BASE.replace("寫報告", "寫週報").replace("運動", "跑步")
+
+    def test_merge_texts_overlapping(self):
+        """測試兩端修改同一行時以衝突標記保留雙方內容"""
+        result = merge_texts(self.BASE, self.BASE.replace("開會", "客戶會議"), self.BASE.replace("開會", "午餐"))
+        assert result.conflicts == 1
+        assert "<<<<<<< 本地\n- 中午：客戶會議\n=======\n- 中午：午餐\n>>>>>>> Google Drive\n" in result.content
+        assert result.content.startswith("# 今日計畫\n")
+        assert result.content.endswith("- 晚上：運動\n")
+
+    def test_merge_texts_identical_changes(self):
+        """測試兩端做了相同修改時不視為衝突"""
+        changed = self.BASE + "- 睡前：閱讀\n"
+        assert merge_texts(self.BASE, changed, changed) == MergeResult(content=changed, conflicts=0)
+
+    def test_one_side_change_suggests_direction(self, merging_service, providers, synced):
+        """測試只有一端修改時，依基準建議單向同步"""
+        local, cloud = providers
+        cloud.write_file(synced, self.BASE + "- 睡前：閱讀\n")
+        file_info = merging_service.compare().files[0]
+        assert file_info.status == FileSyncStatus.DIFFERENT
+        assert file_info.suggested_action == SyncAction.DOWNLOAD
+
+        local.write_file(synced, self.BASE + "- 睡前：閱讀\n- 深夜：寫日記\n")
+        cloud.write_file(synced, self.BASE)
+        assert merging_service.compare().files[0].suggested_action == SyncAction.UPLOAD
+
+    def test_without_base_user_decides(self, sync_service, providers):
+        """測試沒有同步基準時仍由使用者決定"""
+        local, cloud = providers
+        local.write_file("Day/20250701.md", "local")
+        cloud.write_file("Day/20250701.md", "cloud")
+        assert sync_service.compare().files[0].suggested_action == SyncAction.SKIP
+
+    def test_both_sides_changed_merged(self, merging_service, providers, synced):
+        """測試兩端都修改時建議合併，執行後兩端內容一致"""
+        local, cloud = providers
+        local.write_file(synced, self.BASE.replace("寫報告", "寫週報"))
+        cloud.write_file(synced, self.BASE.replace("運動", "跑步"))
+        file_info = merging_service.compare().files[0]
+        assert file_info.suggested_action == SyncAction.MERGE
+
+        result = merging_service.execute([SyncOperationRequest(file_path=synced, action=SyncAction.MERGE)])
+
+        expected = self.BASE.replace("寫報告", "寫週報").replace("運動", "跑步")
+        assert result.results[0].success
+        assert result.results[0].merge_conflicts == 0
+        assert local.read_file(synced) == expected
+        assert cloud.read_file(synced) == expected
+        assert merging_service.compare().files[0].status == FileSyncStatus.SAME
+
+    def test_conflict_resolution_propagates(self, merging_service, providers, synced):
+        """測試衝突標記寫入後，在一端整理的結果會被建議同步到另一端"""
+        local, cloud = providers
+        local.write_file(synced, self.BASE.replace("開會", "客戶會議"))
+        cloud.write_file(synced, self.BASE.replace("開會", "午餐"))
+
+        result = merging_service.execute([SyncOperationRequest(file_path=synced, action=SyncAction.MERGE)])
+        assert result.results[0].merge_conflicts == 1
+        assert local.read_file(synced) == cloud.read_file(synced)
+
+        local.write_file(synced, self.BASE.replace("開會", "客戶午餐會議"))
+        assert merging_service.compare().files[0].suggested_action == SyncAction.UPLOAD
+
+    def test_merge_without_base_fails(self, sync_service, providers):
+        """測試沒有同步基準時合併失敗且不修改檔案"""
+        local, cloud = providers
+        local.write_file("Day/20250701.md", "local")
+        cloud.write_file("Day/20250701.md", "cloud")
+        result = sync_service.execute([SyncOperationRequest(file_path="Day/20250701.md", action=SyncAction.MERGE)])
+        assert result.failed_count == 1
+        assert local.read_file("Day/20250701.md") == "local"
+        assert cloud.read_file("Day/20250701.md") == "cloud"
+
+
+class TestSyncBaseStore:
+    """同步基準快照測試"""
+
+    def test_concurrent_instances_keep_each_others_bases(self, tmp_path):
+        """測試同一帳號的兩個實例（排程與手動同步）各自寫入時不互相覆蓋索引"""
+        scheduled = SyncBaseStore("user@example.com", "Plans", tmp_path)
+        manual = SyncBaseStore("user@example.com", "Plans", tmp_path)
+
+        scheduled.put("Day/20250701.md", "scheduled")
+        manual.put("Day/20250702.md", "manual")
+        scheduled.retain(["Day/20250701.md"])
+
+        reloaded = SyncBaseStore("user@example.com", "Plans", tmp_path)
+        assert reloaded.get("Day/20250701.md") == "scheduled"
+        assert reloaded.get("Day/20250702.md") == "manual"
+
+    def test_parallel_puts_all_recorded(self, tmp_path):
+        """測試多個實例平行寫入時所有基準都保留在索引中"""
+        paths = [f"Day/202507{day:02d}.md" for day in range(1, 21)]
+
+        def put(path):
+            SyncBaseStore("user@example.com", "Plans", tmp_path).put(path, path)
+
+        threads = [threading.Thread(target=put, args=(path,)) for path in paths]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        reloaded = SyncBaseStore("user@example.com", "Plans", tmp_path)
+        assert all(reloaded.get(path) == path for path in paths)